@@ -62,7 +62,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down backend application")
-    container.shutdown()
+    await container.shutdown()
 
 
 def create_app() -> FastAPI:
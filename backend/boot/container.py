@@ -10,7 +10,9 @@ from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
 # Import core modules
+from backend.boot.settings import DatabaseSettings
 from backend.modules.data_fetch.core_fetch_planner import FetchPlanner
+from backend.modules.data_fetch.service_backfill_klines import BackfillConfig, BackfillKlinesService, ExchangePort
 from backend.modules.data_analysis.service_indicator_calc import IndicatorService
 from backend.modules.backtesting.core_backtest_engine import UnifiedBacktestEngine
 from backend.modules.backtesting.port_results_store import InMemoryResultsStore, ResultsFormatter
@@ -28,6 +30,8 @@ class ContainerConfig:
     debug: bool = False
     log_level: str = "INFO"
     database_url: Optional[str] = None
+    database: Optional[DatabaseSettings] = None  # pool settings of the async repository
+    indicator_store_dir: Optional[str] = None  # Parquet copy of the indicator history
     redis_url: Optional[str] = None
     broker_config: Dict[str, Any] = None
 
@@ -136,7 +140,15 @@ class DependencyContainer:
         self._instances['fetch_planner'] = FetchPlanner()
         
         # Indicator service
-        self._instances['indicator_service'] = IndicatorService()
+        indicator_service = IndicatorService(database_url=self.config.database_url)
+        if self.config.indicator_store_dir:
+            # Imported here: the Parquet store needs pyarrow
+            from backend.modules.data_fetch.adapter_indicator_parquet import ParquetIndicatorStore
+            indicator_service.indicator_store = ParquetIndicatorStore(self.config.indicator_store_dir)
+        if self.config.database is not None or self.config.database_url:
+            # Indicator reads and writes go through the pooled async repository
+            indicator_service.repository = self.get_marketdata_repository()
+        self._instances['indicator_service'] = indicator_service
         
         logger.debug("Data components initialized")
     
@@ -221,18 +233,60 @@ class DependencyContainer:
         """Get risk engine instance"""
         return self.get('risk_engine')
     
-    def shutdown(self) -> None:
+    def get_marketdata_repository(self):
+        """
+        Get the async market data repository, creating its pool on first use
+        
+        The engine is built from the configured DatabaseSettings (or
+        database_url with the default pool settings); no connection is opened
+        until the first query.
+        """
+        if 'marketdata_repository' not in self._instances:
+            # Imported here: the asyncpg engine is only needed by the async services
+            from backend.modules.data_fetch.adapter_marketdata_postgres_async import AsyncMarketDataRepository
+            
+            database = self.config.database or DatabaseSettings(url=self.config.database_url)
+            self._instances['marketdata_repository'] = AsyncMarketDataRepository.from_settings(database)
+            logger.debug("Async market data repository initialized")
+        
+        return self._instances['marketdata_repository']
+    
+    def create_backfill_service(self,
+                                exchange: ExchangePort,
+                                config: Optional[BackfillConfig] = None) -> BackfillKlinesService:
+        """Backfill service on the async market data repository and the fetch planner"""
+        return BackfillKlinesService(
+            repository=self.get_marketdata_repository(),
+            exchange=exchange,
+            fetch_planner=self.get_fetch_planner(),
+            config=config
+        )
+    
+    async def shutdown(self) -> None:
         """Shutdown the container and cleanup resources"""
         logger.info("Shutting down container")
         
         # Cleanup live trading service
         if 'live_trading_service' in self._instances:
-            import asyncio
             try:
-                asyncio.create_task(self._instances['live_trading_service'].cleanup())
+                await self._instances['live_trading_service'].cleanup()
             except Exception as e:
                 logger.error(f"Error during live trading service cleanup: {e}")
         
+        # Flush buffered indicator values while the database is still reachable
+        if 'indicator_service' in self._instances:
+            try:
+                await self._instances['indicator_service'].stop()
+            except Exception as e:
+                logger.error(f"Error stopping indicator service: {e}")
+        
+        # Close pooled database connections
+        if 'marketdata_repository' in self._instances:
+            try:
+                await self._instances['marketdata_repository'].close()
+            except Exception as e:
+                logger.error(f"Error closing market data repository: {e}")
+        
         self._instances.clear()
         self._initialized = False
         logger.info("Container shutdown complete")
@@ -255,6 +309,7 @@ def get_container() -> DependencyContainer:
             debug=settings.debug,
             log_level=settings.log_level,
             database_url=settings.database_url,
+            database=settings.database,
             redis_url=settings.redis_url
         )
         
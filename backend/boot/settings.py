@@ -21,12 +21,25 @@ class DatabaseSettings:
     user: str = "postgres"
     password: str = "postgres"
     
+    # Connection pool of the async repository
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_recycle: int = 1800  # seconds
+    pool_timeout: float = 30.0
+    statement_cache_size: int = 512
+    
     @property
     def connection_url(self) -> str:
         """Generate database connection URL"""
         if self.url:
             return self.url
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
+    
+    @property
+    def async_connection_url(self) -> str:
+        """Connection URL for the asyncpg driver"""
+        scheme, _, rest = self.connection_url.partition("://")
+        return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgres") else self.connection_url
 
 
 @dataclass
@@ -164,7 +177,12 @@ def load_settings_from_env() -> AppSettings:
         port=int(os.getenv("DB_PORT", "5432")),
         name=os.getenv("DB_NAME", "tradingbot"),
         user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "postgres")
+        password=os.getenv("DB_PASSWORD", "postgres"),
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "512"))
     )
     
     # Redis settings
@@ -7,6 +7,13 @@ Exports public APIs for strategy testing and performance analysis.
 
 from .core_backtest_engine import UnifiedBacktestEngine, BacktestResults
 from .port_results_store import ResultsFormatter, InMemoryResultsStore
+from .service_sensitivity_analysis import (
+    ParameterSensitivityService, ParameterRange, SensitivityConfig, BacktestEvaluator
+)
+from .service_distributed_backtest import (
+    BacktestCoordinator, BacktestWorker, BacktestShardRunner, DistributedConfig
+)
+from .port_job_transport import LocalCoordinatorClient
 from .api_backtest import router as backtest_router
 
 __all__ = [
@@ -14,5 +21,14 @@ __all__ = [
     'BacktestResults', 
     'ResultsFormatter',
     'InMemoryResultsStore',
+    'ParameterSensitivityService',
+    'ParameterRange',
+    'SensitivityConfig',
+    'BacktestEvaluator',
+    'BacktestCoordinator',
+    'BacktestWorker',
+    'BacktestShardRunner',
+    'DistributedConfig',
+    'LocalCoordinatorClient',
     'backtest_router'
 ]
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+TCP Transport Adapter for Distributed Backtesting
+
+Newline-delimited JSON over plain TCP: each worker message is one line and the
+coordinator answers with exactly one line.
+
+Shards tell workers which code and data to load, so the server listens on
+loopback by default. When a shared secret is configured, every connection
+must first answer an HMAC challenge; binding to any other interface requires
+one.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import secrets
+from typing import Any, Dict, Optional
+
+from backend.modules.backtesting.port_job_transport import CoordinatorHandler
+
+logger = logging.getLogger(__name__)
+
+# Shards may carry sizeable parameter lists; raise the default 64 KiB line limit
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+# Seconds a new connection has to answer the challenge
+HANDSHAKE_TIMEOUT = 10.0
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, default=str) + '\n').encode('utf-8')
+
+
+def _digest(secret: str, nonce: str) -> str:
+    return hmac.new(secret.encode('utf-8'), nonce.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def _is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class TcpCoordinatorServer:
+    """Exposes a coordinator to remote workers over TCP"""
+
+    def __init__(self,
+                 coordinator: CoordinatorHandler,
+                 host: str = '127.0.0.1',
+                 port: int = 8765,
+                 secret: Optional[str] = None):
+        """
+        Args:
+            coordinator: Handler answering worker messages
+            host: Interface to bind; anything but loopback requires ``secret``
+            port: Port to bind, 0 for any free port
+            secret: Shared secret workers must prove knowledge of
+        """
+        self.coordinator = coordinator
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening; when ``port`` is 0 the bound port is stored back on ``self.port``"""
+        if not self.secret and not _is_loopback(self.host):
+            raise ValueError(f"Refusing to serve shards on {self.host} without a shared secret")
+
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=STREAM_LIMIT
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Backtest coordinator listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        """Stop accepting connections and close the listener"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            logger.info("Backtest coordinator server stopped")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info('peername')
+        logger.debug(f"Worker connected from {peer}")
+
+        try:
+            if self.secret and not await self._authenticate(reader, writer):
+                logger.warning(f"Rejected unauthenticated connection from {peer}")
+                return
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line)
+                    reply = await self.coordinator.handle_message(message)
+                except Exception as e:
+                    logger.error(f"Error handling message from {peer}: {e}")
+                    reply = {'type': 'error', 'error': str(e)}
+
+                writer.write(_encode(reply))
+                await writer.drain()
+
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            logger.warning(f"Connection from {peer} dropped")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _authenticate(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Challenge the peer to sign a fresh nonce with the shared secret"""
+        nonce = secrets.token_hex(16)
+        writer.write(_encode({'type': 'challenge', 'nonce': nonce}))
+        await writer.drain()
+
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout=HANDSHAKE_TIMEOUT)
+            answer = json.loads(line)
+        except (asyncio.TimeoutError, ValueError):
+            return False
+
+        digest = answer.get('digest') if isinstance(answer, dict) else None
+        if not isinstance(digest, str) or not hmac.compare_digest(digest, _digest(self.secret, nonce)):
+            writer.write(_encode({'type': 'error', 'error': 'authentication failed'}))
+            await writer.drain()
+            return False
+
+        writer.write(_encode({'type': 'authenticated'}))
+        await writer.drain()
+        return True
+
+
+class TcpCoordinatorClient:
+    """Worker-side TCP client; reconnects lazily after a dropped connection"""
+
+    def __init__(self, host: str, port: int, timeout: float = 30.0, secret: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.secret = secret
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, limit=STREAM_LIMIT),
+            timeout=self.timeout
+        )
+        if self.secret:
+            try:
+                await self._answer_challenge()
+            except Exception:
+                await self._close_unlocked()
+                raise
+
+    async def _answer_challenge(self):
+        challenge = json.loads(await asyncio.wait_for(self._reader.readline(), timeout=self.timeout) or b'{}')
+        if challenge.get('type') != 'challenge':
+            raise ConnectionError("Coordinator did not send an authentication challenge")
+
+        self._writer.write(_encode({'type': 'auth', 'digest': _digest(self.secret, challenge['nonce'])}))
+        await self._writer.drain()
+
+        reply = json.loads(await asyncio.wait_for(self._reader.readline(), timeout=self.timeout) or b'{}')
+        if reply.get('type') != 'authenticated':
+            raise PermissionError("Coordinator rejected the shared secret")
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one message and read one reply; heartbeats and results share the connection"""
+        async with self._lock:
+            if self._writer is None:
+                await self._connect()
+
+            try:
+                self._writer.write(_encode(message))
+                await self._writer.drain()
+                line = await asyncio.wait_for(self._reader.readline(), timeout=self.timeout)
+                if not line:
+                    raise ConnectionError("Coordinator closed the connection")
+                return json.loads(line)
+            except Exception:
+                await self._close_unlocked()
+                raise
+
+    async def close(self) -> None:
+        """Close the connection to the coordinator"""
+        async with self._lock:
+            await self._close_unlocked()
+
+    async def _close_unlocked(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._reader = None
+        self._writer = None
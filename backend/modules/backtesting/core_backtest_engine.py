@@ -6,6 +6,9 @@ Core backtesting engine that supports both regular and futures trading:
 - Futures trading with advanced leverage and commission structures
 - LONG and SHORT position tracking
 - Advanced metrics for futures trading
+
+Price data is an OHLCV DataFrame (Open/High/Low/Close/Volume columns, DatetimeIndex)
+or ``Candles``, which is wrapped into one without copying.
 """
 
 from backtesting import Backtest
@@ -18,6 +21,8 @@ from datetime import datetime
 import json
 import logging
 
+from ..data_fetch.core_candles import Candles
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,7 +100,7 @@ class UnifiedBacktestEngine:
         self._last_backtest = None  # Store last Backtest object for plotting
     
     def run_backtest(self,
-                    data: pd.DataFrame,
+                    data: Union[pd.DataFrame, Candles],
                     strategy_class: Type[Union[BaseStrategy, FuturesBaseStrategy]],
                     initial_cash: float = 10000,
                     commission: float = 0.002,
@@ -107,7 +112,7 @@ class UnifiedBacktestEngine:
         Run a standard backtest with the given data and strategy.
         
         Args:
-            data: OHLCV DataFrame with DatetimeIndex
+            data: OHLCV DataFrame with DatetimeIndex, or Candles
             strategy_class: Strategy class (must inherit from BaseStrategy)
             initial_cash: Starting capital
             commission: Commission per trade (as fraction, e.g., 0.002 = 0.2%)
@@ -119,6 +124,7 @@ class UnifiedBacktestEngine:
         Returns:
             BacktestResults containing stats, trades, and charts
         """
+        data = self._as_frame(data)
         logger.info(f"Starting backtest with {strategy_class.__name__}")
         logger.info(f"Data range: {data.index[0]} to {data.index[-1]}")
         logger.info(f"Initial cash: ${initial_cash:,.2f}, Commission: {commission:.2%}")
@@ -172,7 +178,7 @@ class UnifiedBacktestEngine:
         )
     
     def run_futures_backtest(self,
-                            data: pd.DataFrame,
+                            data: Union[pd.DataFrame, Candles],
                             strategy_class: Type[FuturesBaseStrategy],
                             initial_cash: float = 10000,
                             leverage: float = 10.0,
@@ -186,7 +192,7 @@ class UnifiedBacktestEngine:
         Run a futures backtest with leverage and advanced features.
         
         Args:
-            data: OHLCV DataFrame with DatetimeIndex
+            data: OHLCV DataFrame with DatetimeIndex, or Candles
             strategy_class: Strategy class (must inherit from FuturesBaseStrategy)
             initial_cash: Starting capital
             leverage: Trading leverage (e.g., 10 = 10x leverage)
@@ -200,6 +206,7 @@ class UnifiedBacktestEngine:
         Returns:
             BacktestResults containing stats, trades, and charts with futures metrics
         """
+        data = self._as_frame(data)
         logger.info(f"Starting futures backtest with {strategy_class.__name__}")
         logger.info(f"Data range: {data.index[0]} to {data.index[-1]}")
         logger.info(f"Initial cash: ${initial_cash:,.2f}, Leverage: {leverage}x")
@@ -278,7 +285,7 @@ class UnifiedBacktestEngine:
         )
     
     def optimize(self,
-                data: pd.DataFrame,
+                data: Union[pd.DataFrame, Candles],
                 strategy_class: Type[Union[BaseStrategy, FuturesBaseStrategy]],
                 initial_cash: float = 10000,
                 commission: float = 0.002,
@@ -289,7 +296,7 @@ class UnifiedBacktestEngine:
         Optimize strategy parameters.
         
         Args:
-            data: OHLCV DataFrame
+            data: OHLCV DataFrame, or Candles
             strategy_class: Strategy class to optimize
             initial_cash: Starting capital
             commission: Commission per trade
@@ -301,6 +308,7 @@ class UnifiedBacktestEngine:
         Returns:
             Tuple of (best_params, all_results)
         """
+        data = self._as_frame(data)
         logger.info(f"Starting optimization for {strategy_class.__name__}")
         logger.info(f"Optimizing: {param_ranges}")
         
@@ -324,6 +332,13 @@ class UnifiedBacktestEngine:
         
         return results, results._strategy
     
+    @staticmethod
+    def _as_frame(data: Union[pd.DataFrame, Candles]) -> pd.DataFrame:
+        """Backtesting DataFrame view over Candles; DataFrames pass through"""
+        if isinstance(data, Candles):
+            return data.to_pandas(title_case=True)
+        return data
+    
     def _validate_data(self, data: pd.DataFrame):
         """
         Validate that data is in correct format for backtesting.
@@ -0,0 +1,55 @@
+"""
+Job Transport Port for Distributed Backtesting
+
+Port interface for the request/reply channel between backtest workers and the
+sweep coordinator, plus an in-process stand-in used in tests and single-host runs.
+"""
+
+from typing import Any, Dict, Protocol
+import copy
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CoordinatorHandler(Protocol):
+    """Coordinator side of the protocol: one reply per message"""
+
+    async def handle_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Process a worker message and return the reply"""
+        ...
+
+
+class CoordinatorClient(Protocol):
+    """Port interface used by workers to talk to a coordinator"""
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a message and wait for the coordinator's reply"""
+        ...
+
+    async def close(self) -> None:
+        """Release the underlying connection"""
+        ...
+
+
+class LocalCoordinatorClient:
+    """
+    In-process implementation of CoordinatorClient.
+
+    Messages are deep-copied in both directions so workers and the coordinator
+    never share mutable state, mirroring what a wire transport would do.
+    """
+
+    def __init__(self, coordinator: CoordinatorHandler):
+        self._coordinator = coordinator
+        self.messages_sent = 0
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a message directly to the coordinator"""
+        self.messages_sent += 1
+        reply = await self._coordinator.handle_message(copy.deepcopy(message))
+        return copy.deepcopy(reply)
+
+    async def close(self) -> None:
+        """Nothing to release for the in-process transport"""
+        pass
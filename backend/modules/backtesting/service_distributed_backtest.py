@@ -0,0 +1,533 @@
+"""
+Distributed Backtest Service
+
+Coordinator/worker mode for large parameter sweeps:
+- The coordinator shards (dataset, parameter combination) pairs into jobs
+- Workers on any host pull shards over a CoordinatorClient transport
+- Heartbeats detect lost workers; their shards are re-queued with a retry limit
+- Completed sweeps are aggregated into the results store
+- Workers only import strategies from allowlisted packages and run shards
+  in a separate process, so backtests never hold the event loop's GIL
+"""
+
+import asyncio
+import importlib
+import itertools
+import logging
+import socket
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.modules.backtesting.port_job_transport import CoordinatorClient
+from backend.modules.backtesting.port_results_store import ResultsStore
+from backend.modules.backtesting.service_sensitivity_analysis import (
+    BacktestEvaluator, _evaluate_safely
+)
+
+logger = logging.getLogger(__name__)
+
+# Packages shard strategy_refs may be imported from
+DEFAULT_STRATEGY_PACKAGES = ('strategies', 'backend.modules')
+
+
+@dataclass
+class DistributedConfig:
+    """Configuration for coordinator and workers"""
+    shard_size: int = 10
+    heartbeat_interval: float = 5.0
+    heartbeat_timeout: float = 20.0
+    max_retries: int = 3
+    poll_interval: float = 1.0
+
+
+@dataclass
+class BacktestShard:
+    """A unit of work: several parameter sets on one dataset"""
+    shard_id: str
+    job_id: str
+    dataset_ref: str
+    strategy_ref: str
+    metric: str
+    param_sets: List[Dict[str, Any]]
+    engine_params: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    worker_id: Optional[str] = None
+
+    def to_message(self) -> Dict[str, Any]:
+        return {
+            'type': 'shard',
+            'shard_id': self.shard_id,
+            'job_id': self.job_id,
+            'dataset_ref': self.dataset_ref,
+            'strategy_ref': self.strategy_ref,
+            'metric': self.metric,
+            'param_sets': self.param_sets,
+            'engine_params': self.engine_params,
+            'attempt': self.attempts
+        }
+
+
+@dataclass
+class SweepJob:
+    """Book-keeping for one submitted sweep"""
+    job_id: str
+    name: str
+    total_shards: int
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    completed_shards: int = 0
+    failed_shards: List[str] = field(default_factory=list)
+    result_id: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.completed_shards + len(self.failed_shards) >= self.total_shards
+
+
+class BacktestCoordinator:
+    """
+    Hands out shards to workers and aggregates their results.
+
+    Transport-agnostic: TCP servers and the in-process client both call
+    ``handle_message``.
+    """
+
+    def __init__(self,
+                 results_store: ResultsStore,
+                 config: Optional[DistributedConfig] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.results_store = results_store
+        self.config = config or DistributedConfig()
+        self._clock = clock
+
+        self._pending: Deque[BacktestShard] = deque()
+        self._in_flight: Dict[str, BacktestShard] = {}
+        self._jobs: Dict[str, SweepJob] = {}
+        self._workers: Dict[str, float] = {}
+        self._job_events: Dict[str, asyncio.Event] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'shards_dispatched': 0,
+            'shards_completed': 0,
+            'shards_retried': 0,
+            'shards_failed': 0
+        }
+
+    def submit_sweep(self,
+                     name: str,
+                     strategy_ref: str,
+                     dataset_refs: List[str],
+                     param_grid: Dict[str, List[Any]],
+                     metric: str = 'Sharpe Ratio',
+                     engine_params: Optional[Dict[str, Any]] = None,
+                     shard_size: Optional[int] = None) -> str:
+        """
+        Queue a parameter sweep
+
+        Args:
+            name: Strategy/sweep name used when storing results
+            strategy_ref: Importable "module:ClassName" of the strategy, resolved on workers
+            dataset_refs: Dataset references workers can load (e.g. shared file paths)
+            param_grid: Parameter name to list of values; the cartesian product is swept
+            metric: Statistic to record for each run
+            engine_params: Backtest settings such as initial_cash or commission
+            shard_size: Parameter sets per shard (defaults to config)
+
+        Returns:
+            Job ID
+        """
+        job_id = f"sweep_{uuid.uuid4().hex[:12]}"
+        shard_size = shard_size or self.config.shard_size
+
+        names = list(param_grid.keys())
+        combos = [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+        shards = []
+        for dataset_ref in dataset_refs:
+            for i in range(0, len(combos), shard_size):
+                shards.append(BacktestShard(
+                    shard_id=f"{job_id}_{len(shards)}",
+                    job_id=job_id,
+                    dataset_ref=dataset_ref,
+                    strategy_ref=strategy_ref,
+                    metric=metric,
+                    param_sets=combos[i:i + shard_size],
+                    engine_params=engine_params or {}
+                ))
+
+        self._jobs[job_id] = SweepJob(job_id=job_id, name=name, total_shards=len(shards))
+        self._job_events[job_id] = asyncio.Event()
+        self._pending.extend(shards)
+
+        logger.info(
+            f"Submitted sweep {job_id}: {len(combos)} combinations x "
+            f"{len(dataset_refs)} datasets in {len(shards)} shards"
+        )
+
+        if not shards:
+            self._finish_job(self._jobs[job_id])
+
+        return job_id
+
+    async def handle_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Process one worker message and return the reply"""
+        msg_type = message.get('type')
+        worker_id = message.get('worker_id')
+
+        if worker_id:
+            self._workers[worker_id] = self._clock()
+
+        if msg_type == 'register':
+            logger.info(f"Worker {worker_id} registered")
+            return {'type': 'registered', 'heartbeat_interval': self.config.heartbeat_interval}
+
+        if msg_type == 'heartbeat':
+            return {'type': 'ack'}
+
+        if msg_type == 'request_shard':
+            self.reap_lost_shards()
+            if not self._pending:
+                return {'type': 'idle', 'poll_interval': self.config.poll_interval}
+
+            shard = self._pending.popleft()
+            shard.attempts += 1
+            shard.worker_id = worker_id
+            self._in_flight[shard.shard_id] = shard
+            self.stats['shards_dispatched'] += 1
+            return shard.to_message()
+
+        if msg_type == 'shard_result':
+            self._complete_shard(message['shard_id'], worker_id, message.get('results', []))
+            return {'type': 'ack'}
+
+        if msg_type == 'shard_failed':
+            shard = self._in_flight.get(message['shard_id'])
+            if shard and shard.worker_id == worker_id:
+                logger.warning(f"Shard {shard.shard_id} failed on {worker_id}: {message.get('error')}")
+                self._retry_or_fail(self._in_flight.pop(shard.shard_id))
+            return {'type': 'ack'}
+
+        return {'type': 'error', 'error': f"Unknown message type: {msg_type}"}
+
+    def _complete_shard(self, shard_id: str, worker_id: str, results: List[Dict[str, Any]]):
+        shard = self._in_flight.get(shard_id)
+
+        # Late results from a worker whose shard was already re-assigned are dropped
+        if shard is None or shard.worker_id != worker_id:
+            logger.debug(f"Ignoring stale result for shard {shard_id} from {worker_id}")
+            return
+
+        del self._in_flight[shard_id]
+        job = self._jobs[shard.job_id]
+
+        for result in results:
+            job.results.append({'dataset_ref': shard.dataset_ref, **result})
+
+        job.completed_shards += 1
+        self.stats['shards_completed'] += 1
+
+        if job.is_finished:
+            self._finish_job(job)
+
+    def reap_lost_shards(self) -> int:
+        """
+        Re-queue shards whose worker has missed heartbeats
+
+        Returns:
+            Number of shards re-queued or failed
+        """
+        now = self._clock()
+        lost = [
+            shard for shard in self._in_flight.values()
+            if now - self._workers.get(shard.worker_id, 0) > self.config.heartbeat_timeout
+        ]
+
+        for shard in lost:
+            logger.warning(f"Worker {shard.worker_id} lost; reclaiming shard {shard.shard_id}")
+            del self._in_flight[shard.shard_id]
+            self._retry_or_fail(shard)
+
+        return len(lost)
+
+    def _retry_or_fail(self, shard: BacktestShard):
+        shard.worker_id = None
+
+        if shard.attempts < self.config.max_retries:
+            self.stats['shards_retried'] += 1
+            # Retries go to the front so a sweep isn't held up by its last shard
+            self._pending.appendleft(shard)
+            return
+
+        logger.error(f"Shard {shard.shard_id} failed after {shard.attempts} attempts")
+        self.stats['shards_failed'] += 1
+        job = self._jobs[shard.job_id]
+        job.failed_shards.append(shard.shard_id)
+        if job.is_finished:
+            self._finish_job(job)
+
+    def _finish_job(self, job: SweepJob):
+        scored = [r for r in job.results if r.get('score') is not None and not pd.isna(r['score'])]
+        best = max(scored, key=lambda r: r['score']) if scored else None
+
+        job.result_id = self.results_store.store_results({
+            'strategy_name': job.name,
+            'type': 'distributed_sweep',
+            'status': 'completed' if not job.failed_shards else 'partial',
+            'job_id': job.job_id,
+            'results': job.results,
+            'failed_shards': job.failed_shards,
+            'best': best,
+            'stats': {
+                'runs': len(job.results),
+                'best_score': best['score'] if best else None
+            }
+        })
+
+        logger.info(
+            f"Sweep {job.job_id} finished: {len(job.results)} runs, "
+            f"{len(job.failed_shards)} failed shards"
+        )
+        self._job_events[job.job_id].set()
+
+    async def wait_for_job(self, job_id: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Wait for a sweep to finish and return its result ID"""
+        await asyncio.wait_for(self._job_events[job_id].wait(), timeout=timeout)
+        return self._jobs[job_id].result_id
+
+    def job_status(self, job_id: str) -> Dict[str, Any]:
+        """Progress summary for a sweep"""
+        job = self._jobs[job_id]
+        return {
+            'job_id': job_id,
+            'total_shards': job.total_shards,
+            'completed_shards': job.completed_shards,
+            'failed_shards': len(job.failed_shards),
+            'in_flight': sum(1 for s in self._in_flight.values() if s.job_id == job_id),
+            'pending': sum(1 for s in self._pending if s.job_id == job_id),
+            'finished': job.is_finished,
+            'result_id': job.result_id
+        }
+
+    async def start(self) -> None:
+        """Start the background reaper for lost workers"""
+        async def reaper():
+            while True:
+                try:
+                    await asyncio.sleep(self.config.heartbeat_interval)
+                    self.reap_lost_shards()
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    logger.error(f"Error in shard reaper: {e}")
+
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(reaper())
+
+    async def stop(self) -> None:
+        """Stop the background reaper"""
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            await asyncio.gather(self._reaper_task, return_exceptions=True)
+            self._reaper_task = None
+
+
+def _import_string(ref: str, allowed_packages: Optional[Tuple[str, ...]] = None) -> Any:
+    """
+    Resolve "package.module:attr" (or "package.module.attr")
+
+    Args:
+        ref: Import reference
+        allowed_packages: Packages the module must belong to; None allows any
+
+    Raises:
+        PermissionError: If the module is outside ``allowed_packages``
+    """
+    module_name, _, attr = ref.partition(':') if ':' in ref else ref.rpartition('.')
+    if allowed_packages is not None and not any(
+        module_name == package or module_name.startswith(package + '.') for package in allowed_packages
+    ):
+        raise PermissionError(f"Strategy {ref} is outside the allowed packages {list(allowed_packages)}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def load_dataset(dataset_ref: str) -> pd.DataFrame:
+    """Load an OHLCV dataset from a shared path by file extension"""
+    if dataset_ref.endswith('.parquet'):
+        return pd.read_parquet(dataset_ref)
+    if dataset_ref.endswith('.pkl'):
+        return pd.read_pickle(dataset_ref)
+    return pd.read_csv(dataset_ref, index_col=0, parse_dates=True)
+
+
+class BacktestShardRunner:
+    """Default shard executor: loads the dataset once and backtests every parameter set"""
+
+    def __init__(self,
+                 dataset_loader: Callable[[str], pd.DataFrame] = load_dataset,
+                 cache_size: int = 4,
+                 allowed_packages: Tuple[str, ...] = DEFAULT_STRATEGY_PACKAGES):
+        """
+        Args:
+            dataset_loader: Loads a dataset_ref into an OHLCV DataFrame
+            cache_size: Datasets kept in memory between shards
+            allowed_packages: Packages strategy_refs may be imported from
+        """
+        self.dataset_loader = dataset_loader
+        self.cache_size = cache_size
+        self.allowed_packages = tuple(allowed_packages)
+        self._datasets: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+    def _dataset(self, dataset_ref: str) -> pd.DataFrame:
+        if dataset_ref in self._datasets:
+            self._datasets.move_to_end(dataset_ref)
+            return self._datasets[dataset_ref]
+
+        data = self.dataset_loader(dataset_ref)
+        self._datasets[dataset_ref] = data
+        if len(self._datasets) > self.cache_size:
+            self._datasets.popitem(last=False)
+        return data
+
+    def __call__(self, shard: Dict[str, Any]) -> List[Dict[str, Any]]:
+        evaluator = BacktestEvaluator(
+            data=self._dataset(shard['dataset_ref']),
+            strategy_class=_import_string(shard['strategy_ref'], self.allowed_packages),
+            metric=shard['metric'],
+            **shard.get('engine_params', {})
+        )
+        return [
+            {'params': params, 'score': _evaluate_safely(evaluator, params)}
+            for params in shard['param_sets']
+        ]
+
+
+# Shard runner of this worker process, set once by the pool initializer
+_process_shard_runner: Optional[Callable[[Dict[str, Any]], List[Dict[str, Any]]]] = None
+
+
+def _init_shard_process(run_shard: Callable[[Dict[str, Any]], List[Dict[str, Any]]]):
+    """Process pool initializer: keep the runner (and its dataset cache) in this process"""
+    global _process_shard_runner
+    _process_shard_runner = run_shard
+
+
+def _run_shard_in_process(shard: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return _process_shard_runner(shard)
+
+
+class BacktestWorker:
+    """
+    Pulls shards from a coordinator, runs them off the event loop and reports back.
+
+    Shards run in a single-process pool owned by the worker unless an
+    executor is given. Heartbeats keep flowing while a shard is computing so
+    the coordinator can tell a slow shard from a dead worker.
+    """
+
+    def __init__(self,
+                 client: CoordinatorClient,
+                 run_shard: Optional[Callable[[Dict[str, Any]], List[Dict[str, Any]]]] = None,
+                 worker_id: Optional[str] = None,
+                 config: Optional[DistributedConfig] = None,
+                 executor: Optional[Executor] = None):
+        """
+        Args:
+            client: Transport to the coordinator
+            run_shard: Picklable shard executor (defaults to BacktestShardRunner)
+            worker_id: Stable worker name
+            config: Heartbeat and polling settings
+            executor: Executor calling ``run_shard``; by default a process of its own
+        """
+        self.client = client
+        self.run_shard = run_shard or BacktestShardRunner()
+        self.worker_id = worker_id or f"{socket.gethostname()}_{uuid.uuid4().hex[:8]}"
+        self.config = config or DistributedConfig()
+        self.executor = executor
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._running = False
+        self.shards_completed = 0
+
+    async def run(self, exit_when_idle: bool = False) -> None:
+        """
+        Main worker loop
+
+        Args:
+            exit_when_idle: Return once the coordinator has no work (useful for batch runs)
+        """
+        self._running = True
+        reply = await self.client.request({'type': 'register', 'worker_id': self.worker_id})
+        heartbeat_interval = reply.get('heartbeat_interval', self.config.heartbeat_interval)
+
+        if self.executor is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=1,
+                initializer=_init_shard_process,
+                initargs=(self.run_shard,)
+            )
+
+        try:
+            while self._running:
+                reply = await self.client.request({'type': 'request_shard', 'worker_id': self.worker_id})
+
+                if reply.get('type') == 'shard':
+                    await self._process_shard(reply, heartbeat_interval)
+                elif exit_when_idle:
+                    break
+                else:
+                    await asyncio.sleep(reply.get('poll_interval', self.config.poll_interval))
+        finally:
+            self._running = False
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+
+    async def _execute(self, shard: Dict[str, Any]) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        if self.executor is not None:
+            return await loop.run_in_executor(self.executor, self.run_shard, shard)
+        return await loop.run_in_executor(self._process_pool, _run_shard_in_process, shard)
+
+    async def _process_shard(self, shard: Dict[str, Any], heartbeat_interval: float):
+        shard_id = shard['shard_id']
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(heartbeat_interval)
+                try:
+                    await self.client.request({
+                        'type': 'heartbeat', 'worker_id': self.worker_id, 'shard_id': shard_id
+                    })
+                except Exception as e:
+                    logger.warning(f"Heartbeat failed for {self.worker_id}: {e}")
+
+        heartbeat_task = asyncio.create_task(heartbeat())
+
+        try:
+            results = await self._execute(shard)
+        except Exception as e:
+            logger.error(f"Shard {shard_id} failed on {self.worker_id}: {e}")
+            await self.client.request({
+                'type': 'shard_failed', 'worker_id': self.worker_id,
+                'shard_id': shard_id, 'error': str(e)
+            })
+            return
+        finally:
+            heartbeat_task.cancel()
+            await asyncio.gather(heartbeat_task, return_exceptions=True)
+
+        await self.client.request({
+            'type': 'shard_result', 'worker_id': self.worker_id,
+            'shard_id': shard_id, 'results': results
+        })
+        self.shards_completed += 1
+
+    def stop(self) -> None:
+        """Finish the current shard, then exit the loop"""
+        self._running = False
@@ -0,0 +1,326 @@
+"""
+Parameter Sensitivity Analysis Service
+
+Perturbs strategy parameters around a chosen optimum and evaluates the
+resulting neighbourhoods in parallel:
+- One-dimensional sensitivity curves per parameter
+- Two-dimensional heatmap matrices for pairs of parameters
+- Memoised evaluations so overlapping neighbourhoods are computed once
+- One process pool per service: the evaluator (and the price data it holds)
+  is sent to each worker once by the pool initializer, not with every job
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+import itertools
+import logging
+import math
+import os
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+ParamKey = Tuple[Tuple[str, Any], ...]
+
+
+@dataclass
+class ParameterRange:
+    """Perturbation settings for a single strategy parameter"""
+    name: str
+    step: float
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    integer: bool = False
+
+    def neighbours(self, center: float, steps: int) -> List[Any]:
+        """Values at ``center + k * step`` for k in [-steps, steps], clipped and de-duplicated"""
+        values = []
+        for k in range(-steps, steps + 1):
+            value = center + k * self.step
+            if self.min_value is not None and value < self.min_value:
+                continue
+            if self.max_value is not None and value > self.max_value:
+                continue
+            value = int(round(value)) if self.integer else round(value, 10)
+            if value not in values:
+                values.append(value)
+        return values
+
+
+@dataclass
+class SensitivityConfig:
+    """Configuration for sensitivity analysis runs"""
+    steps: int = 2
+    max_workers: Optional[int] = None
+    chunksize: Optional[int] = None     # None: about four chunks per worker
+
+
+@dataclass
+class BacktestEvaluator:
+    """
+    Picklable evaluator running a single backtest and returning one metric.
+
+    Uses backtesting.py directly (as ``UnifiedBacktestEngine.optimize`` does)
+    so no chart is rendered for each of the many evaluations.
+    """
+    data: pd.DataFrame
+    strategy_class: Type
+    metric: str = 'Sharpe Ratio'
+    initial_cash: float = 10000
+    commission: float = 0.002
+    margin: float = 1.0
+    fixed_params: Dict[str, Any] = field(default_factory=dict)
+
+    def __call__(self, params: Dict[str, Any]) -> float:
+        from backtesting import Backtest
+
+        bt = Backtest(
+            data=self.data,
+            strategy=self.strategy_class,
+            cash=self.initial_cash,
+            commission=self.commission,
+            margin=self.margin,
+            exclusive_orders=True
+        )
+        stats = bt.run(**{**self.fixed_params, **params})
+        value = stats.get(self.metric)
+        return float(value) if value is not None and pd.notna(value) else float('nan')
+
+
+# Evaluator of this worker process, set once by the pool initializer
+_worker_evaluator: Optional[Callable[[Dict[str, Any]], float]] = None
+
+
+def _init_sensitivity_worker(evaluator: Callable[[Dict[str, Any]], float]):
+    """Process pool initializer: keep the evaluator for every job of this worker"""
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _evaluate_in_worker(params: Dict[str, Any]) -> float:
+    return _evaluate_safely(_worker_evaluator, params)
+
+
+def _evaluate_safely(evaluator: Callable[[Dict[str, Any]], float],
+                     params: Dict[str, Any]) -> float:
+    """Run the evaluator, mapping failures to NaN so one bad point can't sink a sweep"""
+    try:
+        return float(evaluator(params))
+    except Exception as e:
+        logger.warning(f"Evaluation failed for {params}: {e}")
+        return float('nan')
+
+
+class ParameterSensitivityService:
+    """
+    Evaluates parameter neighbourhoods around an optimum in a process pool.
+
+    Every evaluated parameter combination is cached by value, so a heatmap for
+    (a, b) and another for (a, c) around the same optimum share the points on
+    the ``a`` axis instead of re-running them.
+
+    The process pool is started on the first parallel evaluation and reused
+    for the rest of the sweep; use the service as a context manager or call
+    ``close`` to shut it down.
+    """
+
+    def __init__(self,
+                 evaluator: Callable[[Dict[str, Any]], float],
+                 config: Optional[SensitivityConfig] = None):
+        self.evaluator = evaluator
+        self.config = config or SensitivityConfig()
+        self._cache: Dict[ParamKey, float] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {
+            'evaluations': 0,
+            'cache_hits': 0,
+            'evaluation_time': 0.0
+        }
+
+    def __enter__(self) -> 'ParameterSensitivityService':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                initializer=_init_sensitivity_worker,
+                initargs=(self.evaluator,)
+            )
+        return self._pool
+
+    def _chunksize(self, jobs: int) -> int:
+        if self.config.chunksize is not None:
+            return self.config.chunksize
+        workers = self.config.max_workers or os.cpu_count() or 1
+        return max(1, jobs // (workers * 4))
+
+    @staticmethod
+    def _key(params: Dict[str, Any]) -> ParamKey:
+        return tuple(sorted(params.items()))
+
+    def evaluate_many(self, param_sets: List[Dict[str, Any]]) -> List[float]:
+        """
+        Evaluate parameter sets, running only the uncached ones in parallel
+
+        Args:
+            param_sets: Parameter dictionaries to evaluate
+
+        Returns:
+            Scores in the same order as ``param_sets``
+        """
+        pending: Dict[ParamKey, Dict[str, Any]] = {}
+        for params in param_sets:
+            key = self._key(params)
+            if key in self._cache:
+                self.stats['cache_hits'] += 1
+            elif key not in pending:
+                pending[key] = params
+
+        if pending:
+            start = time.time()
+            keys = list(pending.keys())
+            jobs = [pending[k] for k in keys]
+
+            if self.config.max_workers == 1 or len(jobs) == 1:
+                scores = [_evaluate_safely(self.evaluator, p) for p in jobs]
+            else:
+                scores = list(self._get_pool().map(
+                    _evaluate_in_worker,
+                    jobs,
+                    chunksize=self._chunksize(len(jobs))
+                ))
+
+            self._cache.update(zip(keys, scores))
+            self.stats['evaluations'] += len(jobs)
+            self.stats['evaluation_time'] += time.time() - start
+            logger.debug(f"Evaluated {len(jobs)} parameter sets in {time.time() - start:.2f}s")
+
+        return [self._cache[self._key(p)] for p in param_sets]
+
+    def parameter_sensitivity(self,
+                              optimum: Dict[str, Any],
+                              ranges: List[ParameterRange]) -> Dict[str, Dict[str, List]]:
+        """
+        One-at-a-time sensitivity curves around the optimum
+
+        Args:
+            optimum: Best parameter set found by optimisation
+            ranges: Perturbation settings for the parameters to vary
+
+        Returns:
+            Mapping of parameter name to {'values': [...], 'scores': [...]}
+        """
+        param_sets = []
+        axes = {}
+        for rng in ranges:
+            values = rng.neighbours(optimum[rng.name], self.config.steps)
+            axes[rng.name] = values
+            param_sets.extend({**optimum, rng.name: v} for v in values)
+
+        self.evaluate_many(param_sets)
+
+        return {
+            name: {
+                'values': values,
+                'scores': [self._cache[self._key({**optimum, name: v})] for v in values]
+            }
+            for name, values in axes.items()
+        }
+
+    def heatmap(self,
+                optimum: Dict[str, Any],
+                x_range: ParameterRange,
+                y_range: ParameterRange) -> Dict[str, Any]:
+        """
+        Score matrix over a two-parameter neighbourhood
+
+        Args:
+            optimum: Best parameter set; other parameters are held at these values
+            x_range: Parameter varied along the columns
+            y_range: Parameter varied along the rows
+
+        Returns:
+            Compact heatmap payload with axis values and a row-major matrix
+        """
+        x_values = x_range.neighbours(optimum[x_range.name], self.config.steps)
+        y_values = y_range.neighbours(optimum[y_range.name], self.config.steps)
+
+        grid = [
+            {**optimum, x_range.name: x, y_range.name: y}
+            for y in y_values
+            for x in x_values
+        ]
+        flat = self.evaluate_many(grid)
+
+        width = len(x_values)
+        matrix = [
+            [None if math.isnan(v) else round(v, 6) for v in flat[row * width:(row + 1) * width]]
+            for row in range(len(y_values))
+        ]
+
+        return {
+            'x_param': x_range.name,
+            'y_param': y_range.name,
+            'x_values': x_values,
+            'y_values': y_values,
+            'matrix': matrix,
+            'optimum': {x_range.name: optimum[x_range.name], y_range.name: optimum[y_range.name]}
+        }
+
+    def heatmaps(self,
+                 optimum: Dict[str, Any],
+                 ranges: List[ParameterRange]) -> List[Dict[str, Any]]:
+        """Heatmaps for every pair of the given parameters, evaluated as one parallel batch"""
+        pairs = list(itertools.combinations(ranges, 2))
+
+        # Submit the union of all grids up front so the pool stays busy
+        grid = []
+        for x_range, y_range in pairs:
+            for y in y_range.neighbours(optimum[y_range.name], self.config.steps):
+                for x in x_range.neighbours(optimum[x_range.name], self.config.steps):
+                    grid.append({**optimum, x_range.name: x, y_range.name: y})
+        self.evaluate_many(grid)
+
+        return [self.heatmap(optimum, x_range, y_range) for x_range, y_range in pairs]
+
+    def stability_score(self, optimum: Dict[str, Any], ranges: List[ParameterRange]) -> float:
+        """
+        How close the mean neighbourhood score stays to the optimum score
+
+        Computed as ``1 - (best - mean) / (max - min)`` over the neighbourhood
+        scores, so it lies in [0, 1] and keeps its meaning for negative or
+        near-zero metrics. Values close to 1.0 indicate a plateau (a flat
+        neighbourhood scores exactly 1.0); low values indicate a spike that
+        is unlikely to survive out of sample.
+        """
+        curves = self.parameter_sensitivity(optimum, ranges)
+        best = self.evaluate_many([optimum])[0]
+        scores = [s for c in curves.values() for s in c['scores'] if not math.isnan(s)]
+
+        if not scores or math.isnan(best):
+            return 0.0
+
+        spread = max(scores + [best]) - min(scores + [best])
+        if spread == 0:
+            return 1.0
+
+        mean = sum(scores) / len(scores)
+        return min(1.0, max(0.0, 1.0 - (best - mean) / spread))
+
+    def clear_cache(self):
+        """Drop all memoised evaluations"""
+        self._cache.clear()
@@ -3,11 +3,42 @@ Data Analysis Module - Handles technical indicators and market analysis
 """
 
 from .core_indicators import IndicatorCalculator
+from .core_anchored_indicators import AnchoredVWAP, VolumeProfile
+from .core_candle_resampler import CandleResampler, ResampledCandle
+from .core_indicator_cache import IndicatorCache
+from .core_indicator_events import IndicatorSnapshotCalculated, expand_indicator_events
+from .core_indicator_graph import IndicatorGraph, IndicatorNode
+from .core_indicator_matrix import IndicatorMatrixCalculator, build_ohlcv_matrix
+from .core_incremental_indicators import Candle, IncrementalIndicatorSet
+from .core_correlation import EwmaCovariance, ReturnCorrelationTracker, RollingCovariance
+from .core_screener import CrossSection, ScreenMatch, Screener, ScreenerError
 from .service_indicator_calc import IndicatorService
+from .service_recalc_scheduler import RecalculationScheduler
 from .port_market_data_reader import MarketDataReaderPort
 
 __all__ = [
     'IndicatorCalculator',
+    'AnchoredVWAP',
+    'VolumeProfile',
+    'CandleResampler',
+    'ResampledCandle',
+    'IndicatorCache',
+    'IndicatorSnapshotCalculated',
+    'expand_indicator_events',
+    'IndicatorGraph',
+    'IndicatorNode',
+    'IndicatorMatrixCalculator',
+    'build_ohlcv_matrix',
+    'Candle',
+    'IncrementalIndicatorSet',
+    'EwmaCovariance',
+    'RollingCovariance',
+    'ReturnCorrelationTracker',
+    'CrossSection',
+    'ScreenMatch',
+    'Screener',
+    'ScreenerError',
     'IndicatorService',
+    'RecalculationScheduler',
     'MarketDataReaderPort',
 ]
\ No newline at end of file
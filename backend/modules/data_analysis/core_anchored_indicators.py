@@ -0,0 +1,214 @@
+"""
+Anchored Indicators
+
+Indicators accumulated from a fixed point in time instead of from the first
+row of whatever window was loaded.
+
+- ``AnchoredVWAP``: VWAP and its volume-weighted standard deviation since the
+  start of the current session (UTC day), week (Monday 00:00 UTC) or a
+  custom datetime, O(1) per candle
+- ``VolumeProfile``: volume per price bucket over a fixed time range, kept in
+  one float64 array that grows with the traded price range
+
+An anchored VWAP only reports values for periods it has seen from their first
+candle; a stream started mid-session stays NaN until the next session begins
+(or until it is seeded with the candles since the anchor).
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple, Union
+import math
+
+import numpy as np
+
+from .core_candle_resampler import bucket_start, to_epoch_ms
+from .core_incremental_indicators import NAN, Candle, IncrementalIndicator
+
+Anchor = Union[str, datetime]
+
+# Named anchors -> resampler interval whose buckets delimit the periods
+ANCHOR_INTERVALS = {'session': '1d', 'week': '1w'}
+
+
+def anchor_start_ms(open_ms: int, anchor: Anchor) -> Optional[int]:
+    """
+    Start of the anchor period containing a candle
+
+    Returns:
+        Epoch ms of the period start, or None for candles before a custom anchor
+    """
+    if isinstance(anchor, datetime):
+        start = to_epoch_ms(anchor)
+        return start if open_ms >= start else None
+    return bucket_start(open_ms, ANCHOR_INTERVALS[anchor])
+
+
+def anchor_name(anchor: Anchor) -> str:
+    """Output suffix of an anchor: 'session', 'week' or 'anchor_YYYYmmddHHMM'"""
+    return f"anchor_{anchor:%Y%m%d%H%M}" if isinstance(anchor, datetime) else anchor
+
+
+def validate_anchor(anchor: Anchor) -> Anchor:
+    if not isinstance(anchor, datetime) and anchor not in ANCHOR_INTERVALS:
+        raise ValueError(f"Unknown anchor {anchor!r}; use {sorted(ANCHOR_INTERVALS)} or a datetime")
+    return anchor
+
+
+class AnchoredVWAP(IncrementalIndicator):
+    """VWAP of the typical price since an anchor, with volume-weighted standard deviation"""
+
+    def __init__(self, anchor: Anchor = 'session'):
+        self.anchor = validate_anchor(anchor)
+        self.period_ms: Optional[int] = None  # start of the period being accumulated
+        self.complete = False                 # period seen from its first candle
+        self.last_ms: Optional[int] = None
+        self.shift = 0.0                      # first typical price of the period
+        self.volume = 0.0
+        self.dv = 0.0                         # sum of volume * (typical - shift)
+        self.dv2 = 0.0                        # sum of volume * (typical - shift)^2
+
+    def _step(self, candle: Candle, commit: bool) -> Dict[str, float]:
+        open_ms = to_epoch_ms(candle.open_time)
+        period = anchor_start_ms(open_ms, self.anchor)
+        typical = (candle.high + candle.low + candle.close) / 3
+
+        if period is None:
+            state = None
+        elif period != self.period_ms:
+            # A new period is complete when a candle before it was seen or it
+            # starts exactly at the anchor
+            complete = self.last_ms is not None or open_ms == period
+            state = (period, complete, typical, 0.0, 0.0, 0.0)
+        else:
+            state = (period, self.complete, self.shift, self.volume, self.dv, self.dv2)
+
+        if state is not None:
+            period, complete, shift, volume, dv, dv2 = state
+            d = typical - shift
+            volume, dv, dv2 = volume + candle.volume, dv + candle.volume * d, dv2 + candle.volume * d * d
+
+        if commit:
+            self.last_ms = open_ms
+            if state is not None:
+                self.period_ms, self.complete, self.shift = period, complete, shift
+                self.volume, self.dv, self.dv2 = volume, dv, dv2
+
+        if state is None or not complete or not volume:
+            return {'vwap': NAN, 'vwap_std': NAN}
+
+        mean = dv / volume
+        return {
+            'vwap': shift + mean,
+            'vwap_std': math.sqrt(max(dv2 / volume - mean * mean, 0.0))
+        }
+
+
+class VolumeProfile:
+    """Volume traded per price bucket over a fixed time range"""
+
+    def __init__(self,
+                 bin_size: float,
+                 start: Optional[datetime] = None,
+                 end: Optional[datetime] = None):
+        """
+        Args:
+            bin_size: Price width of one bucket
+            start: First candle open time included (default: unbounded)
+            end: Candles opening at or after this are excluded (default: unbounded)
+        """
+        if bin_size <= 0:
+            raise ValueError(f"bin_size must be positive, got {bin_size}")
+        self.bin_size = bin_size
+        self.start_ms = to_epoch_ms(start) if start is not None else None
+        self.end_ms = to_epoch_ms(end) if end is not None else None
+        self.origin = 0                # bucket index of volumes[0]
+        self.volumes = np.zeros(0)
+        self.total_volume = 0.0
+        self.candles = 0
+
+    def add(self, candle: Candle) -> bool:
+        """
+        Spread a candle's volume over the buckets its low-high range covers
+
+        Returns:
+            Whether the candle fell inside the time range
+        """
+        if candle.open_time is not None:
+            open_ms = to_epoch_ms(candle.open_time)
+            if (self.start_ms is not None and open_ms < self.start_ms) or \
+                    (self.end_ms is not None and open_ms >= self.end_ms):
+                return False
+
+        low, high = min(candle.low, candle.high), max(candle.low, candle.high)
+        first, last = int(math.floor(low / self.bin_size)), int(math.floor(high / self.bin_size))
+        self._reserve(first, last)
+
+        lo, hi = first - self.origin, last - self.origin + 1
+        if high == low:
+            self.volumes[lo] += candle.volume
+        else:
+            edges = np.arange(first, last + 2) * self.bin_size
+            overlap = np.minimum(edges[1:], high) - np.maximum(edges[:-1], low)
+            self.volumes[lo:hi] += candle.volume * overlap / (high - low)
+
+        self.total_volume += candle.volume
+        self.candles += 1
+        return True
+
+    def _reserve(self, first: int, last: int):
+        if not len(self.volumes):
+            self.origin = first
+            self.volumes = np.zeros(last - first + 1)
+            return
+        before = max(self.origin - first, 0)
+        after = max(last - (self.origin + len(self.volumes) - 1), 0)
+        if before or after:
+            # Grow with headroom so a trending price does not reallocate every candle
+            margin = len(self.volumes) // 2
+            before += margin if before else 0
+            after += margin if after else 0
+            self.volumes = np.pad(self.volumes, (before, after))
+            self.origin -= before
+
+    def histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(bucket lower prices, volumes) over the traded price range"""
+        traded = np.flatnonzero(self.volumes)
+        if not len(traded):
+            return np.array([]), np.array([])
+        lo, hi = traded[0], traded[-1] + 1
+        prices = (np.arange(lo, hi) + self.origin) * self.bin_size
+        return prices, self.volumes[lo:hi].copy()
+
+    def point_of_control(self) -> float:
+        """Mid price of the bucket with the most volume (NaN when empty)"""
+        if not self.total_volume:
+            return NAN
+        return (int(np.argmax(self.volumes)) + self.origin + 0.5) * self.bin_size
+
+    def value_area(self, fraction: float = 0.7) -> Tuple[float, float]:
+        """
+        Price range around the point of control holding ``fraction`` of the volume
+
+        Grows from the point of control towards the heavier neighbouring
+        bucket until the fraction is reached.
+
+        Returns:
+            (value area low, value area high) prices, NaN when empty
+        """
+        if not self.total_volume:
+            return NAN, NAN
+
+        volumes = self.volumes
+        lo = hi = int(np.argmax(volumes))
+        covered, target = volumes[lo], fraction * self.total_volume
+        while covered < target and (lo > 0 or hi < len(volumes) - 1):
+            below = volumes[lo - 1] if lo > 0 else -1.0
+            above = volumes[hi + 1] if hi < len(volumes) - 1 else -1.0
+            if above >= below:
+                hi += 1
+                covered += above
+            else:
+                lo -= 1
+                covered += below
+
+        return (lo + self.origin) * self.bin_size, (hi + self.origin + 1) * self.bin_size
@@ -0,0 +1,177 @@
+"""
+Multi-Timeframe Candle Resampler
+
+Builds higher-timeframe OHLCV candles incrementally from 1m base candles.
+Buckets follow Binance kline boundaries: multiples of the interval since the
+Unix epoch (UTC), except weekly candles which open on Monday 00:00 UTC.
+
+Each base candle updates the open bucket of every target interval; a bucket is
+reported closed when its last minute arrives or when a later bucket starts.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from .core_incremental_indicators import Candle
+
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60_000
+
+INTERVAL_MS = {
+    '1m': MINUTE_MS,
+    '3m': 3 * MINUTE_MS,
+    '5m': 5 * MINUTE_MS,
+    '15m': 15 * MINUTE_MS,
+    '30m': 30 * MINUTE_MS,
+    '1h': 60 * MINUTE_MS,
+    '2h': 120 * MINUTE_MS,
+    '4h': 240 * MINUTE_MS,
+    '6h': 360 * MINUTE_MS,
+    '8h': 480 * MINUTE_MS,
+    '12h': 720 * MINUTE_MS,
+    '1d': 1440 * MINUTE_MS,
+    '3d': 3 * 1440 * MINUTE_MS,
+    '1w': 7 * 1440 * MINUTE_MS,
+}
+
+# The epoch fell on a Thursday; Binance weeks start on Monday
+_BUCKET_OFFSET_MS = {'1w': 4 * 1440 * MINUTE_MS}
+
+
+def to_epoch_ms(timestamp: datetime) -> int:
+    """Epoch milliseconds of a kline time (naive datetimes are local time, as stored)"""
+    return int(round(timestamp.timestamp() * 1000))
+
+
+def bucket_start(open_ms: int, interval: str) -> int:
+    """Open time (epoch ms) of the ``interval`` bucket containing ``open_ms``"""
+    size = INTERVAL_MS[interval]
+    offset = _BUCKET_OFFSET_MS.get(interval, 0)
+    return (open_ms - offset) // size * size + offset
+
+
+@dataclass
+class ResampledCandle:
+    """A higher-timeframe candle update"""
+    symbol: str
+    interval: str
+    candle: Candle
+    closed: bool
+    complete: bool  # every base minute of the bucket was seen
+
+
+@dataclass
+class _Bucket:
+    start_ms: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    minutes: int
+
+    def to_candle(self) -> Candle:
+        return Candle(self.open, self.high, self.low, self.close, self.volume,
+                      datetime.fromtimestamp(self.start_ms / 1000))
+
+
+class CandleResampler:
+    """Maintains open higher-timeframe buckets per symbol from a 1m stream"""
+
+    def __init__(self, intervals: Iterable[str] = ('5m', '15m', '1h', '4h', '1d')):
+        self.intervals = [i for i in intervals if i != '1m']
+        unknown = [i for i in self.intervals if i not in INTERVAL_MS]
+        if unknown:
+            raise ValueError(f"Unsupported resample intervals: {unknown}")
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._last_ms: Dict[Tuple[str, str], int] = {}
+
+    def add(self, symbol: str, candle: Candle) -> List[ResampledCandle]:
+        """
+        Fold a closed 1m candle into every target interval
+
+        Args:
+            symbol: Trading symbol
+            candle: Closed 1m candle with ``open_time`` set
+
+        Returns:
+            Updates per interval: a closed candle when a bucket finished (a bucket
+            left behind by a gap is closed first) and the open bucket otherwise
+        """
+        open_ms = to_epoch_ms(candle.open_time)
+        updates: List[ResampledCandle] = []
+
+        for interval in self.intervals:
+            key = (symbol, interval)
+            start = bucket_start(open_ms, interval)
+            bucket = self._buckets.get(key)
+
+            if open_ms <= self._last_ms.get(key, -1):
+                continue  # Already folded in
+            if bucket is not None and bucket.start_ms != start:
+                updates.append(self._emit(symbol, interval, bucket, closed=True))
+                bucket = None
+
+            if bucket is None:
+                bucket = _Bucket(start, candle.open, candle.high, candle.low, candle.close,
+                                 candle.volume, 0)
+            else:
+                bucket.high = max(bucket.high, candle.high)
+                bucket.low = min(bucket.low, candle.low)
+                bucket.close = candle.close
+                bucket.volume += candle.volume
+            bucket.minutes += 1
+
+            self._last_ms[key] = open_ms
+
+            if open_ms + MINUTE_MS >= start + INTERVAL_MS[interval]:
+                self._buckets.pop(key, None)
+                updates.append(self._emit(symbol, interval, bucket, closed=True))
+            else:
+                self._buckets[key] = bucket
+                updates.append(self._emit(symbol, interval, bucket, closed=False))
+
+        return updates
+
+    def preview(self, symbol: str, candle: Candle) -> List[ResampledCandle]:
+        """
+        Open buckets as they would look with a still-forming 1m candle folded in
+
+        No state is changed; use this for provisional higher-timeframe values.
+        """
+        open_ms = to_epoch_ms(candle.open_time)
+        updates: List[ResampledCandle] = []
+
+        for interval in self.intervals:
+            start = bucket_start(open_ms, interval)
+            bucket = self._buckets.get((symbol, interval))
+
+            if bucket is not None and bucket.start_ms == start:
+                merged = _Bucket(start, bucket.open, max(bucket.high, candle.high),
+                                 min(bucket.low, candle.low), candle.close,
+                                 bucket.volume + candle.volume, bucket.minutes + 1)
+            else:
+                merged = _Bucket(start, candle.open, candle.high, candle.low, candle.close,
+                                 candle.volume, 1)
+            updates.append(self._emit(symbol, interval, merged, closed=False))
+
+        return updates
+
+    def _emit(self, symbol: str, interval: str, bucket: _Bucket, closed: bool) -> ResampledCandle:
+        expected = INTERVAL_MS[interval] // MINUTE_MS
+        return ResampledCandle(symbol, interval, bucket.to_candle(), closed, bucket.minutes == expected)
+
+    def open_candle(self, symbol: str, interval: str) -> Optional[Candle]:
+        """The currently open bucket for a symbol/interval, if any"""
+        bucket = self._buckets.get((symbol, interval))
+        return bucket.to_candle() if bucket else None
+
+    def reset(self, symbol: Optional[str] = None):
+        """Drop open buckets (for one symbol or all)"""
+        for key in [k for k in self._buckets if symbol is None or k[0] == symbol]:
+            del self._buckets[key]
+        for key in [k for k in self._last_ms if symbol is None or k[0] == symbol]:
+            del self._last_ms[key]
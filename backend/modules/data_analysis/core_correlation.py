@@ -0,0 +1,343 @@
+"""
+Incremental Return Correlations
+
+Covariance and correlation matrices across a symbol universe, updated with
+one rank-1 step per aligned return vector instead of recomputing
+``df.corr()`` over the whole window.
+
+- ``EwmaCovariance``: exponentially weighted mean and covariance,
+  O(N²) per update
+- ``RollingCovariance``: exact covariance over the last ``window`` vectors,
+  adding the newest and removing the oldest outer product; sums are kept
+  around a per-symbol shift and rebuilt from the ring buffer every
+  ``window`` updates to bound drift
+- Missing returns (NaN) are handled pairwise: a pair only updates on
+  vectors where both symbols have a return
+- ``ReturnCorrelationTracker`` turns per-symbol closed candles into aligned
+  log-return vectors (one per candle open time) and feeds an engine
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+import logging
+import math
+
+import numpy as np
+
+from .core_candle_resampler import MINUTE_MS, to_epoch_ms
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalCovariance(ABC):
+    """
+    Base class: subclasses implement ``_update(x)`` and ``covariance_matrix()``.
+
+    Symbol bookkeeping and correlation queries are shared by the covariance
+    engines.
+    """
+
+    def __init__(self, symbols: Iterable[str] = (), min_periods: int = 30):
+        self.min_periods = min_periods
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.counts = np.zeros((0, 0), dtype=np.int64)  # vectors seen per pair
+        self.updates = 0
+        self.add_symbols(symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def add_symbols(self, symbols: Iterable[str]):
+        new = [s for s in dict.fromkeys(symbols) if s not in self._index]
+        if not new:
+            return
+        for symbol in new:
+            self._index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        self._grow(len(new))
+
+    def _grow(self, extra: int):
+        self.counts = np.pad(self.counts, ((0, extra), (0, extra)))
+
+    def vector(self, returns: Mapping[str, float]) -> np.ndarray:
+        """Return vector in symbol order (NaN for symbols without a return); new symbols are added"""
+        self.add_symbols(returns)
+        x = np.full(len(self.symbols), np.nan)
+        for symbol, value in returns.items():
+            x[self._index[symbol]] = value
+        return x
+
+    def update(self, returns: Mapping[str, float]):
+        """Consume one aligned return vector given as {symbol: return}"""
+        self.update_vector(self.vector(returns))
+
+    def update_vector(self, x: np.ndarray):
+        """Consume one aligned return vector in symbol order"""
+        x = np.asarray(x, dtype=np.float64)
+        if len(x) != len(self.symbols):
+            raise ValueError(f"Expected {len(self.symbols)} returns, got {len(x)}")
+        self._update(x)
+        self.updates += 1
+
+    @abstractmethod
+    def _update(self, x: np.ndarray):
+        """Fold one aligned return vector (NaN for missing returns) into the estimate"""
+
+    @abstractmethod
+    def covariance_matrix(self) -> np.ndarray:
+        """(N x N) covariance; NaN for pairs with fewer than ``min_periods`` joint returns"""
+
+    def correlation_matrix(self) -> np.ndarray:
+        """(N x N) correlation; NaN for pairs with too few joint returns or zero variance"""
+        cov = self.covariance_matrix()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.outer(std, std)
+        return np.clip(corr, -1.0, 1.0)
+
+    def correlation(self, a: str, b: str) -> float:
+        """Correlation of two symbols' returns (NaN when not yet available)"""
+        i, j = self._index[a], self._index[b]
+        if self.counts[i, j] < self.min_periods:
+            return math.nan
+        cov = self._pair_covariance(i, j)
+        var_a, var_b = self._pair_covariance(i, i), self._pair_covariance(j, j)
+        if var_a <= 0 or var_b <= 0:
+            return math.nan
+        return float(np.clip(cov / math.sqrt(var_a * var_b), -1.0, 1.0))
+
+    def _pair_covariance(self, i: int, j: int) -> float:
+        return float(self.covariance_matrix()[i, j])
+
+    def top_correlated(self,
+                       symbol: str,
+                       n: int = 10,
+                       absolute: bool = False) -> List[Tuple[str, float]]:
+        """
+        Symbols whose returns correlate most with a symbol
+
+        Args:
+            symbol: Reference symbol
+            n: Number of symbols returned
+            absolute: Rank by |correlation| (strong negative correlations count too)
+
+        Returns:
+            (symbol, correlation) pairs, strongest first
+        """
+        i = self._index[symbol]
+        row = self.correlation_matrix()[i].copy()
+        row[i] = np.nan
+        keys = np.abs(row) if absolute else row
+        candidates = np.flatnonzero(~np.isnan(keys))
+        order = candidates[np.argsort(-keys[candidates], kind='stable')][:n]
+        return [(self.symbols[j], float(row[j])) for j in order]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'symbols': len(self.symbols), 'updates': self.updates}
+
+
+class EwmaCovariance(IncrementalCovariance):
+    """Exponentially weighted covariance with one rank-1 update per vector"""
+
+    def __init__(self,
+                 symbols: Iterable[str] = (),
+                 halflife: Optional[float] = None,
+                 alpha: Optional[float] = None,
+                 min_periods: int = 30):
+        """
+        Args:
+            symbols: Initial universe (more are added as they appear)
+            halflife: Vectors after which an observation's weight halves
+            alpha: Smoothing factor instead of ``halflife`` (default halflife: 60)
+            min_periods: Joint returns a pair needs before it is reported
+        """
+        if alpha is None:
+            alpha = 1.0 - 0.5 ** (1.0 / (halflife or 60.0))
+        if not 0.0 < alpha < 1.0:
+            raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+        self.alpha = alpha
+        self.mean = np.zeros(0)
+        self.cov = np.zeros((0, 0))
+        super().__init__(symbols, min_periods)
+
+    def _grow(self, extra: int):
+        super()._grow(extra)
+        self.mean = np.pad(self.mean, (0, extra))
+        self.cov = np.pad(self.cov, ((0, extra), (0, extra)))
+
+    def _update(self, x: np.ndarray):
+        observed = ~np.isnan(x)
+        first = observed & (self.counts.diagonal() == 0)
+        self.mean[first] = x[first]  # seed the mean with a symbol's first return
+
+        if observed.all():
+            d = x - self.mean
+            self.mean += self.alpha * d
+            self.cov += self.alpha * np.outer(d, d)
+            self.cov *= 1.0 - self.alpha
+            self.counts += 1
+            return
+
+        idx = np.flatnonzero(observed)
+        if not len(idx):
+            return
+        block = np.ix_(idx, idx)
+        d = x[idx] - self.mean[idx]
+        self.mean[idx] += self.alpha * d
+        self.cov[block] = (1.0 - self.alpha) * (self.cov[block] + self.alpha * np.outer(d, d))
+        self.counts[block] += 1
+
+    def covariance_matrix(self) -> np.ndarray:
+        return np.where(self.counts >= self.min_periods, self.cov, np.nan)
+
+    def _pair_covariance(self, i: int, j: int) -> float:
+        return float(self.cov[i, j])
+
+
+class RollingCovariance(IncrementalCovariance):
+    """Exact pairwise covariance over the last ``window`` return vectors"""
+
+    def __init__(self, symbols: Iterable[str] = (), window: int = 240, min_periods: int = 30):
+        """
+        Args:
+            symbols: Initial universe (more are added as they appear)
+            window: Return vectors in the window
+            min_periods: Joint returns a pair needs before it is reported
+        """
+        if window < 2:
+            raise ValueError(f"window must be at least 2, got {window}")
+        self.window = window
+        self.buffer = np.zeros((window, 0))  # ring buffer of vectors, NaN = missing
+        self.shift = np.zeros(0)              # per-symbol offset subtracted before summing
+        self.sums = np.zeros((0, 0))          # sums[i, j]: sum of x_i where x_j is present
+        self.products = np.zeros((0, 0))      # sum of x_i * x_j
+        self._filled = 0
+        self._since_rebuild = 0
+        super().__init__(symbols, min_periods)
+
+    def _grow(self, extra: int):
+        super()._grow(extra)
+        self.buffer = np.pad(self.buffer, ((0, 0), (0, extra)), constant_values=np.nan)
+        self.shift = np.pad(self.shift, (0, extra), constant_values=np.nan)
+        self.sums = np.pad(self.sums, ((0, extra), (0, extra)))
+        self.products = np.pad(self.products, ((0, extra), (0, extra)))
+
+    def _apply(self, x: np.ndarray, sign: int):
+        present = ~np.isnan(x)
+        unset = present & np.isnan(self.shift)
+        self.shift[unset] = x[unset]  # shifted sums avoid cancellation for large means
+        values = np.where(present, x - self.shift, 0.0)
+        mask = present.astype(np.float64)
+        self.sums += sign * np.outer(values, mask)
+        self.products += sign * np.outer(values, values)
+        self.counts += sign * np.outer(present, present).astype(np.int64)
+
+    def _update(self, x: np.ndarray):
+        slot = self.updates % self.window
+        if self._filled == self.window:
+            self._apply(self.buffer[slot], -1)
+        else:
+            self._filled += 1
+        self.buffer[slot] = x
+        self._apply(x, +1)
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            self.rebuild()
+
+    def rebuild(self):
+        """Recompute the window sums from the ring buffer, re-centred on the window mean"""
+        rows = self.buffer[:self._filled]
+        present = ~np.isnan(rows)
+        observed = present.any(axis=0)
+        self.shift = np.full(len(self.symbols), np.nan)
+        self.shift[observed] = np.nanmean(rows[:, observed], axis=0)
+        values = np.where(present, rows - self.shift, 0.0)
+        mask = present.astype(np.float64)
+        self.sums = values.T @ mask
+        self.products = values.T @ values
+        self.counts = (mask.T @ mask).astype(np.int64)
+        self._since_rebuild = 0
+
+    def covariance_matrix(self) -> np.ndarray:
+        n = self.counts.astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (self.products - self.sums * self.sums.T / n) / (n - 1)
+        return np.where(self.counts >= max(self.min_periods, 2), cov, np.nan)
+
+    def _pair_covariance(self, i: int, j: int) -> float:
+        n = float(self.counts[i, j])
+        if n < 2:
+            return math.nan
+        return (self.products[i, j] - self.sums[i, j] * self.sums[j, i] / n) / (n - 1)
+
+
+class ReturnCorrelationTracker:
+    """Aligns per-symbol candle closes into log-return vectors for a covariance engine"""
+
+    def __init__(self,
+                 engine: Optional[IncrementalCovariance] = None,
+                 interval_ms: int = MINUTE_MS,
+                 delay: int = 1):
+        """
+        Args:
+            engine: Covariance engine fed with the vectors (default: EwmaCovariance)
+            interval_ms: Candle interval of the closes
+            delay: Candles a vector stays open for late symbols; the vector for
+                open time t is pushed once a candle at t + (delay + 1) intervals arrives
+        """
+        self.engine = engine if engine is not None else EwmaCovariance()
+        self.interval_ms = interval_ms
+        self.delay = delay
+        self._last: Dict[str, Tuple[int, float]] = {}  # symbol -> (open ms, close)
+        self._pending: Dict[int, Dict[str, float]] = {}
+        self._pushed_ms: Optional[int] = None
+        self.stats = {'vectors': 0, 'late': 0, 'gaps': 0}
+
+    def add_close(self, symbol: str, open_time: datetime, close: float) -> int:
+        """
+        Record a closed candle
+
+        Returns:
+            Number of return vectors pushed to the engine
+        """
+        open_ms = to_epoch_ms(open_time)
+        last = self._last.get(symbol)
+        if last is not None and open_ms <= last[0]:
+            return 0
+        self._last[symbol] = (open_ms, close)
+        if last is None:
+            return 0
+
+        if open_ms - last[0] != self.interval_ms or last[1] <= 0 or close <= 0:
+            self.stats['gaps'] += 1
+            return 0
+        if self._pushed_ms is not None and open_ms <= self._pushed_ms:
+            self.stats['late'] += 1
+            return 0
+
+        self._pending.setdefault(open_ms, {})[symbol] = math.log(close / last[1])
+        return self._push_before(open_ms - self.delay * self.interval_ms)
+
+    def _push_before(self, open_ms: int) -> int:
+        ready = sorted(t for t in self._pending if t < open_ms)
+        for t in ready:
+            self.engine.update(self._pending.pop(t))
+            self._pushed_ms = t
+        self.stats['vectors'] += len(ready)
+        return len(ready)
+
+    def flush(self) -> int:
+        """Push every pending vector"""
+        return self._push_before(math.inf)
+
+    def correlation(self, a: str, b: str) -> float:
+        return self.engine.correlation(a, b)
+
+    def top_correlated(self, symbol: str, n: int = 10, absolute: bool = False) -> List[Tuple[str, float]]:
+        return self.engine.top_correlated(symbol, n, absolute)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, **self.engine.get_stats(), 'pending': len(self._pending)}
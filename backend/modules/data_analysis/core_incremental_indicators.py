@@ -0,0 +1,595 @@
+"""
+Streaming incremental indicators
+
+Stateful indicator objects that update in constant time per closed candle and
+can evaluate a provisional value for the still-open candle without touching
+their state. Formulas mirror the batch implementations in IndicatorCalculator
+(pandas/ta), so a stream fed the same candles yields the same values once the
+warm-up period has passed.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Mapping, NamedTuple, Optional, Tuple
+
+NAN = float('nan')
+
+# Running sums are rebuilt from the window this often to stop float drift
+_RESUM_EVERY = 10_000
+
+
+class Candle(NamedTuple):
+    """Minimal OHLCV record fed to incremental indicators"""
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    open_time: Optional[datetime] = None
+
+
+class _RollingSum:
+    """Fixed-size window with running sum and sum of squares (anchored for precision)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: Deque[float] = deque()
+        self.anchor: Optional[float] = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, x: float):
+        if self.anchor is None:
+            self.anchor = x
+        d = x - self.anchor
+        self.values.append(d)
+        self.total += d
+        self.total_sq += d * d
+
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+        self._pushes += 1
+        if self._pushes % _RESUM_EVERY == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+    def preview(self, x: float) -> Tuple[int, float, float]:
+        """(count, sum, sum of squares) of the window as if ``x`` were pushed, in anchored units"""
+        anchor = x if self.anchor is None else self.anchor
+        d = x - anchor
+        count, total, total_sq = len(self.values) + 1, self.total + d, self.total_sq + d * d
+        if count > self.size:
+            old = self.values[0]
+            count, total, total_sq = count - 1, total - old, total_sq - old * old
+        return count, total, total_sq
+
+    def mean_std(self, x: Optional[float] = None) -> Tuple[float, float]:
+        """Window mean and population std, including ``x`` provisionally if given"""
+        if x is None:
+            count, total, total_sq = len(self.values), self.total, self.total_sq
+            anchor = self.anchor
+        else:
+            count, total, total_sq = self.preview(x)
+            anchor = x if self.anchor is None else self.anchor
+        if count < self.size:
+            return NAN, NAN
+        mean = total / count
+        var = max(total_sq / count - mean * mean, 0.0)
+        return anchor + mean, math.sqrt(var)
+
+
+class _RollingExtreme:
+    """Rolling max (or min) over a fixed window using a monotonic deque"""
+
+    def __init__(self, size: int, mode: str = 'max'):
+        self.size = size
+        self.is_max = mode == 'max'
+        self.seq = 0
+        self.window: Deque[Tuple[int, float]] = deque()
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a >= b if self.is_max else a <= b
+
+    def push(self, x: float):
+        self.seq += 1
+        while self.window and self._dominates(x, self.window[-1][1]):
+            self.window.pop()
+        self.window.append((self.seq, x))
+        while self.window[0][0] <= self.seq - self.size:
+            self.window.popleft()
+
+    @property
+    def count(self) -> int:
+        return min(self.seq, self.size)
+
+    def value(self, x: Optional[float] = None, min_periods: Optional[int] = None) -> float:
+        """Window extreme, including ``x`` provisionally if given"""
+        min_periods = self.size if min_periods is None else min_periods
+        if x is None:
+            if self.count < min_periods or not self.window:
+                return NAN
+            return self.window[0][1]
+
+        if min(self.seq + 1, self.size) < min_periods:
+            return NAN
+        cutoff = self.seq + 2 - self.size
+        best = x
+        for seq, v in self.window:
+            if seq >= cutoff:
+                best = max(best, v) if self.is_max else min(best, v)
+                break
+        return best
+
+
+class IncrementalIndicator(ABC):
+    """
+    Base class: subclasses implement ``_step(candle, commit)``.
+
+    ``update`` consumes a closed candle; ``peek`` evaluates the open candle
+    without changing any state.
+    """
+
+    @abstractmethod
+    def _step(self, candle: Candle, commit: bool) -> Any:
+        """Value(s) for ``candle``; state changes only when ``commit`` is set"""
+
+    def update(self, candle: Candle) -> Any:
+        """Consume a closed candle and return the new value(s)"""
+        return self._step(candle, True)
+
+    def peek(self, candle: Candle) -> Any:
+        """Provisional value(s) for an open candle; state is left untouched"""
+        return self._step(candle, False)
+
+
+class IncrementalSMA(IncrementalIndicator):
+    """Simple Moving Average of the close"""
+
+    def __init__(self, period: int):
+        self.window = _RollingSum(period)
+
+    def _step(self, candle: Candle, commit: bool) -> float:
+        if commit:
+            self.window.push(candle.close)
+            return self.window.mean_std()[0]
+        return self.window.mean_std(candle.close)[0]
+
+
+class IncrementalEMA(IncrementalIndicator):
+    """Exponential Moving Average (pandas ``ewm(adjust=False)`` recursion)"""
+
+    def __init__(self, period: Optional[int] = None, alpha: Optional[float] = None, min_periods: int = 0):
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.min_periods = min_periods
+        self.value: Optional[float] = None
+        self.count = 0
+
+    def next_value(self, x: float) -> float:
+        if self.value is None:
+            return x
+        return (1 - self.alpha) * self.value + self.alpha * x
+
+    def _step_value(self, x: float, commit: bool) -> float:
+        value = self.next_value(x)
+        count = self.count + 1
+        if commit:
+            self.value, self.count = value, count
+        return value if count >= self.min_periods else NAN
+
+    def _step(self, candle: Candle, commit: bool) -> float:
+        return self._step_value(candle.close, commit)
+
+
+class IncrementalRSI(IncrementalIndicator):
+    """Relative Strength Index with Wilder smoothing"""
+
+    def __init__(self, period: int = 14):
+        self.up = IncrementalEMA(alpha=1.0 / period, min_periods=period)
+        self.down = IncrementalEMA(alpha=1.0 / period, min_periods=period)
+        self.prev_close: Optional[float] = None
+
+    def _step(self, candle: Candle, commit: bool) -> float:
+        diff = 0.0 if self.prev_close is None else candle.close - self.prev_close
+        avg_up = self.up._step_value(max(diff, 0.0), commit)
+        avg_down = self.down._step_value(max(-diff, 0.0), commit)
+        if commit:
+            self.prev_close = candle.close
+
+        if math.isnan(avg_down):
+            return NAN
+        if avg_down == 0:
+            return 100.0
+        return 100 - 100 / (1 + avg_up / avg_down)
+
+
+class IncrementalMACD(IncrementalIndicator):
+    """MACD line, signal and histogram"""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast = IncrementalEMA(fast_period, min_periods=fast_period)
+        self.slow = IncrementalEMA(slow_period, min_periods=slow_period)
+        self.signal = IncrementalEMA(signal_period, min_periods=signal_period)
+
+    def _step(self, candle: Candle, commit: bool) -> Dict[str, float]:
+        macd = self.fast._step_value(candle.close, commit) - self.slow._step_value(candle.close, commit)
+        # The signal EMA starts at the first defined MACD value
+        signal = self.signal._step_value(macd, commit) if not math.isnan(macd) else NAN
+        return {'macd': macd, 'signal': signal, 'histogram': macd - signal}
+
+
+class IncrementalBollingerBands(IncrementalIndicator):
+    """Bollinger Bands (population standard deviation)"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.window = _RollingSum(period)
+        self.std_dev = std_dev
+
+    def _step(self, candle: Candle, commit: bool) -> Dict[str, float]:
+        if commit:
+            self.window.push(candle.close)
+            middle, std = self.window.mean_std()
+        else:
+            middle, std = self.window.mean_std(candle.close)
+
+        upper = middle + self.std_dev * std
+        lower = middle - self.std_dev * std
+        return {
+            'upper': upper,
+            'middle': middle,
+            'lower': lower,
+            'width': (upper - lower) / middle * 100 if middle else NAN,
+            'percent': (candle.close - lower) / (upper - lower) if upper != lower else NAN
+        }
+
+
+class IncrementalATR(IncrementalIndicator):
+    """Average True Range: mean of the first ``period`` true ranges, then Wilder smoothing"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = NAN
+
+    def true_range(self, candle: Candle) -> float:
+        if self.prev_close is None:
+            return candle.high - candle.low
+        return max(candle.high - candle.low,
+                   abs(candle.high - self.prev_close),
+                   abs(candle.low - self.prev_close))
+
+    def _step(self, candle: Candle, commit: bool) -> float:
+        tr = self.true_range(candle)
+        count = self.count + 1
+        seed_sum = self.seed_sum
+
+        if count < self.period:
+            seed_sum += tr
+            value = NAN
+        elif count == self.period:
+            value = (seed_sum + tr) / self.period
+        else:
+            value = (self.value * (self.period - 1) + tr) / self.period
+
+        if commit:
+            self.prev_close, self.count, self.seed_sum, self.value = candle.close, count, seed_sum, value
+        return value
+
+
+class IncrementalADX(IncrementalIndicator):
+    """
+    Average Directional Index with +DI/-DI.
+
+    Directional movement and true range are Wilder-summed after seeding with
+    the sum of the first ``period`` values; ADX is seeded with the mean of the
+    first ``period`` DX values and Wilder-averaged thereafter.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev: Optional[Candle] = None
+        self.count = 0  # candles after the first
+        self.tr_sum = 0.0
+        self.pos_sum = 0.0
+        self.neg_sum = 0.0
+        self.dx_count = 0
+        self.dx_seed = 0.0
+        self.adx = NAN
+
+    def _step(self, candle: Candle, commit: bool) -> Dict[str, float]:
+        n = self.period
+        result = {'adx': NAN, 'di_plus': NAN, 'di_minus': NAN}
+
+        if self.prev is None:
+            if commit:
+                self.prev = candle
+            return result
+
+        prev = self.prev
+        tr = max(candle.high, prev.close) - min(candle.low, prev.close)
+        up = candle.high - prev.high
+        down = prev.low - candle.low
+        pos = up if up > down and up > 0 else 0.0
+        neg = down if down > up and down > 0 else 0.0
+
+        count = self.count + 1
+        if count <= n:
+            tr_sum, pos_sum, neg_sum = self.tr_sum + tr, self.pos_sum + pos, self.neg_sum + neg
+        else:
+            tr_sum = self.tr_sum - self.tr_sum / n + tr
+            pos_sum = self.pos_sum - self.pos_sum / n + pos
+            neg_sum = self.neg_sum - self.neg_sum / n + neg
+
+        dx_count, dx_seed, adx = self.dx_count, self.dx_seed, self.adx
+        if count >= n:
+            di_plus = 100 * pos_sum / tr_sum if tr_sum else 0.0
+            di_minus = 100 * neg_sum / tr_sum if tr_sum else 0.0
+            di_total = di_plus + di_minus
+            dx = 100 * abs(di_plus - di_minus) / di_total if di_total else 0.0
+
+            dx_count += 1
+            if dx_count < n:
+                dx_seed += dx
+            elif dx_count == n:
+                adx = (dx_seed + dx) / n
+            else:
+                adx = (adx * (n - 1) + dx) / n
+
+            result = {'adx': adx, 'di_plus': di_plus, 'di_minus': di_minus}
+
+        if commit:
+            self.prev, self.count = candle, count
+            self.tr_sum, self.pos_sum, self.neg_sum = tr_sum, pos_sum, neg_sum
+            self.dx_count, self.dx_seed, self.adx = dx_count, dx_seed, adx
+        return result
+
+
+class IncrementalOBV(IncrementalIndicator):
+    """On-Balance Volume"""
+
+    def __init__(self):
+        self.prev_close: Optional[float] = None
+        self.value = 0.0
+
+    def _step(self, candle: Candle, commit: bool) -> float:
+        signed = -candle.volume if self.prev_close is not None and candle.close < self.prev_close else candle.volume
+        value = self.value + signed
+        if commit:
+            self.prev_close, self.value = candle.close, value
+        return value
+
+
+class IncrementalVWAP(IncrementalIndicator):
+    """Cumulative Volume Weighted Average Price from the first candle seen"""
+
+    def __init__(self):
+        self.pv = 0.0
+        self.volume = 0.0
+
+    def _step(self, candle: Candle, commit: bool) -> float:
+        typical = (candle.high + candle.low + candle.close) / 3
+        pv, volume = self.pv + typical * candle.volume, self.volume + candle.volume
+        if commit:
+            self.pv, self.volume = pv, volume
+        return pv / volume if volume else NAN
+
+
+class IncrementalStochastic(IncrementalIndicator):
+    """Stochastic Oscillator %K and its SMA %D"""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.highest = _RollingExtreme(k_period, 'max')
+        self.lowest = _RollingExtreme(k_period, 'min')
+        self.k_values: Deque[float] = deque(maxlen=d_period)
+        self.d_period = d_period
+
+    def _step(self, candle: Candle, commit: bool) -> Dict[str, float]:
+        if commit:
+            self.highest.push(candle.high)
+            self.lowest.push(candle.low)
+            hh, ll = self.highest.value(), self.lowest.value()
+        else:
+            hh, ll = self.highest.value(candle.high), self.lowest.value(candle.low)
+
+        k = 100 * (candle.close - ll) / (hh - ll) if hh != ll else NAN
+
+        recent = list(self.k_values)[1:] if len(self.k_values) == self.d_period else list(self.k_values)
+        recent.append(k)
+        d = sum(recent) / self.d_period if len(recent) == self.d_period else NAN
+
+        if commit:
+            self.k_values.append(k)
+        return {'k': k, 'd': d}
+
+
+class IncrementalCCI(IncrementalIndicator):
+    """
+    Commodity Channel Index.
+
+    The mean absolute deviation has no running form, so each update costs
+    O(period) — constant with respect to history length.
+    """
+
+    def __init__(self, period: int = 20, constant: float = 0.015):
+        self.period = period
+        self.constant = constant
+        self.window: Deque[float] = deque(maxlen=period)
+
+    def _step(self, candle: Candle, commit: bool) -> float:
+        typical = (candle.high + candle.low + candle.close) / 3.0
+        values = list(self.window)
+        values.append(typical)
+        values = values[-self.period:]
+
+        if commit:
+            self.window.append(typical)
+        if len(values) < self.period:
+            return NAN
+
+        mean = sum(values) / self.period
+        mad = sum(abs(v - mean) for v in values) / self.period
+        return (typical - mean) / (self.constant * mad) if mad else NAN
+
+
+class IncrementalWilliamsR(IncrementalIndicator):
+    """Williams %R"""
+
+    def __init__(self, period: int = 14):
+        self.highest = _RollingExtreme(period, 'max')
+        self.lowest = _RollingExtreme(period, 'min')
+
+    def _step(self, candle: Candle, commit: bool) -> float:
+        if commit:
+            self.highest.push(candle.high)
+            self.lowest.push(candle.low)
+            hh, ll = self.highest.value(), self.lowest.value()
+        else:
+            hh, ll = self.highest.value(candle.high), self.lowest.value(candle.low)
+        return -100 * (hh - candle.close) / (hh - ll) if hh != ll else NAN
+
+
+class IncrementalIchimoku(IncrementalIndicator):
+    """Ichimoku conversion/base lines and (unshifted) spans"""
+
+    def __init__(self, conversion_period: int = 9, base_period: int = 26, span_b_period: int = 52):
+        self.extremes = {
+            name: (_RollingExtreme(period, 'max'), _RollingExtreme(period, 'min'))
+            for name, period in (('conv', conversion_period), ('base', base_period), ('span_b', span_b_period))
+        }
+
+    def _step(self, candle: Candle, commit: bool) -> Dict[str, float]:
+        mids = {}
+        for name, (highest, lowest) in self.extremes.items():
+            # Span B is defined from the first candle (min_periods=0 in the batch version)
+            min_periods = 1 if name == 'span_b' else None
+            if commit:
+                highest.push(candle.high)
+                lowest.push(candle.low)
+                mids[name] = 0.5 * (highest.value(min_periods=min_periods) + lowest.value(min_periods=min_periods))
+            else:
+                mids[name] = 0.5 * (highest.value(candle.high, min_periods) + lowest.value(candle.low, min_periods))
+
+        return {
+            'conversion_line': mids['conv'],
+            'base_line': mids['base'],
+            'span_a': 0.5 * (mids['conv'] + mids['base']),
+            'span_b': mids['span_b']
+        }
+
+
+class IncrementalIndicatorSet:
+    """
+    The full IndicatorCalculator indicator set maintained incrementally.
+
+    Output keys match ``IndicatorCalculator.calculate_all_indicators``.
+    """
+
+    def __init__(self, extras: Optional[Mapping[str, IncrementalIndicator]] = None):
+        """
+        Args:
+            extras: Additional indicators keyed by name (e.g. anchored VWAPs);
+                each output of theirs is reported as '<output>_<name>'
+        """
+        self.sma = {20: IncrementalSMA(20), 50: IncrementalSMA(50), 200: IncrementalSMA(200)}
+        self.ema = {12: IncrementalEMA(12), 26: IncrementalEMA(26)}
+        self.macd = IncrementalMACD()
+        self.rsi = IncrementalRSI()
+        self.stochastic = IncrementalStochastic()
+        self.bollinger = IncrementalBollingerBands()
+        self.atr = IncrementalATR()
+        self.obv = IncrementalOBV()
+        self.vwap = IncrementalVWAP()
+        self.adx = IncrementalADX()
+        self.cci = IncrementalCCI()
+        self.williams_r = IncrementalWilliamsR()
+        self.ichimoku = IncrementalIchimoku()
+        self.extras: Dict[str, IncrementalIndicator] = dict(extras or {})
+
+        self.candles_processed = 0
+        self.volume_seen = 0.0
+        self.last_open_time: Optional[datetime] = None
+        self.last_candle: Optional[Candle] = None
+        self.latest_values: Dict[str, float] = {}
+
+    def _step(self, candle: Candle, commit: bool) -> Dict[str, float]:
+        method = 'update' if commit else 'peek'
+        values: Dict[str, float] = {}
+
+        for period, ind in self.sma.items():
+            values[f'sma_{period}'] = getattr(ind, method)(candle)
+        for period, ind in self.ema.items():
+            values[f'ema_{period}'] = getattr(ind, method)(candle)
+
+        macd = getattr(self.macd, method)(candle)
+        values['macd'] = macd['macd']
+        values['macd_signal'] = macd['signal']
+        values['macd_histogram'] = macd['histogram']
+
+        values['rsi'] = getattr(self.rsi, method)(candle)
+
+        stoch = getattr(self.stochastic, method)(candle)
+        values['stoch_k'] = stoch['k']
+        values['stoch_d'] = stoch['d']
+
+        bb = getattr(self.bollinger, method)(candle)
+        for key in ('upper', 'middle', 'lower', 'width', 'percent'):
+            values[f'bb_{key}'] = bb[key]
+
+        values['atr'] = getattr(self.atr, method)(candle)
+
+        obv = getattr(self.obv, method)(candle)
+        vwap = getattr(self.vwap, method)(candle)
+        volume_seen = self.volume_seen + candle.volume
+        # Volume indicators are only reported when the series carries volume
+        if volume_seen > 0:
+            values['obv'] = obv
+            values['vwap'] = vwap
+        for name, indicator in self.extras.items():
+            for output, value in getattr(indicator, method)(candle).items():
+                values[f'{output}_{name}'] = value
+
+        adx = getattr(self.adx, method)(candle)
+        values.update(adx)
+
+        values['cci'] = getattr(self.cci, method)(candle)
+        values['williams_r'] = getattr(self.williams_r, method)(candle)
+
+        ichimoku = getattr(self.ichimoku, method)(candle)
+        values['ichimoku_conversion'] = ichimoku['conversion_line']
+        values['ichimoku_base'] = ichimoku['base_line']
+        values['ichimoku_span_a'] = ichimoku['span_a']
+        values['ichimoku_span_b'] = ichimoku['span_b']
+
+        if commit:
+            self.candles_processed += 1
+            self.volume_seen = volume_seen
+            self.last_open_time = candle.open_time
+            self.last_candle = candle
+
+        values = {name: value for name, value in values.items() if not math.isnan(value)}
+        if commit:
+            self.latest_values = values
+        return values
+
+    def update(self, candle: Candle) -> Dict[str, float]:
+        """Consume a closed candle; returns all defined indicator values"""
+        return self._step(candle, True)
+
+    def peek(self, candle: Candle) -> Dict[str, float]:
+        """Provisional indicator values for the open candle"""
+        return self._step(candle, False)
+
+    def seed_extras(self, candle: Candle):
+        """Feed a closed candle from before the warm-up window to the extra indicators only"""
+        for indicator in self.extras.values():
+            indicator.update(candle)
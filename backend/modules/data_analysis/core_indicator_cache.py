@@ -0,0 +1,142 @@
+"""
+Indicator Result Cache
+
+In-process cache of indicator results keyed by
+(symbol, interval, last closed candle open_time, indicator set).
+
+- Entries hold any number of named results (latest values, stored rows,
+  history slices) computed for that candle
+- Least recently used entries are evicted past an entry count or an
+  estimated memory cap
+- Advancing a (symbol, interval) to a newer candle drops its older entries,
+  so results never outlive the candle they were computed for
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, datetime, Tuple[str, ...]]
+
+
+def estimate_size(obj: Any, _depth: int = 0) -> int:
+    """Rough deep size in bytes of plain containers of scalars"""
+    size = sys.getsizeof(obj)
+    if _depth > 4:
+        return size
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _depth + 1) for v in obj)
+    return size
+
+
+class IndicatorCache:
+    """LRU cache of indicator results with a memory cap and per-candle invalidation"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Dict[Hashable, Any]]" = OrderedDict()
+        self._sizes: Dict[CacheKey, int] = {}
+        self._heads: Dict[Tuple[str, str], datetime] = {}
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def make_key(symbol: str, interval: str, open_time: datetime, indicators: Iterable[str]) -> CacheKey:
+        return (symbol, interval, open_time, tuple(sorted(set(indicators))))
+
+    def head(self, symbol: str, interval: str) -> Optional[datetime]:
+        """Open time of the newest candle seen for a symbol/interval"""
+        return self._heads.get((symbol, interval))
+
+    def advance(self, symbol: str, interval: str, open_time: datetime) -> int:
+        """
+        Record a new candle; entries for older candles are dropped
+
+        Returns:
+            Number of entries invalidated
+        """
+        current = self._heads.get((symbol, interval))
+        if current is not None and open_time <= current:
+            return 0
+
+        self._heads[(symbol, interval)] = open_time
+        stale = [k for k in self._entries if k[0] == symbol and k[1] == interval and k[2] < open_time]
+        for key in stale:
+            self._remove(key)
+
+        self.stats['invalidations'] += len(stale)
+        return len(stale)
+
+    def get(self,
+            symbol: str,
+            interval: str,
+            open_time: Optional[datetime],
+            indicators: Iterable[str],
+            field: Hashable) -> Optional[Any]:
+        """Cached result ``field`` for the candle, or None"""
+        if open_time is None:
+            self.stats['misses'] += 1
+            return None
+
+        key = self.make_key(symbol, interval, open_time, indicators)
+        entry = self._entries.get(key)
+        if entry is None or field not in entry:
+            self.stats['misses'] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[field]
+
+    def put(self,
+            symbol: str,
+            interval: str,
+            open_time: datetime,
+            indicators: Iterable[str],
+            field: Hashable,
+            value: Any):
+        """Store a result for the candle; results for candles older than the head are ignored"""
+        head = self._heads.get((symbol, interval))
+        if head is not None and open_time < head:
+            return
+        self.advance(symbol, interval, open_time)
+
+        key = self.make_key(symbol, interval, open_time, indicators)
+        entry = self._entries.setdefault(key, {})
+        entry[field] = value
+        self._entries.move_to_end(key)
+
+        self.total_bytes -= self._sizes.get(key, 0)
+        self._sizes[key] = estimate_size(entry)
+        self.total_bytes += self._sizes[key]
+
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self._heads.clear()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: CacheKey):
+        self._entries.pop(key, None)
+        self.total_bytes -= self._sizes.pop(key, 0)
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.stats['evictions'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'entries': len(self._entries), 'bytes': self.total_bytes}
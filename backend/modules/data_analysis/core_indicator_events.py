@@ -0,0 +1,72 @@
+"""
+Indicator Events
+
+``IndicatorSnapshotCalculated`` carries every indicator value of one
+(symbol, interval, candle) in a single event, replacing one
+``IndicatorCalculated`` event per indicator.
+
+- Values are plain floats keyed by indicator name
+- Subscribers written for per-indicator events can expand a snapshot with
+  ``expand_indicator_events`` and keep handling both forms
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, ClassVar, Dict, List, Mapping, Optional
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndicatorSnapshotCalculated:
+    """All indicator values calculated for one candle"""
+    symbol: str
+    interval: str
+    timestamp: datetime
+    values: Mapping[str, float]
+    closed: bool = True  # False for provisional values of a still-open candle
+    event_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    occurred_at: datetime = field(default_factory=datetime.now)
+    correlation_id: Optional[str] = None
+    source_context: str = 'indicators'
+
+    event_type: ClassVar[str] = 'IndicatorSnapshotCalculated'
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'event_type': self.event_type,
+            'event_id': self.event_id,
+            'occurred_at': self.occurred_at.isoformat(),
+            'source_context': self.source_context,
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'timestamp': self.timestamp.isoformat(),
+            'closed': self.closed,
+            'values': dict(self.values)
+        }
+
+
+def expand_indicator_events(event: Any, factory: Callable[..., Any]) -> List[Any]:
+    """
+    Per-indicator events for an event of either form
+
+    Args:
+        event: IndicatorSnapshotCalculated, or any other event (returned as is)
+        factory: Builds one per-indicator event from symbol, indicator_name,
+            value and timestamp keywords (e.g. ``BinanceDataNormalizer.to_indicator_event``)
+
+    Returns:
+        One event per indicator value of a snapshot, else ``[event]``
+    """
+    if not isinstance(event, IndicatorSnapshotCalculated):
+        return [event]
+
+    return [
+        factory(symbol=event.symbol, indicator_name=name, value=value, timestamp=event.timestamp)
+        for name, value in event.values.items()
+    ]
@@ -0,0 +1,387 @@
+"""
+Indicator Computation Graph
+
+Declarative graph of indicator nodes. Each node names the series it consumes,
+so shared intermediates are computed once per evaluation:
+- true range feeds ATR and ADX
+- EMA 12/26 feed MACD
+- SMA 20 and the 20-period rolling std feed the Bollinger Bands
+- the 14-period highest high / lowest low feed Stochastic and Williams %R
+
+Only the nodes needed for the requested outputs are evaluated. Formulas
+reproduce the ``ta`` implementations IndicatorCalculator used to call.
+
+Each node also declares its warm-up, so the history an output set needs can
+be derived along its dependencies:
+- ``warmup``: bars the node consumes before its first value (window - 1)
+- ``settle``: further bars until a recursive smoothing has forgotten its seed
+- ``converges``: False for cumulative series (OBV, VWAP) that depend on where
+  the data starts, however long it is
+"""
+
+from dataclasses import dataclass, replace
+import math
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns of the OHLCV DataFrame available to every node
+BASE_INPUTS = ('open', 'high', 'low', 'close', 'volume')
+
+ADX_PERIOD = 14
+ATR_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+
+# Remaining weight of a recursive average's seed that counts as converged
+CONVERGENCE_TOLERANCE = 1e-3
+
+
+def settle_bars(alpha: float, tolerance: float = CONVERGENCE_TOLERANCE) -> int:
+    """Bars until (1 - alpha)^n, the seed's weight in a recursive average, is below ``tolerance``"""
+    return math.ceil(math.log(tolerance) / math.log(1.0 - alpha))
+
+
+def _ema_settle(span: int) -> int:
+    return settle_bars(2.0 / (span + 1))
+
+
+WILDER_SETTLE = settle_bars(1.0 / ADX_PERIOD)
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    """A single series computed from the series named in ``inputs``"""
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[..., pd.Series]
+    public: bool = True
+    warmup: int = 0
+    settle: int = 0
+    converges: bool = True
+
+
+def _wilder_recursion(values: pd.Series, seed: float, start: int, window: int) -> pd.Series:
+    """y[start] = seed, y[i] = y[i-1] * (1 - 1/window) + values[i] / window"""
+    tail = values.iloc[start:].copy()
+    tail.iloc[0] = seed
+    return tail.ewm(alpha=1.0 / window, adjust=False).mean()
+
+
+def _rolling_mean(period: int) -> Callable[[pd.Series], pd.Series]:
+    return lambda s: s.rolling(window=period).mean()
+
+
+def _rolling_max(period: int, min_periods: Optional[int] = None) -> Callable[[pd.Series], pd.Series]:
+    return lambda s: s.rolling(period, min_periods=min_periods).max()
+
+
+def _rolling_min(period: int, min_periods: Optional[int] = None) -> Callable[[pd.Series], pd.Series]:
+    return lambda s: s.rolling(period, min_periods=min_periods).min()
+
+
+def _ema(period: int) -> Callable[[pd.Series], pd.Series]:
+    return lambda s: s.ewm(span=period, adjust=False).mean()
+
+
+def _midpoint(high: pd.Series, low: pd.Series) -> pd.Series:
+    return 0.5 * (high + low)
+
+
+def _true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    prev_close = close.shift(1)
+    return pd.concat(
+        [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+    ).max(axis=1)
+
+
+def _atr(true_range: pd.Series) -> pd.Series:
+    # ta reports zeros until the first full window
+    atr = pd.Series(0.0, index=true_range.index)
+    if len(true_range) >= ATR_PERIOD:
+        seed = true_range.iloc[:ATR_PERIOD].mean()
+        atr.iloc[ATR_PERIOD - 1:] = _wilder_recursion(true_range, seed, ATR_PERIOD - 1, ATR_PERIOD).to_numpy()
+    return atr
+
+
+def _directional_movement(high: pd.Series, low: pd.Series) -> pd.DataFrame:
+    up = high - high.shift(1)
+    down = low.shift(1) - low
+    pos = up.where((up > down) & (up > 0), 0.0)
+    neg = down.where((down > up) & (down > 0), 0.0)
+    return pd.DataFrame({'pos': pos, 'neg': neg})
+
+
+def _wilder_sum(values: pd.Series, window: int) -> pd.Series:
+    """Wilder running sum seeded with the sum of values 1..window; aligned to the input index"""
+    result = pd.Series(np.nan, index=values.index)
+    if len(values) > window:
+        seed = values.iloc[1:window + 1].sum()
+        result.iloc[window:] = (_wilder_recursion(values, seed / window, window, window) * window).to_numpy()
+    return result
+
+
+def _directional_index(true_range: pd.Series, dm: pd.DataFrame) -> pd.DataFrame:
+    tr_sum = _wilder_sum(true_range, ADX_PERIOD)
+    di_plus = 100 * _wilder_sum(dm['pos'], ADX_PERIOD) / tr_sum
+    di_minus = 100 * _wilder_sum(dm['neg'], ADX_PERIOD) / tr_sum
+    return pd.DataFrame({'di_plus': di_plus, 'di_minus': di_minus})
+
+
+def _di_output(column: str) -> Callable[[pd.DataFrame], pd.Series]:
+    def select(di: pd.DataFrame) -> pd.Series:
+        # ta leaves the first DI value (and the warm-up) at zero
+        series = di[column].copy()
+        series.iloc[:ADX_PERIOD + 1] = 0.0
+        return series
+    return select
+
+
+def _adx(di: pd.DataFrame) -> pd.Series:
+    n = ADX_PERIOD
+    dx = 100 * ((di['di_plus'] - di['di_minus']) / (di['di_plus'] + di['di_minus'])).abs()
+    adx = pd.Series(0.0, index=dx.index)
+    first = 2 * n - 1
+    if len(dx) > first:
+        seed = dx.iloc[n:first + 1].mean()
+        adx.iloc[first:] = _wilder_recursion(dx, seed, first, n).to_numpy()
+    return adx
+
+
+def _macd(slow: int) -> Callable[[pd.Series, pd.Series], pd.Series]:
+    def macd(ema_fast: pd.Series, ema_slow: pd.Series) -> pd.Series:
+        line = ema_fast - ema_slow
+        # ta's EMAs carry min_periods=window, so MACD starts at the slow period
+        line.iloc[:slow - 1] = np.nan
+        return line
+    return macd
+
+
+def _macd_signal(signal: int) -> Callable[[pd.Series], pd.Series]:
+    return lambda macd: macd.ewm(span=signal, min_periods=signal, adjust=False).mean()
+
+
+def _rsi(close: pd.Series) -> pd.Series:
+    diff = close.diff(1)
+    up = diff.where(diff > 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    down = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    return pd.Series(np.where(down == 0, 100, 100 - (100 / (1 + up / down))), index=close.index)
+
+
+def _stoch_k(close: pd.Series, highest: pd.Series, lowest: pd.Series) -> pd.Series:
+    return 100 * (close - lowest) / (highest - lowest)
+
+
+def _williams_r(close: pd.Series, highest: pd.Series, lowest: pd.Series) -> pd.Series:
+    return -100 * (highest - close) / (highest - lowest)
+
+
+def _typical_price(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    return (high + low + close) / 3.0
+
+
+def _cci(typical: pd.Series) -> pd.Series:
+    mean = typical.rolling(20).mean()
+    mad = typical.rolling(20).apply(lambda x: np.mean(np.abs(x - np.mean(x))), raw=True)
+    return (typical - mean) / (0.015 * mad)
+
+
+def _obv(close: pd.Series, volume: pd.Series) -> pd.Series:
+    return pd.Series(np.where(close < close.shift(1), -volume, volume), index=close.index).cumsum()
+
+
+def _vwap(typical: pd.Series, volume: pd.Series) -> pd.Series:
+    return (typical * volume).cumsum() / volume.cumsum()
+
+
+def _bb_band(sign: int) -> Callable[[pd.Series, pd.Series], pd.Series]:
+    return lambda middle, std: middle + sign * 2 * std
+
+
+def default_nodes() -> List[IndicatorNode]:
+    """Node set producing the outputs of ``IndicatorCalculator.calculate_all_indicators``"""
+    return [
+        # Shared intermediates
+        IndicatorNode('true_range', ('high', 'low', 'close'), _true_range, public=False, warmup=1),
+        IndicatorNode('typical_price', ('high', 'low', 'close'), _typical_price, public=False),
+        IndicatorNode('std_20', ('close',), lambda s: s.rolling(20).std(ddof=0), public=False, warmup=19),
+        IndicatorNode('highest_high_14', ('high',), _rolling_max(14), public=False, warmup=13),
+        IndicatorNode('lowest_low_14', ('low',), _rolling_min(14), public=False, warmup=13),
+        IndicatorNode('directional_movement', ('high', 'low'), _directional_movement, public=False, warmup=1),
+        IndicatorNode('directional_index', ('true_range', 'directional_movement'), _directional_index, public=False,
+                      warmup=ADX_PERIOD, settle=WILDER_SETTLE),
+        IndicatorNode('ichimoku_mid_9', ('high', 'low'),
+                      lambda h, l: _midpoint(h.rolling(9).max(), l.rolling(9).min()), public=False, warmup=8),
+        IndicatorNode('ichimoku_mid_26', ('high', 'low'),
+                      lambda h, l: _midpoint(h.rolling(26).max(), l.rolling(26).min()), public=False, warmup=25),
+
+        # Trend
+        IndicatorNode('sma_20', ('close',), _rolling_mean(20), warmup=19),
+        IndicatorNode('sma_50', ('close',), _rolling_mean(50), warmup=49),
+        IndicatorNode('sma_200', ('close',), _rolling_mean(200), warmup=199),
+        IndicatorNode('ema_12', ('close',), _ema(MACD_FAST), warmup=MACD_FAST - 1, settle=_ema_settle(MACD_FAST)),
+        IndicatorNode('ema_26', ('close',), _ema(MACD_SLOW), warmup=MACD_SLOW - 1, settle=_ema_settle(MACD_SLOW)),
+        IndicatorNode('macd', ('ema_12', 'ema_26'), _macd(MACD_SLOW)),
+        IndicatorNode('macd_signal', ('macd',), _macd_signal(MACD_SIGNAL), warmup=MACD_SIGNAL - 1,
+                      settle=_ema_settle(MACD_SIGNAL)),
+        IndicatorNode('macd_histogram', ('macd', 'macd_signal'), lambda m, s: m - s),
+
+        # Momentum
+        IndicatorNode('rsi', ('close',), _rsi, warmup=13, settle=WILDER_SETTLE),
+        IndicatorNode('stoch_k', ('close', 'highest_high_14', 'lowest_low_14'), _stoch_k),
+        IndicatorNode('stoch_d', ('stoch_k',), _rolling_mean(3), warmup=2),
+
+        # Volatility
+        IndicatorNode('bb_middle', ('sma_20',), lambda s: s),
+        IndicatorNode('bb_upper', ('bb_middle', 'std_20'), _bb_band(1)),
+        IndicatorNode('bb_lower', ('bb_middle', 'std_20'), _bb_band(-1)),
+        IndicatorNode('bb_width', ('bb_upper', 'bb_lower', 'bb_middle'), lambda u, l, m: (u - l) / m * 100),
+        IndicatorNode('bb_percent', ('close', 'bb_upper', 'bb_lower'),
+                      lambda c, u, l: (c - l) / (u - l).where(u != l, np.nan)),
+        IndicatorNode('atr', ('true_range',), _atr, warmup=ATR_PERIOD - 1, settle=WILDER_SETTLE),
+
+        # Volume
+        IndicatorNode('obv', ('close', 'volume'), _obv, warmup=1, converges=False),
+        IndicatorNode('vwap', ('typical_price', 'volume'), _vwap, converges=False),
+
+        # Directional movement
+        IndicatorNode('adx', ('directional_index',), _adx, warmup=ADX_PERIOD - 1, settle=WILDER_SETTLE),
+        IndicatorNode('di_plus', ('directional_index',), _di_output('di_plus')),
+        IndicatorNode('di_minus', ('directional_index',), _di_output('di_minus')),
+
+        IndicatorNode('cci', ('typical_price',), _cci, warmup=19),
+        IndicatorNode('williams_r', ('close', 'highest_high_14', 'lowest_low_14'), _williams_r),
+
+        # Ichimoku
+        IndicatorNode('ichimoku_conversion', ('ichimoku_mid_9',), lambda s: s),
+        IndicatorNode('ichimoku_base', ('ichimoku_mid_26',), lambda s: s),
+        IndicatorNode('ichimoku_span_a', ('ichimoku_mid_9', 'ichimoku_mid_26'), _midpoint),
+        IndicatorNode('ichimoku_span_b', ('high', 'low'),
+                      lambda h, l: _midpoint(h.rolling(52, min_periods=0).max(), l.rolling(52, min_periods=0).min()),
+                      warmup=51),
+    ]
+
+
+def inherit_warmups(nodes: Iterable[IndicatorNode],
+                    reference: Optional[Iterable[IndicatorNode]] = None) -> List[IndicatorNode]:
+    """Copy warm-up declarations from same-named ``default_nodes()`` onto another node set"""
+    declared = {node.name: node for node in (default_nodes() if reference is None else reference)}
+    return [
+        replace(node, warmup=declared[node.name].warmup, settle=declared[node.name].settle,
+                converges=declared[node.name].converges)
+        if node.name in declared else node
+        for node in nodes
+    ]
+
+
+class IndicatorGraph:
+    """Resolves requested outputs to the minimal set of nodes and evaluates them once each"""
+
+    def __init__(self, nodes: Optional[Iterable[IndicatorNode]] = None):
+        self.nodes: Dict[str, IndicatorNode] = {}
+        for node in (default_nodes() if nodes is None else nodes):
+            self.add(node)
+
+    def add(self, node: IndicatorNode):
+        """Register (or replace) a node"""
+        if node.name in BASE_INPUTS:
+            raise ValueError(f"Node name {node.name} shadows an input column")
+        self.nodes[node.name] = node
+
+    @property
+    def public_outputs(self) -> List[str]:
+        """Names of all indicator outputs, in registration order"""
+        return [name for name, node in self.nodes.items() if node.public]
+
+    def input_columns(self, outputs: Iterable[str]) -> List[str]:
+        """DataFrame columns (transitively) required by ``outputs``"""
+        seen, stack, found = set(), list(outputs), []
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            if current in BASE_INPUTS:
+                found.append(current)
+            elif current in self.nodes:
+                stack.extend(self.nodes[current].inputs)
+        return found
+
+    def plan(self, outputs: Iterable[str]) -> List[str]:
+        """
+        Topologically ordered node names needed for ``outputs``
+
+        Raises:
+            KeyError: an output or input is not a known node or column
+            ValueError: the graph contains a cycle
+        """
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str):
+            if name in BASE_INPUTS or state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Indicator graph has a cycle through {name}")
+            if name not in self.nodes:
+                raise KeyError(f"Unknown indicator: {name}")
+
+            state[name] = 1
+            for dependency in self.nodes[name].inputs:
+                visit(dependency)
+            state[name] = 2
+            order.append(name)
+
+        for output in outputs:
+            visit(output)
+        return order
+
+    def warmup_bars(self, outputs: Iterable[str]) -> int:
+        """Bars needed before every output has its first value"""
+        return self._path_length(outputs, lambda node: node.warmup) + 1
+
+    def lookback_bars(self, outputs: Iterable[str]) -> int:
+        """Bars needed for every recursive output to have converged as well"""
+        return self._path_length(outputs, lambda node: node.warmup + node.settle) + 1
+
+    def path_dependent(self, outputs: Iterable[str]) -> List[str]:
+        """Outputs depending on a cumulative node, which no lookback makes exact"""
+        outputs = list(outputs)
+        return [
+            output for output in outputs
+            if any(not self.nodes[name].converges for name in self.plan([output]))
+        ]
+
+    def _path_length(self, outputs: Iterable[str], cost: Callable[[IndicatorNode], int]) -> int:
+        """Largest summed ``cost`` along any dependency path of the outputs"""
+        lengths: Dict[str, int] = {}
+        for name in self.plan(outputs):
+            node = self.nodes[name]
+            lengths[name] = cost(node) + max((lengths.get(inp, 0) for inp in node.inputs), default=0)
+        return max((lengths[name] for name in outputs if name in lengths), default=0)
+
+    def evaluate(self, data: Mapping[str, Any], outputs: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Evaluate the requested outputs on OHLCV data
+
+        Args:
+            data: DataFrame (or mapping of arrays, for array node sets) with
+                columns: open, high, low, close, volume
+            outputs: Output names (default: every public node)
+
+        Returns:
+            Dictionary of output name to series
+        """
+        outputs = self.public_outputs if outputs is None else list(outputs)
+        values: Dict[str, Any] = {col: data[col] for col in BASE_INPUTS if col in data}
+
+        for name in self.plan(outputs):
+            node = self.nodes[name]
+            values[name] = node.compute(*(values[inp] for inp in node.inputs))
+
+        return {name: values[name] for name in outputs}
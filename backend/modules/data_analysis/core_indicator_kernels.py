@@ -0,0 +1,290 @@
+"""
+NumPy Indicator Kernels
+
+Array kernels for the indicator graph working on contiguous float64 arrays
+instead of pandas Series:
+- rolling means and standard deviations from cumulative sums
+- EMA / Wilder smoothing as a plain recursion
+- rolling max/min over strided sliding-window views
+
+``numpy_nodes()`` mirrors ``core_indicator_graph.default_nodes()`` node for
+node, so both backends produce the same outputs under the same names.
+"""
+
+from typing import Callable, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .core_indicator_graph import ADX_PERIOD, ATR_PERIOD, IndicatorNode, inherit_warmups
+
+
+def _first_valid(x: np.ndarray) -> int:
+    valid = np.flatnonzero(~np.isnan(x))
+    return int(valid[0]) if len(valid) else len(x)
+
+
+def _rolling_sum_core(x: np.ndarray, window: int) -> np.ndarray:
+    """Window sums of a NaN-free array, anchored at the mean for precision"""
+    anchor = x.mean()
+    csum = np.concatenate(([0.0], np.cumsum(x - anchor)))
+    return csum[window:] - csum[:-window] + anchor * window
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean; NaN until a full window of valid values is available"""
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    tail = x[start:]
+    if len(tail) < window:
+        return out
+
+    if np.isnan(tail).any():
+        # Interior gaps: windows touching a NaN are NaN, as with pandas
+        out[start + window - 1:] = sliding_window_view(tail, window).mean(axis=1)
+    else:
+        out[start + window - 1:] = _rolling_sum_core(tail, window) / window
+    return out
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling population standard deviation (ddof=0)"""
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    tail = x[start:]
+    if len(tail) < window:
+        return out
+
+    if np.isnan(tail).any():
+        out[start + window - 1:] = sliding_window_view(tail, window).std(axis=1)
+        return out
+
+    centered = tail - tail.mean()
+    csum = np.concatenate(([0.0], np.cumsum(centered)))
+    csq = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    mean = (csum[window:] - csum[:-window]) / window
+    var = (csq[window:] - csq[:-window]) / window - mean * mean
+    out[start + window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+def rolling_max(x: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Rolling max over a strided window view, ignoring NaNs like pandas"""
+    return _rolling_extreme(x, window, min_periods, np.fmax)
+
+
+def rolling_min(x: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Rolling min over a strided window view, ignoring NaNs like pandas"""
+    return _rolling_extreme(x, window, min_periods, np.fmin)
+
+
+def _rolling_extreme(x, window, min_periods, ufunc) -> np.ndarray:
+    min_periods = window if min_periods is None else max(min_periods, 1)
+    padded = np.concatenate((np.full(window - 1, np.nan), x))
+    out = ufunc.reduce(sliding_window_view(padded, window), axis=1)
+
+    valid = np.concatenate(([0], np.cumsum(~np.isnan(padded))))
+    counts = valid[window:] - valid[:-window]
+    out[counts < min_periods] = np.nan
+    return out
+
+
+def recursive_average(x: np.ndarray,
+                      alpha: float,
+                      min_periods: int = 0,
+                      seed: Optional[float] = None) -> np.ndarray:
+    """
+    y[0] = seed or x[0], y[i] = (1 - alpha) * y[i-1] + alpha * x[i]
+
+    Leading NaNs are skipped (the recursion starts at the first valid value),
+    matching pandas ``ewm(adjust=False)``.
+    """
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    if start == len(x):
+        return out
+
+    values = x[start:].tolist()
+    result = [0.0] * len(values)
+    prev = values[0] if seed is None else seed
+    result[0] = prev
+    decay = 1.0 - alpha
+    for i in range(1, len(values)):
+        prev = decay * prev + alpha * values[i]
+        result[i] = prev
+
+    out[start:] = result
+    out[start:start + max(min_periods - 1, 0)] = np.nan
+    return out
+
+
+def ema(x: np.ndarray, period: int, min_periods: int = 0) -> np.ndarray:
+    """Exponential moving average with span ``period``"""
+    return recursive_average(x, 2.0 / (period + 1), min_periods)
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    out[periods:] = x[:-periods]
+    return out
+
+
+def _true_range(high, low, close) -> np.ndarray:
+    prev_close = shift(close)
+    tr = high - low
+    tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))[1:])
+    return tr
+
+
+def _wilder_from(values: np.ndarray, seed: float, start: int, window: int) -> np.ndarray:
+    """Wilder average of ``values[start:]`` seeded with ``seed`` at ``start``"""
+    tail = values[start:].copy()
+    tail[0] = seed
+    return recursive_average(tail, 1.0 / window)
+
+
+def _atr(true_range: np.ndarray) -> np.ndarray:
+    atr = np.zeros(len(true_range))
+    if len(true_range) >= ATR_PERIOD:
+        seed = true_range[:ATR_PERIOD].mean()
+        atr[ATR_PERIOD - 1:] = _wilder_from(true_range, seed, ATR_PERIOD - 1, ATR_PERIOD)
+    return atr
+
+
+def _directional_movement(high, low) -> np.ndarray:
+    up = high - shift(high)
+    down = shift(low) - low
+    pos = np.where((up > down) & (up > 0), up, 0.0)
+    neg = np.where((down > up) & (down > 0), down, 0.0)
+    return np.vstack((pos, neg))
+
+
+def _wilder_sum(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) > window:
+        seed = values[1:window + 1].sum()
+        out[window:] = _wilder_from(values, seed / window, window, window) * window
+    return out
+
+
+def _directional_index(true_range, dm) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tr_sum = _wilder_sum(true_range, ADX_PERIOD)
+        di_plus = 100 * _wilder_sum(dm[0], ADX_PERIOD) / tr_sum
+        di_minus = 100 * _wilder_sum(dm[1], ADX_PERIOD) / tr_sum
+    return np.vstack((di_plus, di_minus))
+
+
+def _di_output(row: int) -> Callable[[np.ndarray], np.ndarray]:
+    def select(di: np.ndarray) -> np.ndarray:
+        series = di[row].copy()
+        series[:ADX_PERIOD + 1] = 0.0
+        return series
+    return select
+
+
+def _adx(di: np.ndarray) -> np.ndarray:
+    n = ADX_PERIOD
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dx = 100 * np.abs((di[0] - di[1]) / (di[0] + di[1]))
+    adx = np.zeros(di.shape[1])
+    first = 2 * n - 1
+    if len(dx) > first:
+        seed = dx[n:first + 1].mean()
+        adx[first:] = _wilder_from(dx, seed, first, n)
+    return adx
+
+
+def _macd(ema_fast, ema_slow) -> np.ndarray:
+    macd = ema_fast - ema_slow
+    macd[:25] = np.nan
+    return macd
+
+
+def _rsi(close) -> np.ndarray:
+    diff = close - shift(close)
+    up = recursive_average(np.where(diff > 0, diff, 0.0), 1 / 14, 14)
+    down = recursive_average(np.where(diff < 0, -diff, 0.0), 1 / 14, 14)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(down == 0, 100.0, 100 - (100 / (1 + up / down)))
+
+
+def _safe_divide(a, b) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return a / b
+
+
+def _cci(typical) -> np.ndarray:
+    out = np.full(len(typical), np.nan)
+    if len(typical) >= 20:
+        windows = sliding_window_view(typical, 20)
+        mean = windows.mean(axis=1)
+        mad = np.abs(windows - mean[:, None]).mean(axis=1)
+        out[19:] = _safe_divide(typical[19:] - mean, 0.015 * mad)
+    return out
+
+
+def _obv(close, volume) -> np.ndarray:
+    return np.cumsum(np.where(close < shift(close), -volume, volume))
+
+
+def _midpoint(high, low) -> np.ndarray:
+    return 0.5 * (high + low)
+
+
+def numpy_nodes() -> List[IndicatorNode]:
+    """NumPy node set with the same names and dependencies as ``default_nodes()``"""
+    return inherit_warmups([
+        IndicatorNode('true_range', ('high', 'low', 'close'), _true_range, public=False),
+        IndicatorNode('typical_price', ('high', 'low', 'close'), lambda h, l, c: (h + l + c) / 3.0, public=False),
+        IndicatorNode('std_20', ('close',), lambda c: rolling_std(c, 20), public=False),
+        IndicatorNode('highest_high_14', ('high',), lambda h: rolling_max(h, 14), public=False),
+        IndicatorNode('lowest_low_14', ('low',), lambda l: rolling_min(l, 14), public=False),
+        IndicatorNode('directional_movement', ('high', 'low'), _directional_movement, public=False),
+        IndicatorNode('directional_index', ('true_range', 'directional_movement'), _directional_index, public=False),
+        IndicatorNode('ichimoku_mid_9', ('high', 'low'),
+                      lambda h, l: _midpoint(rolling_max(h, 9), rolling_min(l, 9)), public=False),
+        IndicatorNode('ichimoku_mid_26', ('high', 'low'),
+                      lambda h, l: _midpoint(rolling_max(h, 26), rolling_min(l, 26)), public=False),
+
+        IndicatorNode('sma_20', ('close',), lambda c: rolling_mean(c, 20)),
+        IndicatorNode('sma_50', ('close',), lambda c: rolling_mean(c, 50)),
+        IndicatorNode('sma_200', ('close',), lambda c: rolling_mean(c, 200)),
+        IndicatorNode('ema_12', ('close',), lambda c: ema(c, 12)),
+        IndicatorNode('ema_26', ('close',), lambda c: ema(c, 26)),
+        IndicatorNode('macd', ('ema_12', 'ema_26'), _macd),
+        IndicatorNode('macd_signal', ('macd',), lambda m: ema(m, 9, min_periods=9)),
+        IndicatorNode('macd_histogram', ('macd', 'macd_signal'), lambda m, s: m - s),
+
+        IndicatorNode('rsi', ('close',), _rsi),
+        IndicatorNode('stoch_k', ('close', 'highest_high_14', 'lowest_low_14'),
+                      lambda c, hh, ll: _safe_divide(100 * (c - ll), hh - ll)),
+        IndicatorNode('stoch_d', ('stoch_k',), lambda k: rolling_mean(k, 3)),
+
+        IndicatorNode('bb_middle', ('sma_20',), lambda s: s),
+        IndicatorNode('bb_upper', ('bb_middle', 'std_20'), lambda m, s: m + 2 * s),
+        IndicatorNode('bb_lower', ('bb_middle', 'std_20'), lambda m, s: m - 2 * s),
+        IndicatorNode('bb_width', ('bb_upper', 'bb_lower', 'bb_middle'),
+                      lambda u, l, m: _safe_divide(u - l, m) * 100),
+        IndicatorNode('bb_percent', ('close', 'bb_upper', 'bb_lower'),
+                      lambda c, u, l: _safe_divide(c - l, np.where(u != l, u - l, np.nan))),
+        IndicatorNode('atr', ('true_range',), _atr),
+
+        IndicatorNode('obv', ('close', 'volume'), _obv),
+        IndicatorNode('vwap', ('typical_price', 'volume'),
+                      lambda tp, v: _safe_divide(np.cumsum(tp * v), np.cumsum(v))),
+
+        IndicatorNode('adx', ('directional_index',), _adx),
+        IndicatorNode('di_plus', ('directional_index',), _di_output(0)),
+        IndicatorNode('di_minus', ('directional_index',), _di_output(1)),
+
+        IndicatorNode('cci', ('typical_price',), _cci),
+        IndicatorNode('williams_r', ('close', 'highest_high_14', 'lowest_low_14'),
+                      lambda c, hh, ll: _safe_divide(-100 * (hh - c), hh - ll)),
+
+        IndicatorNode('ichimoku_conversion', ('ichimoku_mid_9',), lambda s: s),
+        IndicatorNode('ichimoku_base', ('ichimoku_mid_26',), lambda s: s),
+        IndicatorNode('ichimoku_span_a', ('ichimoku_mid_9', 'ichimoku_mid_26'), _midpoint),
+        IndicatorNode('ichimoku_span_b', ('high', 'low'),
+                      lambda h, l: _midpoint(rolling_max(h, 52, min_periods=1), rolling_min(l, 52, min_periods=1))),
+    ])
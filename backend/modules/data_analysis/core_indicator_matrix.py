@@ -0,0 +1,333 @@
+"""
+Cross-Symbol Indicator Matrix
+
+Indicators for a whole symbol universe at once. Klines are aligned into
+(time x symbol) float64 matrices and each indicator is one vectorized pass
+over all columns:
+- rolling windows use cumulative sums with valid-count masks
+- recursive averages step through time, updating every symbol per step
+- NaN marks rows before a symbol's listing (or missing candles); each column
+  behaves as if its series started at its first valid row
+
+Outputs follow the names and ta semantics of IndicatorCalculator for the
+indicators the live service stores.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .core_indicator_graph import ADX_PERIOD, ATR_PERIOD, IndicatorGraph, IndicatorNode, inherit_warmups
+
+
+# Matrix column -> kline attribute
+_OHLCV_FIELDS = {'open': 'open_price', 'high': 'high_price', 'low': 'low_price',
+                 'close': 'close_price', 'volume': 'volume'}
+
+
+def build_ohlcv_matrix(klines_by_symbol: Dict[str, Any]) -> Tuple[np.ndarray, List[str], Dict[str, np.ndarray]]:
+    """
+    Align per-symbol klines on the union of their open times
+
+    Args:
+        klines_by_symbol: Per symbol, either klines (objects with open_time,
+            open_price, high_price, low_price, close_price, volume) in any order,
+            or OHLCV column arrays such as the ``Candles`` read by ``get_ohlcv_arrays``
+
+    Returns:
+        (open times, symbols, columns) where each column is a (time x symbol)
+        matrix with NaN where a symbol has no candle
+    """
+    symbols = list(klines_by_symbol)
+    per_symbol = [_ohlcv_columns(klines_by_symbol[symbol]) for symbol in symbols]
+    times = np.unique(np.concatenate(
+        [cols['open_time'] for cols in per_symbol] or [np.array([], dtype='datetime64[ms]')]
+    ))
+
+    columns = {name: np.full((len(times), len(symbols)), np.nan) for name in _OHLCV_FIELDS}
+
+    for j, cols in enumerate(per_symbol):
+        if not len(cols['open_time']):
+            continue
+        rows = np.searchsorted(times, cols['open_time'])
+        for name in _OHLCV_FIELDS:
+            columns[name][rows, j] = cols[name]
+
+    return times, symbols, columns
+
+
+def _ohlcv_columns(klines: Any) -> Dict[str, np.ndarray]:
+    """open_time (datetime64[ms]) and float OHLCV arrays from klines or column arrays"""
+    if isinstance(klines, Mapping):
+        columns = {name: np.asarray(klines[name], dtype=np.float64) for name in _OHLCV_FIELDS}
+        columns['open_time'] = np.asarray(klines['open_time']).astype('datetime64[ms]')
+        return columns
+
+    columns = {name: np.array([float(getattr(k, attr)) for k in klines], dtype=np.float64)
+               for name, attr in _OHLCV_FIELDS.items()}
+    columns['open_time'] = np.array([np.datetime64(k.open_time, 'ms') for k in klines],
+                                    dtype='datetime64[ms]')
+    return columns
+
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    out[1:] = x[:-1]
+    return out
+
+
+def _valid_counts(x: np.ndarray) -> np.ndarray:
+    """Running count of valid rows per column"""
+    return np.cumsum(~np.isnan(x), axis=0)
+
+
+def _window_sums(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-column window sums (NaN counted as zero) and valid counts, aligned to the window end"""
+    valid = ~np.isnan(x)
+    zero_row = np.zeros((1, x.shape[1]))
+    csum = np.concatenate((zero_row, np.cumsum(np.where(valid, x, 0.0), axis=0)))
+    ccount = np.concatenate((zero_row, np.cumsum(valid, axis=0)))
+    return csum[window:] - csum[:-window], ccount[window:] - ccount[:-window]
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean per column; NaN unless the window holds ``window`` valid values"""
+    out = np.full_like(x, np.nan)
+    if len(x) < window:
+        return out
+    anchor = np.nan_to_num(np.nanmean(x, axis=0)) if np.isfinite(x).any() else np.zeros(x.shape[1])
+    sums, counts = _window_sums(x - anchor, window)
+    out[window - 1:] = np.where(counts == window, sums / window + anchor, np.nan)
+    return out
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling population standard deviation per column"""
+    out = np.full_like(x, np.nan)
+    if len(x) < window:
+        return out
+    anchor = np.nan_to_num(np.nanmean(x, axis=0)) if np.isfinite(x).any() else np.zeros(x.shape[1])
+    centered = x - anchor
+    sums, counts = _window_sums(centered, window)
+    squares, _ = _window_sums(centered * centered, window)
+    mean = sums / window
+    var = np.maximum(squares / window - mean * mean, 0.0)
+    out[window - 1:] = np.where(counts == window, np.sqrt(var), np.nan)
+    return out
+
+
+def rolling_extreme(x: np.ndarray, window: int, mode: str = 'max') -> np.ndarray:
+    """Rolling max/min per column over a strided view; NaN unless the window is complete"""
+    ufunc = np.fmax if mode == 'max' else np.fmin
+    padded = np.concatenate((np.full((window - 1, x.shape[1]), np.nan), x))
+    out = ufunc.reduce(sliding_window_view(padded, window, axis=0), axis=-1)
+    _, counts = _window_sums(padded, window)
+    out[counts < window] = np.nan
+    return out
+
+
+def recursive_average(x: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    ``ewm(adjust=False)`` per column, starting at each column's first valid row
+
+    Rows where a column is NaN keep its state and output NaN.
+    """
+    out = np.full_like(x, np.nan)
+    state = np.full(x.shape[1], np.nan)
+    count = np.zeros(x.shape[1])
+    decay = 1.0 - alpha
+
+    for t in range(len(x)):
+        row = x[t]
+        valid = ~np.isnan(row)
+        stepped = np.where(np.isnan(state), row, decay * state + alpha * row)
+        state = np.where(valid, stepped, state)
+        count += valid
+        out[t] = np.where(valid & (count >= min_periods), state, np.nan)
+    return out
+
+
+def seeded_wilder_sum(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wilder running sum per column: the sum of the first ``window`` valid values,
+    then ``S - S / window + x``
+
+    Returns:
+        (sums, valid counts); sums are NaN until ``window`` values were seen
+    """
+    out = np.full_like(x, np.nan)
+    state = np.zeros(x.shape[1])
+    counts = np.zeros_like(x)
+    count = np.zeros(x.shape[1])
+
+    for t in range(len(x)):
+        row = x[t]
+        valid = ~np.isnan(row)
+        count += valid
+        value = np.where(valid, row, 0.0)
+        state = np.where(count > window, state - state / window + value, state + value)
+        out[t] = np.where(valid & (count >= window), state, np.nan)
+        counts[t] = count
+    return out, counts
+
+
+def _listed(close: np.ndarray) -> np.ndarray:
+    return ~np.isnan(close)
+
+
+def _true_range(high, low, close) -> np.ndarray:
+    prev_close = _shift(close)
+    with np.errstate(invalid='ignore'):
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return np.where(_listed(close), tr, np.nan)
+
+
+def _atr(true_range: np.ndarray) -> np.ndarray:
+    sums, counts = seeded_wilder_sum(true_range, ATR_PERIOD)
+    # ta reports zeros until the first full window
+    return np.where(np.isnan(true_range), np.nan,
+                    np.where(counts >= ATR_PERIOD, sums / ATR_PERIOD, 0.0))
+
+
+def _directional_index(high, low, close, true_range) -> Dict[str, np.ndarray]:
+    n = ADX_PERIOD
+    listed = _listed(close)
+    up = high - _shift(high)
+    down = _shift(low) - low
+    # The first row of each symbol has no previous candle and is excluded, as in ta
+    has_prev = ~np.isnan(up)
+    with np.errstate(invalid='ignore'):
+        pos = np.where(has_prev, np.where((up > down) & (up > 0), up, 0.0), np.nan)
+        neg = np.where(has_prev, np.where((down > up) & (down > 0), down, 0.0), np.nan)
+    tr = np.where(has_prev, true_range, np.nan)
+
+    tr_sum, counts = seeded_wilder_sum(tr, n)
+    pos_sum, _ = seeded_wilder_sum(pos, n)
+    neg_sum, _ = seeded_wilder_sum(neg, n)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        di_plus = 100 * pos_sum / tr_sum
+        di_minus = 100 * neg_sum / tr_sum
+        dx = 100 * np.abs((di_plus - di_minus) / (di_plus + di_minus))
+
+    dx_sum, dx_counts = seeded_wilder_sum(dx, n)
+
+    # ta leaves warm-up rows (and the first DI row) at zero
+    di_ready = counts > n
+    return {
+        'di_plus': np.where(listed, np.where(di_ready, di_plus, 0.0), np.nan),
+        'di_minus': np.where(listed, np.where(di_ready, di_minus, 0.0), np.nan),
+        'adx': np.where(listed, np.where(dx_counts >= n, dx_sum / n, 0.0), np.nan),
+    }
+
+
+def _macd(ema_fast, ema_slow, close) -> np.ndarray:
+    # ta's EMAs carry min_periods=window, so MACD starts at the slow period
+    return np.where(_valid_counts(close) >= 26, ema_fast - ema_slow, np.nan)
+
+
+def _rsi(close) -> np.ndarray:
+    diff = close - _shift(close)
+    listed = _listed(close)
+    with np.errstate(invalid='ignore'):
+        up = np.where(listed, np.where(diff > 0, diff, 0.0), np.nan)
+        down = np.where(listed, np.where(diff < 0, -diff, 0.0), np.nan)
+    avg_up = recursive_average(up, 1 / 14, 14)
+    avg_down = recursive_average(down, 1 / 14, 14)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(avg_down == 0, 100.0, 100 - 100 / (1 + avg_up / avg_down))
+
+
+def _obv(close, volume) -> np.ndarray:
+    listed = _listed(close)
+    with np.errstate(invalid='ignore'):
+        signed = np.where(close < _shift(close), -volume, volume)
+    return np.where(listed, np.cumsum(np.where(listed, signed, 0.0), axis=0), np.nan)
+
+
+def _vwap(high, low, close, volume) -> np.ndarray:
+    listed = _listed(close)
+    typical = (high + low + close) / 3
+    pv = np.cumsum(np.where(listed, typical * volume, 0.0), axis=0)
+    vol = np.cumsum(np.where(listed, volume, 0.0), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(listed, pv / vol, np.nan)
+
+
+def matrix_nodes() -> List[IndicatorNode]:
+    """Graph nodes operating on (time x symbol) matrices"""
+    return inherit_warmups([
+        IndicatorNode('true_range', ('high', 'low', 'close'), _true_range, public=False),
+        IndicatorNode('std_20', ('close',), lambda c: rolling_std(c, 20), public=False),
+        IndicatorNode('directional_index', ('high', 'low', 'close', 'true_range'), _directional_index, public=False),
+
+        IndicatorNode('sma_20', ('close',), lambda c: rolling_mean(c, 20)),
+        IndicatorNode('sma_50', ('close',), lambda c: rolling_mean(c, 50)),
+        IndicatorNode('sma_200', ('close',), lambda c: rolling_mean(c, 200)),
+        IndicatorNode('ema_12', ('close',), lambda c: recursive_average(c, 2 / 13)),
+        IndicatorNode('ema_26', ('close',), lambda c: recursive_average(c, 2 / 27)),
+        IndicatorNode('macd', ('ema_12', 'ema_26', 'close'), _macd),
+        IndicatorNode('macd_signal', ('macd',), lambda m: recursive_average(m, 2 / 10, 9)),
+        IndicatorNode('macd_histogram', ('macd', 'macd_signal'), lambda m, s: m - s),
+        IndicatorNode('rsi', ('close',), _rsi),
+        IndicatorNode('bb_middle', ('sma_20',), lambda s: s),
+        IndicatorNode('bb_upper', ('bb_middle', 'std_20'), lambda m, s: m + 2 * s),
+        IndicatorNode('bb_lower', ('bb_middle', 'std_20'), lambda m, s: m - 2 * s),
+        IndicatorNode('atr', ('true_range',), _atr),
+        IndicatorNode('adx', ('directional_index',), lambda d: d['adx']),
+        IndicatorNode('di_plus', ('directional_index',), lambda d: d['di_plus']),
+        IndicatorNode('di_minus', ('directional_index',), lambda d: d['di_minus']),
+        IndicatorNode('obv', ('close', 'volume'), _obv),
+        IndicatorNode('vwap', ('high', 'low', 'close', 'volume'), _vwap),
+    ])
+
+
+class IndicatorMatrixCalculator:
+    """Evaluates indicators over (time x symbol) matrices"""
+
+    graph = IndicatorGraph(matrix_nodes())
+
+    @property
+    def supported_indicators(self) -> List[str]:
+        return self.graph.public_outputs
+
+    def calculate(self,
+                  columns: Dict[str, np.ndarray],
+                  indicators: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate indicators for every symbol column at once
+
+        Args:
+            columns: open/high/low/close/volume matrices from ``build_ohlcv_matrix``
+            indicators: Indicator names (default: all supported). Unsupported
+                names are ignored.
+
+        Returns:
+            Dictionary of indicator name to (time x symbol) matrix
+        """
+        supported = set(self.supported_indicators)
+        names = self.supported_indicators if indicators is None else [i for i in indicators if i in supported]
+        return self.graph.evaluate(columns, names)
+
+    @staticmethod
+    def latest(matrices: Dict[str, np.ndarray], symbols: Sequence[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Last valid value of each indicator per symbol
+
+        Returns:
+            {symbol: {indicator: value}}
+        """
+        latest: Dict[str, Dict[str, float]] = {symbol: {} for symbol in symbols}
+
+        for name, matrix in matrices.items():
+            valid = ~np.isnan(matrix)
+            has_value = valid.any(axis=0)
+            last_rows = len(matrix) - 1 - np.argmax(valid[::-1], axis=0)
+            values = matrix[last_rows, np.arange(matrix.shape[1])]
+
+            for j, symbol in enumerate(symbols):
+                if has_value[j]:
+                    latest[symbol][name] = float(values[j])
+
+        return latest
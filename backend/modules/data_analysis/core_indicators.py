@@ -1,14 +1,36 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Mapping, Optional, Tuple, Any, Union
 from datetime import datetime
 import logging
 import ta
 
+from .core_anchored_indicators import Anchor, anchor_start_ms, validate_anchor
+from .core_candle_resampler import to_epoch_ms
+from .core_indicator_graph import BASE_INPUTS, IndicatorGraph
+from .core_indicator_kernels import numpy_nodes
+
 logger = logging.getLogger(__name__)
 
 class IndicatorCalculator:
     
+    # Graphs are stateless, so one per backend is shared by all calculators
+    BACKENDS = {
+        'pandas': IndicatorGraph(),
+        'numpy': IndicatorGraph(numpy_nodes())
+    }
+    
+    def __init__(self, backend: str = 'pandas'):
+        """
+        Args:
+            backend: 'pandas' evaluates Series nodes; 'numpy' runs the array
+                kernels on contiguous float64 columns
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown indicator backend: {backend}")
+        self.backend = backend
+        self.graph = self.BACKENDS[backend]
+    
     @staticmethod
     def calculate_sma(prices: pd.Series, period: int) -> pd.Series:
         """Simple Moving Average"""
@@ -112,6 +134,35 @@ class IndicatorCalculator:
         typical_price = (high + low + close) / 3
         return (typical_price * volume).cumsum() / volume.cumsum()
     
+    @staticmethod
+    def calculate_anchored_vwap(high: pd.Series,
+                                low: pd.Series,
+                                close: pd.Series,
+                                volume: pd.Series,
+                                anchor: Anchor = 'session') -> pd.Series:
+        """
+        VWAP accumulated from an anchor instead of the first row
+        
+        Args:
+            high, low, close, volume: Series indexed by candle open time
+            anchor: 'session' (UTC day), 'week' (Monday 00:00 UTC) or a datetime
+        
+        Returns:
+            Anchored VWAP; NaN before a custom anchor and for a leading period
+            the data does not start at the beginning of
+        """
+        validate_anchor(anchor)
+        open_ms = np.array([to_epoch_ms(t) for t in pd.DatetimeIndex(high.index).to_pydatetime()])
+        periods = np.array([anchor_start_ms(ms, anchor) for ms in open_ms], dtype=float)
+        
+        typical_price = (high + low + close) / 3
+        pv = (typical_price * volume).groupby(periods).cumsum()
+        vwap = pv / volume.groupby(periods).cumsum()
+        
+        if len(open_ms) and not np.isnan(periods[0]) and open_ms[0] != periods[0]:
+            vwap[periods == periods[0]] = np.nan
+        return vwap.where(~np.isnan(periods))
+    
     @staticmethod
     def calculate_adx(high: pd.Series,
                      low: pd.Series,
@@ -213,81 +264,75 @@ class IndicatorCalculator:
             'span_b': ichimoku.ichimoku_b()
         }
     
-    def calculate_all_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def calculate_all_indicators(self,
+                                 df: Union[pd.DataFrame, Mapping[str, np.ndarray]],
+                                 indicators: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        Calculate all indicators for a DataFrame with OHLCV data
+        Calculate indicators for a DataFrame with OHLCV data
         
         Args:
-            df: DataFrame with columns: open, high, low, close, volume
+            df: DataFrame with columns: open, high, low, close, volume; or a
+                mapping of those names to 1-D arrays (as read by
+                ``get_ohlcv_arrays``), in which case the numpy backend returns
+                arrays without building any pandas objects
+            indicators: Indicator names to calculate (default: all). Only the
+                graph nodes these depend on are evaluated.
         
         Returns:
             Dictionary with all calculated indicators
         """
         try:
-            indicators = {}
-            
-            # Trend Indicators
-            indicators['sma_20'] = self.calculate_sma(df['close'], 20)
-            indicators['sma_50'] = self.calculate_sma(df['close'], 50)
-            indicators['sma_200'] = self.calculate_sma(df['close'], 200)
-            indicators['ema_12'] = self.calculate_ema(df['close'], 12)
-            indicators['ema_26'] = self.calculate_ema(df['close'], 26)
-            
-            # MACD
-            macd_data = self.calculate_macd(df['close'])
-            indicators['macd'] = macd_data['macd']
-            indicators['macd_signal'] = macd_data['signal']
-            indicators['macd_histogram'] = macd_data['histogram']
-            
-            # Momentum Indicators
-            indicators['rsi'] = self.calculate_rsi(df['close'])
-            
-            # Stochastic
-            stoch_data = self.calculate_stochastic(df['high'], df['low'], df['close'])
-            indicators['stoch_k'] = stoch_data['k']
-            indicators['stoch_d'] = stoch_data['d']
+            from_arrays = not isinstance(df, pd.DataFrame)
+            outputs = self.graph.public_outputs if indicators is None else list(indicators)
             
-            # Volatility Indicators
-            bb_data = self.calculate_bollinger_bands(df['close'])
-            indicators['bb_upper'] = bb_data['upper']
-            indicators['bb_middle'] = bb_data['middle']
-            indicators['bb_lower'] = bb_data['lower']
-            indicators['bb_width'] = bb_data['width']
-            indicators['bb_percent'] = bb_data['percent']
+            # Volume indicators are skipped when the data carries no volume
+            has_volume = 'volume' in df and np.nansum(np.asarray(df['volume'], dtype=np.float64)) > 0
+            if not has_volume:
+                outputs = [
+                    name for name in outputs
+                    if 'volume' not in self.graph.input_columns([name])
+                ]
             
-            indicators['atr'] = self.calculate_atr(df['high'], df['low'], df['close'])
+            if self.backend == 'numpy':
+                columns = {
+                    col: np.ascontiguousarray(np.asarray(df[col], dtype=np.float64))
+                    for col in BASE_INPUTS if col in df
+                }
+                arrays = self.graph.evaluate(columns, outputs)
+                if from_arrays:
+                    return arrays
+                return {name: pd.Series(values, index=df.index) for name, values in arrays.items()}
             
-            # Volume Indicators
-            if 'volume' in df.columns and df['volume'].sum() > 0:
-                indicators['obv'] = self.calculate_obv(df['close'], df['volume'])
-                indicators['vwap'] = self.calculate_vwap(
-                    df['high'], df['low'], df['close'], df['volume']
-                )
-            
-            # Other Indicators
-            adx_data = self.calculate_adx(df['high'], df['low'], df['close'])
-            indicators['adx'] = adx_data['adx']
-            indicators['di_plus'] = adx_data['di_plus']
-            indicators['di_minus'] = adx_data['di_minus']
-            
-            indicators['cci'] = self.calculate_cci(df['high'], df['low'], df['close'])
-            indicators['williams_r'] = self.calculate_williams_r(
-                df['high'], df['low'], df['close']
-            )
-            
-            # Ichimoku
-            ichimoku_data = self.calculate_ichimoku(df['high'], df['low'], df['close'])
-            indicators['ichimoku_conversion'] = ichimoku_data['conversion_line']
-            indicators['ichimoku_base'] = ichimoku_data['base_line']
-            indicators['ichimoku_span_a'] = ichimoku_data['span_a']
-            indicators['ichimoku_span_b'] = ichimoku_data['span_b']
-            
-            return indicators
+            if from_arrays:
+                df = self.arrays_to_dataframe(df)
+            return self.graph.evaluate(df, outputs)
             
         except Exception as e:
             logger.error(f"Error calculating indicators: {e}")
             raise
     
+    @staticmethod
+    def arrays_to_dataframe(arrays: Mapping[str, np.ndarray]) -> pd.DataFrame:
+        """
+        DataFrame over OHLCV column arrays, indexed by open_time when present
+        
+        Args:
+            arrays: Mapping of open/high/low/close/volume (and optionally
+                open_time) to 1-D arrays in ascending time
+        
+        Returns:
+            DataFrame shaped like the output of prepare_dataframe
+        """
+        index = None
+        if 'open_time' in arrays:
+            index = pd.DatetimeIndex(arrays['open_time'], name='datetime')
+        
+        return pd.DataFrame(
+            {col: np.asarray(arrays[col], dtype=np.float64) for col in BASE_INPUTS if col in arrays},
+            index=index,
+            copy=False
+        )
+    
     def prepare_dataframe(self, kline_data: List[Dict]) -> pd.DataFrame:
         """
         Prepare DataFrame from kline data for indicator calculation
@@ -335,9 +380,23 @@ class IndicatorCalculator:
             logger.error(f"Error preparing dataframe: {e}")
             raise
     
-    def get_latest_indicators(self, df: pd.DataFrame) -> Dict[str, float]:
-        """Get the latest value of all indicators"""
-        indicators = self.calculate_all_indicators(df)
+    def get_latest_indicators(self,
+                              df: pd.DataFrame,
+                              indicators: Optional[Dict[str, pd.Series]] = None,
+                              names: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Get the latest value of each indicator
+        
+        Args:
+            df: DataFrame with OHLCV data (or OHLCV column arrays)
+            indicators: Already calculated indicators; avoids calculating twice
+            names: Indicator names to calculate when ``indicators`` is not given
+        
+        Returns:
+            Dictionary of the last non-NaN value per indicator
+        """
+        if indicators is None:
+            indicators = self.calculate_all_indicators(df, names)
         latest = {}
         
         for name, series in indicators.items():
@@ -346,5 +405,9 @@ class IndicatorCalculator:
                 last_valid = series.last_valid_index()
                 if last_valid is not None:
                     latest[name] = float(series.loc[last_valid])
+            elif isinstance(series, np.ndarray) and series.size:
+                valid = np.flatnonzero(~np.isnan(series))
+                if len(valid):
+                    latest[name] = float(series[valid[-1]])
         
-        return latest
\ No newline at end of file
+        return latest
@@ -0,0 +1,373 @@
+"""
+Universe Screener
+
+Boolean conditions and rankings evaluated over the latest cross-section of a
+symbol universe, held in memory as one float64 array per column.
+
+- ``CrossSection`` keeps the latest and previous closed-candle value of every
+  column (indicators plus OHLCV) for each symbol
+- Conditions are Python-like expressions over column names, e.g.
+  ``rsi < 30 and close < bb_lower`` or ``crosses_above(macd_histogram, 0)``,
+  compiled once and evaluated on all symbols in one vectorized pass
+- Rankings use the same expressions as sort keys, e.g. ``atr / close * 100``
+
+Expression syntax:
+- Arithmetic ``+ - * /``, comparisons (chainable), ``and``/``or``/``not``
+  (also ``&``/``|``/``~``), numeric literals
+- ``prev(x)``: value of ``x`` on the previous closed candle
+- ``crosses_above(a, b)`` / ``crosses_below(a, b)``: ``a`` crossed ``b``
+  between the previous and the latest candle
+- ``abs(x)``, ``min(a, b)``, ``max(a, b)``
+
+Missing values are NaN. Comparisons involving them are unknown rather than
+false, ``not`` keeps them unknown and ``and``/``or`` follow SQL's three-valued
+logic, so ``not rsi > 70`` does not match a symbol without an RSI. A symbol
+matches only when its condition is known to be true.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+import ast
+import logging
+import operator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_COMPARISONS = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+    ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+_ARITHMETIC = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+class ScreenerError(ValueError):
+    """Invalid screener expression or unknown column"""
+
+
+class CrossSection:
+    """Latest and previous value of every column for each symbol of a universe"""
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.current: Dict[str, np.ndarray] = {}
+        self.previous: Dict[str, np.ndarray] = {}
+        self.timestamps = np.array([], dtype='datetime64[us]')
+        for symbol in symbols:
+            self._add_symbol(symbol)
+
+    @classmethod
+    def from_matrices(cls,
+                      symbols: Sequence[str],
+                      matrices: Mapping[str, np.ndarray],
+                      times: Optional[np.ndarray] = None) -> 'CrossSection':
+        """
+        Cross-section from the last two candles of each symbol in (time x symbol) matrices
+
+        Args:
+            symbols: Column order of the matrices
+            matrices: Column name to matrix, e.g. indicator and OHLCV matrices
+            times: Row open times
+
+        Returns:
+            CrossSection over ``symbols``
+        """
+        section = cls(symbols)
+        if not matrices:
+            return section
+
+        # Each symbol's latest row is its last candle with a close, so symbols
+        # whose data ends earlier are not blanked by the shared last row
+        close = matrices.get('close')
+        n_rows = len(next(iter(matrices.values())))
+        columns = np.arange(len(symbols))
+        if close is not None and n_rows:
+            valid = ~np.isnan(close)
+            has_data = valid.any(axis=0)
+            last_rows = n_rows - 1 - np.argmax(valid[::-1], axis=0)
+        else:
+            has_data = np.full(len(symbols), n_rows > 0)
+            last_rows = np.full(len(symbols), n_rows - 1)
+
+        for name, matrix in matrices.items():
+            matrix = np.asarray(matrix, dtype=np.float64)
+            current = np.full(len(symbols), np.nan)
+            previous = np.full(len(symbols), np.nan)
+            if n_rows:
+                current = np.where(has_data, matrix[np.maximum(last_rows, 0), columns], np.nan)
+                previous = np.where(has_data & (last_rows > 0), matrix[np.maximum(last_rows - 1, 0), columns], np.nan)
+            section.current[name] = current
+            section.previous[name] = previous
+
+        if times is not None and n_rows:
+            times = np.asarray(times, dtype='datetime64[us]')
+            section.timestamps = np.where(has_data, times[np.maximum(last_rows, 0)], np.datetime64('NaT'))
+        return section
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def columns(self) -> List[str]:
+        return sorted(self.current)
+
+    def _add_symbol(self, symbol: str) -> int:
+        self._index[symbol] = len(self.symbols)
+        self.symbols.append(symbol)
+        for arrays in (self.current, self.previous):
+            for name in arrays:
+                arrays[name] = np.append(arrays[name], np.nan)
+        self.timestamps = np.append(self.timestamps, np.datetime64('NaT'))
+        return self._index[symbol]
+
+    def update(self, symbol: str, values: Mapping[str, float], timestamp: datetime):
+        """
+        Record the values of a closed candle for one symbol
+
+        A newer timestamp moves the symbol's latest row to ``previous`` first;
+        values for the same candle overwrite the latest row. Older candles are
+        ignored.
+        """
+        i = self._index.get(symbol)
+        if i is None:
+            i = self._add_symbol(symbol)
+
+        ts = np.datetime64(timestamp, 'us')
+        last = self.timestamps[i]
+        if not np.isnat(last) and ts < last:
+            return
+        if np.isnat(last) or ts > last:
+            for name, current in self.current.items():
+                self.previous[name][i] = current[i]
+                current[i] = np.nan
+            self.timestamps[i] = ts
+
+        for name, value in values.items():
+            if name not in self.current:
+                self.current[name] = np.full(len(self.symbols), np.nan)
+                self.previous[name] = np.full(len(self.symbols), np.nan)
+            self.current[name][i] = np.nan if value is None else value
+
+    def column(self, name: str, previous: bool = False) -> np.ndarray:
+        arrays = self.previous if previous else self.current
+        if name not in arrays:
+            raise ScreenerError(f"Unknown column: {name}")
+        return arrays[name]
+
+    def row(self, symbol: str) -> Dict[str, float]:
+        """Latest defined values of one symbol"""
+        i = self._index[symbol]
+        return {name: float(values[i]) for name, values in self.current.items() if not np.isnan(values[i])}
+
+
+Compiled = Callable[[CrossSection, bool], np.ndarray]
+
+
+def compile_expression(expression: str) -> Compiled:
+    """
+    Compile a screener expression into a function of (cross-section, previous)
+
+    Raises:
+        ScreenerError: On syntax outside the screener language
+    """
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ScreenerError(f"Invalid expression {expression!r}: {e.msg}") from e
+    return _compile(tree.body)
+
+
+def _compile(node: ast.AST) -> Compiled:
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda section, previous: section.column(name, previous)
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        value = float(node.value)
+        return lambda section, previous: np.full(len(section), value)
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile(node.operand)
+        if isinstance(node.op, ast.USub):
+            return lambda section, previous: -operand(section, previous)
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            return lambda section, previous: _not(_logical(operand(section, previous)))
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+        reduce = _and if isinstance(node.op, ast.BitAnd) else _or
+        left, right = _compile(node.left), _compile(node.right)
+        return lambda section, previous: reduce(_logical(left(section, previous)),
+                                                _logical(right(section, previous)))
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+        op = _ARITHMETIC[type(node.op)]
+        left, right = _compile(node.left), _compile(node.right)
+
+        def binop(section, previous):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return op(left(section, previous), right(section, previous))
+        return binop
+
+    if isinstance(node, ast.BoolOp):
+        reduce = _and if isinstance(node.op, ast.And) else _or
+        parts = [_compile(value) for value in node.values]
+
+        def boolop(section, previous):
+            result = _logical(parts[0](section, previous))
+            for part in parts[1:]:
+                result = reduce(result, _logical(part(section, previous)))
+            return result
+        return boolop
+
+    if isinstance(node, ast.Compare):
+        operands = [_compile(node.left)] + [_compile(c) for c in node.comparators]
+        ops = [_COMPARISONS[type(op)] for op in node.ops if type(op) in _COMPARISONS]
+        if len(ops) == len(node.ops):
+            def compare(section, previous):
+                values = [operand(section, previous) for operand in operands]
+                result = np.ones(len(section))
+                with np.errstate(invalid='ignore'):
+                    for op, a, b in zip(ops, values, values[1:]):
+                        result = _and(result, _comparison(op(a, b), a, b))
+                return result
+            return compare
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        return _compile_call(node.func.id, [_compile(arg) for arg in node.args])
+
+    raise ScreenerError(f"Unsupported expression: {ast.dump(node)}")
+
+
+def _compile_call(name: str, args: List[Compiled]) -> Compiled:
+    if name == 'prev' and len(args) == 1:
+        return lambda section, previous: args[0](section, True)
+
+    if name in ('crosses_above', 'crosses_below') and len(args) == 2:
+        a, b = args
+        above = name == 'crosses_above'
+
+        def crosses(section, previous):
+            before = a(section, True) - b(section, True)
+            after = a(section, False) - b(section, False)
+            with np.errstate(invalid='ignore'):
+                crossed = (before <= 0) & (after > 0) if above else (before >= 0) & (after < 0)
+            return _comparison(crossed, before, after)
+        return crosses
+
+    if name == 'abs' and len(args) == 1:
+        return lambda section, previous: np.abs(args[0](section, previous))
+
+    if name in ('min', 'max') and len(args) == 2:
+        reduce = np.fmin if name == 'min' else np.fmax
+        return lambda section, previous: reduce(args[0](section, previous), args[1](section, previous))
+
+    raise ScreenerError(f"Unknown function {name}() with {len(args)} arguments")
+
+
+# Logical values are float arrays of 1.0 (true), 0.0 (false) and NaN (unknown)
+
+def _comparison(result: np.ndarray, *operands: np.ndarray) -> np.ndarray:
+    """Boolean result as a logical value, unknown wherever an operand is NaN"""
+    unknown = np.zeros(len(result), dtype=bool)
+    for operand in operands:
+        unknown |= np.isnan(operand)
+    return np.where(unknown, np.nan, result.astype(np.float64))
+
+
+def _logical(values: np.ndarray) -> np.ndarray:
+    """Any value array as a logical value; non-zero is true, NaN unknown"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(values), np.nan, values != 0)
+
+
+def _not(values: np.ndarray) -> np.ndarray:
+    return 1.0 - values
+
+
+def _and(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """False if either side is false, unknown if either is unknown, else true"""
+    return np.where((a == 0) | (b == 0), 0.0, np.where(np.isnan(a) | np.isnan(b), np.nan, 1.0))
+
+
+def _or(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """True if either side is true, unknown if either is unknown, else false"""
+    return np.where((a == 1) | (b == 1), 1.0, np.where(np.isnan(a) | np.isnan(b), np.nan, 0.0))
+
+
+def _truth(values: np.ndarray) -> np.ndarray:
+    """Boolean mask of a value array; NaN (unknown) counts as False"""
+    if values.dtype == bool:
+        return values
+    return np.nan_to_num(values, nan=0.0) != 0
+
+
+@dataclass(frozen=True)
+class ScreenMatch:
+    """Symbol matching a screen, with its rank value when ranked"""
+    symbol: str
+    rank_value: Optional[float] = None
+
+
+class Screener:
+    """Evaluates conditions and rankings over a CrossSection"""
+
+    def __init__(self, max_compiled: int = 256):
+        self.max_compiled = max_compiled
+        self._compiled: Dict[str, Compiled] = {}
+
+    def compile(self, expression: str) -> Compiled:
+        compiled = self._compiled.get(expression)
+        if compiled is None:
+            compiled = compile_expression(expression)
+            if len(self._compiled) >= self.max_compiled:
+                self._compiled.pop(next(iter(self._compiled)))
+            self._compiled[expression] = compiled
+        return compiled
+
+    def mask(self, section: CrossSection, condition: str) -> np.ndarray:
+        """Boolean mask of the symbols satisfying a condition"""
+        return _truth(self.compile(condition)(section, False))
+
+    def screen(self,
+               section: CrossSection,
+               condition: Optional[str] = None,
+               rank_by: Optional[str] = None,
+               top: Optional[int] = None,
+               ascending: bool = False) -> List[ScreenMatch]:
+        """
+        Symbols satisfying a condition, optionally ranked
+
+        Args:
+            section: Cross-section to screen
+            condition: Boolean expression (default: every symbol)
+            rank_by: Numeric expression to sort by; symbols where it is NaN are dropped
+            top: Keep only the first N matches
+            ascending: Sort smallest first (default: largest first)
+
+        Returns:
+            Matches in rank order (symbol order without ``rank_by``)
+        """
+        if not len(section):
+            return []
+
+        selected = self.mask(section, condition) if condition else np.ones(len(section), dtype=bool)
+
+        if rank_by is None:
+            indices = np.flatnonzero(selected)
+            if top is not None:
+                indices = indices[:top]
+            return [ScreenMatch(section.symbols[i]) for i in indices]
+
+        with np.errstate(invalid='ignore'):
+            keys = np.asarray(self.compile(rank_by)(section, False), dtype=np.float64)
+        indices = np.flatnonzero(selected & ~np.isnan(keys))
+        order = indices[np.argsort(keys[indices] if ascending else -keys[indices], kind='stable')]
+        if top is not None:
+            order = order[:top]
+        return [ScreenMatch(section.symbols[i], float(keys[i])) for i in order]
@@ -1,11 +1,26 @@
 import asyncio
+import inspect
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 from sqlalchemy.orm import Session
+import numpy as np
 import pandas as pd
 
 from .core_indicators import IndicatorCalculator
+from .core_indicator_cache import IndicatorCache
+from .core_indicator_events import IndicatorSnapshotCalculated
+from .core_incremental_indicators import Candle, IncrementalIndicatorSet
+from .core_indicator_matrix import IndicatorMatrixCalculator, build_ohlcv_matrix
+from .core_anchored_indicators import Anchor, AnchoredVWAP, anchor_name, anchor_start_ms, validate_anchor
+from .core_candle_resampler import INTERVAL_MS, CandleResampler, bucket_start, to_epoch_ms
+from .core_screener import CrossSection, ScreenMatch, Screener
+from .core_correlation import ReturnCorrelationTracker
+from .service_recalc_scheduler import RecalculationScheduler
+from ..data_fetch.core_candles import Candles
+from ..data_fetch.core_indicator_frame import ADDITIONAL_COLUMNS, INDICATOR_COLUMNS, IndicatorFrame, pivot_indicator_values
 # These imports will be replaced with port interfaces
 # from ..persistence.postgres.market_data_repository import MarketDataRepository
 # from ..market_data.data_normalizer import BinanceDataNormalizer
@@ -13,15 +28,90 @@ from .core_indicators import IndicatorCalculator
 
 logger = logging.getLogger(__name__)
 
+# Higher timeframes are resampled from this interval
+BASE_INTERVAL = '1m'
+
+# Stored klines carry no closed flag; their closing update is written shortly
+# after close_time, so they are only final once this much later
+KLINE_SETTLE_TIME = timedelta(seconds=5)
+
+# Per-process state of historical backfill workers
+_worker_session_factory = None
+_worker_indicator_store = None
+
+
+def _init_backfill_worker(database_url: Optional[str], indicator_store: Any = None):
+    """Process pool initializer: open this worker's own database engine"""
+    global _worker_session_factory, _worker_indicator_store
+    
+    _worker_indicator_store = indicator_store
+    if database_url is None:
+        _worker_session_factory = None
+        return
+    
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    
+    engine = create_engine(database_url, pool_pre_ping=True)
+    _worker_session_factory = sessionmaker(bind=engine)
+
+
+def run_backfill_task(task: Dict[str, Any],
+                      batch_size: int,
+                      enabled_indicators: List[str]) -> Dict[str, Any]:
+    """
+    Backfill one symbol/interval inside a worker process
+    
+    Args:
+        task: symbol, interval, start_date and end_date
+        batch_size: Rows per bulk upsert
+        enabled_indicators: Indicators to store
+        
+    Returns:
+        Result of IndicatorService._batch_calculate_single
+    """
+    if _worker_session_factory is None:
+        raise RuntimeError("Backfill worker has no database configured")
+    
+    from backend.modules.data_fetch.adapter_marketdata_postgres import MarketDataRepository
+    
+    session = _worker_session_factory()
+    try:
+        service = IndicatorService(db_session=session)
+        service.repository = MarketDataRepository(session)
+        service.enabled_indicators = enabled_indicators
+        service.indicator_store = _worker_indicator_store
+        
+        return asyncio.run(service._batch_calculate_single(
+            task['symbol'],
+            task['interval'],
+            task['start_date'],
+            task['end_date'],
+            batch_size
+        ))
+    finally:
+        session.close()
+
+
 class IndicatorService:
+    # Indicators ta reports as 0.0 (rather than NaN) before their warm-up ends
+    ZERO_PADDED_INDICATORS = {'atr', 'adx', 'di_plus', 'di_minus'}
+    
     def __init__(self,
                  db_session: Session = None,
-                 event_bus = None):
+                 event_bus = None,
+                 database_url: Optional[str] = None):
         self.db_session = db_session
         self.event_bus = event_bus
-        # Repository and normalizer will be injected via DI container
-        self.repository = None  # MarketDataRepository(db_session)
+        # Historical backfill workers open their own connections to this database
+        self.database_url = database_url
+        self.backfill_worker = run_backfill_task
+        # Repository and normalizer will be injected via DI container. The
+        # AsyncMarketDataRepository keeps database round-trips off the event
+        # loop; a sync MarketDataRepository (as in backfill workers) also works
+        self.repository = None
         self.calculator = IndicatorCalculator()
+        self.matrix_calculator = IndicatorMatrixCalculator()
         self.normalizer = None  # BinanceDataNormalizer()
         
         # Configuration
@@ -31,14 +121,72 @@ class IndicatorService:
             'ema_12', 'ema_26', 'atr', 'adx', 'obv', 'vwap'
         ]
         
+        # Anchored VWAPs kept per stream, e.g. ('session', 'week'); reported as
+        # vwap_<anchor> and vwap_std_<anchor> alongside the enabled indicators
+        self.vwap_anchors: Tuple[Anchor, ...] = ()
+        
+        # 'snapshot' publishes one IndicatorSnapshotCalculated per calculation,
+        # 'per_indicator' one IndicatorCalculated per value, 'both' does both
+        # (opt-in for subscribers that still expect per-indicator events)
+        self.event_format = 'snapshot'
+        
+        # Indicator writes are buffered and flushed in bulk on size or age,
+        # keyed by the upsert's conflict key so the newest value per key wins
+        self.write_buffer_size = 500
+        self.write_flush_interval = 5.0  # seconds
+        # Values kept across failed flushes; the oldest are dropped beyond this
+        self.write_buffer_limit = 50000
+        self._write_buffer: Dict[Tuple[str, str, str, datetime], Dict[str, Any]] = {}
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Historical backfills calculate this many streamed candles at a time,
+        # each chunk preceded by the converged lookback of the one before
+        self.backfill_chunk_size = 50000
+        
+        # Optional ParquetIndicatorStore: backfilled series and flushed values
+        # are also written to it, and history reads are served from it
+        self.indicator_store = None
+        
         # Tracking
         self.last_calculation: Dict[str, Dict[str, datetime]] = {}
         self.calculation_tasks: Dict[str, asyncio.Task] = {}
         
+        # Results keyed by (symbol, interval, last candle, indicator set)
+        self.cache = IndicatorCache()
+        
+        # Minimal and converged kline counts per indicator set
+        self._lookback_cache: Dict[Tuple[str, ...], Tuple[int, int]] = {}
+        
+        # Incremental indicator state per (symbol, interval)
+        self.streams: Dict[Tuple[str, str], IncrementalIndicatorSet] = {}
+        
+        # Latest close time per (symbol, interval) confirmed by a closed kline event
+        self.confirmed_closes: Dict[Tuple[str, str], datetime] = {}
+        
+        # Latest closed-candle values of every symbol per interval, for screening
+        self.cross_sections: Dict[str, CrossSection] = {}
+        self.screener = Screener()
+        
+        # Incremental 1m return correlations across symbols; None disables tracking
+        self.correlations: Optional[ReturnCorrelationTracker] = None
+        
+        # Open higher-timeframe candles built from 1m klines
+        self.resampler = CandleResampler(self.calculation_intervals)
+        
+        # Market data events are coalesced per (symbol, interval); set
+        # scheduler.provisional_interval to also refresh open candles
+        self.scheduler = RecalculationScheduler(self._recalculate)
+        
         # Stats
         self.stats = {
             'calculations_performed': 0,
             'events_published': 0,
+            'candles_streamed': 0,
+            'stream_warmups': 0,
+            'indicator_values_written': 0,
+            'write_flushes': 0,
+            'indicator_values_dropped': 0,
             'errors': 0
         }
     
@@ -88,100 +236,557 @@ class IndicatorService:
     async def calculate_and_publish(self, 
                                    symbol: str,
                                    interval: str,
-                                   lookback_periods: int = 200) -> Dict[str, float]:
+                                   lookback_periods: Optional[int] = None) -> Dict[str, float]:
         """
-        Calculate indicators and publish events
+        Advance the incremental indicators with new klines and publish events
         
         Args:
             symbol: Trading pair symbol
             interval: Timeframe for calculation
-            lookback_periods: Number of periods to look back
+            lookback_periods: Klines used to warm up the incremental state
+                (default: the converged lookback of the enabled indicators)
         
         Returns:
             Dictionary of latest indicator values
         """
         try:
-            # Get historical klines from database
-            klines = self.repository.get_klines(
-                symbol=symbol,
-                interval=interval,
-                limit=lookback_periods
-            )
+            # Nothing to recompute if the newest candle is closed and already cached
+            latest_kline = await self._repository_call('get_latest_kline', symbol, interval)
+            if latest_kline is not None:
+                self.cache.advance(symbol, interval, latest_kline.open_time)
+                if self._is_closed(latest_kline, confirmed_close=self.confirmed_closes.get((symbol, interval))):
+                    cached = self.cache.get(symbol, interval, latest_kline.open_time,
+                                            self.enabled_indicators, 'latest')
+                    if cached is not None:
+                        return dict(cached)
             
-            if len(klines) < 50:
-                logger.warning(f"Insufficient data for {symbol} {interval}: {len(klines)} klines")
+            latest_values, latest_time = await self._advance_stream(symbol, interval, lookback_periods)
+            if latest_time is None:
                 return {}
             
-            # Convert to DataFrame
-            kline_data = [
-                {
-                    'open_price': k.open_price,
-                    'high_price': k.high_price,
-                    'low_price': k.low_price,
-                    'close_price': k.close_price,
-                    'volume': k.volume,
-                    'open_time': k.open_time
-                }
-                for k in reversed(klines)  # Reverse to get chronological order
-            ]
-            
-            df = self.calculator.prepare_dataframe(kline_data)
-            
-            # Calculate all indicators
-            indicators = self.calculator.calculate_all_indicators(df)
+            closed = latest_time == self.streams[(symbol, interval)].last_open_time
+            await self._store_and_publish(symbol, interval, latest_values, latest_time, closed)
             
-            # Get latest values
-            latest_values = self.calculator.get_latest_indicators(df)
-            latest_time = df.index[-1]
+            logger.debug(f"Calculated {len(latest_values)} indicators for {symbol} {interval}")
+            return latest_values
             
-            # Store and publish selected indicators
-            for indicator_name in self.enabled_indicators:
-                if indicator_name in latest_values:
-                    value = latest_values[indicator_name]
-                    
-                    # Store in database
-                    indicator_data = {
-                        'symbol': symbol,
-                        'indicator_name': indicator_name,
-                        'timeframe': interval,
-                        'timestamp': latest_time,
-                        'value': value,
-                        'parameters': self._get_indicator_parameters(indicator_name)
+        except Exception as e:
+            logger.error(f"Error calculating indicators for {symbol} {interval}: {e}")
+            self.stats['errors'] += 1
+            raise
+    
+    async def _repository_call(self, method: str, *args, **kwargs) -> Any:
+        """Call a repository method, awaiting it on an async repository"""
+        result = getattr(self.repository, method)(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    
+    async def _candle_batches(self, **kwargs) -> AsyncIterator[Candles]:
+        """The repository's iter_candles batches, from a sync or async iterator"""
+        batches = self.repository.iter_candles(**kwargs)
+        if hasattr(batches, '__aiter__'):
+            async for batch in batches:
+                yield batch
+        else:
+            for batch in batches:
+                yield batch
+    
+    async def _store_and_publish(self,
+                           symbol: str,
+                           interval: str,
+                           latest_values: Dict[str, float],
+                           latest_time: datetime,
+                           closed: bool):
+        """Buffer, publish and cache the latest values of a symbol/interval"""
+        records = {}
+        
+        # Store and publish selected indicators
+        for indicator_name in self.enabled_indicators:
+            if indicator_name in latest_values:
+                value = latest_values[indicator_name]
+                
+                # Store in database
+                indicator_data = {
+                    'symbol': symbol,
+                    'indicator_name': indicator_name,
+                    'timeframe': interval,
+                    'timestamp': latest_time,
+                    'value': value,
+                    'parameters': self._get_indicator_parameters(indicator_name)
+                }
+                
+                # Add additional values for complex indicators
+                if indicator_name == 'macd':
+                    indicator_data['additional_values'] = {
+                        'signal': latest_values.get('macd_signal'),
+                        'histogram': latest_values.get('macd_histogram')
                     }
-                    
-                    # Add additional values for complex indicators
-                    if indicator_name == 'macd':
-                        indicator_data['additional_values'] = {
-                            'signal': latest_values.get('macd_signal'),
-                            'histogram': latest_values.get('macd_histogram')
-                        }
-                    
-                    self.repository.save_indicator_value(indicator_data)
-                    
-                    # Publish event
+                
+                await self._buffer_indicator_value(indicator_data)
+                records[indicator_name] = {
+                    'value': value,
+                    'timestamp': latest_time,
+                    'parameters': indicator_data['parameters'],
+                    'additional': indicator_data.get('additional_values', {})
+                }
+        
+        self._publish_indicators(symbol, interval, latest_values, latest_time, closed)
+        
+        # Update tracking
+        if symbol not in self.last_calculation:
+            self.last_calculation[symbol] = {}
+        self.last_calculation[symbol][interval] = datetime.now()
+        
+        self.stats['calculations_performed'] += 1
+        
+        # Stored rows always reflect the newest candle; values are only
+        # reusable once that candle has closed
+        self.cache.put(symbol, interval, latest_time, self.enabled_indicators, 'records', records)
+        if closed:
+            self.cache.put(symbol, interval, latest_time, self.enabled_indicators,
+                           'latest', dict(latest_values))
+            self._update_cross_section(symbol, interval, latest_values, latest_time)
+    
+    def _update_cross_section(self,
+                              symbol: str,
+                              interval: str,
+                              latest_values: Dict[str, float],
+                              latest_time: datetime):
+        """Record a closed candle's indicator values and OHLCV in the interval's cross-section"""
+        values = dict(latest_values)
+        stream = self.streams.get((symbol, interval))
+        candle = stream.last_candle if stream is not None else None
+        if candle is not None and candle.open_time == latest_time:
+            values.update(open=candle.open, high=candle.high, low=candle.low,
+                          close=candle.close, volume=candle.volume)
+        
+        if interval not in self.cross_sections:
+            self.cross_sections[interval] = CrossSection()
+        self.cross_sections[interval].update(symbol, values, latest_time)
+    
+    def screen(self,
+               interval: str,
+               condition: Optional[str] = None,
+               rank_by: Optional[str] = None,
+               top: Optional[int] = None,
+               ascending: bool = False) -> List[ScreenMatch]:
+        """
+        Screen the in-memory cross-section of an interval
+        
+        Columns are the calculated indicators plus open/high/low/close/volume
+        of each symbol's latest closed candle, e.g.
+        ``screen('1h', 'rsi < 30 and close < bb_lower')`` or
+        ``screen('4h', rank_by='atr / close * 100', top=20)``.
+        The cross-section is filled by ``calculate_universe`` and by live
+        calculations; no database queries are made.
+        
+        Args:
+            interval: Time interval
+            condition: Boolean expression over columns (see core_screener)
+            rank_by: Numeric expression to sort matches by
+            top: Keep only the first N matches
+            ascending: Sort smallest first (default: largest first)
+        
+        Returns:
+            Matching symbols in rank order
+        """
+        section = self.cross_sections.get(interval)
+        if section is None:
+            logger.warning(f"No {interval} cross-section to screen yet")
+            return []
+        
+        return self.screener.screen(section, condition, rank_by=rank_by, top=top, ascending=ascending)
+    
+    def _publish_indicators(self,
+                            symbol: str,
+                            interval: str,
+                            latest_values: Dict[str, float],
+                            latest_time: datetime,
+                            closed: bool):
+        """Publish the values as one snapshot event and/or one event per indicator"""
+        values = {
+            name: float(latest_values[name])
+            for name in self._required_indicators() + self._anchored_outputs() if name in latest_values
+        }
+        if not values:
+            return
+        
+        if self.event_format in ('snapshot', 'both'):
+            self.event_bus.publish(IndicatorSnapshotCalculated(
+                symbol=symbol,
+                interval=interval,
+                timestamp=latest_time,
+                values=values,
+                closed=closed
+            ))
+            self.stats['events_published'] += 1
+        
+        if self.event_format in ('per_indicator', 'both'):
+            for indicator_name in self.enabled_indicators:
+                if indicator_name in values:
                     event = self.normalizer.to_indicator_event(
                         symbol=symbol,
                         indicator_name=indicator_name,
-                        value=value,
+                        value=values[indicator_name],
                         timestamp=latest_time
                     )
                     self.event_bus.publish(event)
                     self.stats['events_published'] += 1
+    
+    async def process_base_klines(self,
+                                  symbol: str,
+                                  lookback_periods: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Advance every calculation interval from newly stored 1m klines
+        
+        Only the first call per symbol reads each interval from storage (to warm
+        up its indicators); afterwards one 1m read per call feeds all intervals
+        through the in-memory resampler.
+        
+        Args:
+            symbol: Trading pair symbol
+            lookback_periods: Klines used to warm up the incremental state
+        
+        Returns:
+            Latest indicator values per interval that changed
+        """
+        lookback_periods = lookback_periods or self.required_lookback()[1]
+        base_key = (symbol, BASE_INTERVAL)
+        base = self.streams.get(base_key)
+        
+        if base is None:
+            results = {}
+            for interval in self.calculation_intervals:
+                results[interval] = await self.calculate_and_publish(symbol, interval, lookback_periods)
+            await self._seed_resampler(symbol)
+            return results
+        
+        klines = await self._repository_call(
+            'get_klines',
+            symbol=symbol,
+            interval=BASE_INTERVAL,
+            start_time=base.last_open_time,
+            limit=lookback_periods
+        )
+        if len(klines) >= lookback_periods:
+            # Fell too far behind to resample reliably; warm every interval up again
+            logger.info(f"Base candle stream for {symbol} is stale, warming up again")
+            for key in [k for k in self.streams if k[0] == symbol]:
+                del self.streams[key]
+            self.resampler.reset(symbol)
+            return await self.process_base_klines(symbol, lookback_periods)
+        
+        now = datetime.now()
+        confirmed_close = self.confirmed_closes.get(base_key)
+        updates: Dict[str, Tuple[Dict[str, float], datetime, bool]] = {}
+        
+        for kline in reversed(klines):
+            if kline.open_time <= base.last_open_time:
+                continue
+            candle = self._kline_to_candle(kline)
+            closed = self._is_closed(kline, now, confirmed_close)
+            
+            if closed:
+                updates[BASE_INTERVAL] = (base.update(candle), kline.open_time, True)
+                self.stats['candles_streamed'] += 1
+                if self.correlations is not None:
+                    self.correlations.add_close(symbol, kline.open_time, candle.close)
+                resampled = self.resampler.add(symbol, candle)
+            else:
+                updates[BASE_INTERVAL] = (base.peek(candle), kline.open_time, False)
+                resampled = self.resampler.preview(symbol, candle)
+            
+            for item in resampled:
+                stream = self.streams.get((symbol, item.interval))
+                open_time = item.candle.open_time
+                if stream is None or (stream.last_open_time is not None and open_time <= stream.last_open_time):
+                    continue  # Not warmed up, or already loaded from storage
+                
+                if item.closed:
+                    values = stream.update(item.candle)
+                    self.stats['candles_streamed'] += 1
+                else:
+                    values = stream.peek(item.candle)
+                updates[item.interval] = (values, open_time, item.closed)
+        
+        results = {}
+        for interval, (values, open_time, closed) in updates.items():
+            self.on_kline_ingested(symbol, interval, open_time)
+            await self._store_and_publish(symbol, interval, values, open_time, closed)
+            results[interval] = values
+        
+        return results
+    
+    async def _seed_resampler(self, symbol: str):
+        """Load the 1m klines of the currently open higher-timeframe buckets"""
+        base = self.streams.get((symbol, BASE_INTERVAL))
+        if base is None or base.last_open_time is None or not self.resampler.intervals:
+            return
+        
+        last_ms = to_epoch_ms(base.last_open_time)
+        start_ms = min(bucket_start(last_ms, interval) for interval in self.resampler.intervals)
+        klines = await self._repository_call(
+            'get_klines',
+            symbol=symbol,
+            interval=BASE_INTERVAL,
+            start_time=datetime.fromtimestamp(start_ms / 1000),
+            end_time=base.last_open_time,
+            limit=None
+        )
+        
+        for kline in sorted(klines, key=lambda k: k.open_time):
+            if kline.open_time <= base.last_open_time:
+                self.resampler.add(symbol, self._kline_to_candle(kline))
+    
+    async def _new_stream(self, symbol: str, interval: str, first_open_time: datetime) -> IncrementalIndicatorSet:
+        """
+        Fresh indicator state for a warm-up starting at ``first_open_time``
+        
+        Anchored VWAPs are seeded with the klines between their anchor and
+        the warm-up window (one range read), so they report from the start.
+        """
+        anchors = [validate_anchor(anchor) for anchor in self.vwap_anchors]
+        stream = IncrementalIndicatorSet({anchor_name(anchor): AnchoredVWAP(anchor) for anchor in anchors})
+        if not anchors or interval not in INTERVAL_MS:
+            return stream
+        
+        first_ms = to_epoch_ms(first_open_time)
+        starts = [start for start in (anchor_start_ms(first_ms, anchor) for anchor in anchors)
+                  if start is not None and start < first_ms]
+        if not starts:
+            return stream
+        
+        # One candle before the anchor marks its period as seen from the start
+        seed_start = datetime.fromtimestamp((min(starts) - INTERVAL_MS[interval]) / 1000)
+        klines = await self._repository_call(
+            'get_klines',
+            symbol=symbol,
+            interval=interval,
+            start_time=seed_start,
+            end_time=first_open_time,
+            limit=None
+        )
+        for kline in sorted(klines, key=lambda k: k.open_time):
+            if kline.open_time < first_open_time:
+                stream.seed_extras(self._kline_to_candle(kline))
+        return stream
+    
+    def _anchored_outputs(self) -> List[str]:
+        names = [anchor_name(anchor) for anchor in self.vwap_anchors]
+        return [f'vwap_{name}' for name in names] + [f'vwap_std_{name}' for name in names]
+    
+    @staticmethod
+    def _kline_to_candle(kline: Any) -> Candle:
+        return Candle(
+            open=float(kline.open_price),
+            high=float(kline.high_price),
+            low=float(kline.low_price),
+            close=float(kline.close_price),
+            volume=float(kline.volume),
+            open_time=kline.open_time
+        )
+    
+    async def _advance_stream(self,
+                        symbol: str,
+                        interval: str,
+                        lookback_periods: Optional[int]) -> Tuple[Dict[str, float], Optional[datetime]]:
+        """
+        Feed klines not yet seen into the incremental indicator state
+        
+        The first call warms the state up from ``lookback_periods`` klines;
+        afterwards only klines newer than the last closed one are read. Closed
+        klines advance the state, the still-open kline is only peeked.
+        
+        Returns:
+            Latest indicator values and the open time they refer to
+        """
+        minimum, converged = self.required_lookback()
+        lookback_periods = lookback_periods or converged
+        key = (symbol, interval)
+        stream = self.streams.get(key)
+        
+        if stream is None:
+            klines = await self._repository_call(
+                'get_klines',
+                symbol=symbol,
+                interval=interval,
+                limit=lookback_periods
+            )
             
-            # Update tracking
-            if symbol not in self.last_calculation:
-                self.last_calculation[symbol] = {}
-            self.last_calculation[symbol][interval] = datetime.now()
+            if len(klines) < minimum:
+                logger.warning(f"Insufficient data for {symbol} {interval}: {len(klines)} klines, {minimum} needed")
+                return {}, None
+            if len(klines) < converged:
+                logger.warning(
+                    f"Warming up {symbol} {interval} from {len(klines)} klines; "
+                    f"recursive indicators need {converged} to converge"
+                )
             
-            self.stats['calculations_performed'] += 1
+            new_klines = list(reversed(klines))  # Reverse to get chronological order
+            stream = await self._new_stream(symbol, interval, new_klines[0].open_time)
+            self.stats['stream_warmups'] += 1
+        else:
+            klines = await self._repository_call(
+                'get_klines',
+                symbol=symbol,
+                interval=interval,
+                start_time=stream.last_open_time,
+                limit=lookback_periods
+            )
+            new_klines = [k for k in reversed(klines) if k.open_time > stream.last_open_time]
             
-            logger.debug(f"Calculated {len(latest_values)} indicators for {symbol} {interval}")
-            return latest_values
+            if len(klines) >= lookback_periods:
+                # Fell too far behind to know nothing was skipped; rebuild the state
+                logger.info(f"Indicator stream for {symbol} {interval} is stale, warming up again")
+                del self.streams[key]
+                return await self._advance_stream(symbol, interval, lookback_periods)
+        
+        now = datetime.now()
+        confirmed_close = self.confirmed_closes.get(key)
+        latest_values: Dict[str, float] = {}
+        latest_time = stream.last_open_time
+        
+        for kline in new_klines:
+            candle = self._kline_to_candle(kline)
             
+            if not self._is_closed(kline, now, confirmed_close):
+                latest_values = stream.peek(candle)
+            else:
+                latest_values = stream.update(candle)
+                self.stats['candles_streamed'] += 1
+            latest_time = kline.open_time
+        
+        self.streams[key] = stream
+        
+        if not new_klines:
+            # Nothing new since the last closed candle: report its values again
+            latest_values = stream.latest_values
+        
+        return latest_values, latest_time
+    
+    @staticmethod
+    def _is_closed(kline: Any,
+                   now: Optional[datetime] = None,
+                   confirmed_close: Optional[datetime] = None) -> bool:
+        """
+        Whether a kline's candle is final and may be committed to the streams
+        
+        The exchange's closed flag (``is_closed``) decides when the kline has
+        one. Rows without it are final once a closed kline event confirmed
+        their close time (``confirmed_close``), or once that close time is
+        ``KLINE_SETTLE_TIME`` in the past; until then they are only peeked
+        and re-read on the next pass.
+        """
+        is_closed = getattr(kline, 'is_closed', None)
+        if is_closed is not None:
+            return bool(is_closed)
+        if kline.close_time is None:
+            return True
+        if confirmed_close is not None and kline.close_time <= confirmed_close:
+            return True
+        return kline.close_time + KLINE_SETTLE_TIME <= (now or datetime.now())
+    
+    def on_kline_ingested(self, symbol: str, interval: str, open_time: datetime):
+        """
+        Notify the service of a newly stored kline
+        
+        Cached results for older candles of the symbol/interval are dropped.
+        Called for closed kline events and for every candle streamed through
+        process_base_klines.
+        """
+        self.cache.advance(symbol, interval, open_time)
+    
+    async def _buffer_indicator_value(self, indicator_data: Dict[str, Any]):
+        """Queue an indicator value for the next bulk write, replacing a queued value of the same key"""
+        key = (indicator_data['symbol'], indicator_data['indicator_name'],
+               indicator_data['timeframe'], indicator_data['timestamp'])
+        self._write_buffer.pop(key, None)  # re-queue at the end, as the newest value
+        self._write_buffer[key] = indicator_data
+        
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._periodic_flush())
+            except RuntimeError:
+                pass  # No running loop: only the size and age checks below apply
+        
+        if (len(self._write_buffer) >= self.write_buffer_size or
+                time.monotonic() - self._last_flush >= self.write_flush_interval):
+            await self.flush_indicator_values()
+    
+    async def flush_indicator_values(self) -> int:
+        """
+        Write all buffered indicator values with one bulk upsert
+        
+        Returns:
+            Number of values written
+        """
+        self._last_flush = time.monotonic()
+        if not self._write_buffer:
+            return 0
+        
+        pending, self._write_buffer = self._write_buffer, {}
+        batch = list(pending.values())
+        try:
+            written = await self._repository_call('bulk_save_indicator_values', batch,
+                                                  batch_size=self.write_buffer_size)
         except Exception as e:
-            logger.error(f"Error calculating indicators for {symbol} {interval}: {e}")
+            logger.error(f"Error flushing {len(batch)} indicator values: {e}")
             self.stats['errors'] += 1
+            # Keep the values for the next attempt; values queued meanwhile are newer
+            pending.update(self._write_buffer)
+            self._write_buffer = pending
+            self._trim_write_buffer()
             raise
+        
+        self.stats['indicator_values_written'] += written
+        self.stats['write_flushes'] += 1
+        self._archive_indicator_values(batch)
+        return written
+    
+    def _trim_write_buffer(self):
+        """Drop the oldest buffered values beyond write_buffer_limit"""
+        excess = len(self._write_buffer) - self.write_buffer_limit
+        if excess <= 0:
+            return
+        
+        for key in list(self._write_buffer)[:excess]:
+            del self._write_buffer[key]
+        self.stats['indicator_values_dropped'] += excess
+        logger.warning(f"Indicator write buffer full; dropped the {excess} oldest values")
+    
+    def _archive_indicator_values(self, values: List[Dict[str, Any]]):
+        """Write indicator values to the Parquet store, if one is configured"""
+        if self.indicator_store is None:
+            return
+        
+        rows_by_stream: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for row in pivot_indicator_values(values):
+            rows_by_stream.setdefault((row['symbol'], row['timeframe']), []).append(row)
+        
+        for (symbol, timeframe), rows in rows_by_stream.items():
+            names = sorted({name for row in rows for name in row if name in INDICATOR_COLUMNS})
+            rows.sort(key=lambda row: row['timestamp'])
+            frame = IndicatorFrame.from_rows(symbol, timeframe,
+                                             [(row['timestamp'], *[row.get(n) for n in names]) for row in rows],
+                                             names)
+            try:
+                self.indicator_store.write(frame)
+            except Exception as e:
+                logger.error(f"Error writing {symbol} {timeframe} indicators to the Parquet store: {e}")
+                self.stats['errors'] += 1
+    
+    async def _periodic_flush(self):
+        """Flush values that have waited longer than the flush interval"""
+        while True:
+            try:
+                await asyncio.sleep(self.write_flush_interval)
+                if time.monotonic() - self._last_flush >= self.write_flush_interval:
+                    await self.flush_indicator_values()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in periodic indicator flush: {e}")
     
     async def calculate_on_new_data(self, market_data_event: Any):
         """
@@ -192,23 +797,32 @@ class IndicatorService:
         """
         try:
             symbol = market_data_event.symbol
+            timestamp = getattr(market_data_event, 'timestamp', None)
+            closed = getattr(market_data_event, 'is_closed', None)
             
-            # Check if we should calculate (e.g., every minute)
-            if symbol in self.last_calculation:
-                for interval in ['1m', '5m', '15m']:
-                    last_calc = self.last_calculation[symbol].get(interval)
-                    if not last_calc or (datetime.now() - last_calc).seconds > 60:
-                        await self.calculate_and_publish(symbol, interval)
-            else:
-                # First calculation for this symbol
-                for interval in ['1m', '5m', '15m']:
-                    await self.calculate_and_publish(symbol, interval)
+            if closed and timestamp is not None:
+                # Kline events are stamped with the candle's close time
+                key = (symbol, BASE_INTERVAL)
+                self.confirmed_closes[key] = max(timestamp, self.confirmed_closes.get(key, timestamp))
+                open_time = getattr(market_data_event, 'open_time', None) or timestamp.replace(second=0, microsecond=0)
+                self.on_kline_ingested(symbol, BASE_INTERVAL, open_time)
+            
+            # Bursts of trade/ticker events collapse into one recalculation per
+            # closed 1m candle; higher timeframes are resampled from the same read
+            self.scheduler.submit(symbol, BASE_INTERVAL, timestamp, closed)
                     
         except Exception as e:
             logger.error(f"Error in calculate_on_new_data: {e}")
             self.stats['errors'] += 1
     
-    def get_latest_indicators(self, 
+    async def _recalculate(self, symbol: str, interval: str):
+        """Scheduler handler: advance one symbol/interval"""
+        if interval == BASE_INTERVAL:
+            await self.process_base_klines(symbol)
+        else:
+            await self.calculate_and_publish(symbol, interval)
+    
+    async def get_latest_indicators(self, 
                             symbol: str,
                             timeframe: str = '1m') -> Dict[str, Any]:
         """
@@ -222,30 +836,54 @@ class IndicatorService:
             Dictionary of latest indicator values
         """
         try:
+            head = self.cache.head(symbol, timeframe)
+            cached = self.cache.get(symbol, timeframe, head, self.enabled_indicators, 'records')
+            if cached is not None:
+                return dict(cached)
+            
+            # Buffered values are newer than anything stored
+            await self.flush_indicator_values()
+            
+            # One read of the newest wide row covers every enabled indicator
+            frame = await self._repository_call(
+                'get_indicator_frame',
+                symbol=symbol,
+                timeframe=timeframe,
+                indicator_names=self._required_indicators(),
+                limit=1
+            )
+            latest = frame.latest()
+            
             latest_indicators = {}
             
             for indicator_name in self.enabled_indicators:
-                indicator = self.repository.get_latest_indicator(
-                    symbol=symbol,
-                    indicator_name=indicator_name,
-                    timeframe=timeframe
-                )
-                
-                if indicator:
+                if indicator_name in latest:
+                    value, timestamp = latest[indicator_name]
+                    additional = {}
+                    if indicator_name == 'macd':
+                        additional = {
+                            'signal': latest.get('macd_signal', (None,))[0],
+                            'histogram': latest.get('macd_histogram', (None,))[0]
+                        }
+                    
                     latest_indicators[indicator_name] = {
-                        'value': indicator.value,
-                        'timestamp': indicator.timestamp,
-                        'parameters': indicator.parameters_dict,
-                        'additional': indicator.additional_values_dict
+                        'value': value,
+                        'timestamp': timestamp,
+                        'parameters': self._get_indicator_parameters(indicator_name),
+                        'additional': additional
                     }
             
+            if latest_indicators:
+                newest = max(ind['timestamp'] for ind in latest_indicators.values())
+                self.cache.put(symbol, timeframe, newest, self.enabled_indicators, 'records', latest_indicators)
+            
             return latest_indicators
             
         except Exception as e:
             logger.error(f"Error getting latest indicators: {e}")
             return {}
     
-    def get_indicator_history(self,
+    async def get_indicator_history(self,
                             symbol: str,
                             indicator_name: str,
                             timeframe: str = '1m',
@@ -263,27 +901,79 @@ class IndicatorService:
             List of indicator values
         """
         try:
-            indicators = self.repository.get_indicator_values(
-                symbol=symbol,
-                indicator_name=indicator_name,
-                timeframe=timeframe,
-                limit=periods
-            )
+            field = ('history', indicator_name, periods)
+            head = self.cache.head(symbol, timeframe)
+            cached = self.cache.get(symbol, timeframe, head, self.enabled_indicators, field)
+            if cached is not None:
+                return list(cached)
+            
+            await self.flush_indicator_values()
+            
+            if self.indicator_store is not None:
+                names = [indicator_name, *ADDITIONAL_COLUMNS.get(indicator_name, {}).values()]
+                frame = self.indicator_store.read_tail(symbol, timeframe, periods, names, require=indicator_name)
+                indicators = list(reversed(frame.readings(indicator_name)))
+            else:
+                indicators = await self._repository_call(
+                    'get_indicator_values',
+                    symbol=symbol,
+                    indicator_name=indicator_name,
+                    timeframe=timeframe,
+                    limit=periods
+                )
             
-            return [
+            history = [
                 {
                     'timestamp': ind.timestamp,
                     'value': ind.value,
-                    'parameters': ind.parameters_dict,
+                    'parameters': ind.parameters_dict or self._get_indicator_parameters(indicator_name),
                     'additional': ind.additional_values_dict
                 }
                 for ind in reversed(indicators)  # Return in chronological order
             ]
             
+            if history:
+                self.cache.put(symbol, timeframe, history[-1]['timestamp'], self.enabled_indicators, field, history)
+            
+            return history
+            
         except Exception as e:
             logger.error(f"Error getting indicator history: {e}")
             return []
     
+    def required_lookback(self, indicators: Optional[List[str]] = None) -> Tuple[int, int]:
+        """
+        Kline counts an indicator set needs, from the registry's warm-up declarations
+        
+        Args:
+            indicators: Calculator outputs (default: those the enabled indicators need)
+        
+        Returns:
+            (klines before every indicator has a value,
+             klines after which recursive indicators have converged)
+        """
+        names = self._required_indicators() if indicators is None else list(indicators)
+        key = tuple(sorted(names))
+        
+        if key not in self._lookback_cache:
+            graph = self.calculator.graph
+            cumulative = graph.path_dependent(names)
+            if cumulative:
+                logger.warning(
+                    f"Indicators {cumulative} accumulate over the loaded history; "
+                    f"no lookback makes their values converge"
+                )
+            self._lookback_cache[key] = (graph.warmup_bars(names), graph.lookback_bars(names))
+        
+        return self._lookback_cache[key]
+    
+    def _required_indicators(self) -> List[str]:
+        """Calculator outputs needed to store the enabled indicators"""
+        required = list(self.enabled_indicators)
+        if 'macd' in required:
+            required += ['macd_signal', 'macd_histogram']
+        return required
+    
     def _get_indicator_parameters(self, indicator_name: str) -> Dict[str, Any]:
         """Get default parameters for an indicator"""
         parameters = {
@@ -308,6 +998,9 @@ class IndicatorService:
         """Get service statistics"""
         return {
             **self.stats,
+            'cache': self.cache.get_stats(),
+            'scheduler': self.scheduler.get_stats(),
+            'correlations': self.correlations.get_stats() if self.correlations is not None else None,
             'active_calculations': list(self.calculation_tasks.keys()),
             'last_calculations': {
                 symbol: {
@@ -334,7 +1027,7 @@ class IndicatorService:
             start_date: Start date for calculations
             end_date: End date (default: now)
             batch_size: Number of candles to process at once
-            parallel_workers: Number of parallel calculation workers
+            parallel_workers: Number of worker processes (each opens its own DB connection)
             
         Returns:
             Calculation statistics
@@ -356,36 +1049,69 @@ class IndicatorService:
                     'end_date': end_date
                 })
         
-        # Process with worker pool
-        semaphore = asyncio.Semaphore(parallel_workers)
+        # Process with worker pool: one process per worker, each with its own DB connection
         results = []
+        loop = asyncio.get_running_loop()
+        
+        if self.database_url is None:
+            # Workers cannot reach the database without a URL; fall back to this process
+            logger.warning("No database_url configured; calculating indicators in-process")
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=max(1, parallel_workers),
+                initializer=_init_backfill_worker,
+                initargs=(self.database_url, self.indicator_store)
+            )
         
-        async def calculate_with_semaphore(task):
-            async with semaphore:
-                return await self._batch_calculate_single(
-                    task['symbol'],
-                    task['interval'],
-                    task['start_date'],
-                    task['end_date'],
-                    batch_size
+        async def run_task(task):
+            try:
+                if executor is None:
+                    return await self._batch_calculate_single(
+                        task['symbol'],
+                        task['interval'],
+                        task['start_date'],
+                        task['end_date'],
+                        batch_size
+                    )
+                return await loop.run_in_executor(
+                    executor,
+                    self.backfill_worker,
+                    task,
+                    batch_size,
+                    list(self.enabled_indicators)
                 )
+            except Exception as e:
+                # Includes worker processes that died with their task
+                logger.error(f"Backfill worker failed for {task['symbol']} {task['interval']}: {e}")
+                return {
+                    'success': False,
+                    'symbol': task['symbol'],
+                    'interval': task['interval'],
+                    'error': str(e),
+                    'indicators_calculated': 0
+                }
         
         # Execute calculations
         from tqdm.asyncio import tqdm
         
-        with tqdm(total=total_tasks, desc="Calculating indicators") as pbar:
-            tasks = [calculate_with_semaphore(task) for task in calc_tasks]
-            
-            for future in asyncio.as_completed(tasks):
-                result = await future
-                results.append(result)
-                pbar.update(1)
+        try:
+            with tqdm(total=total_tasks, desc="Calculating indicators") as pbar:
+                futures = [run_task(task) for task in calc_tasks]
                 
-                if result['success']:
-                    pbar.set_description(
-                        f"Calculated {result['symbol']} {result['interval']} "
-                        f"({result['indicators_calculated']} indicators)"
-                    )
+                for future in asyncio.as_completed(futures):
+                    result = await future
+                    results.append(result)
+                    pbar.update(1)
+                    
+                    if result['success']:
+                        pbar.set_description(
+                            f"Calculated {result['symbol']} {result['interval']} "
+                            f"({result['indicators_calculated']} indicators)"
+                        )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
         
         # Compile statistics
         successful = [r for r in results if r['success']]
@@ -411,6 +1137,88 @@ class IndicatorService:
         
         return stats
     
+    async def calculate_universe(self,
+                                 symbols: List[str],
+                                 interval: str,
+                                 lookback_periods: Optional[int] = None,
+                                 save: bool = True) -> Dict[str, Dict[str, float]]:
+        """
+        Refresh indicators for a whole symbol universe in one vectorized pass
+        
+        Klines of all symbols are read with one query, aligned into
+        (time x symbol) matrices and every indicator is computed across all
+        columns at once. Symbols listed later than others simply have NaN rows
+        before their first candle.
+        
+        Args:
+            symbols: Trading symbols
+            interval: Time interval
+            lookback_periods: Klines loaded per symbol (default: the converged
+                lookback of the enabled indicators)
+            save: Store the latest enabled indicator values
+            
+        Returns:
+            Latest indicator values per symbol
+        """
+        start_time = time.time()
+        
+        minimum, converged = self.required_lookback()
+        lookback_periods = lookback_periods or converged
+        
+        arrays_by_symbol = await self._repository_call('get_ohlcv_arrays_multi', symbols=list(symbols),
+                                                       interval=interval, limit=lookback_periods)
+        klines_by_symbol = {}
+        for symbol in symbols:
+            arrays = arrays_by_symbol[symbol]
+            if len(arrays['open_time']) < minimum:
+                logger.warning(f"Insufficient data for {symbol} {interval}: {len(arrays['open_time'])} klines")
+                continue
+            klines_by_symbol[symbol] = arrays
+        
+        if not klines_by_symbol:
+            return {}
+        
+        times, matrix_symbols, columns = build_ohlcv_matrix(klines_by_symbol)
+        matrices = self.matrix_calculator.calculate(columns, self._required_indicators())
+        latest = self.matrix_calculator.latest(matrices, matrix_symbols)
+        self.cross_sections[interval] = CrossSection.from_matrices(matrix_symbols, {**columns, **matrices}, times)
+        
+        if save:
+            for symbol in matrix_symbols:
+                latest_time = klines_by_symbol[symbol]['open_time'][-1].astype('datetime64[us]').item()
+                values = latest[symbol]
+                
+                for indicator_name in self.enabled_indicators:
+                    if indicator_name not in values:
+                        continue
+                    
+                    indicator_data = {
+                        'symbol': symbol,
+                        'indicator_name': indicator_name,
+                        'timeframe': interval,
+                        'timestamp': latest_time,
+                        'value': values[indicator_name],
+                        'parameters': self._get_indicator_parameters(indicator_name)
+                    }
+                    
+                    if indicator_name == 'macd':
+                        indicator_data['additional_values'] = {
+                            'signal': values.get('macd_signal'),
+                            'histogram': values.get('macd_histogram')
+                        }
+                    
+                    await self._buffer_indicator_value(indicator_data)
+            
+            await self.flush_indicator_values()
+        
+        self.stats['calculations_performed'] += len(matrix_symbols)
+        logger.info(
+            f"Calculated {interval} indicators for {len(matrix_symbols)} symbols "
+            f"({len(times)} candles) in {time.time() - start_time:.2f}s"
+        )
+        
+        return latest
+    
     async def _batch_calculate_single(self,
                                      symbol: str,
                                      interval: str,
@@ -418,44 +1226,55 @@ class IndicatorService:
                                      end_date: datetime,
                                      batch_size: int) -> Dict[str, Any]:
         """
-        Calculate indicators for a single symbol/interval in batches
+        Backfill indicators for a single symbol/interval, chunk by chunk
+        
+        The range is streamed in chunks of ``backfill_chunk_size`` candles.
+        Each chunk is calculated with the converged lookback of the previous
+        one prepended, so every candle gets the value a single pass would give
+        it (within the convergence tolerance) while memory stays bounded by
+        one chunk. Cumulative indicators (OBV, VWAP) continue from the
+        previous chunk's totals. Existing rows are read with one range query
+        per chunk and only missing values are written, with bulk upserts.
         
         Args:
             symbol: Trading symbol
             interval: Time interval
             start_date: Start date
             end_date: End date
-            batch_size: Batch size for processing
+            batch_size: Rows per bulk upsert
             
         Returns:
             Calculation result
         """
-        import time
         start_time = time.time()
+        warmup, overlap = self.required_lookback()
         
         try:
-            # Get all klines for the period
-            all_klines = []
-            current_start = start_date
+            pending = Candles.empty(symbol, interval)
+            calculated = 0  # Leading candles of pending already calculated (the lookback)
+            totals: Dict[str, float] = {}
+            klines_processed = 0
+            indicators_saved = 0
             
-            while current_start < end_date:
-                batch_end = min(current_start + timedelta(days=30), end_date)
-                
-                klines = self.repository.get_klines(
-                    symbol=symbol,
-                    interval=interval,
-                    start_time=current_start,
-                    end_time=batch_end,
-                    limit=batch_size * 10  # Get more at once
-                )
-                
-                if klines:
-                    all_klines.extend(klines)
+            async for batch in self._candle_batches(
+                symbol=symbol,
+                interval=interval,
+                start_time=start_date,
+                end_time=end_date,
+                batch_size=self.backfill_chunk_size
+            ):
+                pending = Candles.concat([pending, batch])
+                if len(pending) < max(warmup, calculated + 1):
+                    continue
                 
-                current_start = batch_end
+                indicators_saved += await self._backfill_chunk(symbol, interval, pending, calculated,
+                                                               totals, batch_size)
+                klines_processed += len(pending) - calculated
+                pending = pending.tail(overlap)
+                calculated = len(pending)
             
-            if len(all_klines) < 50:
-                logger.warning(f"Insufficient data for {symbol} {interval}: {len(all_klines)} klines")
+            if klines_processed == 0:
+                logger.warning(f"Insufficient data for {symbol} {interval}: {len(pending)} klines")
                 return {
                     'success': False,
                     'symbol': symbol,
@@ -464,76 +1283,6 @@ class IndicatorService:
                     'indicators_calculated': 0
                 }
             
-            # Sort by time
-            all_klines.sort(key=lambda k: k.open_time)
-            
-            # Process in sliding windows for efficient calculation
-            indicators_saved = 0
-            window_size = min(1000, len(all_klines))  # Use last 1000 candles for calculation
-            step_size = 100  # Calculate every 100 candles
-            
-            for i in range(window_size, len(all_klines) + 1, step_size):
-                window_klines = all_klines[max(0, i - window_size):i]
-                
-                # Convert to DataFrame
-                kline_data = [
-                    {
-                        'open_price': k.open_price,
-                        'high_price': k.high_price,
-                        'low_price': k.low_price,
-                        'close_price': k.close_price,
-                        'volume': k.volume,
-                        'open_time': k.open_time
-                    }
-                    for k in window_klines
-                ]
-                
-                df = self.calculator.prepare_dataframe(kline_data)
-                
-                # Calculate indicators
-                indicators = self.calculator.calculate_all_indicators(df)
-                
-                # Save the latest values for this batch
-                latest_time = df.index[-1]
-                latest_values = self.calculator.get_latest_indicators(df)
-                
-                for indicator_name in self.enabled_indicators:
-                    if indicator_name in latest_values:
-                        value = latest_values[indicator_name]
-                        
-                        # Check if this indicator already exists
-                        existing = self.repository.get_indicator_values(
-                            symbol=symbol,
-                            indicator_name=indicator_name,
-                            timeframe=interval,
-                            start_time=latest_time,
-                            limit=1
-                        )
-                        
-                        if not existing or existing[0].timestamp != latest_time:
-                            # Save indicator
-                            indicator_data = {
-                                'symbol': symbol,
-                                'indicator_name': indicator_name,
-                                'timeframe': interval,
-                                'timestamp': latest_time,
-                                'value': value,
-                                'parameters': self._get_indicator_parameters(indicator_name)
-                            }
-                            
-                            # Add additional values for complex indicators
-                            if indicator_name == 'macd':
-                                indicator_data['additional_values'] = {
-                                    'signal': latest_values.get('macd_signal'),
-                                    'histogram': latest_values.get('macd_histogram')
-                                }
-                            
-                            self.repository.save_indicator_value(indicator_data)
-                            indicators_saved += 1
-            
-            # Commit all indicators
-            self.db_session.commit()
-            
             calculation_time = time.time() - start_time
             
             logger.debug(f"Calculated {indicators_saved} indicators for {symbol} {interval} in {calculation_time:.2f}s")
@@ -543,7 +1292,7 @@ class IndicatorService:
                 'symbol': symbol,
                 'interval': interval,
                 'indicators_calculated': indicators_saved,
-                'klines_processed': len(all_klines),
+                'klines_processed': klines_processed,
                 'calculation_time': calculation_time
             }
             
@@ -558,6 +1307,151 @@ class IndicatorService:
                 'calculation_time': time.time() - start_time
             }
     
+    async def _backfill_chunk(self,
+                              symbol: str,
+                              interval: str,
+                              candles: Candles,
+                              skip: int,
+                              totals: Dict[str, float],
+                              batch_size: int) -> int:
+        """
+        Calculate one backfill chunk and write the values of its new candles
+        
+        Args:
+            symbol: Trading symbol
+            interval: Time interval
+            candles: Lookback candles followed by the new ones
+            skip: Number of leading lookback candles, already written
+            totals: Running sums of the cumulative indicators, updated in place
+            batch_size: Rows per bulk upsert
+        
+        Returns:
+            Number of values written
+        """
+        indicators = self.calculator.calculate_all_indicators(candles, self._required_indicators())
+        values = {name: self._defined_values(name, series) for name, series in indicators.items()}
+        self._continue_cumulative(values, candles, skip, totals)
+        values = {name: series[skip:] for name, series in values.items()}
+        
+        open_times = candles['open_time'][skip:].astype('datetime64[us]')
+        timestamps = open_times.tolist()
+        existing = await self._repository_call(
+            'get_indicator_timestamps',
+            symbol=symbol,
+            timeframe=interval,
+            start_time=timestamps[0],
+            end_time=timestamps[-1],
+            indicator_names=self.enabled_indicators
+        )
+        
+        rows = self._indicator_rows(symbol, interval, timestamps, values, existing)
+        saved = await self._repository_call('bulk_save_indicator_values', rows, batch_size=batch_size)
+        
+        if self.indicator_store is not None:
+            names = [n for n in self._required_indicators() if n in INDICATOR_COLUMNS and n in values]
+            self.indicator_store.write(IndicatorFrame(
+                symbol=symbol,
+                timeframe=interval,
+                timestamps=open_times,
+                columns={name: values[name] for name in names}
+            ))
+        
+        return saved
+    
+    @staticmethod
+    def _continue_cumulative(values: Dict[str, np.ndarray],
+                             candles: Candles,
+                             skip: int,
+                             totals: Dict[str, float]):
+        """
+        Rebase OBV and VWAP of a chunk onto the totals of the candles before it
+        
+        Both accumulate from the first candle they see, so a chunk's own series
+        restart inside its lookback. The first ``skip`` candles are the end of
+        the previous chunk, whose totals continue through the new candles.
+        """
+        volume = np.nan_to_num(candles['volume'])
+        typical = (candles['high'] + candles['low'] + candles['close']) / 3.0
+        cum_volume = np.cumsum(volume)
+        cum_pv = np.cumsum(np.nan_to_num(typical * volume))
+        
+        # Totals of everything before this chunk's first candle
+        base_volume = totals.get('volume', 0.0) - (cum_volume[skip - 1] if skip else 0.0)
+        base_pv = totals.get('pv', 0.0) - (cum_pv[skip - 1] if skip else 0.0)
+        
+        if skip and 'obv' in values:
+            values['obv'] += totals['obv'] - values['obv'][skip - 1]
+        if skip and 'vwap' in values:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values['vwap'] = np.where(base_volume + cum_volume != 0,
+                                          (base_pv + cum_pv) / (base_volume + cum_volume), np.nan)
+        
+        if 'obv' in values:
+            totals['obv'] = float(values['obv'][-1])
+        totals['volume'] = float(base_volume + cum_volume[-1])
+        totals['pv'] = float(base_pv + cum_pv[-1])
+    
+    def _indicator_rows(self,
+                        symbol: str,
+                        interval: str,
+                        timestamps: List[datetime],
+                        indicators: Dict[str, Any],
+                        existing: set) -> List[Dict[str, Any]]:
+        """
+        Rows for every candle with a defined value that is not stored yet
+        
+        ta pads some indicators with zeros during warm-up; those leading zeros
+        are not real values and are skipped like NaNs.
+        """
+        macd_signal = indicators.get('macd_signal')
+        macd_histogram = indicators.get('macd_histogram')
+        if macd_signal is not None:
+            macd_signal = np.asarray(macd_signal, dtype=float)
+        if macd_histogram is not None:
+            macd_histogram = np.asarray(macd_histogram, dtype=float)
+        rows = []
+        
+        for indicator_name in self.enabled_indicators:
+            series = indicators.get(indicator_name)
+            if series is None:
+                continue
+            
+            values = self._defined_values(indicator_name, series)
+            defined = ~np.isnan(values)
+            
+            parameters = self._get_indicator_parameters(indicator_name)
+            
+            for i in np.flatnonzero(defined):
+                timestamp = timestamps[i]
+                if (indicator_name, timestamp) in existing:
+                    continue
+                
+                row = {
+                    'symbol': symbol,
+                    'indicator_name': indicator_name,
+                    'timeframe': interval,
+                    'timestamp': timestamp,
+                    'value': float(values[i]),
+                    'parameters': parameters
+                }
+                
+                if indicator_name == 'macd':
+                    row['additional_values'] = {
+                        'signal': float(macd_signal[i]) if macd_signal is not None else None,
+                        'histogram': float(macd_histogram[i]) if macd_histogram is not None else None
+                    }
+                
+                rows.append(row)
+        
+        return rows
+    
+    def _defined_values(self, indicator_name: str, series: Any) -> np.ndarray:
+        """A calculated series as floats, with the warm-up zeros ta pads some indicators with as NaN"""
+        values = np.array(series, dtype=np.float64)
+        if indicator_name in self.ZERO_PADDED_INDICATORS:
+            values[np.logical_and.accumulate(values == 0)] = np.nan
+        return values
+    
     async def recalculate_all_indicators(self,
                                         symbol: str,
                                         interval: str,
@@ -577,17 +1471,8 @@ class IndicatorService:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=lookback_days)
             
-            # Delete existing indicators in this range
-            from ..persistence.postgres.market_data_tables import IndicatorValue
-            
-            deleted = self.db_session.query(IndicatorValue).filter(
-                IndicatorValue.symbol == symbol,
-                IndicatorValue.timeframe == interval,
-                IndicatorValue.timestamp >= start_date,
-                IndicatorValue.timestamp <= end_date
-            ).delete()
-            
-            self.db_session.commit()
+            # Delete existing indicators in this range from the narrow and wide tables
+            deleted = await self._repository_call('delete_indicator_values', symbol, interval, start_date, end_date)
             
             logger.info(f"Deleted {deleted} existing indicators for {symbol} {interval}")
             
@@ -617,4 +1502,13 @@ class IndicatorService:
             await asyncio.gather(*self.calculation_tasks.values(), return_exceptions=True)
         
         self.calculation_tasks.clear()
+        
+        await self.scheduler.stop()
+        
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush_indicator_values()
+        
         logger.info(f"Indicator service stopped. Stats: {self.stats}")
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Indicator Recalculation Scheduler
+
+Turns a stream of market data events into at most one pending recalculation
+per (symbol, interval).
+
+- An event carrying the kline's closed flag decides closure: a closed kline
+  is recalculated right away, an open one only provisionally. Once a key has
+  seen the flag, events without one (trades, tickers) never close its candle
+- For keys without flagged events, an event whose timestamp falls in a later
+  candle than the previous event means the previous candle closed
+- Other events only trigger provisional recalculations, at most once per
+  ``provisional_interval`` seconds (never, when it is None)
+- Triggers arriving while a key is being recalculated are coalesced into a
+  single rerun after it finishes
+- The number of queued keys is exported to the ``queue_depth`` gauge
+"""
+
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+import asyncio
+import logging
+import time
+
+from .core_candle_resampler import INTERVAL_MS, bucket_start, to_epoch_ms
+
+try:
+    from ..monitoring.core_metrics import system_metrics
+except ImportError:  # prometheus_client not installed
+    system_metrics = {}
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, str]
+
+
+class RecalculationScheduler:
+    """Coalescing, debounced scheduler for per-(symbol, interval) recalculations"""
+
+    def __init__(self,
+                 handler: Callable[[str, str], Awaitable[Any]],
+                 provisional_interval: Optional[float] = None,
+                 max_concurrency: int = 4,
+                 queue_name: str = 'indicator_recalc',
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            handler: Coroutine function run as ``handler(symbol, interval)``
+            provisional_interval: Minimum seconds between recalculations of an
+                open candle; None recalculates on candle close only
+            max_concurrency: Keys recalculated at the same time
+            queue_name: Label of the queue_depth gauge
+            clock: Monotonic time source
+        """
+        self.handler = handler
+        self.provisional_interval = provisional_interval
+        self.max_concurrency = max_concurrency
+        self.queue_name = queue_name
+        self.clock = clock
+
+        self._pending: Dict[Key, float] = {}   # key -> due time
+        self._rerun: Dict[Key, float] = {}     # triggered while in flight
+        self._in_flight: Set[Key] = set()
+        self._last_bucket: Dict[Key, int] = {}
+        self._flagged: Set[Key] = set()        # keys closed by kline flags only
+        self._last_run: Dict[Key, float] = {}
+
+        self._wake = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+        self.stats = {
+            'submitted': 0,
+            'coalesced': 0,
+            'ignored': 0,
+            'runs': 0,
+            'errors': 0
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending) + len(self._rerun)
+
+    def submit(self,
+               symbol: str,
+               interval: str,
+               timestamp: Optional[datetime] = None,
+               closed: Optional[bool] = None) -> bool:
+        """
+        Register a trigger for a symbol/interval
+
+        Args:
+            symbol: Trading symbol
+            interval: Candle interval the trigger applies to
+            timestamp: Event time, used to detect candle closes of keys
+                without flagged events (None counts as a close)
+            closed: The kline's closed flag, for kline events
+
+        Returns:
+            Whether a recalculation is now queued for the key
+        """
+        key = (symbol, interval)
+        self.stats['submitted'] += 1
+        now = self.clock()
+
+        if self._closes_candle(key, timestamp, closed):
+            due = now
+        elif self.provisional_interval is None:
+            self.stats['ignored'] += 1
+            return False
+        else:
+            due = max(now, self._last_run.get(key, float('-inf')) + self.provisional_interval)
+
+        queue = self._rerun if key in self._in_flight else self._pending
+        if key in queue:
+            self.stats['coalesced'] += 1
+            queue[key] = min(queue[key], due)
+        else:
+            queue[key] = due
+
+        self._idle.clear()
+        self._update_gauge()
+        self._wake.set()
+        self._ensure_started()
+        return True
+
+    def _closes_candle(self, key: Key, timestamp: Optional[datetime], closed: Optional[bool]) -> bool:
+        if closed is not None:
+            self._flagged.add(key)
+            return closed
+        if key in self._flagged:
+            return False
+        if timestamp is None or key[1] not in INTERVAL_MS:
+            return True
+
+        bucket = bucket_start(to_epoch_ms(timestamp), key[1])
+        previous = self._last_bucket.get(key)
+        if previous is not None and bucket <= previous:
+            return False
+
+        self._last_bucket[key] = bucket
+        return True
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._run_loop())
+            except RuntimeError:
+                pass  # No running loop yet: start() picks the queue up
+
+    async def start(self):
+        self._ensure_started()
+
+    async def stop(self):
+        """Stop dispatching; recalculations already running are awaited"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait until nothing is queued or running"""
+        self._ensure_started()
+        await asyncio.wait_for(self._idle.wait(), timeout)
+
+    async def _run_loop(self):
+        while True:
+            self._wake.clear()
+            now = self.clock()
+
+            ready = sorted((due, key) for key, due in self._pending.items() if due <= now)
+            for _, key in ready[:max(self.max_concurrency - len(self._in_flight), 0)]:
+                del self._pending[key]
+                self._in_flight.add(key)
+                task = asyncio.create_task(self._run(key))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            self._update_gauge()
+
+            if not self._pending and not self._in_flight:
+                self._idle.set()
+
+            timeout = None
+            if self._pending and len(self._in_flight) < self.max_concurrency:
+                timeout = max(min(self._pending.values()) - self.clock(), 0)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, key: Key):
+        self._last_run[key] = self.clock()
+        try:
+            await self.handler(*key)
+            self.stats['runs'] += 1
+        except Exception as e:
+            logger.error(f"Recalculation failed for {key[0]} {key[1]}: {e}")
+            self.stats['errors'] += 1
+        finally:
+            self._in_flight.discard(key)
+            if key in self._rerun:
+                self._pending[key] = self._rerun.pop(key)
+            self._wake.set()
+
+    def _update_gauge(self):
+        gauge = system_metrics.get('queue_depth')
+        if gauge is not None:
+            gauge.labels(queue_name=self.queue_name).set(self.queue_depth)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'queue_depth': self.queue_depth,
+            'in_flight': len(self._in_flight)
+        }
@@ -5,9 +5,14 @@ Data Fetch Module - Handles market data fetching and storage
 from .service_fetch_klines import KlineFetchService
 from .service_backfill_klines import BackfillKlinesService
 from .core_fetch_planner import FetchPlanner
+from .core_indicator_frame import IndicatorFrame
+from .core_candles import Candles, CandleBuffer
 
 __all__ = [
     'KlineFetchService',
     'BackfillKlinesService',
     'FetchPlanner',
+    'IndicatorFrame',
+    'Candles',
+    'CandleBuffer',
 ]
\ No newline at end of file
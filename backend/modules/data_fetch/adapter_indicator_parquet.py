@@ -0,0 +1,165 @@
+"""
+Parquet Indicator Store
+
+Wide indicator records written to Parquet files partitioned by timeframe,
+symbol and month::
+
+    <root>/timeframe=1h/symbol=BTCUSDT/month=2024-01.parquet
+
+- One float column per indicator plus the timestamp
+- Writes merge into the month partition, newer values replacing older ones
+- Range reads only open the partitions overlapping the range
+- Tail reads open partitions newest first until enough records are found
+
+Requires pyarrow (or fastparquet) through pandas.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .core_indicator_frame import INDICATOR_COLUMNS, IndicatorFrame
+
+logger = logging.getLogger(__name__)
+
+
+class ParquetIndicatorStore:
+    """Partitioned Parquet files in the wide indicator layout"""
+
+    def __init__(self, root_dir: str):
+        self.root = Path(root_dir)
+
+    def partition_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / f"timeframe={timeframe}" / f"symbol={symbol}"
+
+    def partition_path(self, symbol: str, timeframe: str, month: str) -> Path:
+        return self.partition_dir(symbol, timeframe) / f"month={month}.parquet"
+
+    def write(self, frame: IndicatorFrame) -> int:
+        """
+        Merge a frame into its month partitions
+
+        Args:
+            frame: Indicator values of one symbol/timeframe
+
+        Returns:
+            Number of records written
+        """
+        if len(frame) == 0:
+            return 0
+
+        df = frame.to_pandas()
+        months = df.index.strftime('%Y-%m')
+
+        for month, chunk in df.groupby(months):
+            path = self.partition_path(frame.symbol, frame.timeframe, month)
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            if path.exists():
+                existing = pd.read_parquet(path)
+                # New values win; columns missing from the write keep their stored values
+                chunk = chunk.combine_first(existing)
+
+            chunk = chunk.sort_index().astype(np.float64)
+            chunk.to_parquet(path)
+
+        logger.debug(f"Wrote {len(df)} indicator records for {frame.symbol} {frame.timeframe}")
+        return len(df)
+
+    def read(self,
+             symbol: str,
+             timeframe: str,
+             indicator_names: Optional[Sequence[str]] = None,
+             start_time: Optional[datetime] = None,
+             end_time: Optional[datetime] = None) -> IndicatorFrame:
+        """
+        Read a time range into contiguous arrays
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Time interval
+            indicator_names: Columns to read (all known indicators by default)
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+
+        Returns:
+            IndicatorFrame in chronological order; missing values are NaN
+        """
+        names = list(indicator_names or INDICATOR_COLUMNS)
+        paths = self._partitions(symbol, timeframe, start_time, end_time)
+        if not paths:
+            return IndicatorFrame.empty(symbol, timeframe, names)
+
+        chunks = []
+        for path in paths:
+            df = pd.read_parquet(path)
+            chunks.append(df.reindex(columns=names))
+        df = pd.concat(chunks).sort_index()
+
+        if start_time is not None:
+            df = df[df.index >= start_time]
+        if end_time is not None:
+            df = df[df.index <= end_time]
+
+        return IndicatorFrame.from_pandas(symbol, timeframe, df)
+
+    def read_tail(self,
+                  symbol: str,
+                  timeframe: str,
+                  periods: int,
+                  indicator_names: Optional[Sequence[str]] = None,
+                  require: Optional[str] = None) -> IndicatorFrame:
+        """
+        Read the newest records
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Time interval
+            periods: Number of records to keep
+            indicator_names: Columns to read (all known indicators by default)
+            require: Skip records where this indicator is NaN
+
+        Returns:
+            IndicatorFrame of at most ``periods`` records in chronological order
+        """
+        names = list(indicator_names or INDICATOR_COLUMNS)
+        chunks = []
+        found = 0
+
+        for path in reversed(self._partitions(symbol, timeframe, None, None)):
+            df = pd.read_parquet(path).reindex(columns=names)
+            if require is not None:
+                df = df[df[require].notna()]
+            chunks.append(df)
+            found += len(df)
+            if found >= periods:
+                break
+
+        if not chunks:
+            return IndicatorFrame.empty(symbol, timeframe, names)
+
+        df = pd.concat(chunks[::-1]).sort_index()
+        return IndicatorFrame.from_pandas(symbol, timeframe, df).tail(periods)
+
+    def _partitions(self,
+                    symbol: str,
+                    timeframe: str,
+                    start_time: Optional[datetime],
+                    end_time: Optional[datetime]) -> List[Path]:
+        directory = self.partition_dir(symbol, timeframe)
+        if not directory.exists():
+            return []
+
+        first = start_time.strftime('%Y-%m') if start_time else None
+        last = end_time.strftime('%Y-%m') if end_time else None
+
+        paths = []
+        for path in sorted(directory.glob('month=*.parquet')):
+            month = path.stem.split('=', 1)[1]
+            if (first is None or month >= first) and (last is None or month <= last):
+                paths.append(path)
+        return paths
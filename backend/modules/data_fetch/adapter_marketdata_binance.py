@@ -5,12 +5,44 @@ from typing import Dict, List, Optional, Callable, Any
 from datetime import datetime
 from binance import AsyncClient, BinanceSocketManager
 from binance.enums import FuturesType
+from binance.exceptions import BinanceAPIException
 import aiohttp
 
+from .core_candles import Candles, to_ms
+from .core_rate_limiter import (
+    THROTTLE_STATUSES, WeightRateLimiter, kline_request_weight, retry_after, used_weight
+)
+
 logger = logging.getLogger(__name__)
 
+# Klines per historical page; larger pages cost double weight
+HISTORICAL_PAGE_LIMIT = 1000
+
+
+def _historical_kline_record(raw_kline: List, symbol: str, interval: str) -> Dict[str, Any]:
+    """A REST kline row as the kline dict the repositories store"""
+    return {
+        'symbol': symbol.upper(),
+        'interval': interval,
+        'open_time': datetime.fromtimestamp(raw_kline[0] / 1000),
+        'close_time': datetime.fromtimestamp(raw_kline[6] / 1000),
+        'open_price': float(raw_kline[1]),
+        'high_price': float(raw_kline[2]),
+        'low_price': float(raw_kline[3]),
+        'close_price': float(raw_kline[4]),
+        'volume': float(raw_kline[5]),
+        'quote_volume': float(raw_kline[7]),
+        'number_of_trades': int(raw_kline[8]),
+        'taker_buy_base_volume': float(raw_kline[9]),
+        'taker_buy_quote_volume': float(raw_kline[10])
+    }
+
+
 class BinanceFuturesClient:
-    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None):
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 api_secret: Optional[str] = None,
+                 rate_limiter: Optional[WeightRateLimiter] = None):
         self.api_key = api_key
         self.api_secret = api_secret
         self.client: Optional[AsyncClient] = None
@@ -27,6 +59,13 @@ class BinanceFuturesClient:
         self.max_reconnect_attempts = 10
         self.futures_type = FuturesType.USD_M  # USDT-M Futures
         
+        # REST request weight budget shared by all historical requests
+        self.rate_limiter = rate_limiter or WeightRateLimiter()
+        self.max_throttle_retries = 5
+        # The client keeps only its last response; a request and the read of
+        # its headers happen under this lock
+        self._response_lock = asyncio.Lock()
+        
     async def start(self):
         try:
             self.client = await AsyncClient.create(
@@ -281,18 +320,89 @@ class BinanceFuturesClient:
                                   start_time: Optional[int] = None,
                                   end_time: Optional[int] = None,
                                   limit: int = 500) -> List[List]:
-        try:
-            klines = await self.client.futures_klines(
-                symbol=symbol.upper(),
-                interval=interval,
-                startTime=start_time,
-                endTime=end_time,
-                limit=limit
-            )
+        """
+        Historical klines, admitted by the weight rate limiter
+        
+        429/418 responses pause the limiter (Retry-After or backoff) and the
+        request is retried up to ``max_throttle_retries`` times. The used
+        weight is read from the client's ``response`` right after the request,
+        before another request can replace it.
+        """
+        weight = kline_request_weight(limit)
+        attempt = 0
+        while True:
+            async with self.rate_limiter.request(weight):
+                try:
+                    async with self._response_lock:
+                        klines = await self.client.futures_klines(
+                            symbol=symbol.upper(),
+                            interval=interval,
+                            startTime=start_time,
+                            endTime=end_time,
+                            limit=limit
+                        )
+                        headers = getattr(self.client.response, 'headers', None)
+                except BinanceAPIException as e:
+                    if e.status_code not in THROTTLE_STATUSES or attempt >= self.max_throttle_retries:
+                        logger.error(f"Failed to get historical klines: {e}")
+                        raise
+                    attempt += 1
+                    self.rate_limiter.on_throttled(e.status_code, retry_after(getattr(e.response, 'headers', None)))
+                    continue
+                except Exception as e:
+                    logger.error(f"Failed to get historical klines: {e}")
+                    raise
+            
+            used = used_weight(headers)
+            if used is not None:
+                self.rate_limiter.observe_used_weight(used)
+            self.rate_limiter.on_success()
             return klines
-        except Exception as e:
-            logger.error(f"Failed to get historical klines: {e}")
-            raise
+    
+    async def fetch_historical_klines(self,
+                                      symbol: str,
+                                      interval: str,
+                                      start_time: datetime,
+                                      end_time: datetime) -> List[Dict[str, Any]]:
+        """
+        Klines of a time range as kline dicts, paged through get_historical_klines
+        
+        Every page is admitted by the weight rate limiter, so concurrent
+        backfill downloads share this client's request budget.
+        """
+        start_ms, end_ms = to_ms(start_time), to_ms(end_time)
+        records: List[Dict[str, Any]] = []
+        
+        while start_ms <= end_ms:
+            page = await self.get_historical_klines(symbol, interval, start_ms, end_ms, HISTORICAL_PAGE_LIMIT)
+            records.extend(_historical_kline_record(row, symbol, interval) for row in page)
+            if len(page) < HISTORICAL_PAGE_LIMIT:
+                break
+            start_ms = page[-1][0] + 1
+        
+        return records
+    
+    async def validate_symbols(self, symbols: List[str]) -> List[str]:
+        """The symbols currently trading on the exchange"""
+        info = await self.get_exchange_info()
+        trading = {s['symbol'] for s in info['symbols'] if s.get('status') == 'TRADING'}
+        valid = []
+        for symbol in symbols:
+            if symbol.upper() in trading:
+                valid.append(symbol.upper())
+            else:
+                logger.warning(f"Skipping unknown or non-trading symbol {symbol}")
+        return valid
+    
+    async def get_historical_candles(self,
+                                     symbol: str,
+                                     interval: str,
+                                     start_time: Optional[int] = None,
+                                     end_time: Optional[int] = None,
+                                     limit: int = 500) -> Candles:
+        """Historical klines parsed straight into columnar Candles (no per-row dicts)"""
+        klines = await self.get_historical_klines(symbol, interval, start_time, end_time, limit)
+        return Candles.from_binance(klines, symbol=symbol.upper(), interval=interval)
     
     async def get_order_book(self, symbol: str, limit: int = 100) -> Dict:
         try:
@@ -1,22 +1,38 @@
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Iterator, Set, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, func, asc
+from sqlalchemy import and_, desc, func, asc, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
+import asyncio
 import json
 import logging
+import time
 
 from .market_data_tables import (
     KlineData, OrderBookSnapshot, TradeData, 
     IndicatorValue, MarketMetrics, SymbolInfo
 )
+from .market_data_wide_tables import indicator_values_wide
+from .core_candles import Candles
+from .core_ohlcv import ohlcv_arrays, ohlcv_arrays_by_symbol
+from .core_kline_gaps import kline_gap_query, wall_clock_gaps
+from .core_kline_copy import (
+    KLINE_STAGING_TABLE, IngestStats, copy_to_staging, kline_copy_rows, merge_sql, staging_table_sql
+)
+from .core_indicator_frame import (
+    ADDITIONAL_COLUMNS, INDICATOR_COLUMNS, IndicatorFrame, IndicatorReading, merge_indicator_rows,
+    pivot_indicator_values
+)
 
 logger = logging.getLogger(__name__)
 
 class MarketDataRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, ingest_batch_size: int = 50000):
         self.session = session
+        self.ingest_batch_size = ingest_batch_size
+        self.ingest_stats = IngestStats()
+        self._ingest_lock = asyncio.Lock()
     
     # Kline Data Methods
     def save_kline(self, kline_data: Dict[str, Any]) -> KlineData:
@@ -50,7 +66,7 @@ class MarketDataRepository:
                    interval: str,
                    start_time: Optional[datetime] = None,
                    end_time: Optional[datetime] = None,
-                   limit: int = 1000) -> List[KlineData]:
+                   limit: Optional[int] = 1000) -> List[KlineData]:
         query = self.session.query(KlineData).filter(
             and_(
                 KlineData.symbol == symbol,
@@ -65,6 +81,144 @@ class MarketDataRepository:
         
         return query.order_by(desc(KlineData.open_time)).limit(limit).all()
     
+    def get_ohlcv_arrays(self,
+                         symbol: str,
+                         interval: str,
+                         start_time: Optional[datetime] = None,
+                         end_time: Optional[datetime] = None,
+                         limit: Optional[int] = None) -> Candles:
+        """
+        Read klines straight into column arrays, without ORM objects
+        
+        Only the OHLCV columns are selected, already in ascending open time.
+        
+        Args:
+            symbol: Trading symbol
+            interval: Time interval
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+            limit: Keep only the newest ``limit`` klines
+            
+        Returns:
+            Candles (also a mapping of open_time, open, high, low, close and volume to arrays)
+        """
+        table = KlineData.__table__
+        query = self._ohlcv_query(symbol, interval, start_time, end_time)
+        
+        if limit is not None:
+            rows = self.session.execute(query.order_by(desc(table.c.open_time)).limit(limit)).all()
+            rows.reverse()
+        else:
+            rows = self.session.execute(query.order_by(asc(table.c.open_time))).all()
+        
+        return ohlcv_arrays(rows, symbol=symbol, interval=interval)
+    
+    def get_ohlcv_arrays_multi(self,
+                               symbols: List[str],
+                               interval: str,
+                               start_time: Optional[datetime] = None,
+                               end_time: Optional[datetime] = None,
+                               limit: Optional[int] = None) -> Dict[str, Candles]:
+        """
+        Read the klines of many symbols with one query
+        
+        Same columns and order as get_ohlcv_arrays. With a limit, the newest
+        ``limit`` klines of each symbol are kept by a window function, so the
+        whole universe costs a single round-trip.
+        
+        Args:
+            symbols: Trading symbols
+            interval: Time interval
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+            limit: Keep only the newest ``limit`` klines per symbol
+            
+        Returns:
+            Candles per symbol (empty for symbols without klines)
+        """
+        query = self._multi_ohlcv_query(symbols, interval, start_time, end_time, limit)
+        rows = self.session.execute(query).all()
+        return ohlcv_arrays_by_symbol(rows, symbols, interval=interval)
+    
+    def iter_candles(self,
+                     symbol: str,
+                     interval: str,
+                     start_time: Optional[datetime] = None,
+                     end_time: Optional[datetime] = None,
+                     batch_size: int = 50000) -> Iterator[Candles]:
+        """
+        Stream a kline range as ascending Candles batches over a server-side cursor
+        
+        Rows are fetched ``batch_size`` at a time (``stream_results``/``yield_per``),
+        so memory is bounded by one batch whatever the range, and the first batch
+        arrives before the query has finished. The session's connection stays
+        busy until the iterator is exhausted or closed.
+        
+        Args:
+            symbol: Trading symbol
+            interval: Time interval
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+            batch_size: Rows per batch
+            
+        Yields:
+            Candles of at most ``batch_size`` rows, non-overlapping and in order
+        """
+        table = KlineData.__table__
+        query = self._ohlcv_query(symbol, interval, start_time, end_time).order_by(asc(table.c.open_time))
+        
+        result = self.session.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+        try:
+            for rows in result.partitions():
+                yield ohlcv_arrays(rows, symbol=symbol, interval=interval)
+        finally:
+            result.close()
+    
+    @staticmethod
+    def _ohlcv_query(symbol: str,
+                     interval: str,
+                     start_time: Optional[datetime],
+                     end_time: Optional[datetime]):
+        table = KlineData.__table__
+        query = select(
+            table.c.open_time, table.c.open_price, table.c.high_price,
+            table.c.low_price, table.c.close_price, table.c.volume
+        ).where(and_(table.c.symbol == symbol, table.c.interval == interval))
+        
+        if start_time:
+            query = query.where(table.c.open_time >= start_time)
+        if end_time:
+            query = query.where(table.c.open_time <= end_time)
+        return query
+    
+    @staticmethod
+    def _multi_ohlcv_query(symbols: List[str],
+                           interval: str,
+                           start_time: Optional[datetime],
+                           end_time: Optional[datetime],
+                           limit: Optional[int]):
+        table = KlineData.__table__
+        query = select(
+            table.c.symbol, table.c.open_time, table.c.open_price, table.c.high_price,
+            table.c.low_price, table.c.close_price, table.c.volume
+        ).where(and_(table.c.symbol.in_(list(symbols)), table.c.interval == interval))
+        
+        if start_time:
+            query = query.where(table.c.open_time >= start_time)
+        if end_time:
+            query = query.where(table.c.open_time <= end_time)
+        if limit is None:
+            return query.order_by(table.c.symbol, asc(table.c.open_time))
+        
+        ranked = query.add_columns(
+            func.row_number().over(
+                partition_by=table.c.symbol, order_by=desc(table.c.open_time)
+            ).label('newest_rank')
+        ).subquery()
+        return select(*[column for column in ranked.c if column.name != 'newest_rank']).where(
+            ranked.c.newest_rank <= limit
+        ).order_by(ranked.c.symbol, asc(ranked.c.open_time))
+    
     def get_latest_kline(self, symbol: str, interval: str) -> Optional[KlineData]:
         return self.session.query(KlineData).filter(
             and_(
@@ -162,6 +316,86 @@ class MarketDataRepository:
             logger.error(f"Error bulk saving klines: {e}")
             raise
     
+    def copy_save_klines(self,
+                         klines: List[Dict[str, Any]],
+                         batch_size: int = 50000,
+                         session: Optional[Session] = None) -> int:
+        """
+        Bulk upsert klines through COPY into a staging table and one merge per batch
+        
+        Same result as bulk_save_klines, without compiling multi-row INSERT
+        statements; throughput is logged and accumulated in ``ingest_stats``.
+        
+        Args:
+            klines: List of kline dictionaries
+            batch_size: Rows copied and merged per transaction
+            session: Session to copy on (default: the repository's session)
+            
+        Returns:
+            Number of records inserted/updated
+        """
+        if not klines:
+            return 0
+        
+        session = session or self.session
+        target = KlineData.__table__.name
+        stats = IngestStats()
+        
+        connection = None
+        try:
+            for i in range(0, len(klines), batch_size):
+                batch = klines[i:i + batch_size]
+                started = time.perf_counter()
+                
+                # Each commit may return the connection to the pool; the staging
+                # table lives as long as the pooled connection does
+                connection = session.connection().connection
+                cursor = connection.cursor()
+                if not connection.info.get(KLINE_STAGING_TABLE):
+                    for statement in staging_table_sql(target):
+                        cursor.execute(statement)
+                cursor.execute(f"TRUNCATE {KLINE_STAGING_TABLE}")
+                copy_to_staging(cursor, kline_copy_rows(batch))
+                cursor.execute(merge_sql(target))
+                session.commit()
+                connection.info[KLINE_STAGING_TABLE] = True
+                
+                stats.add(len(batch), time.perf_counter() - started)
+            
+            self.ingest_stats.add(stats.rows, stats.seconds, stats.batches)
+            logger.info(
+                f"COPY ingested {stats.rows} klines in {stats.batches} batches, "
+                f"{stats.seconds:.2f}s ({stats.rows_per_second:,.0f} rows/s)"
+            )
+            return stats.rows
+            
+        except Exception as e:
+            session.rollback()
+            if connection is not None:
+                # A rolled back batch may have rolled back the staging DDL with it
+                connection.info.pop(KLINE_STAGING_TABLE, None)
+            logger.error(f"Error COPY ingesting klines: {e}")
+            raise
+    
+    async def bulk_insert_klines(self, klines: List[Dict[str, Any]]) -> int:
+        """
+        BackfillKlinesService saves, through copy_save_klines in a worker thread
+        
+        The worker copies on a session of its own, checked out from the
+        engine's pool, so the repository session stays free for the event
+        loop. Saves of concurrent downloads still run one at a time, as their
+        merges would contend for the same kline rows.
+        
+        Returns:
+            Number of records inserted/updated
+        """
+        async with self._ingest_lock:
+            return await asyncio.to_thread(self._copy_save_klines_on_own_session, klines)
+    
+    def _copy_save_klines_on_own_session(self, klines: List[Dict[str, Any]]) -> int:
+        with Session(bind=self.session.get_bind()) as session:
+            return self.copy_save_klines(klines, self.ingest_batch_size, session=session)
+    
     def get_data_gaps(self, 
                       symbol: str, 
                       interval: str,
@@ -170,6 +404,9 @@ class MarketDataRepository:
         """
         Find gaps in kline data for a given time range
         
+        Detection runs in Postgres (``LAG()`` over the stored open times), so
+        only gap boundaries are returned whatever the length of the range.
+        
         Args:
             symbol: Trading symbol
             interval: Time interval
@@ -177,57 +414,10 @@ class MarketDataRepository:
             end_time: End of the range to check
             
         Returns:
-            List of (gap_start, gap_end) tuples representing missing data ranges
+            List of (gap_start, gap_end) open times of missing candles, both inclusive
         """
-        klines = self.get_klines(symbol, interval, start_time, end_time, limit=100000)
-        
-        if not klines:
-            return [(start_time, end_time)]
-        
-        # Sort klines by open time
-        klines.sort(key=lambda k: k.open_time)
-        
-        gaps = []
-        
-        # Check for gap at the beginning
-        if klines[0].open_time > start_time:
-            gaps.append((start_time, klines[0].open_time))
-        
-        # Check for gaps between klines
-        expected_duration = self._get_interval_duration(interval)
-        for i in range(len(klines) - 1):
-            expected_next = klines[i].close_time + timedelta(milliseconds=1)
-            actual_next = klines[i + 1].open_time
-            
-            if actual_next > expected_next + expected_duration:
-                gaps.append((expected_next, actual_next))
-        
-        # Check for gap at the end
-        if klines[-1].close_time < end_time:
-            gaps.append((klines[-1].close_time, end_time))
-        
-        return gaps
-    
-    def _get_interval_duration(self, interval: str) -> timedelta:
-        """Convert interval string to timedelta"""
-        interval_map = {
-            '1m': timedelta(minutes=1),
-            '3m': timedelta(minutes=3),
-            '5m': timedelta(minutes=5),
-            '15m': timedelta(minutes=15),
-            '30m': timedelta(minutes=30),
-            '1h': timedelta(hours=1),
-            '2h': timedelta(hours=2),
-            '4h': timedelta(hours=4),
-            '6h': timedelta(hours=6),
-            '8h': timedelta(hours=8),
-            '12h': timedelta(hours=12),
-            '1d': timedelta(days=1),
-            '3d': timedelta(days=3),
-            '1w': timedelta(weeks=1),
-            '1M': timedelta(days=30)  # Approximate
-        }
-        return interval_map.get(interval, timedelta(minutes=1))
+        query = kline_gap_query(KlineData.__table__, symbol, interval, start_time, end_time)
+        return wall_clock_gaps(self.session.execute(query), interval)
     
     # Order Book Methods
     def save_orderbook_snapshot(self, orderbook_data: Dict[str, Any]) -> OrderBookSnapshot:
@@ -313,49 +503,307 @@ class MarketDataRepository:
             logger.error(f"Error saving indicator value: {e}")
             raise
     
-    def get_indicator_values(self,
-                           symbol: str,
-                           indicator_name: str,
-                           timeframe: str,
-                           start_time: Optional[datetime] = None,
-                           limit: int = 100) -> List[IndicatorValue]:
-        query = self.session.query(IndicatorValue).filter(
+    def bulk_save_indicator_values(self,
+                                   values: List[Dict[str, Any]],
+                                   batch_size: int = 1000) -> int:
+        """
+        Bulk upsert indicator values with multi-row INSERT ... ON CONFLICT
+        
+        Args:
+            values: Indicator dictionaries as accepted by save_indicator_value
+            batch_size: Rows per statement; each batch is committed on its own
+            
+        Returns:
+            Number of records inserted/updated
+        """
+        if not values:
+            return 0
+        
+        total_saved = 0
+        
+        try:
+            for i in range(0, len(values), batch_size):
+                batch = [
+                    {
+                        'symbol': v['symbol'],
+                        'indicator_name': v['indicator_name'],
+                        'timeframe': v['timeframe'],
+                        'timestamp': v['timestamp'],
+                        'value': v['value'],
+                        'parameters': json.dumps(v.get('parameters', {})),
+                        'additional_values': json.dumps(v.get('additional_values', {}))
+                    }
+                    for v in values[i:i + batch_size]
+                ]
+                
+                stmt = insert(IndicatorValue).values(batch)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['symbol', 'indicator_name', 'timeframe', 'timestamp'],
+                    set_={
+                        'value': stmt.excluded.value,
+                        'parameters': stmt.excluded.parameters,
+                        'additional_values': stmt.excluded.additional_values
+                    }
+                )
+                
+                self.session.execute(stmt)
+                self.session.commit()
+                total_saved += len(batch)
+            
+            self.bulk_save_indicator_rows(pivot_indicator_values(values), batch_size=batch_size)
+            
+            logger.debug(f"Bulk saved {total_saved} indicator values")
+            return total_saved
+            
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error bulk saving indicator values: {e}")
+            raise
+    
+    def get_indicator_timestamps(self,
+                                 symbol: str,
+                                 timeframe: str,
+                                 start_time: datetime,
+                                 end_time: datetime,
+                                 indicator_names: Optional[List[str]] = None) -> Set[Tuple[str, datetime]]:
+        """
+        (indicator_name, timestamp) pairs already stored in a time range, in one query
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Time interval
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+            indicator_names: Restrict to these indicators
+        """
+        query = self.session.query(IndicatorValue.indicator_name, IndicatorValue.timestamp).filter(
             and_(
                 IndicatorValue.symbol == symbol,
-                IndicatorValue.indicator_name == indicator_name,
-                IndicatorValue.timeframe == timeframe
+                IndicatorValue.timeframe == timeframe,
+                IndicatorValue.timestamp >= start_time,
+                IndicatorValue.timestamp <= end_time
             )
         )
         
-        if start_time:
-            query = query.filter(IndicatorValue.timestamp >= start_time)
+        if indicator_names:
+            query = query.filter(IndicatorValue.indicator_name.in_(indicator_names))
         
-        indicators = query.order_by(desc(IndicatorValue.timestamp)).limit(limit).all()
+        return {(name, timestamp) for name, timestamp in query.all()}
+    
+    def bulk_save_indicator_rows(self,
+                                 rows: List[Dict[str, Any]],
+                                 batch_size: int = 1000) -> int:
+        """
+        Upsert wide indicator rows; only the indicator columns present are overwritten
         
-        # Parse JSON fields
-        for ind in indicators:
-            ind.parameters_dict = json.loads(ind.parameters) if ind.parameters else {}
-            ind.additional_values_dict = json.loads(ind.additional_values) if ind.additional_values else {}
+        Args:
+            rows: Dicts with symbol, timeframe, timestamp and indicator columns
+            batch_size: Rows per statement; each batch is committed on its own
+            
+        Returns:
+            Number of rows inserted/updated
+        """
+        if not rows:
+            return 0
+        
+        # Rows sharing a column set go into the same multi-row statement
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            columns = tuple(sorted(k for k in row if k in indicator_values_wide.c))
+            groups.setdefault(columns, []).append(row)
+        
+        total_saved = 0
         
-        return indicators
+        try:
+            for columns, group in groups.items():
+                indicator_columns = [c for c in columns if c in INDICATOR_COLUMNS]
+                
+                for i in range(0, len(group), batch_size):
+                    batch = group[i:i + batch_size]
+                    stmt = insert(indicator_values_wide).values(batch)
+                    if indicator_columns:
+                        stmt = stmt.on_conflict_do_update(
+                            index_elements=['symbol', 'timeframe', 'timestamp'],
+                            set_={c: stmt.excluded[c] for c in indicator_columns}
+                        )
+                    else:
+                        stmt = stmt.on_conflict_do_nothing()
+                    
+                    self.session.execute(stmt)
+                    self.session.commit()
+                    total_saved += len(batch)
+            
+            return total_saved
+            
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error bulk saving wide indicator rows: {e}")
+            raise
     
-    def get_latest_indicator(self,
+    def get_indicator_frame(self,
                             symbol: str,
-                            indicator_name: str,
-                            timeframe: str) -> Optional[IndicatorValue]:
-        indicator = self.session.query(IndicatorValue).filter(
+                            timeframe: str,
+                            indicator_names: Optional[List[str]] = None,
+                            start_time: Optional[datetime] = None,
+                            end_time: Optional[datetime] = None,
+                            limit: Optional[int] = None,
+                            require: Optional[str] = None) -> IndicatorFrame:
+        """
+        Read indicators over a time range with one query into contiguous arrays
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Time interval
+            indicator_names: Columns to read (all known indicators by default)
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+            limit: Keep only the newest ``limit`` rows
+            require: Skip rows where this indicator is NULL
+            
+        Returns:
+            IndicatorFrame in chronological order; missing values are NaN
+        """
+        names = [n for n in (indicator_names or INDICATOR_COLUMNS) if n in INDICATOR_COLUMNS]
+        table = indicator_values_wide
+        
+        query = select(table.c.timestamp, *[table.c[n] for n in names]).where(
+            and_(table.c.symbol == symbol, table.c.timeframe == timeframe)
+        )
+        if start_time:
+            query = query.where(table.c.timestamp >= start_time)
+        if end_time:
+            query = query.where(table.c.timestamp <= end_time)
+        if require:
+            query = query.where(table.c[require].isnot(None))
+        
+        if limit is not None:
+            rows = self.session.execute(query.order_by(desc(table.c.timestamp)).limit(limit)).all()
+        else:
+            rows = self.session.execute(query).all()
+        
+        # Timestamps written before the wide table existed and not migrated yet
+        narrow = self._narrow_indicator_rows(symbol, timeframe, names, start_time, end_time, limit, require)
+        
+        return IndicatorFrame.from_rows(symbol, timeframe, merge_indicator_rows(rows, narrow, limit), names)
+    
+    def _narrow_indicator_rows(self,
+                               symbol: str,
+                               timeframe: str,
+                               names: List[str],
+                               start_time: Optional[datetime],
+                               end_time: Optional[datetime],
+                               limit: Optional[int],
+                               require: Optional[str]) -> List[Tuple[Any, ...]]:
+        """get_indicator_frame rows from the narrow table, for timestamps missing from the wide table"""
+        table = indicator_values_wide
+        parents = {parent for parent, extras in ADDITIONAL_COLUMNS.items()
+                   if any(column in names for column in extras.values())}
+        
+        migrated = select(table.c.timestamp).where(
+            and_(
+                table.c.symbol == symbol,
+                table.c.timeframe == timeframe,
+                table.c.timestamp == IndicatorValue.timestamp
+            )
+        ).exists()
+        timestamps = self.session.query(IndicatorValue.timestamp).filter(
             and_(
                 IndicatorValue.symbol == symbol,
-                IndicatorValue.indicator_name == indicator_name,
-                IndicatorValue.timeframe == timeframe
+                IndicatorValue.timeframe == timeframe,
+                IndicatorValue.indicator_name.in_([require] if require else names),
+                ~migrated
             )
-        ).order_by(desc(IndicatorValue.timestamp)).first()
+        )
+        if start_time:
+            timestamps = timestamps.filter(IndicatorValue.timestamp >= start_time)
+        if end_time:
+            timestamps = timestamps.filter(IndicatorValue.timestamp <= end_time)
+        if limit is not None:
+            timestamps = timestamps.distinct().order_by(desc(IndicatorValue.timestamp)).limit(limit)
         
-        if indicator:
-            indicator.parameters_dict = json.loads(indicator.parameters) if indicator.parameters else {}
-            indicator.additional_values_dict = json.loads(indicator.additional_values) if indicator.additional_values else {}
+        values = self.session.query(IndicatorValue).filter(
+            and_(
+                IndicatorValue.symbol == symbol,
+                IndicatorValue.timeframe == timeframe,
+                IndicatorValue.indicator_name.in_(set(names) | parents),
+                IndicatorValue.timestamp.in_(timestamps.subquery().select())
+            )
+        ).all()
         
-        return indicator
+        wide = pivot_indicator_values(
+            {
+                'symbol': v.symbol,
+                'indicator_name': v.indicator_name,
+                'timeframe': v.timeframe,
+                'timestamp': v.timestamp,
+                'value': v.value,
+                'additional_values': json.loads(v.additional_values) if v.additional_values else {}
+            }
+            for v in values
+        )
+        rows = [(row['timestamp'], *[row.get(n) for n in names]) for row in wide]
+        if require in names:
+            rows = [row for row in rows if row[1 + names.index(require)] is not None]
+        return rows
+    
+    def delete_indicator_values(self,
+                                symbol: str,
+                                timeframe: str,
+                                start_time: datetime,
+                                end_time: datetime) -> int:
+        """
+        Delete a time range of indicator values from the narrow and wide tables
+        
+        Returns:
+            Number of narrow rows deleted
+        """
+        table = indicator_values_wide
+        try:
+            deleted = self.session.query(IndicatorValue).filter(
+                IndicatorValue.symbol == symbol,
+                IndicatorValue.timeframe == timeframe,
+                IndicatorValue.timestamp >= start_time,
+                IndicatorValue.timestamp <= end_time
+            ).delete()
+            self.session.execute(table.delete().where(and_(
+                table.c.symbol == symbol,
+                table.c.timeframe == timeframe,
+                table.c.timestamp >= start_time,
+                table.c.timestamp <= end_time
+            )))
+            self.session.commit()
+            return deleted
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error deleting indicator values: {e}")
+            raise
+    
+    def get_indicator_values(self,
+                           symbol: str,
+                           indicator_name: str,
+                           timeframe: str,
+                           start_time: Optional[datetime] = None,
+                           limit: int = 100) -> List[IndicatorReading]:
+        """Newest ``limit`` values of one indicator, newest first"""
+        frame = self.get_indicator_frame(
+            symbol, timeframe, self._with_additional(indicator_name),
+            start_time=start_time, limit=limit, require=indicator_name
+        )
+        return list(reversed(frame.readings(indicator_name)))
+    
+    def get_latest_indicator(self,
+                            symbol: str,
+                            indicator_name: str,
+                            timeframe: str) -> Optional[IndicatorReading]:
+        """Latest value of one indicator"""
+        frame = self.get_indicator_frame(symbol, timeframe, self._with_additional(indicator_name),
+                                         limit=1, require=indicator_name)
+        readings = frame.readings(indicator_name)
+        return readings[-1] if readings else None
+    
+    @staticmethod
+    def _with_additional(indicator_name: str) -> List[str]:
+        return [indicator_name, *ADDITIONAL_COLUMNS.get(indicator_name, {}).values()]
     
     # Market Metrics Methods
     def save_market_metrics(self, metrics_data: Dict[str, Any]) -> MarketMetrics:
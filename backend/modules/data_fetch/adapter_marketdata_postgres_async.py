@@ -0,0 +1,373 @@
+"""
+Async Postgres market data repository
+
+Implements ``MarketDataRepositoryPort`` on SQLAlchemy's asyncio engine with
+the asyncpg driver, so database round-trips of the async services overlap
+with exchange I/O instead of blocking the event loop.
+
+- Pooled connections: ``pool_size`` kept open, ``max_overflow`` extra under
+  load, recycled after ``pool_recycle`` seconds, pre-pinged on checkout
+- Prepared statements cached per connection (``statement_cache_size``; 0 for
+  transaction-pooling proxies such as PgBouncer)
+- Kline ingest through COPY into a staging table and one merge per batch
+- Gap detection with one ``LAG()`` query (``core_kline_gaps``)
+- Kline and indicator reads/writes for the indicator service; indicator
+  methods run MarketDataRepository's statements on the pooled connection
+  through ``run_sync``, so both repositories share one implementation
+- Pool wait and per-operation query latency in ``get_stats`` and Prometheus
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+import io
+import logging
+import time
+
+from sqlalchemy import and_, asc, case, desc, func, or_, select
+from sqlalchemy.engine import Row, make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session
+
+from .market_data_tables import KlineData
+from .adapter_marketdata_postgres import MarketDataRepository
+from .core_candles import Candles
+from .core_ohlcv import ohlcv_arrays, ohlcv_arrays_by_symbol
+from .core_db_metrics import DatabaseMetrics
+from .core_indicator_frame import IndicatorFrame, IndicatorReading
+from .core_kline_gaps import kline_gap_query, wall_clock_gaps
+from .core_kline_copy import (
+    KLINE_COPY_COLUMNS, KLINE_STAGING_TABLE, IngestStats, copy_csv, kline_copy_rows, merge_sql, staging_table_sql
+)
+
+logger = logging.getLogger(__name__)
+
+
+def create_marketdata_engine(url: str,
+                             pool_size: int = 10,
+                             max_overflow: int = 20,
+                             pool_recycle: int = 1800,
+                             pool_timeout: float = 30.0,
+                             statement_cache_size: int = 512) -> AsyncEngine:
+    """
+    Async engine with a tuned connection pool and prepared statement cache
+
+    Args:
+        url: ``postgresql+asyncpg://`` database URL
+        pool_size: Connections kept open
+        max_overflow: Extra connections opened under load
+        pool_recycle: Seconds after which a connection is replaced
+        pool_timeout: Seconds to wait for a connection before failing
+        statement_cache_size: Prepared statements cached per connection
+    """
+    url = make_url(url).update_query_dict({'prepared_statement_cache_size': str(statement_cache_size)})
+    return create_async_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        pool_pre_ping=True,
+        connect_args={'statement_cache_size': statement_cache_size}
+    )
+
+
+class AsyncMarketDataRepository:
+    """Async kline and indicator repository over a pooled asyncpg engine"""
+
+    def __init__(self,
+                 engine: AsyncEngine,
+                 ingest_batch_size: int = 50000,
+                 pool_name: str = 'marketdata'):
+        """
+        Args:
+            engine: Async engine, e.g. from ``create_marketdata_engine``
+            ingest_batch_size: Rows copied and merged per transaction
+            pool_name: Label of the pool metrics
+        """
+        self.engine = engine
+        self.ingest_batch_size = ingest_batch_size
+        self.metrics = DatabaseMetrics(pool_name)
+        self.ingest_stats = IngestStats()
+        self.table = KlineData.__table__
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs) -> 'AsyncMarketDataRepository':
+        """Repository on an engine built from the application's DatabaseSettings"""
+        engine = create_marketdata_engine(
+            settings.async_connection_url,
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_recycle=settings.pool_recycle,
+            pool_timeout=settings.pool_timeout,
+            statement_cache_size=settings.statement_cache_size
+        )
+        return cls(engine, **kwargs)
+
+    async def close(self):
+        """Close all pooled connections"""
+        await self.engine.dispose()
+
+    @asynccontextmanager
+    async def _connection(self, operation: str) -> AsyncIterator[AsyncConnection]:
+        """Pooled connection, timing the wait for it and the operation using it"""
+        requested = time.perf_counter()
+        async with self.engine.connect() as connection:
+            acquired = time.perf_counter()
+            self.metrics.observe_pool_wait(acquired - requested)
+            self.metrics.set_checked_out(self.engine.pool.checkedout())
+            failed = False
+            try:
+                yield connection
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self.metrics.observe_query(operation, time.perf_counter() - acquired, failed)
+        self.metrics.set_checked_out(self.engine.pool.checkedout())
+
+    # MarketDataRepositoryPort
+
+    async def bulk_insert_klines(self, klines: List[Dict[str, Any]]) -> int:
+        """
+        Upsert klines through COPY into the connection's staging table
+
+        Each batch of ``ingest_batch_size`` rows is copied and merged in its
+        own transaction; the staging table is created once per pooled
+        connection.
+
+        Returns:
+            Number of records inserted/updated
+        """
+        if not klines:
+            return 0
+
+        target = self.table.name
+        stats = IngestStats()
+
+        for i in range(0, len(klines), self.ingest_batch_size):
+            batch = klines[i:i + self.ingest_batch_size]
+            started = time.perf_counter()
+
+            async with self._connection('bulk_insert_klines') as connection:
+                # COPY is only exposed by the driver; its transaction spans the batch
+                raw = await connection.get_raw_connection()
+                driver = raw.driver_connection
+                async with driver.transaction():
+                    # The staging table lives as long as the pooled connection
+                    if not raw.info.get(KLINE_STAGING_TABLE):
+                        for statement in staging_table_sql(target):
+                            await driver.execute(statement)
+                    await driver.execute(f"TRUNCATE {KLINE_STAGING_TABLE}")
+                    await driver.copy_to_table(
+                        KLINE_STAGING_TABLE,
+                        source=io.BytesIO(copy_csv(kline_copy_rows(batch)).getvalue().encode()),
+                        columns=list(KLINE_COPY_COLUMNS),
+                        format='csv'
+                    )
+                    await driver.execute(merge_sql(target))
+                raw.info[KLINE_STAGING_TABLE] = True
+
+            stats.add(len(batch), time.perf_counter() - started)
+
+        self.ingest_stats.add(stats.rows, stats.seconds, stats.batches)
+        logger.debug(
+            f"COPY ingested {stats.rows} klines in {stats.batches} batches "
+            f"({stats.rows_per_second:,.0f} rows/s)"
+        )
+        return stats.rows
+
+    async def get_data_gaps(self,
+                            symbol: str,
+                            interval: str,
+                            start: datetime,
+                            end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Runs of missing candles as inclusive (first, last) open times"""
+        query = kline_gap_query(self.table, symbol, interval, start, end)
+        async with self._connection('get_data_gaps') as connection:
+            return wall_clock_gaps(await connection.execute(query), interval)
+
+    async def get_latest_timestamp(self, symbol: str, interval: str) -> Optional[datetime]:
+        table = self.table
+        query = select(func.max(table.c.open_time)).where(
+            and_(table.c.symbol == symbol, table.c.interval == interval)
+        )
+        async with self._connection('get_latest_timestamp') as connection:
+            return await connection.scalar(query)
+
+    async def validate_data_integrity(self, symbol: str, interval: str) -> Dict[str, Any]:
+        """
+        Row count, time range, malformed candles and gaps of a series
+
+        Returns:
+            Dict with is_valid and issues, as read by BackfillKlinesService
+        """
+        table = self.table
+        malformed = or_(
+            table.c.high_price < table.c.low_price,
+            table.c.high_price < func.greatest(table.c.open_price, table.c.close_price),
+            table.c.low_price > func.least(table.c.open_price, table.c.close_price),
+            table.c.volume < 0
+        )
+        query = select(
+            func.count(),
+            func.min(table.c.open_time),
+            func.max(table.c.open_time),
+            func.sum(case((malformed, 1), else_=0))
+        ).where(and_(table.c.symbol == symbol, table.c.interval == interval))
+
+        async with self._connection('validate_data_integrity') as connection:
+            count, first, last, invalid = (await connection.execute(query)).one()
+            gaps = []
+            if count:
+                result = await connection.execute(kline_gap_query(table, symbol, interval, first, last))
+                gaps = wall_clock_gaps(result, interval)
+
+        issues = []
+        if not count:
+            issues.append('no data')
+        if invalid:
+            issues.append(f"{invalid} candles with inconsistent OHLC or negative volume")
+        if gaps:
+            issues.append(f"{len(gaps)} gaps")
+
+        return {
+            'is_valid': not issues,
+            'issues': issues,
+            'count': count,
+            'first': first,
+            'last': last,
+            'invalid_candles': invalid or 0,
+            'gaps': gaps
+        }
+
+    # Reads for the indicator services
+
+    async def get_ohlcv_arrays(self,
+                               symbol: str,
+                               interval: str,
+                               start_time: Optional[datetime] = None,
+                               end_time: Optional[datetime] = None,
+                               limit: Optional[int] = None) -> Candles:
+        """Async counterpart of MarketDataRepository.get_ohlcv_arrays"""
+        table = self.table
+        query = MarketDataRepository._ohlcv_query(symbol, interval, start_time, end_time)
+
+        async with self._connection('get_ohlcv_arrays') as connection:
+            if limit is not None:
+                rows = (await connection.execute(query.order_by(desc(table.c.open_time)).limit(limit))).all()
+                rows.reverse()
+            else:
+                rows = (await connection.execute(query.order_by(asc(table.c.open_time)))).all()
+
+        return ohlcv_arrays(rows, symbol=symbol, interval=interval)
+
+    async def get_ohlcv_arrays_multi(self,
+                                     symbols: List[str],
+                                     interval: str,
+                                     start_time: Optional[datetime] = None,
+                                     end_time: Optional[datetime] = None,
+                                     limit: Optional[int] = None) -> Dict[str, Candles]:
+        """Async counterpart of MarketDataRepository.get_ohlcv_arrays_multi"""
+        query = MarketDataRepository._multi_ohlcv_query(symbols, interval, start_time, end_time, limit)
+
+        async with self._connection('get_ohlcv_arrays_multi') as connection:
+            rows = (await connection.execute(query)).all()
+
+        return ohlcv_arrays_by_symbol(rows, symbols, interval=interval)
+
+    async def iter_candles(self,
+                           symbol: str,
+                           interval: str,
+                           start_time: Optional[datetime] = None,
+                           end_time: Optional[datetime] = None,
+                           batch_size: int = 50000) -> AsyncIterator[Candles]:
+        """Async counterpart of MarketDataRepository.iter_candles, over a server-side cursor"""
+        table = self.table
+        query = MarketDataRepository._ohlcv_query(symbol, interval, start_time, end_time).order_by(
+            asc(table.c.open_time)
+        )
+
+        async with self._connection('iter_candles') as connection:
+            result = await connection.stream(query.execution_options(yield_per=batch_size))
+            try:
+                async for rows in result.partitions():
+                    yield ohlcv_arrays(rows, symbol=symbol, interval=interval)
+            finally:
+                await result.close()
+
+    async def get_latest_kline(self, symbol: str, interval: str) -> Optional[Row]:
+        """Newest kline row of a series"""
+        table = self.table
+        query = select(table).where(
+            and_(table.c.symbol == symbol, table.c.interval == interval)
+        ).order_by(desc(table.c.open_time)).limit(1)
+
+        async with self._connection('get_latest_kline') as connection:
+            return (await connection.execute(query)).first()
+
+    async def get_klines(self,
+                         symbol: str,
+                         interval: str,
+                         start_time: Optional[datetime] = None,
+                         end_time: Optional[datetime] = None,
+                         limit: Optional[int] = 1000) -> List[Row]:
+        """Async counterpart of MarketDataRepository.get_klines: kline rows, newest first"""
+        table = self.table
+        query = select(table).where(and_(table.c.symbol == symbol, table.c.interval == interval))
+        if start_time:
+            query = query.where(table.c.open_time >= start_time)
+        if end_time:
+            query = query.where(table.c.open_time <= end_time)
+
+        async with self._connection('get_klines') as connection:
+            return (await connection.execute(query.order_by(desc(table.c.open_time)).limit(limit))).all()
+
+    # Indicator values, in the narrow and wide tables
+
+    async def bulk_save_indicator_values(self, values: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        return await self._on_session('bulk_save_indicator_values', values, batch_size=batch_size)
+
+    async def get_indicator_timestamps(self,
+                                       symbol: str,
+                                       timeframe: str,
+                                       start_time: datetime,
+                                       end_time: datetime,
+                                       indicator_names: Optional[List[str]] = None) -> Set[Tuple[str, datetime]]:
+        return await self._on_session('get_indicator_timestamps', symbol, timeframe, start_time, end_time,
+                                      indicator_names=indicator_names)
+
+    async def get_indicator_frame(self, symbol: str, timeframe: str, **kwargs) -> IndicatorFrame:
+        return await self._on_session('get_indicator_frame', symbol, timeframe, **kwargs)
+
+    async def get_indicator_values(self, symbol: str, indicator_name: str, timeframe: str,
+                                   **kwargs) -> List[IndicatorReading]:
+        return await self._on_session('get_indicator_values', symbol, indicator_name, timeframe, **kwargs)
+
+    async def delete_indicator_values(self,
+                                      symbol: str,
+                                      timeframe: str,
+                                      start_time: datetime,
+                                      end_time: datetime) -> int:
+        return await self._on_session('delete_indicator_values', symbol, timeframe, start_time, end_time)
+
+    async def _on_session(self, method: str, *args, **kwargs) -> Any:
+        """Run a MarketDataRepository method on a Session over a pooled connection"""
+        def call(sync_connection):
+            with Session(bind=sync_connection) as session:
+                return getattr(MarketDataRepository(session), method)(*args, **kwargs)
+
+        async with self._connection(method) as connection:
+            return await connection.run_sync(call)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool occupancy, pool wait, query latency and ingest throughput"""
+        pool = self.engine.pool
+        return {
+            **self.metrics.to_dict({
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow()
+            }),
+            'ingest': self.ingest_stats.to_dict()
+        }
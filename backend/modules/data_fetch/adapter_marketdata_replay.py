@@ -15,9 +15,12 @@ import logging
 from collections import defaultdict
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from src.domain.ports.market_data_port import (
     MarketDataPort, MarketDataConfig, Tick, Kline, TimeFrame
 )
+from .core_candles import Candles, wall_to_epoch_ms
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +95,9 @@ class ReplayAdapter(MarketDataPort):
         self.current_ticks: Dict[str, Tick] = {}
         self.current_klines: Dict[tuple, Kline] = {}
         
+        # Recorded klines as columnar Candles, built on first use
+        self.candles: Dict[tuple, Candles] = {}
+        
         # Statistics
         self.stats = {
             "ticks_replayed": 0,
@@ -147,6 +153,7 @@ class ReplayAdapter(MarketDataPort):
         
         self.connected = False
         self.recorded_data.clear()
+        self.candles.clear()
         self.current_ticks.clear()
         self.current_klines.clear()
         
@@ -191,6 +198,36 @@ class ReplayAdapter(MarketDataPort):
         
         return klines
     
+    def get_candles(
+        self,
+        symbol: str,
+        timeframe: TimeFrame,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Candles:
+        """Recorded klines as Candles; time filters and limit return views, not copies."""
+        key = (symbol, timeframe)
+        candles = self.candles.get(key)
+        if candles is None:
+            klines = self.recorded_data[symbol].klines.get(timeframe, []) if symbol in self.recorded_data else []
+            n = len(klines)
+            candles = Candles(
+                wall_to_epoch_ms(np.array([k.timestamp for k in klines], dtype='datetime64[ms]')),
+                *(np.fromiter((float(getattr(k, name)) for k in klines), np.float64, n)
+                  for name in ('open', 'high', 'low', 'close', 'volume')),
+                symbol=symbol,
+                interval=getattr(timeframe, 'value', timeframe)
+            )
+            self.candles[key] = candles
+        
+        # Same inclusive bounds as get_klines
+        if start_time or end_time:
+            candles = candles.between(start_time, end_time)
+        if limit is not None:
+            candles = candles.tail(limit)
+        return candles
+    
     async def stream_ticks(self, symbols: List[str]) -> AsyncIterator[Tick]:
         """Stream ticks in replay order."""
         if self.config and self.config.deterministic:
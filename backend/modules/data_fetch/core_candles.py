@@ -0,0 +1,326 @@
+"""
+Columnar Candles
+
+``Candles`` is a struct-of-arrays container for klines shared by the fetch,
+analysis, replay and backtesting modules:
+- ``time_ms``: int64 epoch milliseconds of the candle open
+- ``open``/``high``/``low``/``close``/``volume``: float64 arrays
+
+Slicing (``candles[a:b]``, ``tail``, ``between``) returns views over the same
+arrays, and ``to_pandas`` wraps them without copying. ``Candles`` is also a
+read-only mapping of ``OHLCV_COLUMNS`` to arrays (``open_time`` as
+datetime64[ms] wall time, like stored kline times), so code written for
+``ohlcv_arrays`` results accepts it unchanged.
+
+``CandleBuffer`` appends candles into preallocated arrays and exposes the
+filled part as ``Candles`` views.
+
+Naive datetimes are local wall time, as written by BinanceDataNormalizer
+(``datetime.fromtimestamp``). On UTC hosts wall time and epoch time coincide
+and conversions are array views; elsewhere they go through ``datetime``.
+"""
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+OHLCV_COLUMNS = ('open_time',) + PRICE_COLUMNS
+
+# Kline attributes / normalized dict keys -> Candles column
+KLINE_FIELDS = {'open': 'open_price', 'high': 'high_price', 'low': 'low_price',
+                'close': 'close_price', 'volume': 'volume'}
+
+_UTC_HOST = time.timezone == 0 and not time.daylight
+
+TimeLike = Union[int, datetime, np.datetime64]
+
+
+def wall_to_epoch_ms(wall: Any) -> np.ndarray:
+    """Epoch ms (int64) of naive local wall times"""
+    wall = np.asarray(wall, dtype='datetime64[ms]')
+    if _UTC_HOST:
+        return wall.view(np.int64)
+    return np.array([int(t.timestamp() * 1000) for t in wall.astype(object)], dtype=np.int64)
+
+
+def epoch_ms_to_wall(time_ms: np.ndarray) -> np.ndarray:
+    """Naive local wall times (datetime64[ms]) of epoch ms"""
+    if _UTC_HOST:
+        return time_ms.view('datetime64[ms]')
+    return np.array([datetime.fromtimestamp(ms / 1000) for ms in time_ms.tolist()], dtype='datetime64[ms]')
+
+
+def to_ms(value: TimeLike) -> int:
+    """Epoch ms of an int (already ms), naive datetime or datetime64"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return int(wall_to_epoch_ms(np.array([value]))[0])
+
+
+class Candles(Mapping):
+    """Klines of one symbol/interval as int64 epoch-ms times and float64 OHLCV arrays"""
+
+    __slots__ = ('time_ms', 'open', 'high', 'low', 'close', 'volume', 'symbol', 'interval')
+
+    def __init__(self,
+                 time_ms: Any,
+                 open: Any,
+                 high: Any,
+                 low: Any,
+                 close: Any,
+                 volume: Any,
+                 symbol: Optional[str] = None,
+                 interval: Optional[str] = None):
+        """
+        Arrays of the right dtype are used as is (not copied).
+
+        Raises:
+            ValueError: If the columns differ in length
+        """
+        self.time_ms = np.asarray(time_ms, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+        self.symbol = symbol
+        self.interval = interval
+
+        n = len(self.time_ms)
+        if any(len(getattr(self, name)) != n for name in PRICE_COLUMNS):
+            raise ValueError("Candle columns must have equal length")
+
+    # Construction
+
+    @classmethod
+    def empty(cls, symbol: Optional[str] = None, interval: Optional[str] = None) -> 'Candles':
+        return cls(np.empty(0, np.int64), *(np.empty(0) for _ in PRICE_COLUMNS), symbol=symbol, interval=interval)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]], **meta) -> 'Candles':
+        """From ``(open_time, open, high, low, close, volume)`` tuples, e.g. range query results"""
+        if not rows:
+            return cls.empty(**meta)
+        fields = list(zip(*rows))
+        return cls(wall_to_epoch_ms(np.array(fields[0], dtype='datetime64[ms]')), *fields[1:6], **meta)
+
+    @classmethod
+    def from_klines(cls, klines: Iterable[Any], **meta) -> 'Candles':
+        """From kline objects (ORM rows) or normalized kline dicts with ``open_price``... fields"""
+        klines = list(klines)
+        if not klines:
+            return cls.empty(**meta)
+        get = (lambda k, f: k[f]) if isinstance(klines[0], dict) else getattr
+        times = np.array([get(k, 'open_time') for k in klines], dtype='datetime64[ms]')
+        return cls(
+            wall_to_epoch_ms(times),
+            *(np.fromiter((float(get(k, field)) for k in klines), np.float64, len(klines))
+              for field in KLINE_FIELDS.values()),
+            **meta
+        )
+
+    @classmethod
+    def from_binance(cls, raw: Sequence[Sequence[Any]], **meta) -> 'Candles':
+        """From Binance REST kline rows (``[open_ms, "o", "h", "l", "c", "v", close_ms, ...]``)"""
+        if not raw:
+            return cls.empty(**meta)
+        table = np.array([row[:6] for row in raw], dtype=object)
+        return cls(table[:, 0].astype(np.int64), *(table[:, i].astype(np.float64) for i in range(1, 6)), **meta)
+
+    @classmethod
+    def from_arrays(cls, arrays: 'Mapping[str, Any]', **meta) -> 'Candles':
+        """From an ``ohlcv_arrays`` style mapping (``open_time`` datetime64 or ``time_ms``)"""
+        if isinstance(arrays, Candles):
+            return arrays
+        time_ms = arrays['time_ms'] if 'time_ms' in arrays else wall_to_epoch_ms(arrays['open_time'])
+        return cls(time_ms, *(arrays[name] for name in PRICE_COLUMNS), **meta)
+
+    @classmethod
+    def from_pandas(cls, df: pd.DataFrame, **meta) -> 'Candles':
+        """
+        From a DataFrame indexed by open time, with lower-case or title-case
+        (backtesting) OHLCV columns; float64 columns are not copied
+        """
+        columns = {c.lower(): c for c in df.columns}
+        times = df.index if isinstance(df.index, pd.DatetimeIndex) else pd.DatetimeIndex(df[columns['open_time']])
+        return cls(
+            wall_to_epoch_ms(times.to_numpy()),
+            *(df[columns[name]].to_numpy(dtype=np.float64, copy=False) for name in PRICE_COLUMNS),
+            **meta
+        )
+
+    @classmethod
+    def concat(cls, chunks: Iterable['Candles']) -> 'Candles':
+        """Join chunks into one ascending series, keeping one candle per open time"""
+        chunks = list(chunks)
+        meta = {'symbol': chunks[0].symbol, 'interval': chunks[0].interval} if chunks else {}
+        chunks = [c for c in chunks if len(c)]
+        if not chunks:
+            return cls.empty(**meta)
+        if len(chunks) == 1:
+            return chunks[0]
+
+        time_ms = np.concatenate([c.time_ms for c in chunks])
+        _, first = np.unique(time_ms, return_index=True)
+        return cls(time_ms[first], *(np.concatenate([getattr(c, name) for c in chunks])[first]
+                                     for name in PRICE_COLUMNS), **meta)
+
+    # Mapping of OHLCV_COLUMNS, and zero-copy slicing
+
+    def __len__(self) -> int:
+        return len(self.time_ms)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(OHLCV_COLUMNS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in OHLCV_COLUMNS or key == 'time_ms'
+
+    def __getitem__(self, key: Union[str, slice]) -> Any:
+        if isinstance(key, slice):
+            return Candles(self.time_ms[key], *(getattr(self, name)[key] for name in PRICE_COLUMNS),
+                           symbol=self.symbol, interval=self.interval)
+        if key == 'open_time':
+            return self.open_time
+        if key == 'time_ms' or key in PRICE_COLUMNS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Candles):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            np.array_equal(self[name], other[name], equal_nan=name != 'open_time') for name in OHLCV_COLUMNS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        span = f"{self.open_time[0]} .. {self.open_time[-1]}" if len(self) else "empty"
+        return f"Candles({self.symbol or '?'} {self.interval or '?'}, {len(self)} rows, {span})"
+
+    @property
+    def open_time(self) -> np.ndarray:
+        """Open times as naive wall-time datetime64[ms] (a view on UTC hosts)"""
+        return epoch_ms_to_wall(self.time_ms)
+
+    def datetime_at(self, i: int) -> datetime:
+        return datetime.fromtimestamp(int(self.time_ms[i]) / 1000)
+
+    def tail(self, n: int) -> 'Candles':
+        return self[max(len(self) - n, 0):]
+
+    def between(self, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None) -> 'Candles':
+        """Candles with ``start <= open time <= end`` (a view; times must be ascending)"""
+        lo = 0 if start is None else int(np.searchsorted(self.time_ms, to_ms(start), side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.time_ms, to_ms(end), side='right'))
+        return self[lo:hi]
+
+    # Conversion
+
+    def to_pandas(self, title_case: bool = False) -> pd.DataFrame:
+        """
+        DataFrame over the same arrays, indexed by open time
+
+        Args:
+            title_case: Name columns Open/High/Low/Close/Volume as the
+                backtesting engine expects
+        """
+        names = [name.title() if title_case else name for name in PRICE_COLUMNS]
+        return pd.DataFrame(
+            {label: getattr(self, name) for label, name in zip(names, PRICE_COLUMNS)},
+            index=pd.DatetimeIndex(self.open_time, name='open_time'),
+            copy=False
+        )
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """``ohlcv_arrays`` style dict of the columns (no copies)"""
+        return {name: self[name] for name in OHLCV_COLUMNS}
+
+    def rows(self) -> Iterator[Tuple[int, float, float, float, float, float]]:
+        """``(time_ms, open, high, low, close, volume)`` tuples in order"""
+        return zip(self.time_ms.tolist(), *(getattr(self, name).tolist() for name in PRICE_COLUMNS))
+
+
+class CandleBuffer:
+    """Growable append buffer whose filled part is exposed as Candles views"""
+
+    def __init__(self,
+                 capacity: int = 1024,
+                 symbol: Optional[str] = None,
+                 interval: Optional[str] = None):
+        self.symbol = symbol
+        self.interval = interval
+        self._time_ms = np.empty(capacity, dtype=np.int64)
+        self._prices = np.empty((len(PRICE_COLUMNS), capacity), dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._time_ms)
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, 2 * self.capacity)
+        time_ms = np.empty(capacity, dtype=np.int64)
+        prices = np.empty((len(PRICE_COLUMNS), capacity), dtype=np.float64)
+        time_ms[:self._size] = self._time_ms[:self._size]
+        prices[:, :self._size] = self._prices[:, :self._size]
+        self._time_ms, self._prices = time_ms, prices
+
+    def append(self, time_ms: TimeLike, open: float, high: float, low: float, close: float, volume: float):
+        """Append one candle; replaces the last one if it has the same open time"""
+        ms = to_ms(time_ms)
+        if self._size and ms == self._time_ms[self._size - 1]:
+            self._size -= 1
+        elif self._size and ms < self._time_ms[self._size - 1]:
+            raise ValueError("Candles must be appended in ascending open time")
+        self._reserve(1)
+        self._time_ms[self._size] = ms
+        self._prices[:, self._size] = (open, high, low, close, volume)
+        self._size += 1
+
+    def extend(self, candles: Candles):
+        """Append candles newer than the last buffered one"""
+        if self._size:
+            candles = candles[int(np.searchsorted(candles.time_ms, self._time_ms[self._size - 1], side='right')):]
+        n = len(candles)
+        self._reserve(n)
+        self._time_ms[self._size:self._size + n] = candles.time_ms
+        for i, name in enumerate(PRICE_COLUMNS):
+            self._prices[i, self._size:self._size + n] = getattr(candles, name)
+        self._size += n
+
+    def trim(self, keep: int):
+        """Keep only the newest ``keep`` candles (moved to the front of the arrays)"""
+        if self._size <= keep:
+            return
+        start = self._size - keep
+        self._time_ms[:keep] = self._time_ms[start:self._size]
+        self._prices[:, :keep] = self._prices[:, start:self._size]
+        self._size = keep
+
+    def view(self) -> Candles:
+        """
+        Buffered candles without copying
+
+        Views see later in-place writes but not appends that reallocate or
+        ``trim``; take a new view after appending.
+        """
+        n = self._size
+        return Candles(self._time_ms[:n], *(self._prices[i, :n] for i in range(len(PRICE_COLUMNS))),
+                       symbol=self.symbol, interval=self.interval)
@@ -0,0 +1,84 @@
+"""
+Database Metrics
+
+Pool wait and query latency of a repository, kept in-process for
+``get_stats`` and mirrored to the Prometheus histograms when
+prometheus_client is installed:
+- pool wait: time from requesting a connection to holding one
+- query latency: time an operation holds its connection, per operation
+"""
+
+from typing import Any, Dict, Optional
+import math
+
+try:
+    from ..monitoring.core_metrics import system_metrics
+except ImportError:  # prometheus_client not installed
+    system_metrics = {}
+
+
+class LatencyStats:
+    """Count, mean and max of observed durations"""
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.mean * 1000, 3) if self.count else None,
+            'max_ms': round(self.max * 1000, 3)
+        }
+
+
+class DatabaseMetrics:
+    """Pool wait and per-operation query latency of one connection pool"""
+
+    def __init__(self, pool: str = 'marketdata'):
+        self.pool = pool
+        self.pool_wait = LatencyStats()
+        self.queries: Dict[str, LatencyStats] = {}
+        self.errors: Dict[str, int] = {}
+
+    def observe_pool_wait(self, seconds: float):
+        self.pool_wait.observe(seconds)
+        histogram = system_metrics.get('db_pool_wait')
+        if histogram is not None:
+            histogram.labels(pool=self.pool).observe(seconds)
+
+    def observe_query(self, operation: str, seconds: float, failed: bool = False):
+        self.queries.setdefault(operation, LatencyStats()).observe(seconds)
+        if failed:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+        histogram = system_metrics.get('db_query_latency')
+        if histogram is not None:
+            histogram.labels(pool=self.pool, operation=operation).observe(seconds)
+
+    def set_checked_out(self, connections: int):
+        gauge = system_metrics.get('db_pool_checked_out')
+        if gauge is not None:
+            gauge.labels(pool=self.pool).set(connections)
+
+    def to_dict(self, pool_status: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        stats = {
+            'pool': self.pool,
+            'pool_wait': self.pool_wait.to_dict(),
+            'queries': {name: latency.to_dict() for name, latency in sorted(self.queries.items())},
+            'errors': dict(self.errors)
+        }
+        if pool_status:
+            stats.update(pool_status)
+        return stats
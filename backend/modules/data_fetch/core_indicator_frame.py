@@ -0,0 +1,235 @@
+"""
+Wide Indicator Layout
+
+Indicator values stored as one record per (symbol, timeframe, timestamp) with a
+float column per indicator, shared by the Postgres table and the Parquet store.
+
+- ``INDICATOR_COLUMNS`` fixes the column set (the calculator's public outputs)
+- ``pivot_indicator_values`` turns narrow per-indicator dicts into wide rows
+- ``wide_backfill_sql`` does the same pivot in SQL to migrate stored values
+- ``merge_indicator_rows`` combines wide rows with rows not migrated yet
+- ``IndicatorFrame`` holds a range read as contiguous NumPy arrays
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ('symbol', 'timeframe', 'timestamp')
+
+INDICATOR_COLUMNS = (
+    'sma_20', 'sma_50', 'sma_200', 'ema_12', 'ema_26',
+    'macd', 'macd_signal', 'macd_histogram', 'rsi', 'stoch_k', 'stoch_d',
+    'bb_middle', 'bb_upper', 'bb_lower', 'bb_width', 'bb_percent',
+    'atr', 'obv', 'vwap', 'adx', 'di_plus', 'di_minus', 'cci', 'williams_r',
+    'ichimoku_conversion', 'ichimoku_base', 'ichimoku_span_a', 'ichimoku_span_b',
+)
+
+# Narrow ``additional_values`` keys that have their own wide column
+ADDITIONAL_COLUMNS = {
+    'macd': {'signal': 'macd_signal', 'histogram': 'macd_histogram'},
+}
+
+
+def pivot_indicator_values(values: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge narrow indicator dicts into one wide row per (symbol, timeframe, timestamp)
+
+    Args:
+        values: Dicts with symbol, indicator_name, timeframe, timestamp, value and
+            optional additional_values (as written by the indicator service)
+
+    Returns:
+        Rows with the key columns plus one entry per known indicator present;
+        missing values (None or NaN) are None, i.e. NULL
+    """
+    rows: Dict[Tuple[str, str, datetime], Dict[str, Any]] = {}
+
+    for v in values:
+        name = v['indicator_name']
+        if name not in INDICATOR_COLUMNS:
+            continue
+
+        key = (v['symbol'], v['timeframe'], v['timestamp'])
+        row = rows.setdefault(key, dict(zip(KEY_COLUMNS, key)))
+        row[name] = _to_float(v['value'])
+
+        for extra, column in ADDITIONAL_COLUMNS.get(name, {}).items():
+            extra_value = (v.get('additional_values') or {}).get(extra)
+            if extra_value is not None:
+                row[column] = _to_float(extra_value)
+
+    return list(rows.values())
+
+
+def wide_backfill_sql(narrow_table: str = 'indicator_values',
+                      wide_table: str = 'indicator_values_wide') -> str:
+    """
+    Postgres statement pivoting every narrow indicator row into the wide table
+
+    Values come from the indicator's own row, or for ``ADDITIONAL_COLUMNS``
+    from the parent indicator's ``additional_values`` JSON. Existing wide rows
+    are left untouched. NaN values are stored as NULL.
+    """
+    sources = {name: [f"MAX(NULLIF(value, 'NaN'::double precision)) FILTER (WHERE indicator_name = '{name}')"]
+               for name in INDICATOR_COLUMNS}
+    for parent, extras in ADDITIONAL_COLUMNS.items():
+        for extra, column in extras.items():
+            sources[column].append(
+                f"MAX(NULLIF((NULLIF(additional_values, '')::json ->> '{extra}')::double precision, "
+                f"'NaN'::double precision)) "
+                f"FILTER (WHERE indicator_name = '{parent}')"
+            )
+
+    columns = ', '.join(KEY_COLUMNS + INDICATOR_COLUMNS)
+    values = ',\n       '.join(
+        exprs[0] if len(exprs) == 1 else f"COALESCE({', '.join(exprs)})"
+        for exprs in sources.values()
+    )
+    names = ', '.join(f"'{name}'" for name in sorted({*INDICATOR_COLUMNS, *ADDITIONAL_COLUMNS}))
+    return (
+        f"INSERT INTO {wide_table} ({columns})\n"
+        f"SELECT symbol, timeframe, timestamp,\n       {values}\n"
+        f"FROM {narrow_table}\n"
+        f"WHERE indicator_name IN ({names})\n"
+        f"GROUP BY symbol, timeframe, timestamp\n"
+        f"ON CONFLICT (symbol, timeframe, timestamp) DO NOTHING"
+    )
+
+
+def merge_indicator_rows(rows: Sequence[Sequence[Any]],
+                         fallback: Sequence[Sequence[Any]],
+                         limit: Optional[int] = None) -> List[Tuple[Any, ...]]:
+    """
+    Union two sets of ``(timestamp, *values)`` rows in chronological order
+
+    Args:
+        rows: Preferred rows (the wide table)
+        fallback: Rows used only for timestamps missing from ``rows``
+        limit: Keep only the newest ``limit`` rows of the union
+
+    Returns:
+        Merged rows, oldest first
+    """
+    merged = {row[0]: tuple(row) for row in fallback}
+    merged.update((row[0], tuple(row)) for row in rows)
+    ordered = [merged[timestamp] for timestamp in sorted(merged)]
+    if limit is not None:
+        ordered = ordered[max(len(ordered) - limit, 0):]
+    return ordered
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+@dataclass
+class IndicatorReading:
+    """A single indicator value read back from the wide layout"""
+    symbol: str
+    indicator_name: str
+    timeframe: str
+    timestamp: datetime
+    value: float
+    parameters_dict: Dict[str, Any] = field(default_factory=dict)
+    additional_values_dict: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class IndicatorFrame:
+    """Indicator values of one symbol/timeframe over a time range, oldest first"""
+    symbol: str
+    timeframe: str
+    timestamps: np.ndarray  # datetime64[us]
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(cls,
+                  symbol: str,
+                  timeframe: str,
+                  rows: Sequence[Sequence[Any]],
+                  names: Sequence[str]) -> 'IndicatorFrame':
+        """
+        Build from ``(timestamp, *values)`` tuples in chronological order
+
+        NULL values become NaN.
+        """
+        if not rows:
+            return cls.empty(symbol, timeframe, names)
+
+        fields = list(zip(*rows))
+        return cls(
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamps=np.array(fields[0], dtype='datetime64[us]'),
+            columns={name: np.array(col, dtype=np.float64) for name, col in zip(names, fields[1:])}
+        )
+
+    @classmethod
+    def empty(cls, symbol: str, timeframe: str, names: Sequence[str]) -> 'IndicatorFrame':
+        return cls(symbol, timeframe, np.array([], dtype='datetime64[us]'),
+                   {name: np.array([], dtype=np.float64) for name in names})
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def timestamp_at(self, index: int) -> datetime:
+        return self.timestamps[index].astype('datetime64[us]').item()
+
+    def latest(self, names: Optional[Iterable[str]] = None) -> Dict[str, Tuple[float, datetime]]:
+        """Newest non-NaN value and its timestamp per column"""
+        latest = {}
+        for name in names or self.columns:
+            column = self.columns.get(name)
+            if column is None:
+                continue
+            valid = np.flatnonzero(~np.isnan(column))
+            if len(valid):
+                latest[name] = (float(column[valid[-1]]), self.timestamp_at(valid[-1]))
+        return latest
+
+    def readings(self, name: str) -> List[IndicatorReading]:
+        """Non-NaN values of one indicator as readings, oldest first"""
+        column = self.columns[name]
+        extras = {extra: self.columns[col] for extra, col in ADDITIONAL_COLUMNS.get(name, {}).items()
+                  if col in self.columns}
+        return [
+            IndicatorReading(
+                symbol=self.symbol,
+                indicator_name=name,
+                timeframe=self.timeframe,
+                timestamp=self.timestamp_at(i),
+                value=float(column[i]),
+                additional_values_dict={extra: float(values[i]) for extra, values in extras.items()
+                                        if not np.isnan(values[i])}
+            )
+            for i in np.flatnonzero(~np.isnan(column))
+        ]
+
+    def tail(self, periods: int) -> 'IndicatorFrame':
+        """The last ``periods`` records (views, no copy)"""
+        start = max(len(self) - periods, 0)
+        return IndicatorFrame(self.symbol, self.timeframe, self.timestamps[start:],
+                              {name: col[start:] for name, col in self.columns.items()})
+
+    def to_pandas(self) -> pd.DataFrame:
+        """DataFrame indexed by timestamp with one column per indicator"""
+        return pd.DataFrame(self.columns, index=pd.DatetimeIndex(self.timestamps, name='timestamp'))
+
+    @classmethod
+    def from_pandas(cls, symbol: str, timeframe: str, df: pd.DataFrame) -> 'IndicatorFrame':
+        return cls(
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamps=df.index.values.astype('datetime64[us]'),
+            columns={name: df[name].to_numpy(dtype=np.float64) for name in df.columns}
+        )
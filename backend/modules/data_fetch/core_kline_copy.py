@@ -0,0 +1,148 @@
+"""
+Kline COPY Ingest
+
+Building blocks of the bulk kline ingest path: rows are streamed with
+``COPY ... FROM STDIN`` into a staging table and merged into the kline table
+with a single ``INSERT ... SELECT ... ON CONFLICT`` per batch, so no large
+parameterized statement is ever compiled.
+
+- ``kline_copy_rows``: normalized kline dicts as records in ``KLINE_COPY_COLUMNS`` order
+- ``copy_csv``: records as a CSV buffer for ``COPY ... (FORMAT csv)``
+- ``copy_to_staging``: COPY through a psycopg2 or psycopg 3 cursor
+- ``staging_table_sql`` / ``merge_sql``: staging DDL and the merge statement
+- ``IngestStats``: rows, batches and rows/second of an ingest
+
+The staging table is a temporary table: never WAL-logged like an unlogged
+table, but private to the connection, so parallel ingests cannot see each
+other's rows. It lives as long as the connection; repositories run its DDL
+once per pooled connection and record that in the connection's ``info``
+under ``KLINE_STAGING_TABLE``.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import csv
+import io
+
+KLINE_KEY_COLUMNS = ('symbol', 'interval', 'open_time')
+
+KLINE_COPY_COLUMNS = KLINE_KEY_COLUMNS + (
+    'close_time', 'open_price', 'high_price', 'low_price', 'close_price', 'volume',
+    'quote_volume', 'number_of_trades', 'taker_buy_base_volume', 'taker_buy_quote_volume'
+)
+
+# Columns refreshed when a stored candle is ingested again (as bulk_save_klines)
+KLINE_UPDATE_COLUMNS = (
+    'high_price', 'low_price', 'close_price', 'volume', 'quote_volume',
+    'number_of_trades', 'taker_buy_base_volume', 'taker_buy_quote_volume'
+)
+
+KLINE_STAGING_TABLE = 'kline_ingest_staging'
+
+_DEFAULTS = {'quote_volume': 0}
+
+
+def kline_copy_rows(klines: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Any, ...]]:
+    """Kline dicts (as accepted by save_kline) as tuples in ``KLINE_COPY_COLUMNS`` order"""
+    for kline in klines:
+        yield tuple(kline.get(column, _DEFAULTS.get(column)) for column in KLINE_COPY_COLUMNS)
+
+
+def copy_csv(rows: Iterable[Sequence[Any]]) -> io.StringIO:
+    """
+    CSV buffer of records for ``COPY ... FROM STDIN WITH (FORMAT csv)``
+
+    None becomes an unquoted empty field, which COPY reads as NULL.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def copy_to_staging(cursor: Any, rows: Iterable[Sequence[Any]], staging: str = KLINE_STAGING_TABLE):
+    """
+    Stream records into the staging table through a DB-API cursor
+
+    psycopg2 cursors expose ``copy_expert``, psycopg 3 cursors ``copy``;
+    asyncpg connections have ``copy_to_table`` and are used directly.
+
+    Raises:
+        TypeError: If the driver has no COPY support
+    """
+    buffer = copy_csv(rows)
+    if hasattr(cursor, 'copy_expert'):
+        cursor.copy_expert(copy_sql(staging), buffer)
+    elif hasattr(cursor, 'copy'):
+        with cursor.copy(copy_sql(staging)) as copy:
+            copy.write(buffer.getvalue())
+    else:
+        raise TypeError(f"{type(cursor).__name__} does not support COPY")
+
+
+def staging_table_sql(target: str, staging: str = KLINE_STAGING_TABLE) -> List[str]:
+    """
+    Statements creating the connection's staging table if needed
+
+    ``seq`` numbers staged rows in arrival order so the merge keeps the latest
+    copy of a candle ingested twice in one batch.
+    """
+    columns = ', '.join(KLINE_COPY_COLUMNS)
+    return [
+        f"CREATE TEMPORARY TABLE IF NOT EXISTS {staging} AS "
+        f"SELECT {columns} FROM {target} WITH NO DATA",
+        f"ALTER TABLE {staging} ADD COLUMN IF NOT EXISTS seq BIGSERIAL",
+    ]
+
+
+def copy_sql(staging: str = KLINE_STAGING_TABLE) -> str:
+    return f"COPY {staging} ({', '.join(KLINE_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+
+def merge_sql(target: str,
+              constraint: Optional[str] = 'unique_kline',
+              staging: str = KLINE_STAGING_TABLE) -> str:
+    """
+    Single INSERT ... SELECT upserting the staged rows into ``target``
+
+    Only the newest staged copy of each candle is inserted (a row cannot be
+    updated twice by one statement). Without a ``constraint`` name the
+    conflict target is the key columns.
+    """
+    columns = ', '.join(KLINE_COPY_COLUMNS)
+    keys = ', '.join(KLINE_KEY_COLUMNS)
+    updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in KLINE_UPDATE_COLUMNS)
+    conflict = f"ON CONSTRAINT {constraint}" if constraint else f"({keys})"
+    return (
+        f"INSERT INTO {target} ({columns}) "
+        f"SELECT {columns} FROM ("
+        f"SELECT {columns}, row_number() OVER (PARTITION BY {keys} ORDER BY seq DESC) AS newest "
+        f"FROM {staging}) AS staged "
+        f"WHERE newest = 1 "
+        f"ON CONFLICT {conflict} DO UPDATE SET {updates}"
+    )
+
+
+@dataclass
+class IngestStats:
+    """Running totals of a bulk ingest"""
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    def add(self, rows: int, seconds: float, batches: int = 1):
+        self.rows += rows
+        self.batches += batches
+        self.seconds += seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'batches': self.batches,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1)
+        }
@@ -0,0 +1,132 @@
+"""
+Kline Gap Detection
+
+Missing candles in a stored kline series, found by the database so only the
+gap boundaries leave it:
+- ``kline_gap_query``: ``LAG()`` over the open times of a range; each row is
+  one run of missing candles
+- ``gap_window``: a requested range snapped to the interval's open-time grid
+- ``wall_clock_gaps``: the query's rows measured in epoch time
+
+The range is bracketed by two sentinel open times (one step before its first
+and after its last grid point), so gaps at either end and an empty range come
+out of the same comparison as gaps between stored candles. The scan reads
+only ``open_time`` and can be served by the (symbol, interval, open_time)
+index, whatever the length of the range.
+
+Open times are stored as naive local wall time (``datetime.fromtimestamp``),
+so the grid and the sentinels are derived in epoch ms and converted back,
+as ``wall_to_epoch_ms`` does. The database compares wall-clock spacing;
+spacings that only come from a DST shift are dropped by ``wall_clock_gaps``.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import DateTime, Table, and_, cast, func, select, union_all
+from sqlalchemy.sql import Select
+
+from .core_candles import to_ms
+from .core_fetch_planner import FetchPlanner
+
+# Intervals of uneven length: the largest spacing that is not a gap
+GAP_TOLERANCE = {'1M': timedelta(days=31)}
+
+# The epoch fell on a Thursday; Binance weeks open on Monday
+_GRID_OFFSET_MS = {'1w': 4 * 24 * 60 * 60 * 1000}
+
+
+def interval_step(interval: str) -> timedelta:
+    """Spacing of consecutive open times (approximate for 1M)"""
+    return timedelta(milliseconds=_step_ms(interval))
+
+
+def _step_ms(interval: str) -> int:
+    return FetchPlanner.INTERVAL_MS.get(interval, FetchPlanner.INTERVAL_MS['1m'])
+
+
+def _wall(time_ms: int) -> datetime:
+    return datetime.fromtimestamp(time_ms / 1000)
+
+
+def _shift(wall: datetime, time_ms: int) -> datetime:
+    """Wall time ``time_ms`` of epoch time after ``wall``"""
+    return _wall(to_ms(wall) + time_ms)
+
+
+def gap_window(interval: str, start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """
+    First and last open time on the interval grid inside ``[start, end]``
+
+    Monthly candles have no fixed grid; their bounds are returned unchanged.
+    """
+    if interval in GAP_TOLERANCE:
+        return start, end
+    step = _step_ms(interval)
+    offset = _GRID_OFFSET_MS.get(interval, 0)
+    first = -((offset - to_ms(start)) // step) * step + offset
+    last = (to_ms(end) - offset) // step * step + offset
+    return _wall(first), _wall(last)
+
+
+def wall_clock_gaps(rows: Iterable[Tuple[datetime, datetime]], interval: str) -> List[Tuple[datetime, datetime]]:
+    """
+    Rows of ``kline_gap_query`` re-measured in epoch time
+
+    Drops spacings that are only wider on the wall clock (a DST change
+    between two consecutive candles) and recomputes the bounds of real gaps
+    on the epoch grid. On a UTC host the rows come back unchanged.
+    """
+    step = interval_step(interval)
+    step_ms = _step_ms(interval)
+    tolerance_ms = GAP_TOLERANCE.get(interval, step) // timedelta(milliseconds=1)
+
+    gaps = []
+    for gap_start, gap_end in rows:
+        previous = to_ms(gap_start - step)
+        following = to_ms(gap_end + step)
+        if following - previous > tolerance_ms:
+            gaps.append((_wall(previous + step_ms), _wall(following - step_ms)))
+    return gaps
+
+
+def kline_gap_query(table: Table,
+                    symbol: str,
+                    interval: str,
+                    start: datetime,
+                    end: datetime) -> Select:
+    """
+    Runs of missing candles in ``[start, end]`` as ``(gap_start, gap_end)`` rows
+
+    Both bounds are open times of missing candles (inclusive), in order;
+    pass the rows through ``wall_clock_gaps``.
+
+    Args:
+        table: Kline table with symbol, interval and open_time columns
+        symbol: Trading symbol
+        interval: Time interval
+        start: Range start
+        end: Range end
+    """
+    step = interval_step(interval)
+    step_ms = _step_ms(interval)
+    first, last = gap_window(interval, start, end)
+    open_time = table.c.open_time
+
+    stored = select(open_time.label('open_time')).where(and_(
+        table.c.symbol == symbol,
+        table.c.interval == interval,
+        open_time >= first,
+        open_time <= last
+    ))
+    times = union_all(stored, select(cast(_shift(last, step_ms), DateTime).label('open_time'))).subquery()
+
+    previous = func.lag(times.c.open_time, 1, cast(_shift(first, -step_ms), DateTime)).over(order_by=times.c.open_time)
+    spacing = select(times.c.open_time, previous.label('previous')).subquery()
+
+    return select(
+        (spacing.c.previous + step).label('gap_start'),
+        (spacing.c.open_time - step).label('gap_end')
+    ).where(
+        spacing.c.open_time - spacing.c.previous > GAP_TOLERANCE.get(interval, step)
+    ).order_by(spacing.c.open_time)
@@ -0,0 +1,69 @@
+"""
+OHLCV Column Arrays
+
+Klines as column arrays, the form range reads materialize into without
+building per-row objects. Results are ``Candles`` (see core_candles), which
+also read as a mapping of ``OHLCV_COLUMNS`` to arrays:
+
+- ``open_time`` is datetime64[ms] (wall time as stored), prices and volume float64
+- Rows are in ascending open time
+"""
+
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Sequence, Union
+import logging
+
+import numpy as np
+
+from .core_candles import Candles
+
+logger = logging.getLogger(__name__)
+
+
+def ohlcv_arrays(rows: Sequence[Sequence[Any]], **meta) -> Candles:
+    """
+    Columns from ``(open_time, open, high, low, close, volume)`` tuples
+
+    Args:
+        rows: Result rows in ascending open time
+        **meta: ``symbol`` / ``interval`` recorded on the result
+
+    Returns:
+        Candles (empty for no rows)
+    """
+    return Candles.from_rows(rows, **meta)
+
+
+def ohlcv_arrays_by_symbol(rows: Sequence[Sequence[Any]],
+                           symbols: Iterable[str],
+                           **meta) -> Dict[str, Candles]:
+    """
+    Columns per symbol from ``(symbol, open_time, open, high, low, close, volume)`` tuples
+
+    Args:
+        rows: Result rows ordered by symbol, then ascending open time
+        symbols: Symbols requested; those without rows get empty Candles
+        **meta: ``interval`` recorded on the results
+
+    Returns:
+        Candles per symbol
+    """
+    result = {symbol: Candles.empty(symbol, **meta) for symbol in symbols}
+    for symbol, group in groupby(rows, key=itemgetter(0)):
+        result[symbol] = Candles.from_rows([row[1:] for row in group], symbol=symbol, **meta)
+    return result
+
+
+def empty_ohlcv() -> Candles:
+    return Candles.empty()
+
+
+def concat_ohlcv(chunks: Iterable[Union[Candles, Dict[str, np.ndarray]]]) -> Candles:
+    """
+    Join range reads into one ascending series, keeping one row per open time
+
+    Overlapping chunk boundaries (inclusive range ends) are deduplicated.
+    Plain ``{column: array}`` mappings are accepted as well.
+    """
+    return Candles.concat(Candles.from_arrays(chunk) for chunk in chunks)
@@ -0,0 +1,203 @@
+"""
+Weight Rate Limiter
+
+Token-bucket scheduler for Binance REST request weight, shared by all
+concurrent requests of a client:
+- Weight refills continuously at ``capacity`` per ``window`` seconds (minus
+  a safety ``headroom``); a request is admitted as soon as its weight is
+  available, so requests stay in flight back to back instead of in groups
+  separated by fixed sleeps
+- ``X-MBX-USED-WEIGHT-1M`` response headers reconcile the bucket with the
+  exchange's own count (weight used by other processes on the same IP)
+- 429 (rate limited) and 418 (IP banned) pause every request for the
+  ``Retry-After`` period, or an exponential backoff without one, and halve
+  the refill rate; each successful request restores it additively
+- ``max_in_flight`` bounds concurrent requests
+
+Waiting requests are admitted in arrival order.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Mapping, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# USD-M futures REST limit per IP
+BINANCE_FUTURES_WEIGHT_PER_MINUTE = 2400
+
+USED_WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1M'
+THROTTLE_STATUSES = (429, 418)
+
+
+def kline_request_weight(limit: int) -> int:
+    """Weight of one futures klines request for ``limit`` candles"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def used_weight(headers: Optional[Mapping[str, str]]) -> Optional[int]:
+    """Used weight reported by a response, if any"""
+    value = _header(headers, USED_WEIGHT_HEADER)
+    return int(value) if value is not None and value.isdigit() else None
+
+
+def retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Seconds from a ``Retry-After`` header, if any"""
+    value = _header(headers, 'Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        # Plain dicts are case-sensitive, unlike aiohttp's headers
+        lowered = name.lower()
+        value = next((v for k, v in headers.items() if k.lower() == lowered), None)
+    return value
+
+
+class WeightRateLimiter:
+    """Adaptive token bucket over request weight"""
+
+    def __init__(self,
+                 capacity: int = BINANCE_FUTURES_WEIGHT_PER_MINUTE,
+                 window: float = 60.0,
+                 headroom: float = 0.9,
+                 max_in_flight: int = 10,
+                 min_rate_factor: float = 0.1,
+                 recovery: float = 0.05,
+                 base_backoff: float = 1.0,
+                 max_backoff: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep):
+        """
+        Args:
+            capacity: Weight allowed per window by the exchange
+            window: Window length in seconds
+            headroom: Fraction of the capacity this limiter may use
+            max_in_flight: Concurrent requests
+            min_rate_factor: Lowest fraction of the refill rate after throttling
+            recovery: Refill rate fraction regained per successful request
+            base_backoff: Pause after a first throttle without Retry-After (doubles per repeat)
+            max_backoff: Longest pause without Retry-After
+            clock: Monotonic time source
+            sleep: Coroutine function sleeping for a number of seconds
+        """
+        self.capacity = capacity
+        self.window = window
+        self.budget = capacity * headroom
+        self.min_rate_factor = min_rate_factor
+        self.recovery = recovery
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.sleep = sleep
+
+        self.tokens = self.budget
+        self.rate_factor = 1.0
+        self.blocked_until = 0.0
+        self.strikes = 0                       # consecutive throttles
+        self._updated = clock()
+        self._queue = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+        self.stats = {
+            'requests': 0,
+            'weight': 0,
+            'throttled': 0,
+            'banned': 0,
+            'waited_seconds': 0.0,
+            'server_used_weight': None
+        }
+
+    @property
+    def refill_rate(self) -> float:
+        """Weight regained per second"""
+        return self.budget / self.window * self.rate_factor
+
+    def _refill(self) -> float:
+        now = self.clock()
+        self.tokens = min(self.budget, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+        return now
+
+    async def acquire(self, weight: int = 1):
+        """Wait until ``weight`` can be spent, then spend it"""
+        weight = min(weight, self.budget)
+        async with self._queue:
+            while True:
+                now = self._refill()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= weight:
+                    self.tokens -= weight
+                    self.stats['requests'] += 1
+                    self.stats['weight'] += weight
+                    return
+                else:
+                    delay = (weight - self.tokens) / self.refill_rate
+                self.stats['waited_seconds'] += delay
+                await self.sleep(delay)
+
+    @asynccontextmanager
+    async def request(self, weight: int = 1) -> AsyncIterator[None]:
+        """Hold an in-flight slot and ``weight`` tokens for one request"""
+        async with self._in_flight:
+            await self.acquire(weight)
+            yield
+
+    def observe_used_weight(self, used: int):
+        """Never keep more tokens than the exchange's reported usage leaves"""
+        self._refill()
+        self.stats['server_used_weight'] = used
+        self.tokens = min(self.tokens, self.budget - used)
+
+    def on_success(self):
+        self.strikes = 0
+        self.rate_factor = min(1.0, self.rate_factor + self.recovery)
+
+    def on_throttled(self, status: int, retry_after_seconds: Optional[float] = None) -> float:
+        """
+        Pause all requests after a 429/418 response
+
+        Returns:
+            Seconds until requests are admitted again
+        """
+        now = self._refill()
+        self.strikes += 1
+        self.stats['banned' if status == 418 else 'throttled'] += 1
+
+        pause = retry_after_seconds
+        if pause is None:
+            pause = min(self.max_backoff, self.base_backoff * 2 ** (self.strikes - 1))
+        self.blocked_until = max(self.blocked_until, now + pause)
+        self.rate_factor = max(self.min_rate_factor, self.rate_factor / 2)
+        self.tokens = min(self.tokens, 0.0)
+
+        logger.warning(
+            f"Exchange returned {status}; pausing requests for {pause:.1f}s, "
+            f"refill rate at {self.rate_factor:.0%}"
+        )
+        return self.blocked_until - now
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            **self.stats,
+            'tokens': round(self.tokens, 1),
+            'rate_factor': round(self.rate_factor, 3),
+            'blocked_for': round(max(0.0, self.blocked_until - self.clock()), 3)
+        }
@@ -0,0 +1,44 @@
+"""
+Wide indicator table
+
+``indicator_values_wide`` is declared on the same MetaData as the ORM tables
+in ``market_data_tables``, so ``Base.metadata.create_all`` creates it with
+them. Existing narrow ``IndicatorValue`` rows are copied over by
+``migrate_indicator_values_wide`` (see scripts/utils/migrate_indicator_values_wide.py).
+"""
+
+import logging
+
+from sqlalchemy import Column, DateTime, Float, String, Table, text
+from sqlalchemy.engine import Connection
+
+from .market_data_tables import IndicatorValue
+from .core_indicator_frame import INDICATOR_COLUMNS, wide_backfill_sql
+
+logger = logging.getLogger(__name__)
+
+# One row per (symbol, timeframe, timestamp), a float column per indicator
+indicator_values_wide = Table(
+    'indicator_values_wide',
+    IndicatorValue.metadata,
+    Column('symbol', String(20), primary_key=True),
+    Column('timeframe', String(10), primary_key=True),
+    Column('timestamp', DateTime, primary_key=True),
+    *[Column(name, Float) for name in INDICATOR_COLUMNS]
+)
+
+
+def migrate_indicator_values_wide(connection: Connection) -> int:
+    """
+    Create the wide table if needed and fill it from the narrow table
+
+    Rows already present in the wide table are kept, so the migration can be
+    re-run safely.
+
+    Returns:
+        Number of wide rows inserted
+    """
+    indicator_values_wide.create(connection, checkfirst=True)
+    result = connection.execute(text(wide_backfill_sql(IndicatorValue.__table__.name, indicator_values_wide.name)))
+    logger.info(f"Backfilled {result.rowcount} wide indicator rows from {IndicatorValue.__table__.name}")
+    return result.rowcount
@@ -23,6 +23,7 @@ class MarketDataRepositoryPort(Protocol):
         ...
     
     async def get_data_gaps(self, symbol: str, interval: str, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Runs of missing candles as inclusive (first, last) open times, found database-side"""
         ...
     
     async def get_latest_timestamp(self, symbol: str, interval: str) -> Optional[datetime]:
@@ -152,48 +153,46 @@ class BackfillKlinesService:
                 'errors': []
             }
             
-            # Process fetch plan in parallel batches
-            batch_size = self.config.parallel_downloads
-            for i in range(0, len(fetch_plan), batch_size):
-                batch = fetch_plan[i:i + batch_size]
-                
-                # Create tasks for parallel download
-                tasks = [
-                    self._download_batch(item)
-                    for item in batch
-                ]
-                
-                # Execute batch
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Process results
-                for item, result in zip(batch, results):
-                    if isinstance(result, Exception):
-                        logger.error(f"Failed to download {item['symbol']} {item['interval']}: {result}")
-                        stats['failed_batches'] += 1
-                        stats['errors'].append(str(result))
-                    else:
-                        stats['successful_batches'] += 1
-                        stats['total_candles'] += result['candles_count']
-                        stats['symbols_processed'].add(item['symbol'])
-                        stats['intervals_processed'].add(item['interval'])
-                        
-                        # Update progress
-                        self._update_progress(item['symbol'], item['interval'], 100.0)
-                
-                # Small delay between batch groups
-                if i + batch_size < len(fetch_plan):
-                    await asyncio.sleep(self.config.retry_delay)
+            # Keep up to parallel_downloads downloads in flight at all times;
+            # the exchange adapter paces their requests against the exchange
+            # limit (BinanceFuturesClient admits every page through its
+            # WeightRateLimiter)
+            semaphore = asyncio.Semaphore(self.config.parallel_downloads)
+            
+            async def download(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+                async with semaphore:
+                    try:
+                        return item, await self._download_batch(item)
+                    except Exception as e:
+                        return item, e
+            
+            # Process results as downloads finish
+            for finished in asyncio.as_completed([download(item) for item in fetch_plan]):
+                item, result = await finished
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to download {item['symbol']} {item['interval']}: {result}")
+                    stats['failed_batches'] += 1
+                    stats['errors'].append(str(result))
+                else:
+                    stats['successful_batches'] += 1
+                    stats['total_candles'] += result['candles_count']
+                    stats['symbols_processed'].add(item['symbol'])
+                    stats['intervals_processed'].add(item['interval'])
+                    
+                    # Update progress
+                    self._update_progress(item['symbol'], item['interval'], 100.0)
             
             # Convert sets to lists for JSON serialization
             stats['symbols_processed'] = list(stats['symbols_processed'])
             stats['intervals_processed'] = list(stats['intervals_processed'])
             stats['end_time'] = datetime.now()
             stats['duration'] = (stats['end_time'] - stats['start_time']).total_seconds()
+            stats['candles_per_second'] = stats['total_candles'] / stats['duration'] if stats['duration'] else 0.0
             
             logger.info(
                 f"Historical download complete: {stats['total_candles']} candles, "
-                f"{stats['successful_batches']}/{stats['total_batches']} batches successful"
+                f"{stats['successful_batches']}/{stats['total_batches']} batches successful, "
+                f"{stats['candles_per_second']:,.0f} candles/s"
             )
             
             return stats
@@ -150,6 +150,25 @@ system_metrics = {
         labels=['symbol', 'interval']
     ),
     
+    # Database
+    'db_pool_wait': metrics_registry.histogram(
+        'db_pool_wait_seconds',
+        'Time spent waiting for a pooled database connection',
+        labels=['pool'],
+        buckets=LATENCY_BUCKETS
+    ),
+    'db_query_latency': metrics_registry.histogram(
+        'db_query_latency_seconds',
+        'Latency of repository operations once a connection is held',
+        labels=['pool', 'operation'],
+        buckets=LATENCY_BUCKETS
+    ),
+    'db_pool_checked_out': metrics_registry.gauge(
+        'db_pool_checked_out',
+        'Database connections currently checked out of the pool',
+        labels=['pool']
+    ),
+    
     # System health
     'system_up': metrics_registry.gauge(
         'system_up',
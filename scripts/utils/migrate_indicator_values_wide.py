@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Create indicator_values_wide and fill it from the narrow indicator_values table
+
+Safe to re-run: rows already in the wide table are kept.
+"""
+
+import os
+import sys
+
+from sqlalchemy import create_engine
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from backend.modules.data_fetch.market_data_wide_tables import migrate_indicator_values_wide
+
+DATABASE_URL = os.environ.get('DATABASE_URL', 'postgresql://localhost/tradingbot')
+
+
+def main():
+    engine = create_engine(DATABASE_URL)
+    with engine.begin() as connection:
+        inserted = migrate_indicator_values_wide(connection)
+    print(f"✅ Migrated {inserted:,} wide indicator rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,7 +14,8 @@ from src.infrastructure.market_data.market_data_service import MarketDataService
 from src.infrastructure.indicators.indicator_service import IndicatorService
 from src.infrastructure.messaging.in_memory_event_bus import InMemoryEventBus
 from src.infrastructure.persistence.postgres.market_data_tables import Base
-from src.domain.shared.contracts.core_events import MarketDataReceived, IndicatorCalculated
+from src.domain.shared.contracts.core_events import MarketDataReceived
+from backend.modules.data_analysis.core_indicator_events import IndicatorSnapshotCalculated
 
 # Configure logging
 logging.basicConfig(
@@ -61,12 +62,13 @@ class MarketDataPipeline:
         def handle_market_data(event: MarketDataReceived):
             logger.info(f"Market data received: {event.symbol} @ {event.price}")
         
-        # Handle indicator events
-        def handle_indicator(event: IndicatorCalculated):
-            logger.info(f"Indicator calculated: {event.symbol} {event.indicator_name} = {event.value}")
+        # Handle indicator events: one snapshot per symbol, interval and candle
+        def handle_indicators(event: IndicatorSnapshotCalculated):
+            for indicator_name, value in event.values.items():
+                logger.info(f"Indicator calculated: {event.symbol} {event.interval} {indicator_name} = {value}")
         
         self.event_bus.subscribe('MarketDataReceived', handle_market_data)
-        self.event_bus.subscribe('IndicatorCalculated', handle_indicator)
+        self.event_bus.subscribe('IndicatorSnapshotCalculated', handle_indicators)
     
     async def start(self):
         """Start the market data pipeline"""
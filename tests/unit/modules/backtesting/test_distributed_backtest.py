@@ -0,0 +1,160 @@
+"""
+Unit tests for the distributed backtest coordinator and workers
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from backend.modules.backtesting.adapter_transport_tcp import (
+    TcpCoordinatorClient, TcpCoordinatorServer
+)
+from backend.modules.backtesting.port_job_transport import LocalCoordinatorClient
+from backend.modules.backtesting.port_results_store import InMemoryResultsStore
+from backend.modules.backtesting.service_distributed_backtest import (
+    BacktestCoordinator, BacktestShardRunner, BacktestWorker, DistributedConfig
+)
+
+
+def score_shard(shard):
+    return [
+        {'params': p, 'score': p['fast'] * 10 + p['slow'], 'pid': os.getpid()}
+        for p in shard['param_sets']
+    ]
+
+
+def broken_shard(shard):
+    raise RuntimeError("no data")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def config():
+    return DistributedConfig(shard_size=2, heartbeat_interval=0.01, heartbeat_timeout=10, max_retries=2)
+
+
+class TestBacktestCoordinator:
+    """Test suite for coordinator/worker sweeps"""
+
+    @pytest.mark.asyncio
+    async def test_sweep_is_sharded_and_aggregated(self, config):
+        store = InMemoryResultsStore()
+        coordinator = BacktestCoordinator(store, config)
+        job_id = coordinator.submit_sweep(
+            'GridStrategy', 'strategies:Grid', ['btc.parquet', 'eth.parquet'],
+            {'fast': [1, 2, 3], 'slow': [10, 20]}
+        )
+
+        workers = [
+            BacktestWorker(LocalCoordinatorClient(coordinator), score_shard, worker_id=f"w{i}", config=config)
+            for i in range(3)
+        ]
+        await asyncio.gather(*(w.run(exit_when_idle=True) for w in workers))
+
+        result_id = await coordinator.wait_for_job(job_id, timeout=1)
+        stored = store.retrieve_results(result_id)
+
+        assert coordinator.job_status(job_id)['total_shards'] == 6
+        assert len(stored['results']) == 12
+        assert stored['status'] == 'completed'
+        assert stored['best']['params'] == {'fast': 3, 'slow': 20}
+        assert {r['dataset_ref'] for r in stored['results']} == {'btc.parquet', 'eth.parquet'}
+
+    @pytest.mark.asyncio
+    async def test_lost_worker_shard_is_reassigned(self, config):
+        clock = FakeClock()
+        store = InMemoryResultsStore()
+        coordinator = BacktestCoordinator(store, config, clock=clock)
+        job_id = coordinator.submit_sweep('Grid', 'strategies:Grid', ['btc'], {'fast': [1], 'slow': [10]})
+
+        # Worker takes the only shard and disappears
+        lost = await coordinator.handle_message({'type': 'request_shard', 'worker_id': 'dead'})
+        assert lost['type'] == 'shard'
+
+        clock.now = 30.0
+        worker = BacktestWorker(LocalCoordinatorClient(coordinator), score_shard, worker_id='alive', config=config)
+        await worker.run(exit_when_idle=True)
+
+        # A late result from the dead worker must not be double counted
+        await coordinator.handle_message({
+            'type': 'shard_result', 'worker_id': 'dead', 'shard_id': lost['shard_id'],
+            'results': score_shard(lost)
+        })
+
+        stored = store.retrieve_results(await coordinator.wait_for_job(job_id, timeout=1))
+        assert worker.shards_completed == 1
+        assert coordinator.stats['shards_retried'] == 1
+        assert len(stored['results']) == 1
+
+    @pytest.mark.asyncio
+    async def test_shard_fails_after_max_retries(self, config):
+        store = InMemoryResultsStore()
+        coordinator = BacktestCoordinator(store, config)
+        job_id = coordinator.submit_sweep('Grid', 'strategies:Grid', ['btc'], {'fast': [1], 'slow': [10]})
+
+        worker = BacktestWorker(LocalCoordinatorClient(coordinator), broken_shard, worker_id='w', config=config)
+        await worker.run(exit_when_idle=True)
+
+        stored = store.retrieve_results(await coordinator.wait_for_job(job_id, timeout=1))
+        assert stored['status'] == 'partial'
+        assert coordinator.stats['shards_failed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_tcp_transport_round_trip(self, config):
+        store = InMemoryResultsStore()
+        coordinator = BacktestCoordinator(store, config)
+        server = TcpCoordinatorServer(coordinator, host='127.0.0.1', port=0)
+        await server.start()
+
+        try:
+            job_id = coordinator.submit_sweep('Grid', 'strategies:Grid', ['btc'], {'fast': [1, 2], 'slow': [10]})
+            client = TcpCoordinatorClient('127.0.0.1', server.port)
+            worker = BacktestWorker(client, score_shard, worker_id='remote', config=config)
+            await worker.run(exit_when_idle=True)
+            await client.close()
+
+            stored = store.retrieve_results(await coordinator.wait_for_job(job_id, timeout=1))
+            assert len(stored['results']) == 2
+            # Shards ran in the worker's own process, not on the event loop's thread
+            assert {r['pid'] for r in stored['results']} != {os.getpid()}
+        finally:
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_tcp_transport_requires_shared_secret(self, config):
+        coordinator = BacktestCoordinator(InMemoryResultsStore(), config)
+
+        with pytest.raises(ValueError):
+            await TcpCoordinatorServer(coordinator, host='0.0.0.0', port=0).start()
+
+        server = TcpCoordinatorServer(coordinator, port=0, secret='s3cret')
+        await server.start()
+        try:
+            client = TcpCoordinatorClient('127.0.0.1', server.port, timeout=1, secret='s3cret')
+            assert (await client.request({'type': 'heartbeat', 'worker_id': 'w'}))['type'] == 'ack'
+            await client.close()
+
+            intruder = TcpCoordinatorClient('127.0.0.1', server.port, timeout=1, secret='guess')
+            with pytest.raises(PermissionError):
+                await intruder.request({'type': 'request_shard', 'worker_id': 'x'})
+            assert 'x' not in coordinator._workers
+        finally:
+            await server.stop()
+
+    def test_strategy_ref_outside_allowlist_is_rejected(self):
+        runner = BacktestShardRunner(dataset_loader=lambda ref: None, allowed_packages=('strategies',))
+        shard = {
+            'dataset_ref': 'btc', 'strategy_ref': 'os:system', 'metric': 'Sharpe Ratio',
+            'param_sets': [{}]
+        }
+
+        with pytest.raises(PermissionError):
+            runner(shard)
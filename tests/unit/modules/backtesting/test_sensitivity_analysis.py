@@ -0,0 +1,132 @@
+"""
+Unit tests for ParameterSensitivityService
+"""
+
+import math
+
+import pytest
+
+from backend.modules.backtesting.service_sensitivity_analysis import (
+    ParameterSensitivityService, ParameterRange, SensitivityConfig
+)
+
+
+def quadratic_score(params):
+    """Peak of 10 at grid_spacing=1.0, levels=10"""
+    return 10 - (params['grid_spacing'] - 1.0) ** 2 - 0.01 * (params['levels'] - 10) ** 2
+
+
+class CountingEvaluator:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, params):
+        self.calls += 1
+        return quadratic_score(params)
+
+
+class PickleCountingEvaluator:
+    """Counts how often it is pickled in this (parent) process"""
+    pickles = 0
+
+    def __call__(self, params):
+        return quadratic_score(params)
+
+    def __getstate__(self):
+        PickleCountingEvaluator.pickles += 1
+        return {}
+
+
+class TestParameterSensitivityService:
+    """Test suite for ParameterSensitivityService"""
+
+    @pytest.fixture
+    def optimum(self):
+        return {'grid_spacing': 1.0, 'levels': 10}
+
+    @pytest.fixture
+    def ranges(self):
+        return [
+            ParameterRange('grid_spacing', step=0.25, min_value=0.5),
+            ParameterRange('levels', step=2, min_value=2, integer=True)
+        ]
+
+    def test_neighbours_are_clipped_and_rounded(self):
+        rng = ParameterRange('levels', step=1.6, min_value=8, integer=True)
+
+        assert rng.neighbours(10, 2) == [8, 10, 12, 13]
+
+    def test_heatmap_shape_and_peak(self, optimum, ranges):
+        service = ParameterSensitivityService(quadratic_score, SensitivityConfig(max_workers=1))
+
+        heatmap = service.heatmap(optimum, ranges[0], ranges[1])
+
+        assert heatmap['x_values'] == [0.5, 0.75, 1.0, 1.25, 1.5]
+        assert heatmap['y_values'] == [6, 8, 10, 12, 14]
+        assert len(heatmap['matrix']) == 5
+        assert all(len(row) == 5 for row in heatmap['matrix'])
+        assert heatmap['matrix'][2][2] == pytest.approx(10.0)
+        assert max(max(row) for row in heatmap['matrix']) == heatmap['matrix'][2][2]
+
+    def test_overlapping_neighbourhoods_are_not_recomputed(self, optimum, ranges):
+        evaluator = CountingEvaluator()
+        service = ParameterSensitivityService(evaluator, SensitivityConfig(max_workers=1))
+
+        service.heatmap(optimum, ranges[0], ranges[1])
+        calls_after_heatmap = evaluator.calls
+        curves = service.parameter_sensitivity(optimum, ranges)
+
+        # Both 1-D curves lie on the heatmap grid
+        assert evaluator.calls == calls_after_heatmap == 25
+        assert service.stats['cache_hits'] > 0
+        assert curves['grid_spacing']['scores'][2] == pytest.approx(10.0)
+
+    def test_process_pool_matches_serial(self, optimum, ranges):
+        serial = ParameterSensitivityService(quadratic_score, SensitivityConfig(max_workers=1))
+        parallel = ParameterSensitivityService(quadratic_score, SensitivityConfig(max_workers=2))
+
+        with parallel:
+            assert parallel.heatmaps(optimum, ranges) == serial.heatmaps(optimum, ranges)
+
+    def test_pool_is_reused_and_evaluator_sent_once_per_worker(self, optimum, ranges):
+        PickleCountingEvaluator.pickles = 0
+
+        with ParameterSensitivityService(PickleCountingEvaluator(), SensitivityConfig(max_workers=2)) as service:
+            service.heatmap(optimum, ranges[0], ranges[1])
+            pool = service._pool
+            service.clear_cache()
+            service.parameter_sensitivity(optimum, ranges)
+
+            assert service._pool is pool
+            assert service.stats['evaluations'] == 25 + 9
+            # Sent with the initializer (or inherited by fork), never per job
+            assert PickleCountingEvaluator.pickles <= 2
+
+        assert service._pool is None
+
+    def test_stability_score_is_range_normalised(self, optimum, ranges):
+        def negative(params):
+            return quadratic_score(params) - 20      # peak of -10
+
+        def spike(params):
+            return 5.0 if params == optimum else -1.0
+
+        plateau = ParameterSensitivityService(negative, SensitivityConfig(max_workers=1))
+        peaked = ParameterSensitivityService(spike, SensitivityConfig(max_workers=1))
+        flat = ParameterSensitivityService(lambda params: 0.0, SensitivityConfig(max_workers=1))
+
+        assert 0.5 < plateau.stability_score(optimum, ranges) < 1.0
+        assert peaked.stability_score(optimum, ranges) < plateau.stability_score(optimum, ranges)
+        assert flat.stability_score(optimum, ranges) == 1.0
+
+    def test_failed_evaluations_become_none(self, optimum, ranges):
+        def flaky(params):
+            if params['levels'] == 6:
+                raise RuntimeError("boom")
+            return quadratic_score(params)
+
+        service = ParameterSensitivityService(flaky, SensitivityConfig(max_workers=1))
+        heatmap = service.heatmap(optimum, ranges[0], ranges[1])
+
+        assert heatmap['matrix'][0] == [None] * 5
+        assert not math.isnan(service.stability_score(optimum, ranges))
@@ -0,0 +1,156 @@
+"""
+Unit tests for anchored VWAP and volume profile
+"""
+
+import math
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.modules.data_analysis.core_anchored_indicators import AnchoredVWAP, VolumeProfile
+from backend.modules.data_analysis.core_incremental_indicators import Candle
+from backend.modules.data_analysis.core_indicators import IndicatorCalculator
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+# Naive local datetimes of UTC instants, as klines are stored
+UTC_DAY = datetime.fromtimestamp(1704153600)  # 2024-01-02 00:00 UTC
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(4)
+    n = 4 * 24 * 3
+    close = 40000 + np.cumsum(rng.normal(0, 20, n))
+    start = UTC_DAY + timedelta(hours=6)  # mid-session
+    return pd.DataFrame({
+        'high': close + rng.uniform(0, 15, n),
+        'low': close - rng.uniform(0, 15, n),
+        'close': close,
+        'volume': rng.uniform(1, 10, n)
+    }, index=pd.DatetimeIndex([start + timedelta(minutes=15 * i) for i in range(n)]))
+
+
+def to_candles(df):
+    return [Candle(r.close, r.high, r.low, r.close, r.volume, ts.to_pydatetime())
+            for ts, r in zip(df.index, df.itertuples())]
+
+
+def session_vwap(df):
+    typical = (df['high'] + df['low'] + df['close']) / 3
+    return (typical * df['volume']).sum() / df['volume'].sum()
+
+
+class TestAnchoredVWAP:
+
+    def test_matches_batch_and_resets_each_session(self, ohlcv):
+        vwap = AnchoredVWAP('session')
+        rows = [vwap.update(c) for c in to_candles(ohlcv)]
+        batch = IndicatorCalculator.calculate_anchored_vwap(
+            ohlcv['high'], ohlcv['low'], ohlcv['close'], ohlcv['volume'], 'session')
+
+        actual = np.array([row['vwap'] for row in rows])
+        np.testing.assert_allclose(actual, batch, rtol=1e-12, equal_nan=True)
+
+        # The partial first session is not reported; later ones are exact
+        first_session = ohlcv.index < UTC_DAY + timedelta(days=1)
+        assert np.isnan(actual[first_session]).all()
+        day = ohlcv[(ohlcv.index >= UTC_DAY + timedelta(days=1)) & (ohlcv.index < UTC_DAY + timedelta(days=2))]
+        assert actual[np.flatnonzero(ohlcv.index == day.index[-1])[0]] == pytest.approx(session_vwap(day))
+
+        typical = (day['high'] + day['low'] + day['close']) / 3
+        expected_std = math.sqrt(np.average((typical - session_vwap(day)) ** 2, weights=day['volume']))
+        assert rows[np.flatnonzero(ohlcv.index == day.index[-1])[0]]['vwap_std'] == pytest.approx(expected_std)
+
+    def test_custom_anchor_and_peek(self, ohlcv):
+        anchor = UTC_DAY + timedelta(hours=20)
+        vwap = AnchoredVWAP(anchor)
+        candles = to_candles(ohlcv)
+        rows = [vwap.update(c) for c in candles[:-1]]
+
+        assert all(math.isnan(r['vwap']) for r, c in zip(rows, candles) if c.open_time < anchor)
+        since = ohlcv[(ohlcv.index >= anchor)]
+        provisional = vwap.peek(candles[-1])
+        assert provisional['vwap'] == pytest.approx(session_vwap(since))
+        assert vwap.update(candles[-1]) == provisional
+
+    def test_unknown_anchor_rejected(self):
+        with pytest.raises(ValueError):
+            AnchoredVWAP('month')
+
+
+class TestVolumeProfile:
+
+    def test_volume_spread_over_price_buckets(self):
+        profile = VolumeProfile(bin_size=10.0)
+        profile.add(Candle(100, 120, 100, 110, volume=4.0))
+        profile.add(Candle(115, 115, 115, 115, volume=2.0))
+        profile.add(Candle(60, 65, 55, 60, volume=1.0))  # extends the range downwards
+
+        prices, volumes = profile.histogram()
+        assert volumes.sum() == pytest.approx(7.0)
+        assert dict(zip(prices, volumes))[110.0] == pytest.approx(4.0)
+        assert dict(zip(prices, volumes))[50.0] == pytest.approx(0.5)
+        assert profile.point_of_control() == 115.0
+
+        low, high = profile.value_area(0.7)
+        inside = volumes[(prices >= low) & (prices < high)].sum()
+        assert inside >= 0.7 * 7.0
+        assert (low, high) == (100.0, 120.0)
+
+    def test_time_range_is_fixed(self):
+        start = datetime(2024, 1, 1, 10)
+        profile = VolumeProfile(1.0, start=start, end=start + timedelta(hours=1))
+
+        assert not profile.add(Candle(5, 6, 4, 5, 1.0, start - timedelta(minutes=1)))
+        assert profile.add(Candle(5, 6, 4, 5, 1.0, start))
+        assert not profile.add(Candle(5, 6, 4, 5, 1.0, start + timedelta(hours=1)))
+        assert profile.candles == 1
+
+
+class KlineRepository:
+    def __init__(self, klines):
+        self.klines = klines
+
+    def get_klines(self, symbol, interval, start_time=None, end_time=None, limit=1000):
+        rows = [k for k in self.klines
+                if (start_time is None or k.open_time >= start_time)
+                and (end_time is None or k.open_time <= end_time)]
+        return list(reversed(rows))[:limit]
+
+    def get_latest_kline(self, symbol, interval):
+        return self.klines[-1]
+
+    def bulk_save_indicator_values(self, values, batch_size=1000):
+        return len(values)
+
+
+class TestServiceAnchors:
+
+    @pytest.mark.asyncio
+    async def test_warm_up_seeds_session_vwap_from_anchor(self):
+        rng = np.random.default_rng(2)
+        start = UTC_DAY - timedelta(minutes=30)
+        close = 100 + np.cumsum(rng.normal(0, 0.1, 430))
+        klines = [
+            SimpleNamespace(
+                open_time=start + timedelta(minutes=i), close_time=start + timedelta(minutes=i, seconds=59),
+                open_price=c, high_price=c + 0.2, low_price=c - 0.2, close_price=c, volume=1.0 + i % 3
+            )
+            for i, c in enumerate(close)
+        ]
+        published = []
+        service = IndicatorService(event_bus=SimpleNamespace(publish=published.append))
+        service.repository = KlineRepository(klines)
+        service.vwap_anchors = ('session',)
+
+        values = await service.calculate_and_publish('BTCUSDT', '1m')
+
+        session = [k for k in klines if k.open_time >= UTC_DAY]
+        expected = sum((k.high_price + k.low_price + k.close_price) / 3 * k.volume for k in session) / \
+            sum(k.volume for k in session)
+        assert values['vwap_session'] == pytest.approx(expected)
+        assert published[-1].values['vwap_session'] == pytest.approx(expected)
+        assert 'vwap_std_session' in published[-1].values
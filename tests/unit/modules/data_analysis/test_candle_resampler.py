@@ -0,0 +1,154 @@
+"""
+Unit tests for multi-timeframe resampling from 1m candles
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.modules.data_analysis.core_candle_resampler import (
+    CandleResampler, bucket_start, to_epoch_ms
+)
+from backend.modules.data_analysis.core_incremental_indicators import Candle, IncrementalIndicatorSet
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+EPOCH_2024 = 1704067200000  # 2024-01-01 00:00 UTC, a Monday
+MINUTE = 60_000
+
+
+def minute_candle(i, price=100.0):
+    return Candle(price, price + 1, price - 1, price + 0.5, 10.0,
+                  datetime.fromtimestamp((EPOCH_2024 + i * MINUTE) / 1000))
+
+
+class TestCandleResampler:
+
+    def test_buckets_follow_binance_boundaries(self):
+        thursday = EPOCH_2024 + 3 * 86_400_000 + 5 * 3_600_000
+        assert bucket_start(thursday + 7 * MINUTE, '5m') == thursday + 5 * MINUTE
+        assert bucket_start(thursday + 7 * MINUTE, '4h') == thursday - 3_600_000
+        assert bucket_start(thursday, '1d') == EPOCH_2024 + 3 * 86_400_000
+        # Weekly candles open on Monday 00:00 UTC
+        assert bucket_start(thursday, '1w') == EPOCH_2024
+        monday = datetime.fromtimestamp(bucket_start(thursday, '1w') / 1000, tz=timezone.utc)
+        assert monday.weekday() == 0
+
+    def test_aggregates_and_closes_on_last_minute(self):
+        resampler = CandleResampler(['5m'])
+        prices = [100, 104, 98, 101, 103]
+
+        for i, price in enumerate(prices[:-1]):
+            update, = resampler.add('BTCUSDT', minute_candle(i, price))
+            assert not update.closed
+
+        update, = resampler.add('BTCUSDT', minute_candle(4, prices[-1]))
+        assert update.closed and update.complete
+        candle = update.candle
+        assert candle.open == 100
+        assert candle.high == 105
+        assert candle.low == 97
+        assert candle.close == 103.5
+        assert candle.volume == 50
+        assert to_epoch_ms(candle.open_time) == EPOCH_2024
+        assert resampler.open_candle('BTCUSDT', '5m') is None
+
+    def test_gap_closes_partial_bucket_and_duplicates_are_ignored(self):
+        resampler = CandleResampler(['5m'])
+        resampler.add('BTCUSDT', minute_candle(0))
+        assert resampler.add('BTCUSDT', minute_candle(0)) == []
+
+        closed, opened = resampler.add('BTCUSDT', minute_candle(7))
+        assert closed.closed and not closed.complete
+        assert to_epoch_ms(closed.candle.open_time) == EPOCH_2024
+        assert not opened.closed
+        assert to_epoch_ms(opened.candle.open_time) == EPOCH_2024 + 5 * MINUTE
+
+    def test_preview_does_not_change_state(self):
+        resampler = CandleResampler(['15m'])
+        resampler.add('BTCUSDT', minute_candle(0, 100))
+
+        preview, = resampler.preview('BTCUSDT', minute_candle(1, 120))
+        assert preview.candle.high == 121 and preview.candle.volume == 20
+        assert resampler.open_candle('BTCUSDT', '15m').high == 101
+
+    def test_unknown_interval_rejected(self):
+        with pytest.raises(ValueError):
+            CandleResampler(['7m'])
+
+
+def make_kline(candle, minutes):
+    return SimpleNamespace(
+        open_time=candle.open_time,
+        close_time=datetime.fromtimestamp((to_epoch_ms(candle.open_time) + minutes * MINUTE - 1) / 1000),
+        open_price=candle.open, high_price=candle.high, low_price=candle.low,
+        close_price=candle.close, volume=candle.volume
+    )
+
+
+def aggregate(candles, size):
+    out = []
+    for i in range(0, len(candles) - len(candles) % size, size):
+        chunk = candles[i:i + size]
+        out.append(Candle(chunk[0].open, max(c.high for c in chunk), min(c.low for c in chunk),
+                          chunk[-1].close, sum(c.volume for c in chunk), chunk[0].open_time))
+    return out
+
+
+class IntervalRepository:
+    def __init__(self, klines):
+        self.klines = klines
+        self.reads = []
+
+    def get_latest_kline(self, symbol, interval):
+        return self.klines[interval][-1]
+
+    def get_klines(self, symbol, interval, start_time=None, end_time=None, limit=1000):
+        self.reads.append(interval)
+        rows = [k for k in self.klines[interval]
+                if (start_time is None or k.open_time >= start_time) and
+                (end_time is None or k.open_time <= end_time)]
+        return list(reversed(rows))[:limit]
+
+    def bulk_save_indicator_values(self, values, batch_size=1000):
+        return len(values)
+
+
+@pytest.mark.asyncio
+async def test_higher_timeframes_follow_one_minute_reads():
+    rng = np.random.default_rng(3)
+    closes = 100 + np.cumsum(rng.normal(0, 1, 600))
+    minutes = [Candle(c, c + abs(rng.normal()), c - abs(rng.normal()), c + rng.normal(0, 0.2),
+                      float(rng.uniform(1, 5)), minute_candle(i).open_time)
+               for i, c in enumerate(closes)]
+    # Stored history ends part-way through a 5m bucket
+    stored, live = minutes[:403], minutes[403:]
+
+    repo = IntervalRepository({
+        '1m': [make_kline(c, 1) for c in stored],
+        '5m': [make_kline(c, 5) for c in aggregate(stored, 5)],
+    })
+    service = IndicatorService()
+    service.repository = repo
+    service.normalizer = SimpleNamespace(to_indicator_event=lambda **kwargs: kwargs)
+    service.event_bus = SimpleNamespace(publish=lambda event: None)
+    service.calculation_intervals = ['1m', '5m']
+    service.resampler = CandleResampler(['5m'])
+
+    await service.process_base_klines('BTCUSDT')
+
+    for candle in live:
+        repo.klines['1m'].append(make_kline(candle, 1))
+        repo.reads.clear()
+        await service.process_base_klines('BTCUSDT')
+        assert repo.reads == ['1m']
+
+    expected = IncrementalIndicatorSet()
+    for candle in aggregate(minutes, 5):
+        expected.update(candle)
+
+    stream = service.streams[('BTCUSDT', '5m')]
+    assert stream.last_open_time == aggregate(minutes, 5)[-1].open_time
+    for name, value in expected.latest_values.items():
+        assert stream.latest_values[name] == pytest.approx(value, rel=1e-9), name
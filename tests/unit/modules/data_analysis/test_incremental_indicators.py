@@ -0,0 +1,163 @@
+"""
+Unit tests for streaming incremental indicators
+"""
+
+import math
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.modules.data_analysis.core_incremental_indicators import (
+    Candle, IncrementalIndicator, IncrementalIndicatorSet
+)
+from backend.modules.data_analysis.core_indicators import IndicatorCalculator
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+WARMUP = 60
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(7)
+    n = 300
+    close = 30000 + np.cumsum(rng.normal(0, 40, n))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 5, n),
+        'high': close + rng.uniform(0, 30, n),
+        'low': close - rng.uniform(0, 30, n),
+        'close': close,
+        'volume': rng.uniform(1, 10, n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='min'))
+
+
+def to_candles(df):
+    return [
+        Candle(row.open, row.high, row.low, row.close, row.volume, ts.to_pydatetime())
+        for ts, row in zip(df.index, df.itertuples())
+    ]
+
+
+class TestIncrementalIndicators:
+    """Incremental outputs must match the batch calculator"""
+
+    def test_matches_batch_calculation(self, ohlcv):
+        batch = IndicatorCalculator().calculate_all_indicators(ohlcv)
+        stream = IncrementalIndicatorSet()
+        rows = [stream.update(c) for c in to_candles(ohlcv)]
+
+        for name, series in batch.items():
+            expected = series.iloc[WARMUP:].to_numpy()
+            actual = np.array([row.get(name, math.nan) for row in rows[WARMUP:]])
+            np.testing.assert_allclose(actual, expected, rtol=1e-7, atol=1e-8, err_msg=name)
+
+    def test_peek_does_not_mutate_state(self, ohlcv):
+        candles = to_candles(ohlcv)
+        stream = IncrementalIndicatorSet()
+        for c in candles[:-1]:
+            stream.update(c)
+
+        # Several provisional ticks for the open candle, then the close
+        last = candles[-1]
+        stream.peek(last._replace(close=last.close + 100, high=last.high + 100))
+        provisional = stream.peek(last)
+        final = stream.update(last)
+
+        assert provisional.keys() == final.keys()
+        for name, value in final.items():
+            assert provisional[name] == pytest.approx(value), name
+
+    def test_indicator_base_requires_step(self):
+        with pytest.raises(TypeError):
+            IncrementalIndicator()
+
+
+class FakeRepository:
+    def __init__(self, klines):
+        self.klines = klines
+        self.calls = []
+
+    def get_klines(self, symbol, interval, start_time=None, end_time=None, limit=1000):
+        self.calls.append(start_time)
+        rows = [k for k in self.klines if start_time is None or k.open_time >= start_time]
+        return list(reversed(rows))[:limit]
+
+    def get_latest_kline(self, symbol, interval):
+        return self.klines[-1] if self.klines else None
+
+    def bulk_save_indicator_values(self, values, batch_size=1000):
+        return len(values)
+
+
+class TestIndicatorServiceStreaming:
+
+    @pytest.mark.asyncio
+    async def test_only_new_klines_are_processed(self, ohlcv):
+        start = datetime.now() - timedelta(minutes=len(ohlcv) + 5)
+        klines = [
+            SimpleNamespace(
+                open_time=start + timedelta(minutes=i),
+                close_time=start + timedelta(minutes=i + 1) - timedelta(milliseconds=1),
+                open_price=c.open, high_price=c.high, low_price=c.low,
+                close_price=c.close, volume=c.volume
+            )
+            for i, c in enumerate(to_candles(ohlcv))
+        ]
+
+        service = IndicatorService(event_bus=SimpleNamespace(publish=lambda e: None))
+        service.repository = FakeRepository(klines[:-10])
+        service.normalizer = SimpleNamespace(to_indicator_event=lambda **kw: kw)
+
+        await service.calculate_and_publish('BTCUSDT', '1m', lookback_periods=len(ohlcv))
+        assert service.stats['candles_streamed'] == len(ohlcv) - 10
+
+        service.repository.klines = klines
+        values = await service.calculate_and_publish('BTCUSDT', '1m', lookback_periods=len(ohlcv))
+
+        assert service.stats['candles_streamed'] == len(ohlcv)
+        assert service.stats['stream_warmups'] == 1
+        assert service.repository.calls[-1] == klines[-11].open_time
+
+        expected = IndicatorCalculator().get_latest_indicators(ohlcv)
+        assert values['rsi'] == pytest.approx(expected['rsi'])
+        assert values['atr'] == pytest.approx(expected['atr'])
+
+    @pytest.mark.asyncio
+    async def test_klines_commit_only_once_closed(self, ohlcv):
+        start = datetime.now() - timedelta(minutes=len(ohlcv))
+        klines = [
+            SimpleNamespace(
+                open_time=start + timedelta(minutes=i),
+                close_time=start + timedelta(minutes=i + 1) - timedelta(milliseconds=1),
+                open_price=c.open, high_price=c.high, low_price=c.low,
+                close_price=c.close, volume=c.volume, is_closed=True
+            )
+            for i, c in enumerate(to_candles(ohlcv))
+        ]
+        # The last candle's close time has passed but its final update hasn't arrived
+        last = klines[-1]
+        klines[-1] = SimpleNamespace(**{**vars(last), 'close_price': last.close_price + 500, 'is_closed': False})
+
+        service = IndicatorService(event_bus=SimpleNamespace(publish=lambda e: None))
+        service.repository = FakeRepository(klines)
+        service.normalizer = SimpleNamespace(to_indicator_event=lambda **kw: kw)
+
+        await service.calculate_and_publish('BTCUSDT', '1m', lookback_periods=len(ohlcv))
+        stream = service.streams[('BTCUSDT', '1m')]
+        assert stream.last_open_time == klines[-2].open_time
+
+        klines[-1] = last
+        values = await service.calculate_and_publish('BTCUSDT', '1m', lookback_periods=len(ohlcv))
+
+        assert stream.last_open_time == last.open_time
+        assert values['rsi'] == pytest.approx(IndicatorCalculator().get_latest_indicators(ohlcv)['rsi'])
+
+    def test_flagless_klines_settle_after_close(self):
+        now = datetime(2024, 1, 1, 0, 1)
+        kline = SimpleNamespace(close_time=now - timedelta(milliseconds=1))
+
+        assert not IndicatorService._is_closed(kline, now)
+        assert IndicatorService._is_closed(kline, now + timedelta(seconds=10))
+        assert IndicatorService._is_closed(SimpleNamespace(close_time=None, is_closed=None), now)
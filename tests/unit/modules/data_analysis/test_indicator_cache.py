@@ -0,0 +1,171 @@
+"""
+Unit tests for the indicator result cache
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.modules.data_analysis.core_indicator_cache import IndicatorCache
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+from backend.modules.data_fetch.core_indicator_frame import IndicatorFrame
+
+T0 = datetime(2024, 1, 1)
+INDICATORS = ['rsi', 'macd']
+
+
+class TestIndicatorCache:
+
+    def test_hit_requires_same_candle_and_indicator_set(self):
+        cache = IndicatorCache()
+        cache.put('BTCUSDT', '1m', T0, INDICATORS, 'latest', {'rsi': 55.0})
+
+        assert cache.get('BTCUSDT', '1m', T0, ['macd', 'rsi'], 'latest') == {'rsi': 55.0}
+        assert cache.get('BTCUSDT', '1m', T0, ['rsi'], 'latest') is None
+        assert cache.get('BTCUSDT', '5m', T0, INDICATORS, 'latest') is None
+
+    def test_new_candle_invalidates_older_entries(self):
+        cache = IndicatorCache()
+        cache.put('BTCUSDT', '1m', T0, INDICATORS, 'latest', {'rsi': 55.0})
+        cache.put('ETHUSDT', '1m', T0, INDICATORS, 'latest', {'rsi': 40.0})
+
+        assert cache.advance('BTCUSDT', '1m', T0 + timedelta(minutes=1)) == 1
+        assert cache.get('BTCUSDT', '1m', T0, INDICATORS, 'latest') is None
+        assert cache.get('ETHUSDT', '1m', T0, INDICATORS, 'latest') == {'rsi': 40.0}
+
+        # Late results for an old candle are not cached
+        cache.put('BTCUSDT', '1m', T0, INDICATORS, 'latest', {'rsi': 1.0})
+        assert cache.get('BTCUSDT', '1m', T0, INDICATORS, 'latest') is None
+
+    def test_lru_eviction_by_count_and_memory(self):
+        cache = IndicatorCache(max_entries=2)
+        for symbol in ('A', 'B'):
+            cache.put(symbol, '1m', T0, INDICATORS, 'latest', {})
+        cache.get('A', '1m', T0, INDICATORS, 'latest')
+        cache.put('C', '1m', T0, INDICATORS, 'latest', {})
+
+        assert cache.get('B', '1m', T0, INDICATORS, 'latest') is None
+        assert cache.get('A', '1m', T0, INDICATORS, 'latest') is not None
+
+        small = IndicatorCache(max_bytes=2000)
+        for i in range(50):
+            small.put(f'S{i}', '1m', T0, INDICATORS, 'history', list(range(20)))
+        assert small.total_bytes <= 2000
+        assert small.stats['evictions'] > 0
+
+
+class CountingRepository:
+    def __init__(self, klines):
+        self.klines = klines
+        self.kline_reads = 0
+        self.indicator_reads = 0
+
+    def get_latest_kline(self, symbol, interval):
+        return self.klines[-1]
+
+    def get_klines(self, symbol, interval, start_time=None, end_time=None, limit=1000):
+        self.kline_reads += 1
+        rows = [k for k in self.klines if start_time is None or k.open_time >= start_time]
+        return list(reversed(rows))[:limit]
+
+    def get_indicator_frame(self, symbol, timeframe, indicator_names=None, start_time=None,
+                            end_time=None, limit=None, require=None):
+        self.indicator_reads += 1
+        return IndicatorFrame.empty(symbol, timeframe, indicator_names or [])
+
+    def bulk_save_indicator_values(self, values, batch_size=1000):
+        return len(values)
+
+
+@pytest.fixture
+def klines():
+    rng = np.random.default_rng(1)
+    start = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=300)
+    close = 100 + np.cumsum(rng.normal(0, 1, 100))
+    return [
+        SimpleNamespace(
+            open_time=start + timedelta(minutes=i), close_time=start + timedelta(minutes=i, seconds=59),
+            open_price=c, high_price=c + 1, low_price=c - 1, close_price=c, volume=1.0
+        )
+        for i, c in enumerate(close)
+    ]
+
+
+class TestServiceCache:
+
+    @pytest.mark.asyncio
+    async def test_no_recompute_without_new_candle(self, klines):
+        published = []
+        service = IndicatorService(event_bus=SimpleNamespace(publish=published.append))
+        service.repository = CountingRepository(klines)
+        service.normalizer = SimpleNamespace(to_indicator_event=lambda **kw: kw)
+
+        first = await service.calculate_and_publish('BTCUSDT', '1m')
+        second = await service.calculate_and_publish('BTCUSDT', '1m')
+
+        assert first == second
+        assert service.repository.kline_reads == 1
+        assert len(published) == 1  # one snapshot event per calculation
+
+        # Latest values are served from the cache without indicator queries
+        latest = await service.get_latest_indicators('BTCUSDT', '1m')
+        assert latest['rsi']['value'] == first['rsi']
+        assert service.repository.indicator_reads == 0
+
+    @pytest.mark.asyncio
+    async def test_new_candle_triggers_recompute(self, klines):
+        service = IndicatorService(event_bus=SimpleNamespace(publish=lambda e: None))
+        service.repository = CountingRepository(klines[:-1])
+        service.normalizer = SimpleNamespace(to_indicator_event=lambda **kw: kw)
+
+        await service.calculate_and_publish('BTCUSDT', '1m')
+        service.repository.klines = klines
+        service.on_kline_ingested('BTCUSDT', '1m', klines[-1].open_time)
+
+        assert await service.get_latest_indicators('BTCUSDT', '1m') == {}
+        await service.calculate_and_publish('BTCUSDT', '1m')
+        assert service.repository.kline_reads == 2
+
+    @pytest.mark.asyncio
+    async def test_closed_kline_event_invalidates_then_recomputes(self, klines):
+        service = IndicatorService(event_bus=SimpleNamespace(publish=lambda e: None))
+        service.repository = CountingRepository(klines[:-1])
+        service.calculation_intervals = ['1m']
+
+        def closed_event(kline):
+            return SimpleNamespace(symbol='BTCUSDT', timestamp=kline.close_time, is_closed=True)
+
+        await service.calculate_on_new_data(closed_event(klines[-2]))
+        await service.scheduler.drain(timeout=1)
+        before = await service.get_latest_indicators('BTCUSDT', '1m')
+        assert before['rsi']['timestamp'] == klines[-2].open_time
+        assert service.repository.indicator_reads == 0
+
+        service.repository.klines = klines
+        await service.calculate_on_new_data(closed_event(klines[-1]))
+        # Ingesting the kline drops the results of the previous candle at once
+        assert service.cache.head('BTCUSDT', '1m') == klines[-1].open_time
+        assert service.cache.get('BTCUSDT', '1m', klines[-2].open_time, service.enabled_indicators,
+                                 'records') is None
+
+        await service.scheduler.drain(timeout=1)
+        await service.scheduler.stop()
+        after = await service.get_latest_indicators('BTCUSDT', '1m')
+        assert after['rsi']['timestamp'] == klines[-1].open_time
+        assert service.repository.indicator_reads == 0
+
+    @pytest.mark.asyncio
+    async def test_warmup_reads_only_required_lookback(self, klines):
+        service = IndicatorService(event_bus=SimpleNamespace(publish=lambda e: None))
+        service.repository = CountingRepository(klines)
+        reads = []
+        get_klines = service.repository.get_klines
+        service.repository.get_klines = lambda *a, **kw: reads.append(kw.get('limit')) or get_klines(*a, **kw)
+
+        minimum, converged = service.required_lookback()
+        await service.calculate_and_publish('BTCUSDT', '1m')
+
+        assert reads == [converged]
+        assert minimum < converged
@@ -0,0 +1,61 @@
+"""
+Unit tests for batched indicator events
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from backend.modules.data_analysis.core_indicator_events import (
+    IndicatorSnapshotCalculated, expand_indicator_events
+)
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+T0 = datetime(2024, 1, 1)
+
+
+def per_indicator_event(**kwargs):
+    return SimpleNamespace(kind='IndicatorCalculated', **kwargs)
+
+
+class TestIndicatorEvents:
+
+    def test_snapshot_expands_to_per_indicator_events(self):
+        snapshot = IndicatorSnapshotCalculated('BTCUSDT', '1m', T0, {'rsi': 55.0, 'macd': 1.5})
+
+        events = expand_indicator_events(snapshot, per_indicator_event)
+
+        assert [(e.indicator_name, e.value) for e in events] == [('rsi', 55.0), ('macd', 1.5)]
+        assert all(e.symbol == 'BTCUSDT' and e.timestamp == T0 for e in events)
+
+        single = per_indicator_event(indicator_name='rsi')
+        assert expand_indicator_events(single, per_indicator_event) == [single]
+
+        payload = snapshot.to_dict()
+        assert payload['event_type'] == 'IndicatorSnapshotCalculated'
+        assert payload['values'] == {'rsi': 55.0, 'macd': 1.5}
+
+    def test_one_snapshot_per_calculation_by_default(self):
+        assert IndicatorService().event_format == 'snapshot'
+
+    @pytest.mark.parametrize('event_format, snapshots, singles', [
+        ('snapshot', 1, 0),
+        ('per_indicator', 0, 2),
+        ('both', 1, 2),
+    ])
+    def test_service_event_format(self, event_format, snapshots, singles):
+        published = []
+        service = IndicatorService(event_bus=SimpleNamespace(publish=published.append))
+        service.normalizer = SimpleNamespace(to_indicator_event=per_indicator_event)
+        service.enabled_indicators = ['rsi', 'macd']
+        service.event_format = event_format
+
+        service._publish_indicators('BTCUSDT', '1m', {'rsi': 55.0, 'macd': 1.5, 'macd_signal': 1.0, 'atr': 3.0},
+                                    T0, closed=True)
+
+        snapshot_events = [e for e in published if isinstance(e, IndicatorSnapshotCalculated)]
+        assert len(snapshot_events) == snapshots
+        assert len(published) - len(snapshot_events) == singles
+        if snapshot_events:
+            assert snapshot_events[0].values == {'rsi': 55.0, 'macd': 1.5, 'macd_signal': 1.0}
@@ -0,0 +1,135 @@
+"""
+Unit tests for the indicator computation graph
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.modules.data_analysis.core_indicator_graph import (
+    IndicatorGraph, IndicatorNode, _ema, _macd, _macd_signal, default_nodes
+)
+from backend.modules.data_analysis.core_indicators import IndicatorCalculator
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(11)
+    n = 300
+    close = 20000 + np.cumsum(rng.normal(0, 30, n))
+    return pd.DataFrame({
+        'open': close,
+        'high': close + rng.uniform(0, 25, n),
+        'low': close - rng.uniform(0, 25, n),
+        'close': close,
+        'volume': rng.uniform(1, 5, n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+
+
+def counting_graph():
+    calls = {}
+
+    def wrap(node):
+        def compute(*args):
+            calls[node.name] = calls.get(node.name, 0) + 1
+            return node.compute(*args)
+        return IndicatorNode(node.name, node.inputs, compute, node.public)
+
+    return IndicatorGraph(wrap(n) for n in default_nodes()), calls
+
+
+class TestIndicatorGraph:
+
+    def test_matches_ta_implementations(self, ohlcv):
+        calc = IndicatorCalculator()
+        result = calc.calculate_all_indicators(ohlcv)
+        h, l, c = ohlcv['high'], ohlcv['low'], ohlcv['close']
+
+        expected = {
+            'atr': calc.calculate_atr(h, l, c),
+            'rsi': calc.calculate_rsi(c),
+            'cci': calc.calculate_cci(h, l, c),
+            'williams_r': calc.calculate_williams_r(h, l, c),
+            'macd_signal': calc.calculate_macd(c)['signal'],
+            'bb_percent': calc.calculate_bollinger_bands(c)['percent'],
+            'stoch_d': calc.calculate_stochastic(h, l, c)['d'],
+            'ichimoku_span_b': calc.calculate_ichimoku(h, l, c)['span_b'],
+        }
+        expected.update(calc.calculate_adx(h, l, c))
+
+        for name, series in expected.items():
+            np.testing.assert_allclose(result[name], series, rtol=1e-9, atol=1e-9, err_msg=name)
+
+    def test_shared_intermediates_evaluated_once(self, ohlcv):
+        graph, calls = counting_graph()
+        graph.evaluate(ohlcv)
+
+        assert calls['true_range'] == 1
+        assert calls['ema_12'] == 1
+        assert calls['highest_high_14'] == 1
+        assert all(count == 1 for count in calls.values())
+
+    def test_only_required_nodes_evaluated(self, ohlcv):
+        graph, calls = counting_graph()
+        result = graph.evaluate(ohlcv, ['rsi', 'atr'])
+
+        assert set(result) == {'rsi', 'atr'}
+        assert set(calls) == {'rsi', 'atr', 'true_range'}
+
+    def test_unknown_and_cyclic_nodes_rejected(self):
+        graph = IndicatorGraph([
+            IndicatorNode('a', ('b',), lambda s: s),
+            IndicatorNode('b', ('a',), lambda s: s),
+        ])
+        with pytest.raises(ValueError):
+            graph.plan(['a'])
+        with pytest.raises(KeyError):
+            graph.plan(['missing'])
+
+    def test_volume_outputs_skipped_without_volume(self, ohlcv):
+        ohlcv['volume'] = 0.0
+        result = IndicatorCalculator().calculate_all_indicators(ohlcv)
+        assert 'obv' not in result and 'vwap' not in result
+        assert 'adx' in result
+
+
+class TestLookback:
+
+    def test_declared_warmups_match_first_valid_value(self, ohlcv):
+        calc = IndicatorCalculator()
+        result = calc.calculate_all_indicators(ohlcv)
+
+        # Outputs padded with NaN (ta seeds EMAs at the first bar and zero-fills ATR/ADX)
+        for name in ('sma_20', 'macd', 'macd_signal', 'rsi', 'cci', 'stoch_d', 'bb_upper', 'ichimoku_base'):
+            first_valid = int(np.argmax(np.isfinite(np.asarray(result[name], dtype=float))))
+            assert calc.graph.warmup_bars([name]) == first_valid + 1, name
+
+    def test_tail_of_lookback_matches_full_history(self, ohlcv):
+        calc = IndicatorCalculator()
+        names = ['rsi', 'macd_signal', 'atr', 'adx', 'ema_26', 'bb_upper']
+        lookback = calc.graph.lookback_bars(names)
+        assert lookback < len(ohlcv)
+
+        full = calc.calculate_all_indicators(ohlcv, names)
+        tail = calc.calculate_all_indicators(ohlcv.iloc[-lookback:], names)
+        for name in names:
+            expected = full[name].iloc[-1]
+            assert tail[name].iloc[-1] == pytest.approx(expected, rel=1e-3, abs=1e-3 * abs(expected) + 1e-6), name
+
+    def test_cumulative_outputs_reported(self):
+        graph = IndicatorCalculator().graph
+        assert graph.path_dependent(['rsi', 'obv', 'vwap']) == ['obv', 'vwap']
+        assert graph.lookback_bars(['sma_200']) == 200
+        assert graph.warmup_bars(['macd_signal']) == 34
+
+    def test_macd_seed_follows_node_periods(self, ohlcv):
+        nodes = [
+            IndicatorNode('fast', ('close',), _ema(3)),
+            IndicatorNode('slow', ('close',), _ema(6)),
+            IndicatorNode('macd', ('fast', 'slow'), _macd(6)),
+            IndicatorNode('macd_signal', ('macd',), _macd_signal(4), warmup=3),
+        ]
+        result = IndicatorGraph(nodes).evaluate({'close': ohlcv['close']}, ['macd', 'macd_signal'])
+
+        assert result['macd'].first_valid_index() == ohlcv.index[5]
+        assert result['macd_signal'].first_valid_index() == ohlcv.index[8]
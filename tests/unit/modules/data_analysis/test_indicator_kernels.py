@@ -0,0 +1,105 @@
+"""
+Parity tests for the NumPy indicator kernels against the ta implementations
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.modules.data_analysis.core_indicator_kernels import (
+    ema, rolling_max, rolling_mean, rolling_min, rolling_std
+)
+from backend.modules.data_analysis.core_indicators import IndicatorCalculator
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(5)
+    n = 600
+    close = 40000 + np.cumsum(rng.normal(0, 60, n))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 5, n),
+        'high': close + rng.uniform(0, 50, n),
+        'low': close - rng.uniform(0, 50, n),
+        'close': close,
+        'volume': rng.uniform(1, 20, n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+def ta_reference(calc, df):
+    h, l, c, v = df['high'], df['low'], df['close'], df['volume']
+    ref = {
+        'sma_20': calc.calculate_sma(c, 20),
+        'ema_26': calc.calculate_ema(c, 26),
+        'rsi': calc.calculate_rsi(c),
+        'atr': calc.calculate_atr(h, l, c),
+        'obv': calc.calculate_obv(c, v),
+        'vwap': calc.calculate_vwap(h, l, c, v),
+        'cci': calc.calculate_cci(h, l, c),
+        'williams_r': calc.calculate_williams_r(h, l, c),
+    }
+    for key, series in calc.calculate_macd(c).items():
+        ref['macd' if key == 'macd' else f'macd_{key}'] = series
+    for key, series in calc.calculate_bollinger_bands(c).items():
+        ref[f'bb_{key}'] = series
+    for key, series in calc.calculate_stochastic(h, l, c).items():
+        ref[f'stoch_{key}'] = series
+    ref.update(calc.calculate_adx(h, l, c))
+    ichimoku = calc.calculate_ichimoku(h, l, c)
+    ref['ichimoku_conversion'] = ichimoku['conversion_line']
+    ref['ichimoku_base'] = ichimoku['base_line']
+    ref['ichimoku_span_a'] = ichimoku['span_a']
+    ref['ichimoku_span_b'] = ichimoku['span_b']
+    return ref
+
+
+class TestNumpyKernels:
+
+    def test_backend_matches_ta(self, ohlcv):
+        calc = IndicatorCalculator(backend='numpy')
+        result = calc.calculate_all_indicators(ohlcv)
+
+        for name, expected in ta_reference(calc, ohlcv).items():
+            assert result[name].index.equals(ohlcv.index)
+            np.testing.assert_allclose(result[name], expected, rtol=1e-9, atol=1e-8, err_msg=name)
+
+    def test_backends_agree_on_subset(self, ohlcv):
+        names = ['rsi', 'macd', 'bb_upper', 'adx']
+        numpy_result = IndicatorCalculator(backend='numpy').calculate_all_indicators(ohlcv, names)
+        pandas_result = IndicatorCalculator().calculate_all_indicators(ohlcv, names)
+
+        assert set(numpy_result) == set(names)
+        for name in names:
+            np.testing.assert_allclose(numpy_result[name], pandas_result[name], rtol=1e-9, equal_nan=True)
+
+    def test_column_arrays_accepted_directly(self, ohlcv):
+        arrays = {col: ohlcv[col].to_numpy() for col in ohlcv.columns}
+        arrays['open_time'] = ohlcv.index.values
+        names = ['rsi', 'macd', 'obv']
+
+        numpy_result = IndicatorCalculator(backend='numpy').calculate_all_indicators(arrays, names)
+        pandas_result = IndicatorCalculator().calculate_all_indicators(arrays, names)
+        reference = IndicatorCalculator().calculate_all_indicators(ohlcv, names)
+
+        for name in names:
+            assert isinstance(numpy_result[name], np.ndarray)
+            assert pandas_result[name].index.equals(ohlcv.index)
+            np.testing.assert_allclose(numpy_result[name], reference[name], rtol=1e-9, equal_nan=True)
+            np.testing.assert_allclose(pandas_result[name], reference[name], rtol=1e-12, equal_nan=True)
+
+        latest = IndicatorCalculator(backend='numpy').get_latest_indicators(arrays, numpy_result)
+        assert latest['rsi'] == pytest.approx(reference['rsi'].iloc[-1])
+
+    def test_primitives_handle_leading_and_interior_nans(self):
+        x = np.array([np.nan, np.nan, 1.0, 2.0, 3.0, np.nan, 5.0, 6.0, 7.0, 8.0])
+        s = pd.Series(x)
+
+        np.testing.assert_allclose(rolling_mean(x, 3), s.rolling(3).mean(), equal_nan=True)
+        np.testing.assert_allclose(rolling_std(x, 3), s.rolling(3).std(ddof=0), equal_nan=True)
+        np.testing.assert_allclose(rolling_max(x, 3), s.rolling(3).max(), equal_nan=True)
+        np.testing.assert_allclose(rolling_min(x, 3, min_periods=1), s.rolling(3, min_periods=1).min(), equal_nan=True)
+        np.testing.assert_allclose(ema(x[:5], 3), s[:5].ewm(span=3, adjust=False).mean(), equal_nan=True)
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            IndicatorCalculator(backend='gpu')
@@ -0,0 +1,106 @@
+"""
+Unit tests for cross-symbol matrix indicator calculation
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.modules.data_analysis.core_indicator_matrix import (
+    IndicatorMatrixCalculator, build_ohlcv_matrix
+)
+from backend.modules.data_analysis.core_indicators import IndicatorCalculator
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+from backend.modules.data_fetch.core_ohlcv import ohlcv_arrays
+
+START = datetime(2024, 1, 1)
+
+
+def make_klines(rng, count, offset, base):
+    close = base + np.cumsum(rng.normal(0, 1, count))
+    return [
+        SimpleNamespace(
+            open_time=START + timedelta(hours=offset + i),
+            open_price=close[i], high_price=close[i] + rng.uniform(0, 1),
+            low_price=close[i] - rng.uniform(0, 1), close_price=close[i],
+            volume=rng.uniform(1, 5)
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def universe():
+    rng = np.random.default_rng(9)
+    # Symbols listed at different times
+    return {
+        'BTCUSDT': make_klines(rng, 300, 0, 100),
+        'ETHUSDT': make_klines(rng, 260, 40, 50),
+        'SOLUSDT': make_klines(rng, 120, 180, 20),
+    }
+
+
+class TestIndicatorMatrix:
+
+    def test_columns_match_single_symbol_calculation(self, universe):
+        times, symbols, columns = build_ohlcv_matrix(universe)
+        matrices = IndicatorMatrixCalculator().calculate(columns)
+        calc = IndicatorCalculator()
+
+        assert columns['close'].shape == (300, 3)
+
+        for j, symbol in enumerate(symbols):
+            df = calc.prepare_dataframe([vars(k) for k in universe[symbol]])
+            expected = calc.calculate_all_indicators(df)
+            offset = len(times) - len(df)
+
+            assert np.isnan(matrices['rsi'][:offset, j]).all()
+            for name, matrix in matrices.items():
+                np.testing.assert_allclose(
+                    matrix[offset:, j], expected[name], rtol=1e-8, atol=1e-8, err_msg=f"{symbol} {name}"
+                )
+
+    def test_latest_cross_section(self, universe):
+        _, symbols, columns = build_ohlcv_matrix(universe)
+        calculator = IndicatorMatrixCalculator()
+        latest = calculator.latest(calculator.calculate(columns, ['sma_200', 'rsi']), symbols)
+
+        assert 'sma_200' in latest['BTCUSDT']
+        assert 'sma_200' not in latest['SOLUSDT']
+        assert set(latest['SOLUSDT']) == {'rsi'}
+
+
+class FakeRepository:
+    def __init__(self, klines):
+        self.klines = klines
+        self.saved = []
+        self.reads = 0
+
+    def get_ohlcv_arrays_multi(self, symbols, interval, start_time=None, end_time=None, limit=None):
+        self.reads += 1
+        return {symbol: ohlcv_arrays([
+            (k.open_time, k.open_price, k.high_price, k.low_price, k.close_price, k.volume)
+            for k in self.klines.get(symbol, [])[-limit:]
+        ]) for symbol in symbols}
+
+    def bulk_save_indicator_values(self, values, batch_size=1000):
+        self.saved.extend(values)
+        return len(values)
+
+
+class TestCalculateUniverse:
+
+    @pytest.mark.asyncio
+    async def test_refresh_saves_latest_per_symbol(self, universe):
+        service = IndicatorService()
+        service.repository = FakeRepository({**universe, 'NEWUSDT': universe['SOLUSDT'][:10]})
+
+        latest = await service.calculate_universe(list(universe) + ['NEWUSDT'], '1h', lookback_periods=300)
+
+        assert set(latest) == set(universe)
+        assert service.repository.reads == 1  # one query for the whole universe
+        saved = {(d['symbol'], d['indicator_name']) for d in service.repository.saved}
+        assert ('ETHUSDT', 'macd') in saved
+        assert all(d['timestamp'] == universe[d['symbol']][-1].open_time for d in service.repository.saved)
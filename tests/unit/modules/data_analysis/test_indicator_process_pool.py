@@ -0,0 +1,66 @@
+"""
+Unit tests for process-pool historical indicator calculation
+"""
+
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from backend.modules.data_analysis import service_indicator_calc
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+
+def fake_backfill(task, batch_size, enabled_indicators):
+    time.sleep(0.05)
+    return {
+        'success': True,
+        'symbol': task['symbol'],
+        'interval': task['interval'],
+        'indicators_calculated': len(enabled_indicators),
+        'calculation_time': 0.05,
+        'pid': os.getpid(),
+        'has_session_factory': service_indicator_calc._worker_session_factory is not None
+    }
+
+
+def failing_backfill(task, batch_size, enabled_indicators):
+    raise RuntimeError("boom")
+
+
+class TestProcessPoolBackfill:
+
+    @pytest.mark.asyncio
+    async def test_tasks_run_in_worker_processes(self):
+        service = IndicatorService(database_url='sqlite://')
+        service.backfill_worker = fake_backfill
+
+        stats = await service.batch_calculate_historical(
+            ['BTCUSDT', 'ETHUSDT', 'SOLUSDT'], ['1h', '4h'],
+            datetime(2024, 1, 1), datetime(2024, 2, 1), parallel_workers=3
+        )
+
+        assert stats['total_tasks'] == 6
+        assert stats['successful'] == 6
+        assert stats['total_indicators'] == 6 * len(service.enabled_indicators)
+
+    @pytest.mark.asyncio
+    async def test_worker_failures_are_reported(self):
+        service = IndicatorService(database_url='sqlite://')
+        service.backfill_worker = failing_backfill
+
+        stats = await service.batch_calculate_historical(
+            ['BTCUSDT'], ['1h'], datetime(2024, 1, 1), datetime(2024, 2, 1), parallel_workers=2
+        )
+
+        assert stats['failed'] == 1
+        assert stats['failed_tasks'] == ['BTCUSDT_1h: boom']
+
+    def test_worker_initializer_opens_own_engine(self):
+        service_indicator_calc._init_backfill_worker('sqlite://')
+        try:
+            result = fake_backfill({'symbol': 'X', 'interval': '1m'}, 10, ['rsi'])
+            assert result['has_session_factory']
+        finally:
+            service_indicator_calc._init_backfill_worker(None)
@@ -0,0 +1,97 @@
+"""
+Unit tests for buffered indicator persistence in IndicatorService
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+
+class RecordingRepository:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def bulk_save_indicator_values(self, values, batch_size=1000):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(values))
+        return len(values)
+
+
+def value(i):
+    return {'symbol': 'BTCUSDT', 'indicator_name': 'rsi', 'timeframe': '1m',
+            'timestamp': datetime(2024, 1, 1, 0, i), 'value': 50.0 + i}
+
+
+@pytest.fixture
+def service():
+    service = IndicatorService()
+    service.repository = RecordingRepository()
+    service.write_buffer_size = 3
+    service.write_flush_interval = 0.05
+    return service
+
+
+class TestIndicatorWriteBuffer:
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_size(self, service):
+        for i in range(7):
+            await service._buffer_indicator_value(value(i))
+
+        assert [len(b) for b in service.repository.batches] == [3, 3]
+        await service.stop()
+        assert [len(b) for b in service.repository.batches] == [3, 3, 1]
+        assert service.stats['indicator_values_written'] == 7
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_time(self, service):
+        await service._buffer_indicator_value(value(0))
+        assert service.repository.batches == []
+
+        await asyncio.sleep(0.15)
+        assert len(service.repository.batches) == 1
+        await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_values(self, service):
+        service.write_buffer_size = 10
+        service.repository.fail = True
+        await service._buffer_indicator_value(value(0))
+        await service._buffer_indicator_value(value(1))
+
+        with pytest.raises(RuntimeError):
+            await service.flush_indicator_values()
+
+        assert len(service._write_buffer) == 2
+        service.repository.fail = False
+        assert await service.flush_indicator_values() == 2
+
+    @pytest.mark.asyncio
+    async def test_same_key_is_written_once_with_the_last_value(self, service):
+        service.write_buffer_size = 10
+        await service._buffer_indicator_value(value(0))
+        await service._buffer_indicator_value(value(1))
+        await service._buffer_indicator_value({**value(0), 'value': 99.0})  # open candle updated
+
+        assert await service.flush_indicator_values() == 2
+        batch, = service.repository.batches
+        assert [(v['timestamp'].minute, v['value']) for v in batch] == [(1, 51.0), (0, 99.0)]
+
+    @pytest.mark.asyncio
+    async def test_failed_flushes_keep_at_most_the_limit(self, service):
+        service.write_buffer_size = 10
+        service.write_buffer_limit = 3
+        service.repository.fail = True
+        for i in range(5):
+            await service._buffer_indicator_value(value(i))
+
+        with pytest.raises(RuntimeError):
+            await service.flush_indicator_values()
+
+        assert [v['timestamp'].minute for v in service._write_buffer.values()] == [2, 3, 4]
+        assert service.stats['indicator_values_dropped'] == 2
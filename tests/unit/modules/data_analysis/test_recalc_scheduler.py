@@ -0,0 +1,134 @@
+"""
+Unit tests for the coalescing indicator recalculation scheduler
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.modules.data_analysis.service_recalc_scheduler import RecalculationScheduler
+from backend.modules.monitoring.core_metrics import get_metric_value, system_metrics
+
+T0 = datetime(2024, 1, 1, 12, 0)
+
+
+class RecordingHandler:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+
+    async def __call__(self, symbol, interval):
+        self.calls.append((symbol, interval))
+        await asyncio.sleep(self.delay)
+
+
+class TestRecalculationScheduler:
+
+    @pytest.mark.asyncio
+    async def test_recalculates_once_per_closed_candle(self):
+        handler = RecordingHandler()
+        scheduler = RecalculationScheduler(handler)
+
+        for second in range(0, 60, 2):
+            scheduler.submit('BTCUSDT', '1m', T0 + timedelta(seconds=second))
+        await scheduler.drain(timeout=1)
+        assert handler.calls == [('BTCUSDT', '1m')]
+
+        scheduler.submit('BTCUSDT', '1m', T0 + timedelta(minutes=1))
+        scheduler.submit('ETHUSDT', '1m', T0 + timedelta(minutes=1))
+        await scheduler.drain(timeout=1)
+        await scheduler.stop()
+
+        assert handler.calls.count(('BTCUSDT', '1m')) == 2
+        assert handler.calls.count(('ETHUSDT', '1m')) == 1
+        assert scheduler.stats['ignored'] == 29
+
+    @pytest.mark.asyncio
+    async def test_closed_flag_decides_candle_close(self):
+        handler = RecordingHandler()
+        scheduler = RecalculationScheduler(handler)
+        close_time = T0 + timedelta(seconds=59, milliseconds=999)
+
+        # Open kline updates never close the candle, even across a bucket boundary
+        scheduler.submit('BTCUSDT', '1m', close_time, closed=False)
+        scheduler.submit('BTCUSDT', '1m', close_time + timedelta(minutes=1), closed=False)
+        await scheduler.drain(timeout=1)
+        assert handler.calls == []
+
+        scheduler.submit('BTCUSDT', '1m', close_time + timedelta(minutes=1), closed=True)
+        await scheduler.drain(timeout=1)
+        assert handler.calls == [('BTCUSDT', '1m')]
+
+        # Once flagged, unflagged trades in a new bucket are not closes
+        scheduler.submit('BTCUSDT', '1m', T0 + timedelta(minutes=5))
+        await scheduler.drain(timeout=1)
+        await scheduler.stop()
+
+        assert handler.calls == [('BTCUSDT', '1m')]
+        assert scheduler.stats['ignored'] == 3
+
+    @pytest.mark.asyncio
+    async def test_triggers_during_calculation_coalesce_into_one_rerun(self):
+        handler = RecordingHandler(delay=0.05)
+        scheduler = RecalculationScheduler(handler)
+
+        scheduler.submit('BTCUSDT', '1m', T0)
+        await asyncio.sleep(0.01)  # first run in flight
+        for minute in range(1, 6):
+            scheduler.submit('BTCUSDT', '1m', T0 + timedelta(minutes=minute))
+
+        assert scheduler.queue_depth == 1
+        assert get_metric_value(system_metrics['queue_depth'], {'queue_name': 'indicator_recalc'}) == 1
+
+        await scheduler.drain(timeout=1)
+        await scheduler.stop()
+
+        assert len(handler.calls) == 2
+        assert scheduler.stats['coalesced'] == 4
+        assert get_metric_value(system_metrics['queue_depth'], {'queue_name': 'indicator_recalc'}) == 0
+
+    @pytest.mark.asyncio
+    async def test_provisional_rate_limits_open_candle_updates(self):
+        handler = RecordingHandler()
+        scheduler = RecalculationScheduler(handler, provisional_interval=0.05)
+
+        for i in range(20):
+            scheduler.submit('BTCUSDT', '1m', T0 + timedelta(seconds=i))
+            await asyncio.sleep(0.01)
+        await scheduler.drain(timeout=1)
+        await scheduler.stop()
+
+        # Initial run plus one provisional refresh per 50 ms over ~200 ms
+        assert 2 <= len(handler.calls) <= 6
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_counted(self):
+        async def failing(symbol, interval):
+            raise RuntimeError("boom")
+
+        scheduler = RecalculationScheduler(failing)
+        scheduler.submit('BTCUSDT', '1m')
+        await scheduler.drain(timeout=1)
+        await scheduler.stop()
+
+        assert scheduler.stats['errors'] == 1
+        assert scheduler.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_closed_kline_event_confirms_stored_close():
+    from types import SimpleNamespace
+    from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+    service = IndicatorService()
+    close_time = datetime.now() - timedelta(milliseconds=1)
+    row = SimpleNamespace(close_time=close_time)
+    assert not IndicatorService._is_closed(row)
+
+    await service.calculate_on_new_data(SimpleNamespace(symbol='BTCUSDT', timestamp=close_time, is_closed=True))
+    await service.scheduler.stop()
+
+    confirmed = service.confirmed_closes[('BTCUSDT', '1m')]
+    assert confirmed == close_time
+    assert IndicatorService._is_closed(row, confirmed_close=confirmed)
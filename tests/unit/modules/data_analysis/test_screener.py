@@ -0,0 +1,139 @@
+"""
+Unit tests for the universe screener
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.modules.data_analysis.core_screener import CrossSection, Screener, ScreenerError
+from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+from backend.modules.data_fetch.core_ohlcv import ohlcv_arrays
+
+T0 = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def section():
+    section = CrossSection()
+    previous = {
+        'AAA': {'rsi': 35.0, 'close': 100.0, 'bb_lower': 95.0, 'atr': 2.0, 'macd_histogram': -0.5},
+        'BBB': {'rsi': 50.0, 'close': 10.0, 'bb_lower': 9.0, 'atr': 0.5, 'macd_histogram': 0.2},
+        'CCC': {'rsi': 40.0, 'close': 1.0, 'bb_lower': 0.9, 'atr': 0.1, 'macd_histogram': -0.1},
+    }
+    latest = {
+        'AAA': {'rsi': 25.0, 'close': 90.0, 'bb_lower': 92.0, 'atr': 3.0, 'macd_histogram': 0.4},
+        'BBB': {'rsi': 28.0, 'close': 9.5, 'bb_lower': 9.0, 'atr': 0.6, 'macd_histogram': -0.1},
+        'CCC': {'rsi': 20.0, 'close': 0.8, 'bb_lower': 0.85, 'atr': 0.2},
+    }
+    for symbol in previous:
+        section.update(symbol, previous[symbol], T0)
+        section.update(symbol, latest[symbol], T0 + timedelta(hours=1))
+    return section
+
+
+class TestScreener:
+
+    def test_boolean_conditions(self, section):
+        screener = Screener()
+
+        matches = screener.screen(section, 'rsi < 30 and close < bb_lower')
+        assert [m.symbol for m in matches] == ['AAA', 'CCC']
+
+        assert [m.symbol for m in screener.screen(section, 'not rsi < 27 or close > 5 and atr > 1')] == ['AAA', 'BBB']
+        assert [m.symbol for m in screener.screen(section, '(rsi < 27) & ~(atr > 1)')] == ['CCC']
+        assert [m.symbol for m in screener.screen(section, '20 <= rsi < 26')] == ['AAA', 'CCC']
+
+    def test_missing_values_never_match(self, section):
+        screener = Screener()
+        section.update('DDD', {'close': 50.0, 'atr': 1.0}, T0 + timedelta(hours=1))  # no RSI yet
+
+        assert [m.symbol for m in screener.screen(section, 'not rsi > 70')] == ['AAA', 'BBB', 'CCC']
+        assert [m.symbol for m in screener.screen(section, '~(rsi > 70)')] == ['AAA', 'BBB', 'CCC']
+        assert [m.symbol for m in screener.screen(section, '(rsi < 30) & (close > 5)')] == ['AAA', 'BBB']
+        assert [m.symbol for m in screener.screen(section, 'rsi > 50 and close > 5')] == []
+        # Unknown or true is true; unknown and false is false
+        assert [m.symbol for m in screener.screen(section, '(rsi < 0) | (close > 40)')] == ['AAA', 'DDD']
+        assert [m.symbol for m in screener.screen(section, 'not (rsi < 0 and close > 40)')] == ['AAA', 'BBB', 'CCC']
+        assert [m.symbol for m in screener.screen(section, 'not (rsi < 0 or close < 0)')] == ['AAA', 'BBB', 'CCC']
+        # CCC has no latest histogram: neither crossed nor not crossed
+        assert [m.symbol for m in screener.screen(section, 'not crosses_above(macd_histogram, 0)')] == ['BBB']
+
+    def test_crossing_uses_previous_candle(self, section):
+        screener = Screener()
+
+        assert [m.symbol for m in screener.screen(section, 'crosses_above(macd_histogram, 0)')] == ['AAA']
+        assert [m.symbol for m in screener.screen(section, 'crosses_below(macd_histogram, 0)')] == ['BBB']
+        # CCC has no latest histogram: NaN never matches
+        assert [m.symbol for m in screener.screen(section, 'rsi < prev(rsi) - 10')] == ['BBB', 'CCC']
+
+    def test_ranking_top_n(self, section):
+        matches = Screener().screen(section, 'rsi < 30', rank_by='atr / close * 100', top=2)
+
+        assert [m.symbol for m in matches] == ['CCC', 'BBB']
+        assert matches[0].rank_value == pytest.approx(25.0)
+        ascending = Screener().screen(section, rank_by='atr / close * 100', ascending=True)
+        assert [m.symbol for m in ascending] == ['AAA', 'BBB', 'CCC']
+
+    def test_invalid_expressions_rejected(self, section):
+        screener = Screener()
+        with pytest.raises(ScreenerError):
+            screener.screen(section, 'unknown_column > 1')
+        with pytest.raises(ScreenerError):
+            screener.screen(section, "__import__('os')")
+        with pytest.raises(ScreenerError):
+            screener.screen(section, 'rsi <')
+
+    def test_older_updates_ignored_and_same_candle_overwrites(self, section):
+        section.update('AAA', {'rsi': 99.0}, T0)
+        assert section.row('AAA')['rsi'] == 25.0
+
+        section.update('AAA', {'rsi': 24.0}, T0 + timedelta(hours=1))
+        assert section.row('AAA')['rsi'] == 24.0
+        assert section.column('rsi', previous=True)[0] == 35.0
+
+    def test_from_matrices_uses_each_symbols_last_candle(self):
+        times = np.array([T0 + timedelta(hours=i) for i in range(3)], dtype='datetime64[us]')
+        close = np.array([[1.0, 10.0], [2.0, 11.0], [3.0, np.nan]])
+        section = CrossSection.from_matrices(['AAA', 'BBB'], {'close': close}, times)
+
+        np.testing.assert_array_equal(section.column('close'), [3.0, 11.0])
+        np.testing.assert_array_equal(section.column('close', previous=True), [2.0, 10.0])
+        assert section.timestamps[1] == times[1]
+
+
+class ArrayRepository:
+    def __init__(self, arrays):
+        self.arrays = arrays
+
+    def get_ohlcv_arrays_multi(self, symbols, interval, start_time=None, end_time=None, limit=None):
+        return {symbol: self.arrays[symbol] for symbol in symbols}
+
+    def bulk_save_indicator_values(self, values, batch_size=1000):
+        return len(values)
+
+
+class TestServiceScreen:
+
+    @pytest.mark.asyncio
+    async def test_universe_refresh_fills_cross_section(self):
+        rng = np.random.default_rng(3)
+        arrays = {}
+        for symbol, scale in (('AAA', 100.0), ('BBB', 1.0)):
+            close = scale * (1 + np.cumsum(rng.normal(0, 0.01, 300)))
+            rows = [(T0 + timedelta(hours=i), c, c * 1.01, c * 0.99, c, 1.0) for i, c in enumerate(close)]
+            arrays[symbol] = ohlcv_arrays(rows)
+
+        service = IndicatorService(event_bus=SimpleNamespace(publish=lambda e: None))
+        service.repository = ArrayRepository(arrays)
+        latest = await service.calculate_universe(['AAA', 'BBB'], '1h', save=False)
+
+        matches = service.screen('1h', 'rsi >= 0', rank_by='atr / close * 100')
+        assert {m.symbol for m in matches} == {'AAA', 'BBB'}
+        for match in matches:
+            expected = latest[match.symbol]['atr'] / arrays[match.symbol]['close'][-1] * 100
+            assert match.rank_value == pytest.approx(expected)
+
+        assert service.screen('5m', 'rsi < 30') == []
@@ -0,0 +1,119 @@
+"""
+Unit tests for the columnar Candles container
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.modules.data_fetch.core_candles import CandleBuffer, Candles
+from backend.modules.data_fetch.core_ohlcv import concat_ohlcv, ohlcv_arrays, ohlcv_arrays_by_symbol
+
+T0 = datetime(2024, 1, 1)
+T0_MS = int(T0.timestamp() * 1000)
+
+
+def make_candles(n=50, start=0):
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return Candles(
+        T0_MS + 60_000 * np.arange(start, start + n),
+        close, close + 1, close - 1, close, rng.uniform(1, 5, n),
+        symbol='BTCUSDT', interval='1m'
+    )
+
+
+class TestCandles:
+
+    def test_slices_and_pandas_are_views(self):
+        candles = make_candles()
+        window = candles[10:20]
+        frame = candles.to_pandas(title_case=True)
+
+        assert len(window) == 10 and window.symbol == 'BTCUSDT'
+        assert np.shares_memory(window.close, candles.close)
+        assert np.shares_memory(frame['Close'].to_numpy(), candles.close)
+        assert list(frame.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert frame.index[0] == pd.Timestamp(T0)
+        assert Candles.from_pandas(frame) == candles
+
+    def test_between_is_inclusive(self):
+        candles = make_candles()
+        window = candles.between(T0 + timedelta(minutes=5), T0 + timedelta(minutes=9))
+        assert len(window) == 5
+        assert window.datetime_at(0) == T0 + timedelta(minutes=5)
+        assert len(candles.tail(3)) == 3 and len(candles.tail(100)) == 50
+
+    def test_sources_agree(self):
+        candles = make_candles(5)
+        raw = [[t, str(o), str(h), str(l), str(c), str(v), t + 59_999, '0']
+               for t, o, h, l, c, v in candles.rows()]
+        orm = [SimpleNamespace(open_time=candles.datetime_at(i), open_price=candles.open[i],
+                               high_price=candles.high[i], low_price=candles.low[i],
+                               close_price=candles.close[i], volume=candles.volume[i])
+               for i in range(len(candles))]
+        rows = [(k.open_time, k.open_price, k.high_price, k.low_price, k.close_price, k.volume) for k in orm]
+
+        assert Candles.from_binance(raw) == candles
+        assert Candles.from_klines(orm) == candles
+        assert ohlcv_arrays(rows) == candles
+        assert Candles.from_klines([]) == Candles.empty()
+
+    def test_rows_split_by_symbol(self):
+        candles = make_candles(4)
+        rows = [(symbol, candles.datetime_at(i), o, h, l, c, v)
+                for symbol, count in (('BTCUSDT', 4), ('ETHUSDT', 2))
+                for i, (_, o, h, l, c, v) in enumerate(list(candles.rows())[:count])]
+
+        arrays = ohlcv_arrays_by_symbol(rows, ['BTCUSDT', 'ETHUSDT', 'SOLUSDT'], interval='1m')
+
+        assert arrays['BTCUSDT'] == candles
+        assert arrays['ETHUSDT'] == candles[:2] and arrays['ETHUSDT'].symbol == 'ETHUSDT'
+        assert len(arrays['SOLUSDT']) == 0 and arrays['SOLUSDT'].interval == '1m'
+
+    def test_concat_dedupes_overlap(self):
+        merged = concat_ohlcv([make_candles(10), make_candles(10, start=5)])
+        assert len(merged) == 15
+        assert np.all(np.diff(merged.time_ms) == 60_000)
+
+    def test_mapping_consumers_accept_candles(self):
+        from backend.modules.data_analysis.core_indicator_matrix import build_ohlcv_matrix
+        from backend.modules.data_analysis.core_indicators import IndicatorCalculator
+
+        candles = make_candles(120)
+        calc = IndicatorCalculator()
+        from_candles = calc.calculate_all_indicators(candles, ['rsi', 'sma_20'])
+        from_frame = calc.calculate_all_indicators(candles.to_pandas(), ['rsi', 'sma_20'])
+        np.testing.assert_allclose(from_candles['rsi'], from_frame['rsi'])
+
+        times, symbols, columns = build_ohlcv_matrix({'BTCUSDT': candles, 'ETHUSDT': candles[60:]})
+        assert len(times) == 120 and symbols == ['BTCUSDT', 'ETHUSDT']
+        assert np.isnan(columns['close'][59, 1]) and columns['close'][60, 1] == candles.close[60]
+
+
+class TestCandleBuffer:
+
+    def test_append_replaces_open_candle(self):
+        buffer = CandleBuffer(capacity=2)
+        buffer.append(T0, 1, 2, 0.5, 1.5, 10)
+        buffer.append(T0, 1, 3, 0.5, 2.5, 12)
+        buffer.append(T0_MS + 60_000, 2.5, 3, 2, 2.8, 5)
+        buffer.append(T0_MS + 120_000, 2.8, 3, 2, 2.9, 5)
+
+        view = buffer.view()
+        assert len(view) == 3 and buffer.capacity >= 3
+        assert view.close.tolist() == [2.5, 2.8, 2.9]
+        with pytest.raises(ValueError):
+            buffer.append(T0, 1, 1, 1, 1, 1)
+
+    def test_extend_skips_known_and_trim_keeps_newest(self):
+        buffer = CandleBuffer(capacity=8)
+        buffer.extend(make_candles(10))
+        buffer.extend(make_candles(10, start=5))
+        assert len(buffer) == 15
+
+        buffer.trim(4)
+        assert buffer.view() == concat_ohlcv([make_candles(10), make_candles(10, start=5)]).tail(4)
@@ -0,0 +1,41 @@
+"""
+Unit tests for repository pool and query metrics
+"""
+
+import math
+
+from backend.boot.settings import DatabaseSettings
+from backend.modules.data_fetch.core_db_metrics import DatabaseMetrics, LatencyStats
+
+
+class TestDatabaseMetrics:
+
+    def test_latency_stats(self):
+        stats = LatencyStats()
+        assert math.isnan(stats.mean) and stats.to_dict()['mean_ms'] is None
+
+        stats.observe(0.010)
+        stats.observe(0.030)
+        assert stats.count == 2
+        assert stats.to_dict() == {'count': 2, 'mean_ms': 20.0, 'max_ms': 30.0}
+
+    def test_pool_wait_and_queries_tracked_per_operation(self):
+        metrics = DatabaseMetrics('test_pool')
+        metrics.observe_pool_wait(0.002)
+        metrics.observe_query('get_data_gaps', 0.05)
+        metrics.observe_query('get_data_gaps', 0.07, failed=True)
+        metrics.observe_query('bulk_insert_klines', 0.4)
+        metrics.set_checked_out(3)
+
+        stats = metrics.to_dict({'checked_out': 3})
+        assert stats['pool_wait']['count'] == 1
+        assert list(stats['queries']) == ['bulk_insert_klines', 'get_data_gaps']
+        assert stats['queries']['get_data_gaps']['max_ms'] == 70.0
+        assert stats['errors'] == {'get_data_gaps': 1}
+        assert stats['checked_out'] == 3
+
+    def test_async_url_uses_asyncpg_driver(self):
+        settings = DatabaseSettings(host='db', name='bot', user='u', password='p')
+        assert settings.async_connection_url == 'postgresql+asyncpg://u:p@db:5432/bot'
+        assert DatabaseSettings(url='postgres://u@h/db').async_connection_url == 'postgresql+asyncpg://u@h/db'
+        assert settings.pool_size > 0 and settings.statement_cache_size > 0
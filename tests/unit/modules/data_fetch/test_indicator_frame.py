@@ -0,0 +1,203 @@
+"""
+Unit tests for the wide indicator layout
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.modules.data_fetch.core_indicator_frame import (
+    IndicatorFrame, merge_indicator_rows, pivot_indicator_values, wide_backfill_sql
+)
+
+T0 = datetime(2024, 1, 31, 23, 58)
+
+
+def narrow(name, value, minute=0, **extra):
+    return {'symbol': 'BTCUSDT', 'indicator_name': name, 'timeframe': '1m',
+            'timestamp': T0 + timedelta(minutes=minute), 'value': value, **extra}
+
+
+class TestIndicatorFrame:
+
+    def test_pivot_merges_indicators_per_timestamp(self):
+        rows = pivot_indicator_values([
+            narrow('rsi', 55.0),
+            narrow('macd', 1.5, additional_values={'signal': 1.0, 'histogram': 0.5}),
+            narrow('rsi', 56.0, minute=1),
+            narrow('unknown', 1.0),
+        ])
+
+        assert rows == [
+            {'symbol': 'BTCUSDT', 'timeframe': '1m', 'timestamp': T0,
+             'rsi': 55.0, 'macd': 1.5, 'macd_signal': 1.0, 'macd_histogram': 0.5},
+            {'symbol': 'BTCUSDT', 'timeframe': '1m', 'timestamp': T0 + timedelta(minutes=1), 'rsi': 56.0},
+        ]
+
+    def test_pivot_writes_missing_values_as_null(self):
+        row, = pivot_indicator_values([
+            narrow('rsi', float('nan')),
+            narrow('atr', None),
+            narrow('macd', 1.5, additional_values={'signal': float('nan'), 'histogram': 0.5}),
+        ])
+
+        assert row['rsi'] is None and row['atr'] is None
+        assert row['macd_signal'] is None and row['macd_histogram'] == 0.5
+
+    def test_merge_fills_timestamps_missing_from_wide_rows(self):
+        t = [T0 + timedelta(minutes=i) for i in range(4)]
+        wide = [(t[1], 51.0), (t[3], 53.0)]
+        narrow_rows = [(t[0], 40.0), (t[1], 41.0), (t[2], 42.0)]
+
+        assert merge_indicator_rows(wide, narrow_rows) == [(t[0], 40.0), (t[1], 51.0), (t[2], 42.0), (t[3], 53.0)]
+        # The limit applies to the union, not to either source
+        assert merge_indicator_rows(wide, narrow_rows, limit=2) == [(t[2], 42.0), (t[3], 53.0)]
+        assert merge_indicator_rows([], [], limit=1) == []
+
+    def test_rows_become_contiguous_arrays(self):
+        rows = [(T0, 50.0, 1.0, 0.8), (T0 + timedelta(minutes=1), 52.0, None, None)]
+        frame = IndicatorFrame.from_rows('BTCUSDT', '1m', rows, ['rsi', 'macd', 'macd_signal'])
+
+        assert frame.columns['rsi'].dtype == np.float64
+        assert frame.columns['rsi'].flags['C_CONTIGUOUS']
+        assert np.isnan(frame.columns['macd'][1])
+
+        latest = frame.latest()
+        assert latest['rsi'] == (52.0, T0 + timedelta(minutes=1))
+        assert latest['macd'] == (1.0, T0)
+
+        reading, = frame.readings('macd')
+        assert reading.timestamp == T0
+        assert reading.additional_values_dict == {'signal': 0.8}
+
+        assert len(frame.tail(1)) == 1
+        assert len(IndicatorFrame.from_rows('BTCUSDT', '1m', [], ['rsi'])) == 0
+
+    def test_backfill_sql_pivots_narrow_rows(self):
+        sql = wide_backfill_sql('indicator_values', 'indicator_values_wide')
+
+        assert sql.startswith('INSERT INTO indicator_values_wide (symbol, timeframe, timestamp, sma_20')
+        assert "MAX(NULLIF(value, 'NaN'::double precision)) FILTER (WHERE indicator_name = 'rsi')" in sql
+        # MACD signal comes from its own rows or the macd row's JSON
+        assert ("COALESCE(MAX(NULLIF(value, 'NaN'::double precision)) FILTER (WHERE indicator_name = 'macd_signal'), "
+                "MAX(NULLIF((NULLIF(additional_values, '')::json ->> 'signal')::double precision, "
+                "'NaN'::double precision)) FILTER (WHERE indicator_name = 'macd'))") in sql
+        assert 'FROM indicator_values\n' in sql
+        assert sql.endswith('ON CONFLICT (symbol, timeframe, timestamp) DO NOTHING')
+
+
+def test_parquet_store_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    from backend.modules.data_fetch.adapter_indicator_parquet import ParquetIndicatorStore
+
+    store = ParquetIndicatorStore(str(tmp_path))
+    times = [T0 + timedelta(minutes=i) for i in range(4)]  # spans two months
+    frame = IndicatorFrame.from_rows('BTCUSDT', '1m', [(t, float(i), None) for i, t in enumerate(times)],
+                                     ['rsi', 'atr'])
+    assert store.write(frame) == 4
+    assert len(list(store.partition_dir('BTCUSDT', '1m').iterdir())) == 2
+
+    update = IndicatorFrame.from_rows('BTCUSDT', '1m', [(times[1], 2.5)], ['atr'])
+    store.write(update)
+
+    read = store.read('BTCUSDT', '1m', ['rsi', 'atr'], start_time=times[1], end_time=times[2])
+    assert list(read.columns['rsi']) == [1.0, 2.0]
+    assert read.columns['atr'][0] == 2.5 and np.isnan(read.columns['atr'][1])
+
+    tail = store.read_tail('BTCUSDT', '1m', 3, ['rsi', 'atr'], require='atr')
+    assert list(tail.columns['atr']) == [2.5]
+    assert list(store.read_tail('BTCUSDT', '1m', 3, ['rsi']).columns['rsi']) == [1.0, 2.0, 3.0]
+
+
+class FakeIndicatorStore:
+    """ParquetIndicatorStore keeping the written frames in memory"""
+
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(frame)
+        return len(frame)
+
+    def read_tail(self, symbol, timeframe, periods, indicator_names=None, require=None):
+        frame = self.frames[-1]
+        columns = [frame.columns.get(n, np.full(len(frame), np.nan)) for n in indicator_names]
+        rows = [(frame.timestamp_at(i), *[column[i] for column in columns])
+                for i in range(len(frame)) if not np.isnan(frame.columns[require][i])]
+        return IndicatorFrame.from_rows(symbol, timeframe, rows, indicator_names).tail(periods)
+
+
+@pytest.mark.asyncio
+async def test_service_archives_flushed_values_and_reads_history_from_the_store():
+    from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+    service = IndicatorService()
+    service.indicator_store = store = FakeIndicatorStore()
+    service.repository = SimpleNamespace(
+        bulk_save_indicator_values=lambda values, batch_size: len(values),
+        get_indicator_values=lambda **kwargs: pytest.fail('history is read from the store')
+    )
+    service.write_buffer_size = 100
+
+    for minute in range(3):
+        await service._buffer_indicator_value(narrow('macd', 1.0 + minute, minute=minute,
+                                               additional_values={'signal': 0.5, 'histogram': None}))
+    await service._buffer_indicator_value(narrow('rsi', 50.0, minute=3))
+    await service.flush_indicator_values()
+
+    frame, = store.frames
+    assert list(frame.columns['macd'][:3]) == [1.0, 2.0, 3.0]
+    assert np.isnan(frame.columns['macd'][3]) and frame.columns['rsi'][3] == 50.0
+
+    history = await service.get_indicator_history('BTCUSDT', 'macd', '1m', periods=2)
+    assert [h['value'] for h in history] == [2.0, 3.0]
+    assert history[-1]['additional'] == {'signal': 0.5}
+
+
+@pytest.mark.asyncio
+async def test_service_reads_latest_row_once():
+    from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+    reads = []
+
+    def get_indicator_frame(symbol, timeframe, indicator_names=None, limit=None, **kwargs):
+        reads.append(indicator_names)
+        values = {'rsi': 55.0, 'macd': 1.5, 'macd_signal': 1.0, 'macd_histogram': 0.5}
+        return IndicatorFrame.from_rows(symbol, timeframe, [(T0, *[values.get(n) for n in indicator_names])],
+                                        indicator_names)
+
+    service = IndicatorService()
+    service.repository = SimpleNamespace(get_indicator_frame=get_indicator_frame,
+                                         bulk_save_indicator_values=lambda values, batch_size: len(values))
+
+    latest = await service.get_latest_indicators('BTCUSDT', '1m')
+
+    assert len(reads) == 1
+    assert set(latest) == {'rsi', 'macd'}
+    assert latest['macd']['additional'] == {'signal': 1.0, 'histogram': 0.5}
+    assert latest['rsi']['parameters'] == {'period': 14}
+
+
+@pytest.mark.asyncio
+async def test_recalculation_deletes_narrow_and_wide_rows():
+    from backend.modules.data_analysis.service_indicator_calc import IndicatorService
+
+    deletes = []
+
+    def delete_indicator_values(symbol, timeframe, start_time, end_time):
+        deletes.append((symbol, timeframe))
+        return 7
+
+    async def batch_calculate_single(symbol, interval, start_date, end_date, batch_size):
+        return {'success': True, 'indicators_calculated': 9}
+
+    service = IndicatorService()
+    service.repository = SimpleNamespace(delete_indicator_values=delete_indicator_values)
+    service._batch_calculate_single = batch_calculate_single
+
+    result = await service.recalculate_all_indicators('BTCUSDT', '1h', lookback_days=1)
+
+    assert deletes == [('BTCUSDT', '1h')]
+    assert result == {'deleted': 7, 'recalculated': 9, 'success': True}
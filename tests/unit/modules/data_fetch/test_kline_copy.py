@@ -0,0 +1,143 @@
+"""
+Unit tests for the COPY-based kline ingest helpers
+"""
+
+import csv
+import io
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from backend.modules.data_fetch.core_kline_copy import (
+    KLINE_COPY_COLUMNS, KLINE_STAGING_TABLE, IngestStats, copy_csv, copy_sql, copy_to_staging,
+    kline_copy_rows, merge_sql, staging_table_sql
+)
+
+KLINE = {
+    'symbol': 'BTCUSDT', 'interval': '1m',
+    'open_time': datetime(2024, 1, 1), 'close_time': datetime(2024, 1, 1, 0, 0, 59, 999000),
+    'open_price': Decimal('42000.5'), 'high_price': 42010.0, 'low_price': 41990.0,
+    'close_price': 42005.25, 'volume': 12.5, 'number_of_trades': 310,
+}
+
+
+class TestKlineCopy:
+
+    def test_rows_follow_copy_columns_with_defaults(self):
+        row, = kline_copy_rows([KLINE])
+        record = dict(zip(KLINE_COPY_COLUMNS, row))
+        assert record['open_price'] == Decimal('42000.5')
+        assert record['quote_volume'] == 0
+        assert record['taker_buy_base_volume'] is None
+
+    def test_csv_round_trip_keeps_nulls_unquoted(self):
+        text = copy_csv(kline_copy_rows([KLINE, {**KLINE, 'open_time': datetime(2024, 1, 1, 0, 1)}])).getvalue()
+        lines = text.splitlines()
+        assert len(lines) == 2
+        assert lines[0].startswith('BTCUSDT,1m,2024-01-01 00:00:00,2024-01-01 00:00:59.999000,42000.5,')
+        assert lines[0].endswith(',310,,')  # NULL taker volumes
+
+        fields = next(csv.reader([lines[1]]))
+        assert len(fields) == len(KLINE_COPY_COLUMNS)
+
+    def test_merge_keeps_latest_staged_copy(self):
+        sql = merge_sql('kline_data')
+        assert sql.startswith('INSERT INTO kline_data (symbol, interval, open_time, close_time')
+        assert 'PARTITION BY symbol, interval, open_time ORDER BY seq DESC' in sql
+        assert 'ON CONFLICT ON CONSTRAINT unique_kline DO UPDATE SET high_price = EXCLUDED.high_price' in sql
+        assert 'open_price = EXCLUDED' not in sql
+        assert 'ON CONFLICT (symbol, interval, open_time) DO' in merge_sql('kline_data', constraint=None)
+
+    def test_merge_upserts_real_rows(self):
+        db = sqlite3.connect(':memory:')
+        columns = ', '.join(KLINE_COPY_COLUMNS)
+        typed = ', '.join(f"{column} NUMERIC" for column in KLINE_COPY_COLUMNS)
+        db.execute(f"CREATE TABLE kline_data ({typed}, UNIQUE (symbol, interval, open_time))")
+        db.execute(f"CREATE TABLE {KLINE_STAGING_TABLE} (seq INTEGER PRIMARY KEY, {typed})")
+
+        def load(table, klines):
+            # Rows as COPY reads them from the CSV stream
+            for row in csv.reader(copy_csv(kline_copy_rows(klines))):
+                db.execute(f"INSERT INTO {table} ({columns}) VALUES ({', '.join('?' * len(row))})",
+                           [value or None for value in row])
+
+        minute = datetime(2024, 1, 1, 0, 1)
+        load('kline_data', [{**KLINE, 'open_price': 1.0, 'close_price': 1.0}])
+        load(KLINE_STAGING_TABLE, [
+            {**KLINE, 'open_price': 2.0, 'close_price': 2.0},   # conflicts with the stored candle
+            {**KLINE, 'open_time': minute, 'open_price': 3.0, 'close_price': 3.0},
+            {**KLINE, 'open_time': minute, 'open_price': 4.0, 'close_price': 4.0},  # later copy wins
+        ])
+
+        db.execute(merge_sql('kline_data', constraint=None))
+        rows = db.execute("SELECT open_price, close_price FROM kline_data ORDER BY open_time").fetchall()
+        # Conflicts refresh the update columns only; the stored open price stays
+        assert rows == [(1.0, 2.0), (4.0, 4.0)]
+
+    def test_copy_through_either_psycopg_cursor(self):
+        class Psycopg2Cursor:
+            def copy_expert(self, sql, buffer):
+                self.copied = (sql, buffer.getvalue())
+
+        class Copy(io.StringIO):
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                Psycopg3Cursor.copied = self.getvalue()
+
+        class Psycopg3Cursor:
+            def copy(self, sql):
+                assert sql == copy_sql()
+                return Copy()
+
+        old, new = Psycopg2Cursor(), Psycopg3Cursor()
+        copy_to_staging(old, kline_copy_rows([KLINE]))
+        copy_to_staging(new, kline_copy_rows([KLINE]))
+        assert old.copied == (copy_sql(), new.copied)
+        assert new.copied.startswith('BTCUSDT,1m,')
+
+        with pytest.raises(TypeError):
+            copy_to_staging(object(), [])
+
+    def test_staging_is_session_private(self):
+        create, add_seq = staging_table_sql('kline_data')
+        assert create.startswith('CREATE TEMPORARY TABLE IF NOT EXISTS kline_ingest_staging')
+        assert 'seq BIGSERIAL' in add_seq
+        assert copy_sql().endswith('FROM STDIN WITH (FORMAT csv)')
+
+    def test_stats_report_rows_per_second(self):
+        stats = IngestStats()
+        stats.add(50000, 0.5)
+        stats.add(30000, 0.3)
+        assert stats.batches == 2
+        assert stats.rows_per_second == pytest.approx(100000)
+        assert stats.to_dict()['rows'] == 80000
+        assert IngestStats().rows_per_second == 0.0
+
+
+@pytest.mark.asyncio
+async def test_backfill_copy_runs_on_its_own_session(monkeypatch):
+    postgres = pytest.importorskip('backend.modules.data_fetch.adapter_marketdata_postgres')
+    import threading
+    from types import SimpleNamespace
+
+    engine = object()
+    shared = SimpleNamespace(get_bind=lambda: engine)
+    repository = postgres.MarketDataRepository(shared, ingest_batch_size=10)
+    calls = []
+
+    def copy_save_klines(klines, batch_size, session=None):
+        calls.append((threading.get_ident(), session, batch_size))
+        return len(klines)
+
+    monkeypatch.setattr(repository, 'copy_save_klines', copy_save_klines)
+
+    assert await repository.bulk_insert_klines([KLINE, KLINE]) == 2
+
+    (thread, session, batch_size), = calls
+    assert thread != threading.get_ident()
+    assert session is not shared and session.get_bind() is engine
+    assert batch_size == 10
@@ -0,0 +1,142 @@
+"""
+Unit tests for database-side kline gap detection
+"""
+
+from datetime import datetime, timedelta
+import os
+import time
+
+import pytest
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+
+from backend.modules.data_fetch.core_kline_gaps import gap_window, kline_gap_query, wall_clock_gaps
+
+klines = Table(
+    'kline_data', MetaData(),
+    Column('symbol', String), Column('interval', String),
+    Column('open_time', DateTime), Column('close_price', Float)
+)
+
+
+def compiled(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+
+
+@pytest.fixture
+def host_tz():
+    """Switch the process time zone, as a host outside UTC would have it"""
+    previous = os.environ.get('TZ')
+
+    def switch(name):
+        os.environ['TZ'] = name
+        time.tzset()
+
+    switch('UTC')
+    yield switch
+    if previous is None:
+        os.environ.pop('TZ', None)
+    else:
+        os.environ['TZ'] = previous
+    time.tzset()
+
+
+def run_gap_query(query, open_times):
+    """
+    Postgres' evaluation of ``kline_gap_query`` over stored open times
+
+    Bounds and sentinels are read from the compiled statement; LAG and the
+    interval arithmetic are on naive timestamps, as in the database.
+    """
+    params = query.compile(dialect=postgresql.dialect()).params
+    values = [v for v in params.values() if isinstance(v, datetime)]
+    before, first, last, after = values
+    step = next(v for v in params.values() if isinstance(v, timedelta))
+
+    times = sorted(t for t in open_times if first <= t <= last) + [after]
+    rows, previous = [], before
+    for open_time in times:
+        if open_time - previous > step:
+            rows.append((previous + step, open_time - step))
+        previous = open_time
+    return rows
+
+
+class TestGapWindow:
+
+    @pytest.fixture(autouse=True)
+    def utc(self, host_tz):
+        pass
+
+    def test_snaps_inward_to_open_time_grid(self):
+        assert gap_window('1h', datetime(2024, 1, 1, 0, 30), datetime(2024, 1, 3, 5, 10)) == \
+            (datetime(2024, 1, 1, 1), datetime(2024, 1, 3, 5))
+        assert gap_window('15m', datetime(2024, 1, 1), datetime(2024, 1, 1, 1)) == \
+            (datetime(2024, 1, 1), datetime(2024, 1, 1, 1))
+
+    def test_weeks_open_on_monday(self):
+        first, last = gap_window('1w', datetime(2024, 1, 3), datetime(2024, 1, 20))
+        assert (first, last) == (datetime(2024, 1, 8), datetime(2024, 1, 15))
+        assert first.weekday() == 0
+
+    def test_months_are_not_snapped(self):
+        assert gap_window('1M', datetime(2024, 1, 3), datetime(2024, 5, 1)) == \
+            (datetime(2024, 1, 3), datetime(2024, 5, 1))
+
+
+class TestGapQuery:
+
+    @pytest.fixture(autouse=True)
+    def utc(self, host_tz):
+        pass
+
+    def test_single_window_scan_over_open_times(self):
+        sql = compiled(kline_gap_query(klines, 'BTCUSDT', '1h', datetime(2024, 1, 1, 0, 30), datetime(2024, 1, 3, 5, 10)))
+
+        assert 'lag(' in sql and 'OVER (ORDER BY' in sql
+        assert 'close_price' not in sql and 'LIMIT' not in sql
+        # Grid-aligned range, bracketed by sentinels one step outside it
+        assert "open_time >= '2024-01-01 01:00:00'" in sql
+        assert "open_time <= '2024-01-03 05:00:00'" in sql
+        assert "'2024-01-03 06:00:00'" in sql and "'2024-01-01 00:00:00'" in sql
+
+    def test_monthly_spacing_tolerates_long_months(self):
+        sql = compiled(kline_gap_query(klines, 'BTCUSDT', '1M', datetime(2024, 1, 1), datetime(2024, 6, 1)))
+        assert 'make_interval(secs=>2678400.0)' in sql  # 31 days
+
+
+class TestLocalWallTime:
+    """Open times stored as ``datetime.fromtimestamp`` on a host outside UTC"""
+
+    def series(self, start_ms, count, step_ms, missing=()):
+        return [datetime.fromtimestamp((start_ms + i * step_ms) / 1000) for i in range(count) if i not in missing]
+
+    def test_window_and_sentinels_on_the_stored_grid(self, host_tz):
+        host_tz('Asia/Kolkata')  # UTC+05:30: hour candles open at :30 local
+        hour = 3600 * 1000
+        stored = self.series(1704067200000, 48, hour)  # 2024-01-01T00:00Z
+
+        first, last = gap_window('1h', stored[0] - timedelta(minutes=10), stored[-1] + timedelta(minutes=10))
+        assert (first, last) == (stored[0], stored[-1])
+        assert first.minute == 30
+
+        week = gap_window('1w', datetime(2024, 1, 3), datetime(2024, 1, 20))[0]
+        assert week == datetime.fromtimestamp(1704672000)  # Monday 2024-01-08T00:00Z
+
+        query = kline_gap_query(klines, 'BTCUSDT', '1h', stored[0], stored[-1])
+        assert run_gap_query(query, stored) == []
+
+        query = kline_gap_query(klines, 'BTCUSDT', '1h', stored[0] - timedelta(hours=2), stored[-1])
+        assert run_gap_query(query, stored) == [(stored[0] - timedelta(hours=2), stored[0] - timedelta(hours=1))]
+
+    def test_dst_change_is_not_a_gap(self, host_tz):
+        host_tz('America/New_York')  # clocks jump 02:00 -> 03:00 on 2024-03-10
+        hour = 3600 * 1000
+        stored = self.series(1710036000000, 12, hour, missing=(8,))  # 2024-03-10T02:00Z
+
+        query = kline_gap_query(klines, 'BTCUSDT', '1h', stored[0], stored[-1])
+        rows = run_gap_query(query, stored)
+        assert len(rows) == 2  # the wall clock skips an hour at the change
+
+        missing = datetime.fromtimestamp((1710036000000 + 8 * hour) / 1000)
+        assert wall_clock_gaps(rows, '1h') == [(missing, missing)]
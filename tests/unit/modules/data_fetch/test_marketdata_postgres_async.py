@@ -0,0 +1,286 @@
+"""
+Unit tests for the async Postgres market data repository, on a fake asyncpg connection
+"""
+
+import csv
+import io
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+pytest.importorskip('greenlet')  # required by sqlalchemy.ext.asyncio
+async_repo = pytest.importorskip('backend.modules.data_fetch.adapter_marketdata_postgres_async')
+
+from backend.boot.container import ContainerConfig, DependencyContainer
+from backend.boot.settings import DatabaseSettings
+from backend.modules.data_fetch.core_kline_copy import KLINE_COPY_COLUMNS, KLINE_STAGING_TABLE
+
+AsyncMarketDataRepository = async_repo.AsyncMarketDataRepository
+
+
+class FakeAsyncpg:
+    """asyncpg connection: statements, transactions and COPY as recorded calls"""
+
+    def __init__(self):
+        self.statements = []
+        self.copies = []
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield
+
+    async def execute(self, sql):
+        self.statements.append(sql)
+
+    async def copy_to_table(self, table, source, columns, format):
+        rows = list(csv.reader(io.StringIO(source.read().decode())))
+        self.copies.append((table, tuple(columns), format, rows))
+
+
+class FakeResult(list):
+
+    def all(self):
+        return list(self)
+
+    def one(self):
+        return self[0]
+
+    def first(self):
+        return self[0] if self else None
+
+
+class FakeStream:
+    """AsyncResult of a streamed query, partitioned by its yield_per"""
+
+    def __init__(self, rows, size):
+        self.rows = rows
+        self.size = size
+        self.closed = False
+
+    async def partitions(self):
+        for i in range(0, len(self.rows), self.size):
+            yield self.rows[i:i + self.size]
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """SQLAlchemy AsyncConnection answering queries with canned rows"""
+
+    def __init__(self, driver, rows):
+        self.raw = type('PooledConnection', (), {'driver_connection': driver, 'info': {}})()
+        self.sync_connection = object()
+        self.rows = rows
+        self.queries = []
+        self.streams = []
+
+    async def get_raw_connection(self):
+        return self.raw
+
+    async def execute(self, query):
+        self.queries.append(str(query.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.rows)
+
+    async def scalar(self, query):
+        return (await self.execute(query))[0][0]
+
+    async def stream(self, query):
+        self.queries.append(str(query.compile(dialect=postgresql.dialect())))
+        self.streams.append(FakeStream(self.rows, query.get_execution_options()['yield_per']))
+        return self.streams[-1]
+
+    async def run_sync(self, fn):
+        return fn(self.sync_connection)
+
+
+class FakePool:
+
+    def checkedout(self):
+        return 0
+
+    def size(self):
+        return 1
+
+    def overflow(self):
+        return 0
+
+
+class FakeEngine:
+    """Pool of one connection, reused by every operation"""
+
+    def __init__(self, rows=()):
+        self.driver = FakeAsyncpg()
+        self.connection = FakeConnection(self.driver, list(rows))
+        self.pool = FakePool()
+        self.disposed = False
+
+    async def dispose(self):
+        self.disposed = True
+
+    @asynccontextmanager
+    async def connect(self):
+        yield self.connection
+
+
+def kline(minute, close):
+    return {
+        'symbol': 'BTCUSDT', 'interval': '1m',
+        'open_time': datetime(2024, 1, 1, 0, minute), 'close_time': datetime(2024, 1, 1, 0, minute, 59),
+        'open_price': 1.0, 'high_price': 2.0, 'low_price': 0.5, 'close_price': close, 'volume': 3.0,
+    }
+
+
+class TestAsyncMarketDataRepository:
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_copies_batches_and_stages_once(self):
+        engine = FakeEngine()
+        repository = AsyncMarketDataRepository(engine, ingest_batch_size=2)
+
+        assert await repository.bulk_insert_klines([kline(i, 10.0 + i) for i in range(3)]) == 3
+        assert await repository.bulk_insert_klines([kline(5, 15.0)]) == 1
+
+        driver = engine.driver
+        assert driver.transactions == 3
+        creates = [sql for sql in driver.statements if sql.startswith('CREATE TEMPORARY TABLE')]
+        assert len(creates) == 1  # one pooled connection, staged once
+        assert engine.connection.raw.info[KLINE_STAGING_TABLE] is True
+        assert sum(sql.startswith('INSERT INTO kline_data') for sql in driver.statements) == 3
+
+        table, columns, fmt, rows = driver.copies[0]
+        assert (table, columns, fmt) == (KLINE_STAGING_TABLE, KLINE_COPY_COLUMNS, 'csv')
+        assert [len(rows) for *_, rows in driver.copies] == [2, 1, 1]
+        assert rows[1][KLINE_COPY_COLUMNS.index('close_price')] == '11.0'
+
+        stats = repository.get_stats()
+        assert stats['ingest']['rows'] == 4 and stats['ingest']['batches'] == 3
+        assert stats['queries']['bulk_insert_klines']['count'] == 3
+        assert await repository.bulk_insert_klines([]) == 0
+
+    @pytest.mark.asyncio
+    async def test_data_gaps_come_from_the_lag_query(self):
+        gap = (datetime(2024, 1, 1, 0, 3), datetime(2024, 1, 1, 0, 4))
+        engine = FakeEngine(rows=[gap])
+        repository = AsyncMarketDataRepository(engine)
+
+        gaps = await repository.get_data_gaps('BTCUSDT', '1m', datetime(2024, 1, 1), datetime(2024, 1, 1, 1))
+
+        assert gaps == [gap]
+        sql, = engine.connection.queries
+        assert 'lag(' in sql and 'gap_start' in sql
+        assert repository.get_stats()['queries']['get_data_gaps']['count'] == 1
+
+    @pytest.mark.asyncio
+    async def test_ohlcv_arrays_newest_rows_in_ascending_order(self):
+        # Newest first, as the limited query returns them
+        rows = [(datetime(2024, 1, 1, 0, minute), 1.0, 2.0, 0.5, float(minute), 3.0) for minute in (2, 1)]
+        engine = FakeEngine(rows=rows)
+        repository = AsyncMarketDataRepository(engine)
+
+        candles = await repository.get_ohlcv_arrays('BTCUSDT', '1m', limit=2)
+
+        assert np.array_equal(candles['close'], [1.0, 2.0])
+        assert len(candles) == 2 and candles.symbol == 'BTCUSDT'
+        assert 'ORDER BY kline_data.open_time DESC' in engine.connection.queries[0]
+
+    @pytest.mark.asyncio
+    async def test_universe_is_read_with_one_ranked_query(self):
+        rows = [('BTCUSDT', datetime(2024, 1, 1, 0, minute), 1.0, 2.0, 0.5, float(minute), 3.0)
+                for minute in (1, 2)]
+        engine = FakeEngine(rows=rows)
+        repository = AsyncMarketDataRepository(engine)
+
+        arrays = await repository.get_ohlcv_arrays_multi(['BTCUSDT', 'ETHUSDT'], '1h', limit=2)
+
+        assert np.array_equal(arrays['BTCUSDT']['close'], [1.0, 2.0])
+        assert len(arrays['ETHUSDT']) == 0
+        sql, = engine.connection.queries
+        assert 'kline_data.symbol IN (__[POSTCOMPILE_symbol_1])' in sql
+        assert 'row_number() OVER (PARTITION BY kline_data.symbol ORDER BY kline_data.open_time DESC)' in sql
+        assert 'newest_rank <=' in sql
+
+    @pytest.mark.asyncio
+    async def test_kline_reads_for_the_indicator_service(self):
+        rows = [(datetime(2024, 1, 1, 0, minute), 1.0, 2.0, 0.5, float(minute), 3.0) for minute in range(5)]
+        engine = FakeEngine(rows=rows)
+        repository = AsyncMarketDataRepository(engine)
+
+        batches = [batch async for batch in repository.iter_candles('BTCUSDT', '1m', batch_size=2)]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert engine.connection.streams[0].closed
+
+        klines = await repository.get_klines('BTCUSDT', '1m', start_time=datetime(2024, 1, 1), limit=3)
+        assert len(klines) == 5  # canned rows; the limit is applied by the query
+        assert await repository.get_latest_kline('BTCUSDT', '1m') == rows[0]
+        assert 'ORDER BY kline_data.open_time DESC' in engine.connection.queries[1]
+        assert 'LIMIT' in engine.connection.queries[2]
+
+    @pytest.mark.asyncio
+    async def test_indicator_methods_run_the_sync_repository_on_the_connection(self, monkeypatch):
+        calls = []
+
+        class SyncRepository:
+            def __init__(self, session):
+                self.session = session
+
+            def get_indicator_frame(self, symbol, timeframe, **kwargs):
+                calls.append((self.session.bind, symbol, timeframe, kwargs))
+                return 'frame'
+
+        monkeypatch.setattr(async_repo, 'MarketDataRepository', SyncRepository)
+        engine = FakeEngine()
+        repository = AsyncMarketDataRepository(engine)
+
+        assert await repository.get_indicator_frame('BTCUSDT', '1m', limit=1) == 'frame'
+        assert calls == [(engine.connection.sync_connection, 'BTCUSDT', '1m', {'limit': 1})]
+        assert repository.get_stats()['queries']['get_indicator_frame']['count'] == 1
+
+    def test_engine_pool_and_statement_cache(self, monkeypatch):
+        created = {}
+        monkeypatch.setattr(async_repo, 'create_async_engine', lambda url, **kwargs: created.update(url=url, **kwargs))
+
+        async_repo.create_marketdata_engine('postgresql+asyncpg://u:p@db/bot', pool_size=4, statement_cache_size=0)
+
+        assert created['url'].query == {'prepared_statement_cache_size': '0'}
+        assert created['connect_args'] == {'statement_cache_size': 0}
+        assert created['pool_size'] == 4 and created['pool_pre_ping'] is True
+
+
+class TestContainerWiring:
+
+    def test_backfill_service_runs_on_the_async_repository(self, monkeypatch):
+        engines = []
+        monkeypatch.setattr(async_repo, 'create_async_engine', lambda url, **kwargs: engines.append(kwargs) or FakeEngine())
+
+        settings = DatabaseSettings(host='db', name='bot', user='u', password='p', pool_size=3)
+        container = DependencyContainer(ContainerConfig(database=settings))
+        container._initialized = True  # only the data components under test
+        container._instances['fetch_planner'] = planner = object()
+
+        service = container.create_backfill_service(exchange=object())
+
+        assert isinstance(service.repository, AsyncMarketDataRepository)
+        assert service.fetch_planner is planner
+        assert container.get_marketdata_repository() is service.repository
+        assert len(engines) == 1 and engines[0]['pool_size'] == 3
+
+    @pytest.mark.asyncio
+    async def test_indicator_service_shares_the_repository_until_shutdown(self, monkeypatch):
+        engine = FakeEngine()
+        monkeypatch.setattr(async_repo, 'create_async_engine', lambda url, **kwargs: engine)
+
+        container = DependencyContainer(ContainerConfig(database=DatabaseSettings(host='db', name='bot')))
+        container._initialize_data_components()
+        container._initialized = True
+
+        service = container.get_indicator_service()
+        assert service.repository is container.get_marketdata_repository()
+
+        await container.shutdown()
+        assert engine.disposed
@@ -0,0 +1,222 @@
+"""
+Unit tests for the weight-aware REST rate limiter and backfill scheduling
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.modules.data_fetch.core_rate_limiter import (
+    WeightRateLimiter, kline_request_weight, retry_after, used_weight
+)
+from backend.modules.data_fetch.service_backfill_klines import BackfillConfig, BackfillKlinesService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def limiter(clock, **kwargs):
+    return WeightRateLimiter(capacity=100, window=10.0, headroom=1.0, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestWeightRateLimiter:
+
+    def test_request_weights_and_headers(self):
+        assert [kline_request_weight(n) for n in (50, 100, 500, 1000, 1500)] == [1, 2, 5, 5, 10]
+        assert used_weight({'x-mbx-used-weight-1m': '1234'}) == 1234
+        assert used_weight({}) is None and used_weight(None) is None
+        assert retry_after({'Retry-After': '7'}) == 7.0
+        assert retry_after({'Retry-After': 'soon'}) is None
+
+    @pytest.mark.asyncio
+    async def test_burst_then_paced_at_refill_rate(self):
+        clock = FakeClock()
+        bucket = limiter(clock)
+
+        for _ in range(20):
+            await bucket.acquire(5)
+        assert clock.now == 0.0  # full budget spent without waiting
+
+        await bucket.acquire(5)
+        assert clock.now == pytest.approx(0.5)  # 10 weight/s refill
+        assert bucket.stats['weight'] == 105
+
+    @pytest.mark.asyncio
+    async def test_server_usage_caps_tokens(self):
+        clock = FakeClock()
+        bucket = limiter(clock)
+        bucket.observe_used_weight(90)
+
+        await bucket.acquire(10)
+        await bucket.acquire(10)
+        assert clock.now == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_throttle_pauses_and_slows_then_recovers(self):
+        clock = FakeClock()
+        bucket = limiter(clock, base_backoff=2.0, recovery=0.25)
+
+        assert bucket.on_throttled(429) == pytest.approx(2.0)
+        assert bucket.on_throttled(429) == pytest.approx(4.0)  # exponential without Retry-After
+        assert bucket.rate_factor == pytest.approx(0.25)
+
+        await bucket.acquire(1)
+        assert clock.now >= 4.0
+
+        bucket.on_success()
+        assert bucket.strikes == 0 and bucket.rate_factor == pytest.approx(0.5)
+
+        assert bucket.on_throttled(418, retry_after_seconds=120) == pytest.approx(120)
+        assert bucket.get_stats()['banned'] == 1 and bucket.get_stats()['throttled'] == 2
+
+    @pytest.mark.asyncio
+    async def test_in_flight_bound(self):
+        bucket = WeightRateLimiter(max_in_flight=2)
+        running = peak = 0
+
+        async def call():
+            nonlocal running, peak
+            async with bucket.request(1):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+
+
+class FakeExchange:
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def validate_symbols(self, symbols):
+        return symbols
+
+    async def fetch_historical_klines(self, symbol, interval, start_time, end_time):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01 if symbol != 'SLOW' else 0.05)
+        self.running -= 1
+        return [{'symbol': symbol}]
+
+
+class FakeRepository:
+    async def bulk_insert_klines(self, klines):
+        return len(klines)
+
+
+class FakePlanner:
+    def create_fetch_plan(self, symbols, intervals, start_date, end_date):
+        return [{'symbol': s, 'interval': '1m', 'start': start_date, 'end': end_date} for s in symbols]
+
+
+class TestBackfillScheduling:
+
+    @pytest.mark.asyncio
+    async def test_downloads_stay_in_flight_without_group_delays(self):
+        exchange = FakeExchange()
+        service = BackfillKlinesService(
+            FakeRepository(), exchange, FakePlanner(),
+            BackfillConfig(parallel_downloads=3, retry_delay=5)
+        )
+        end = datetime(2024, 1, 2)
+
+        started = asyncio.get_running_loop().time()
+        stats = await service.download_historical_data(
+            ['SLOW'] + [f"S{i}" for i in range(8)], ['1m'], end - timedelta(days=1), end
+        )
+
+        assert asyncio.get_running_loop().time() - started < 1.0
+        assert stats['successful_batches'] == 9 and stats['total_candles'] == 9
+        assert exchange.peak == 3
+
+
+class FakeResponse:
+    def __init__(self, used):
+        self.headers = {'x-mbx-used-weight-1m': str(used)}
+
+
+class FakeAsyncClient:
+    """python-binance AsyncClient: the last response is kept on the shared client"""
+
+    def __init__(self, used, delays):
+        self.used = used
+        self.delays = delays
+        self.response = None
+
+    async def futures_klines(self, symbol, **kwargs):
+        self.response = FakeResponse(self.used[symbol])
+        await asyncio.sleep(self.delays[symbol])  # reading the body
+        return []
+
+
+class FakeKlinesClient:
+    """AsyncClient serving one 1m kline per minute of the requested range"""
+
+    def __init__(self):
+        self.requests = []
+        self.response = None
+
+    async def futures_exchange_info(self):
+        return {'symbols': [{'symbol': 'BTCUSDT', 'status': 'TRADING'}, {'symbol': 'ETHUSDT', 'status': 'TRADING'}]}
+
+    async def futures_klines(self, symbol, interval, startTime, endTime, limit):
+        self.requests.append((symbol, startTime))
+        first = -(-startTime // 60_000) * 60_000  # klines opening at or after startTime
+        opens = range(first, endTime + 1, 60_000)[:limit]
+        self.response = FakeResponse(0)  # no other users of the IP
+        return [[t, '1', '2', '0.5', '1.5', '3', t + 59_999, '4', 5, '1', '2', '0'] for t in opens]
+
+
+class TestBinanceUsedWeight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_read_their_own_headers(self):
+        binance = pytest.importorskip('backend.modules.data_fetch.adapter_marketdata_binance')
+
+        client = binance.BinanceFuturesClient(rate_limiter=WeightRateLimiter(max_in_flight=2))
+        client.client = FakeAsyncClient(used={'FIRST': 100, 'SECOND': 900}, delays={'FIRST': 0.02, 'SECOND': 0.0})
+
+        observed = []
+        client.rate_limiter.observe_used_weight = lambda used: observed.append(used)
+
+        async def fetch(symbol):
+            await client.get_historical_klines(symbol, '1m', limit=100)
+            return observed[-1]
+
+        # SECOND cannot replace the client's response while FIRST is still reading its body
+        assert await asyncio.gather(fetch('FIRST'), fetch('SECOND')) == [100, 900]
+        assert sorted(observed) == [100, 900]
+
+    @pytest.mark.asyncio
+    async def test_backfill_pages_are_paced_by_the_limiter(self):
+        binance = pytest.importorskip('backend.modules.data_fetch.adapter_marketdata_binance')
+
+        clock = FakeClock()
+        # Two 1000-kline pages at once, then 1 weight/s
+        bucket = WeightRateLimiter(capacity=10, window=10.0, headroom=1.0, clock=clock, sleep=clock.sleep)
+        client = binance.BinanceFuturesClient(rate_limiter=bucket)
+        client.client = FakeKlinesClient()
+        service = BackfillKlinesService(FakeRepository(), client, FakePlanner(), BackfillConfig(parallel_downloads=2))
+        start = datetime(2024, 1, 1)
+
+        stats = await service.download_historical_data(['BTCUSDT', 'ETHUSDT', 'DELISTED'], ['1m'], start,
+                                                       start + timedelta(minutes=2499))
+
+        assert stats['total_candles'] == 2 * 2500
+        assert len(client.client.requests) == 6  # pages of 1000, 1000 and 500 per symbol
+        assert bucket.stats['weight'] == 30 and bucket.stats['server_used_weight'] == 0
+        assert clock.now == pytest.approx(20.0)  # four pages waited 5s each for their weight